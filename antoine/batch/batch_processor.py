@@ -23,6 +23,9 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 from src.models import CompanyData, CompanyIntelligenceConfig
 from src.antoine_scraper_adapter import AntoineScraperAdapter
 from src.progress_logger import start_company_processing, log_processing_phase, complete_company_processing
+from src.browser_pool import get_browser_pool, get_browser_pool_stats
+from src.page_cache import get_page_cache, get_page_cache_stats
+from src.llm_cache import get_llm_cache, get_llm_cache_stats
 
 logger = logging.getLogger(__name__)
 
@@ -213,6 +216,10 @@ class AntoineBatchProcessor:
             'total_processing_time': 0.0
         }
         
+        # Start browsers for the Crawl4AI fallback paths while discovery runs
+        if self.enable_resource_pooling:
+            get_browser_pool().warm_up(min(self.max_concurrent_companies, len(companies)))
+        
         # Submit all companies to thread pool
         futures = {}
         for company in companies:
@@ -274,7 +281,10 @@ class AntoineBatchProcessor:
             'total_pages_crawled': self.stats['total_pages_crawled'],
             'avg_pages_per_company': self.stats['total_pages_crawled'] / max(result.successful, 1),
             'avg_seconds_per_company': self.stats['total_processing_time'] / max(result.successful, 1),
-            'parallel_efficiency': self.stats['total_processing_time'] / max(result.total_duration, 1)
+            'parallel_efficiency': self.stats['total_processing_time'] / max(result.total_duration, 1),
+            'browser_pool': get_browser_pool_stats(),
+            'page_cache': get_page_cache_stats(),
+            'llm_cache': get_llm_cache_stats()
         }
         
         logger.info(f"📊 Batch processing completed:")
@@ -284,6 +294,12 @@ class AntoineBatchProcessor:
         logger.info(f"   Duration: {result.total_duration:.1f}s")
         logger.info(f"   Throughput: {result.companies_per_minute:.1f} companies/minute")
         logger.info(f"   Parallel efficiency: {result.resource_stats['parallel_efficiency']:.1%}")
+        page_cache = get_page_cache()
+        if page_cache:
+            logger.info(page_cache.report())
+        llm_cache = get_llm_cache()
+        if llm_cache:
+            logger.info(llm_cache.report())
         
         return result
     
@@ -317,6 +333,6 @@ class AntoineBatchProcessor:
         logger.info("Shutting down antoine batch processor")
         self.executor.shutdown(wait=True)
         
-        # Clear resource pools
+        # Clear resource pools (the shared browser pool is process-wide and closes at exit)
         with self.pool_lock:
             self.scraper_pool.clear()
\ No newline at end of file
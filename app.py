@@ -28,6 +28,13 @@ from src.main_pipeline import TheodoreIntelligencePipeline, find_company_by_name
 from src.models import CompanyIntelligenceConfig, CompanySimilarity, CompanyData
 from typing import Optional
 from src.progress_logger import progress_logger, start_company_processing
+from src.browser_pool import get_browser_pool, get_browser_pool_stats
+from src.page_cache import get_page_cache_stats
+from src.llm_cache import get_llm_cache_stats
+from src.embedding_service import get_embedding_cache_stats
+from src.host_scheduler import get_host_scheduler_stats
+from src.discovery_cache import get_discovery_cache_stats
+from src.company_mirror import ensure_company_mirror, get_company_mirror, get_company_mirror_stats
 
 # Import authentication modules
 from src.auth_manager import AuthManager
@@ -303,6 +310,79 @@ def diagnostic_check():
     
     return jsonify(response)
 
+@app.route('/api/browser-pool/stats')
+def browser_pool_stats():
+    """Shared headless browser pool usage"""
+    return jsonify({
+        'browser_pool': get_browser_pool_stats(),
+        'timestamp': datetime.utcnow().isoformat()
+    })
+
+@app.route('/api/page-cache/stats')
+def page_cache_stats():
+    """Shared on-disk page cache hit rates and size"""
+    return jsonify({
+        'page_cache': get_page_cache_stats(),
+        'timestamp': datetime.utcnow().isoformat()
+    })
+
+@app.route('/api/llm-cache/stats')
+def llm_cache_stats():
+    """LLM response cache hit rate and tokens / cost saved"""
+    return jsonify({
+        'llm_cache': get_llm_cache_stats(),
+        'timestamp': datetime.utcnow().isoformat()
+    })
+
+@app.route('/api/embedding-cache/stats')
+def embedding_cache_stats():
+    """Persistent embedding cache and embedding queue statistics"""
+    return jsonify({
+        'embedding_cache': get_embedding_cache_stats(),
+        'embedding_service': pipeline.bedrock_client.embeddings.get_stats() if pipeline else None,
+        'timestamp': datetime.utcnow().isoformat()
+    })
+
+
+@app.route('/api/host-scheduler/stats')
+def host_scheduler_stats():
+    """Per-host crawl politeness scheduler statistics"""
+    return jsonify({
+        'host_scheduler': get_host_scheduler_stats(),
+        'timestamp': datetime.utcnow().isoformat()
+    })
+
+
+@app.route('/api/discovery-cache/stats')
+def discovery_cache_stats():
+    """Per-domain robots/sitemap/navigation discovery cache statistics"""
+    return jsonify({
+        'discovery_cache': get_discovery_cache_stats(),
+        'timestamp': datetime.utcnow().isoformat()
+    })
+
+@app.route('/api/company-mirror/stats')
+def company_mirror_stats():
+    """Local company metadata mirror statistics"""
+    return jsonify({
+        'company_mirror': get_company_mirror_stats(),
+        'timestamp': datetime.utcnow().isoformat()
+    })
+
+@app.route('/api/company-mirror/sync', methods=['POST'])
+def company_mirror_sync():
+    """Re-seed the company metadata mirror from Pinecone"""
+    if not pipeline:
+        return jsonify({'error': 'Theodore pipeline not initialized'}), 500
+    mirror = get_company_mirror()
+    if not mirror:
+        return jsonify({'error': 'Company mirror disabled'}), 400
+    try:
+        synced = mirror.sync_from_index(pipeline.pinecone_client.index, pipeline.config.pinecone_dimension)
+        return jsonify({'success': True, 'companies': synced, 'timestamp': datetime.utcnow().isoformat()})
+    except Exception as e:
+        return jsonify({'error': f'Mirror sync failed: {str(e)}'}), 500
+
 @app.route('/diagnostic')
 def diagnostic_page():
     """Diagnostic page for troubleshooting pipeline issues"""
@@ -315,19 +395,31 @@ def get_companies_details():
         return jsonify({'error': 'Theodore pipeline not initialized'}), 500
     
     try:
-        # Query all vectors
-        query_result = pipeline.pinecone_client.index.query(
-            vector=[0.0] * 1536,
-            top_k=50,
-            include_metadata=True,
-            include_values=False
-        )
+        page = request.args.get('page', 1, type=int)
+        per_page = request.args.get('per_page', 50, type=int)
+        mirror = ensure_company_mirror(pipeline.pinecone_client.index, pipeline.config.pinecone_dimension)
+        
+        if mirror:
+            # Served from the local metadata mirror: every company, paginated and sorted in SQLite
+            records, total = mirror.list_companies(
+                page=page, per_page=per_page,
+                sort=request.args.get('sort', 'name'), order=request.args.get('order', 'asc'),
+                industry=request.args.get('industry'), query=request.args.get('q')
+            )
+        else:
+            # Query all vectors
+            query_result = pipeline.pinecone_client.index.query(
+                vector=[0.0] * 1536,
+                top_k=50,
+                include_metadata=True,
+                include_values=False
+            )
+            records = [(match.id, match.metadata or {}) for match in query_result.matches]
+            total = len(records)
         
         companies_with_details = []
         
-        for match in query_result.matches:
-            metadata = match.metadata
-            
+        for company_id, metadata in records:
             # Extract products/services data
             products_services = metadata.get('products_services_offered', '')
             if isinstance(products_services, str) and products_services:
@@ -336,7 +428,7 @@ def get_companies_details():
                 products_list = []
             
             company_detail = {
-                'id': match.id,
+                'id': company_id,
                 'name': metadata.get('company_name', 'Unknown'),
                 'website': metadata.get('website', ''),
                 'industry': metadata.get('industry', 'Unknown'),
@@ -360,17 +452,20 @@ def get_companies_details():
             }
             companies_with_details.append(company_detail)
         
-        # Sort by company name
-        companies_with_details.sort(key=lambda x: x['name'])
+        if not mirror:
+            # Sort by company name
+            companies_with_details.sort(key=lambda x: x['name'])
         
-        # Statistics
+        # Statistics (for the companies on this page)
         companies_with_products = len([c for c in companies_with_details if c['products_services_offered']])
         companies_with_culture = len([c for c in companies_with_details if c['company_culture'] not in ['No data', 'unknown', '']])
         
         return jsonify({
             'success': True,
             'companies': companies_with_details,
-            'total': len(companies_with_details),
+            'total': total,
+            'page': page if mirror else 1,
+            'per_page': per_page if mirror else total,
             'stats': {
                 'companies_with_products': companies_with_products,
                 'companies_with_culture': companies_with_culture,
@@ -745,6 +840,9 @@ def research_company():
             import time
             start_time = time.time()
             
+            # Get a browser warming up for the Crawl4AI fallback while discovery runs
+            get_browser_pool().warm_up(1)
+            
             # Use the original process_single_company method without signal-based timeout
             # (The scraper has its own built-in timeout handling)
             scraped_company = pipeline.process_single_company(
@@ -1370,21 +1468,30 @@ def browse_database():
             stats = {}
             total_companies = 0
         
-        # Get all companies using raw Pinecone query
+        # Get all companies, from the local metadata mirror when available
         companies = []
+        page = request.args.get('page', 1, type=int)
+        per_page = request.args.get('per_page', 100, type=int)
         try:
-            # Query all vectors with metadata
-            query_response = index.query(
-                vector=[0.0] * 1536,  # Dummy vector for metadata-only query
-                top_k=100,
-                include_metadata=True,
-                include_values=False
-            )
+            mirror = ensure_company_mirror(index)
+            if mirror:
+                records, mirrored_total = mirror.list_companies(
+                    page=page, per_page=per_page,
+                    sort=request.args.get('sort', 'name'), order=request.args.get('order', 'asc'),
+                    industry=request.args.get('industry'), query=request.args.get('q')
+                )
+            else:
+                # Query all vectors with metadata
+                query_response = index.query(
+                    vector=[0.0] * 1536,  # Dummy vector for metadata-only query
+                    top_k=100,
+                    include_metadata=True,
+                    include_values=False
+                )
+                records = [(match.id, match.metadata or {}) for match in query_response.matches]
+                mirrored_total = len(records)
             
-            for match in query_response.matches:
-                metadata = match.metadata or {}
-                company_id = match.id
-                
+            for company_id, metadata in records:
                 companies.append({
                     "id": company_id,
                     "name": metadata.get('company_name', metadata.get('name', 'Unknown')),
@@ -1400,16 +1507,20 @@ def browse_database():
             
             # Update total count from actual results if stats failed
             if total_companies == 0:
-                total_companies = len(companies)
+                total_companies = mirrored_total
                 
         except Exception as e:
             print(f"Warning: Failed to get companies: {e}")
             # Return empty list if query fails
             companies = []
+            mirrored_total = 0
         
         return jsonify({
             "total_companies": total_companies,
             "companies": companies,
+            "page": page,
+            "per_page": per_page,
+            "matching_companies": mirrored_total,
             "database_stats": {"total_vectors": total_companies},
             "timestamp": datetime.utcnow().isoformat()
         })
@@ -1824,6 +1935,18 @@ def search_companies():
         # Get companies from actual database
         company_database = {}
         if pipeline and pipeline.pinecone_client:
+            mirror = ensure_company_mirror(pipeline.pinecone_client.index, pipeline.config.pinecone_dimension)
+            if mirror:
+                # Prefix / full-text match over every company in the local mirror (already ranked)
+                for _, metadata in mirror.search(query, limit=5):
+                    smart_suggestions.append({
+                        'name': metadata.get('company_name', ''),
+                        'website': metadata.get('website', ''),
+                        'industry': metadata.get('industry', 'Unknown'),
+                        'business_model': metadata.get('business_model', 'Unknown')
+                    })
+                return jsonify({'results': smart_suggestions})
+            
             try:
                 # Query Pinecone for all companies
                 dummy_embedding = [0.0] * 1536
@@ -2355,9 +2478,8 @@ def update_company(company_id):
         updated_fields.append('last_updated')
         
         # Update the vector in Pinecone (keeping the same embedding)
-        pipeline.pinecone_client.index.upsert(
-            vectors=[(company_id, vector_data.values, existing_metadata)]
-        )
+        if not pipeline.pinecone_client.update_company_metadata(company_id, vector_data.values, existing_metadata):
+            return jsonify({'error': 'Failed to update company in vector database'}), 500
         
         return jsonify({
             'success': True,
@@ -2861,11 +2983,11 @@ def classify_unknown_industries():
                         current_metadata['industry'] = industry
                         
                         # Upsert back to Pinecone
-                        pipeline.pinecone_client.index.upsert([(
+                        pipeline.pinecone_client.update_company_metadata(
                             company['id'],
                             current_values,
                             current_metadata
-                        )])
+                        )
                         
                         classified_count += 1
                         results_log.append(f"✅ {company['name']}: {industry}")
@@ -3220,11 +3342,9 @@ def batch_classify_companies():
                         'classification_timestamp': datetime.now().isoformat()
                     })
                     
-                    # Update in Pinecone
-                    update_result = pipeline.pinecone_client.index.update(
-                        id=company['id'],
-                        metadata=updated_metadata
-                    )
+                    # Update in Pinecone (and the local metadata mirror)
+                    if not pipeline.pinecone_client.set_company_metadata(company['id'], updated_metadata):
+                        raise RuntimeError("Failed to store classification")
                     
                     successful_classifications += 1
                     results.append({
@@ -3764,59 +3884,91 @@ def get_batch_progress(job_id):
 
 @app.route('/api/batch/stream/<job_id>')
 def stream_batch_progress(job_id):
-    """Stream real-time batch progress updates using Server-Sent Events"""
+    """
+    Stream real-time batch progress updates using Server-Sent Events
+
+    Updates are pushed from the progress bus as BatchProgressLogger publishes
+    them. Reconnecting clients send Last-Event-ID and resume where they left
+    off; otherwise (or if the gap is too old) they get a fresh snapshot.
+    """
     from flask import Response
     from src.progress_logger import progress_logger
+    from src.progress_bus import get_progress_bus
     import json
     import time
     
+    topic = f"batch:{job_id}"
+    heartbeat_seconds = 15
+    max_idle_seconds = 600  # Give up on a job that stops reporting entirely
+    
+    last_event_header = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        last_event_id = int(last_event_header) if last_event_header else None
+    except ValueError:
+        last_event_id = None
+    
     def generate():
         """Generate SSE events for batch progress"""
-        last_update = None
-        no_update_count = 0
-        max_no_updates = 60  # Stop after 60 seconds of no updates
+        bus = get_progress_bus()
         
-        while True:
-            try:
-                # Get current progress
-                progress = progress_logger.get_batch_progress(job_id)
-                
-                if not progress:
-                    yield f"data: {json.dumps({'error': 'Job not found'})}\n\n"
-                    break
-                
-                # Check if progress has changed
-                current_status = progress.get('status')
-                current_processed = progress.get('processed', 0)
-                current_message = progress.get('current_message', '')
-                
-                current_update = f"{current_status}-{current_processed}-{current_message}"
-                
-                if current_update != last_update:
-                    # Progress changed, send update
-                    yield f"data: {json.dumps(progress)}\n\n"
-                    last_update = current_update
-                    no_update_count = 0
-                else:
-                    no_update_count += 1
-                
-                # Check if job is completed
-                if current_status == 'completed':
-                    # Send final update and close
-                    yield f"data: {json.dumps({'event': 'complete', 'progress': progress})}\n\n"
-                    break
-                
-                # Check for timeout
-                if no_update_count >= max_no_updates:
-                    yield f"data: {json.dumps({'event': 'timeout', 'message': 'No updates for 60 seconds'})}\n\n"
-                    break
+        def snapshot(progress, event_id):
+            # Tag snapshots with the bus position they were read at, so a reconnect resumes after them
+            return f"id: {event_id}\ndata: {json.dumps(progress, default=str)}\n\n"
+        
+        try:
+            # Take the bus position before reading the store so nothing published in between is lost
+            snapshot_id = bus.last_event_id
+            progress = progress_logger.get_batch_progress(job_id)
+            if not progress:
+                yield f"data: {json.dumps({'error': 'Job not found'})}\n\n"
+                return
+            
+            cursor = last_event_id
+            missed, complete = bus.events_since(topic, cursor)
+            if cursor is None or not complete:
+                cursor = snapshot_id
+                yield snapshot(progress, snapshot_id)
+            else:
+                for event in missed:
+                    if event.event != 'complete':  # Completion is sent below from the stored status
+                        yield event.to_sse()
+                    cursor = event.id
+            
+            if progress.get('status') == 'completed':
+                yield f"data: {json.dumps({'event': 'complete', 'progress': progress}, default=str)}\n\n"
+                return
+            
+            last_sent = progress
+            idle_since = time.time()
+            for events in bus.subscribe(topic, cursor, heartbeat=heartbeat_seconds):
+                if events is None:
+                    # Nothing published in this process; the batch may run in another
+                    # one that shares the progress store, so check it directly
+                    snapshot_id = bus.last_event_id
+                    progress = progress_logger.get_batch_progress(job_id)
+                    if progress and progress != last_sent:
+                        last_sent = progress
+                        idle_since = time.time()
+                        yield snapshot(progress, snapshot_id)
+                        if progress.get('status') == 'completed':
+                            yield f"data: {json.dumps({'event': 'complete', 'progress': progress}, default=str)}\n\n"
+                            return
+                    elif time.time() - idle_since >= max_idle_seconds:
+                        yield f"data: {json.dumps({'event': 'timeout', 'message': f'No updates for {max_idle_seconds} seconds'})}\n\n"
+                        return
+                    yield ": keep-alive\n\n"
+                    continue
                 
-                # Sleep before next check
-                time.sleep(1)
+                idle_since = time.time()
+                for event in events:
+                    if event.event == 'complete':
+                        yield f"id: {event.id}\ndata: {json.dumps({'event': 'complete', 'progress': event.data}, default=str)}\n\n"
+                        return
+                    last_sent = event.data
+                    yield event.to_sse()
                 
-            except Exception as e:
-                yield f"data: {json.dumps({'error': str(e)})}\n\n"
-                break
+        except Exception as e:
+            yield f"data: {json.dumps({'error': str(e)})}\n\n"
     
     return Response(
         generate(),
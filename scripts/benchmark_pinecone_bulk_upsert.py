@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Pinecone bulk writer against a local fake index
+
+The fake index charges a fixed round-trip latency per request plus transfer
+time at a fixed bandwidth, and rejects requests over 2 MB like Pinecone does.
+Compares the old sequential 100-vector loop with PineconeBulkWriter at a few
+parallelism levels.
+
+Usage:
+    python scripts/benchmark_pinecone_bulk_upsert.py --companies 5000 --latency-ms 80
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from src.pinecone_bulk_writer import PineconeBulkWriter, estimate_vector_bytes
+
+MAX_REQUEST_BYTES = 2 * 1024 * 1024
+
+
+class FakeIndex:
+    """Latency + bandwidth model of a remote index; shared link bandwidth across concurrent requests."""
+
+    def __init__(self, latency: float, bandwidth_mb_s: float):
+        self.latency = latency
+        self.bandwidth = bandwidth_mb_s * 1024 * 1024
+        self.count = 0
+        self.rejected = 0
+        self._link = threading.Lock()
+        self._lock = threading.Lock()
+
+    def upsert(self, vectors, namespace=None):
+        size = sum(estimate_vector_bytes(vector) for vector in vectors)
+        if size > MAX_REQUEST_BYTES:
+            with self._lock:
+                self.rejected += 1
+            raise ValueError(f"Request size {size} exceeds 2MB limit")
+        with self._link:
+            time.sleep(size / self.bandwidth)  # Transfer is serialized on the shared link
+        time.sleep(self.latency)  # Round trip overlaps across requests
+        with self._lock:
+            self.count += len(vectors)
+
+
+def make_vectors(count: int, dimension: int):
+    rng = random.Random(7)
+    vectors = []
+    for i in range(count):
+        # Most companies are small; some carry large raw_content like real scrapes
+        raw_content = "x" * rng.choice([500, 2_000, 8_000, 40_000])
+        vectors.append({
+            "id": f"company-{i}",
+            "values": [rng.random() for _ in range(dimension)],
+            "metadata": {"company_name": f"Company {i}", "raw_content": raw_content},
+        })
+    return vectors
+
+
+def sequential_upsert(index, vectors, batch_size=100):
+    """The previous batch_upsert_companies loop"""
+    upserted = 0
+    for i in range(0, len(vectors), batch_size):
+        try:
+            index.upsert(vectors=vectors[i:i + batch_size])
+            upserted += len(vectors[i:i + batch_size])
+        except Exception:
+            pass
+    return upserted
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--companies", type=int, default=3000)
+    parser.add_argument("--dimension", type=int, default=1536)
+    parser.add_argument("--latency-ms", type=float, default=80)
+    parser.add_argument("--bandwidth-mb-s", type=float, default=50)
+    args = parser.parse_args()
+
+    vectors = make_vectors(args.companies, args.dimension)
+    total_mb = sum(estimate_vector_bytes(vector) for vector in vectors) / 1024 / 1024
+    print(f"📦 {len(vectors)} vectors, {total_mb:.1f} MB, {args.latency_ms:.0f} ms RTT, {args.bandwidth_mb_s} MB/s")
+    print(f"   Bandwidth floor: {total_mb / args.bandwidth_mb_s:.2f}s")
+    print("=" * 60)
+
+    index = FakeIndex(args.latency_ms / 1000, args.bandwidth_mb_s)
+    started = time.time()
+    upserted = sequential_upsert(index, vectors)
+    elapsed = time.time() - started
+    print(f"sequential x100     {elapsed:7.2f}s  {upserted / elapsed:8.0f}/s  "
+          f"upserted {upserted}, rejected requests {index.rejected}")
+
+    for parallel in (1, 4, 8, 16):
+        index = FakeIndex(args.latency_ms / 1000, args.bandwidth_mb_s)
+        writer = PineconeBulkWriter(index, max_batch_vectors=100, max_parallel=parallel, retry_backoff=0)
+        result = writer.upsert(vectors)
+        print(f"bulk writer x{parallel:<3}     {result.duration_seconds:7.2f}s  {result.vectors_per_second:8.0f}/s  "
+              f"upserted {result.written}, {result.requests} requests, rejected requests {index.rejected}")
+
+
+if __name__ == "__main__":
+    main()
@@ -23,13 +23,19 @@ Usage:
 """
 
 import asyncio
+import hashlib
 import logging
 import os
+import re
 import sys
 import time
-from typing import List
+from typing import Awaitable, Callable, Dict, List, Optional
 from urllib.parse import urljoin, urlparse
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+
+from src.antoine_fetcher import FetchResult, get_page_fetcher, close_page_fetcher
+from src.host_scheduler import host_slot, retry_after_from_headers
+from src.page_cache import get_page_cache
 
 # Load environment variables
 try:
@@ -70,6 +76,16 @@ class PageCrawlResult:
     crawl_time: float = 0.0
     extraction_method: str = ""  # "trafilatura" or "beautifulsoup_fallback"
     error: str = ""
+    etag: str = ""  # Validators from the page response, for conditional re-crawls
+    last_modified: str = ""
+    not_modified: bool = False  # Server answered 304 to a conditional request
+    content_hash: str = ""  # content_hash() of the full text, before truncation
+
+
+def content_hash(content: str) -> str:
+    """Hash page text with whitespace collapsed, so reflowed markup isn't a change."""
+    normalized = re.sub(r'\s+', ' ', content or '').strip()
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
 
 
 @dataclass
@@ -84,7 +100,9 @@ class BatchCrawlResult:
     aggregated_content: str = ""
     page_results: List[PageCrawlResult] = None
     errors: List[str] = None
-    
+    cancelled_pages: int = 0  # In-flight or queued pages dropped by the scheduler
+    stop_reason: str = ""  # Why the scheduler stopped early ("" when every page ran)
+
     def __post_init__(self):
         if self.page_results is None:
             self.page_results = []
@@ -92,23 +110,56 @@ class BatchCrawlResult:
             self.errors = []
 
 
+@dataclass
+class CrawlBudget:
+    """
+    When to stop crawling a company's pages.
+
+    The crawl stops (and cancels whatever is still queued or in flight) as soon as
+    either content budget is met or the deadline passes. `max_pages` only counts
+    once at least `min_chars` of content has been gathered, so a handful of tiny
+    pages can't end the crawl early.
+    """
+    max_pages: Optional[int] = None  # Successful pages
+    max_chars: Optional[int] = None  # Total extracted characters
+    min_chars: int = 5000
+    deadline_seconds: Optional[float] = None  # Measured from the start of the crawl
+
+    def stop_reason(self, successful_pages: int, total_chars: int) -> str:
+        """Return why the budget is met, or "" if crawling should continue."""
+        if self.max_chars is not None and total_chars >= self.max_chars:
+            return f"content budget met ({total_chars:,}/{self.max_chars:,} chars)"
+        if (self.max_pages is not None and successful_pages >= self.max_pages
+                and total_chars >= self.min_chars):
+            return f"page budget met ({successful_pages}/{self.max_pages} pages)"
+        return ""
+
+
 async def crawl_single_page(
     url: str,
     base_url: str,
     timeout_seconds: int = 30,
-    max_content_length: int = 10000
+    max_content_length: int = 10000,
+    validators: Optional[Dict[str, str]] = None
 ) -> PageCrawlResult:
     """
     Crawl a single page and extract clean text content using Trafilatura.
     
     Uses Trafilatura's superior boilerplate removal and content extraction
     to get clean, unique content from each page without navigation/header/footer.
-    
+    The HTML is downloaded with the loop's shared AsyncPageFetcher, so pages
+    crawled concurrently share pooled keep-alive connections. Downloaded HTML and
+    extracted text go into the shared page cache, so retries and re-runs within
+    the cache TTL don't touch the network.
+
     Args:
         url: Full URL to crawl
         base_url: Base website URL for context
         timeout_seconds: Timeout for page crawling
         max_content_length: Maximum content length to extract
+        validators: 'etag' / 'last_modified' from a previous crawl; when given the
+            request is conditional and an unchanged page comes back with
+            not_modified=True and no content
         
     Returns:
         PageCrawlResult with extracted content or error details
@@ -124,31 +175,87 @@ async def crawl_single_page(
     print(f"🔍 [{url}] Starting Trafilatura extraction...")
     start_time = time.time()
     
+    # Conditional re-checks (validators given) must see the live page, so they skip cache reads
+    page_cache = get_page_cache()
+    read_cache = page_cache is not None and not validators
+    
+    if read_cache:
+        cached_text = await page_cache.get_async(url, "text")
+        if cached_text:
+            content = cached_text.content
+            if len(content) > max_content_length:
+                content = content[:max_content_length] + "... [TRUNCATED]"
+            print(f"💾 [{url}] Served from page cache ({len(content)} chars)")
+            return PageCrawlResult(
+                url=url,
+                success=True,
+                content=content,
+                title=cached_text.meta.get('title', ''),
+                content_length=len(content),
+                crawl_time=time.time() - start_time,
+                extraction_method=cached_text.meta.get('extraction_method', 'trafilatura'),
+                etag=cached_text.meta.get('etag', ''),
+                last_modified=cached_text.meta.get('last_modified', ''),
+                content_hash=content_hash(cached_text.content)
+            )
+    
     try:
-        # Configure realistic browser headers to bypass anti-bot protection
-        user_agent = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
-        
-        # Create Trafilatura config with adaptive timeout settings
-        trafilatura_config = trafilatura.settings.use_config()
-        trafilatura_config.set('DEFAULT', 'USER_AGENTS', user_agent)
-        trafilatura_config.set('DEFAULT', 'TIMEOUT', str(timeout_seconds))  # Use adaptive timeout
-        
-        # Download the page content with realistic browser user agent
-        downloaded = trafilatura.fetch_url(url, config=trafilatura_config)
-        
+        # Download through the shared async fetcher so concurrent pages overlap
+        # their network waits (trafilatura.fetch_url blocks the event loop)
+        conditional_headers = {}
+        if validators:
+            if validators.get('etag'):
+                conditional_headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                conditional_headers['If-Modified-Since'] = validators['last_modified']
+
+        cached_html = await page_cache.get_async(url, "html") if read_cache else None
+        if cached_html:
+            fetch_result = FetchResult(
+                url=url,
+                success=True,
+                html=cached_html.content,
+                etag=cached_html.meta.get('etag', ''),
+                last_modified=cached_html.meta.get('last_modified', '')
+            )
+        else:
+            fetch_result = await get_page_fetcher().fetch(
+                url, timeout_seconds=timeout_seconds, headers=conditional_headers or None
+            )
+            if fetch_result.success and page_cache:
+                await page_cache.put_async(url, fetch_result.html, "html", {
+                    'etag': fetch_result.etag,
+                    'last_modified': fetch_result.last_modified
+                })
+        if fetch_result.not_modified:
+            print(f"♻️  [{url}] Not modified since last crawl")
+            return PageCrawlResult(
+                url=url,
+                success=True,
+                crawl_time=time.time() - start_time,
+                extraction_method="not_modified",
+                etag=fetch_result.etag or validators.get('etag', ''),
+                last_modified=fetch_result.last_modified or validators.get('last_modified', ''),
+                not_modified=True
+            )
+        downloaded = fetch_result.html if fetch_result.success else None
+
         if not downloaded:
             crawl_time = time.time() - start_time
-            
+
             # Check if this might be a 403 error (anti-bot protection)
             # and try Crawl4AI fallback for protected sites
-            print(f"⚠️  [{url}] Trafilatura failed to download, trying Crawl4AI fallback...")
+            print(f"⚠️  [{url}] Download failed ({fetch_result.error}), trying Crawl4AI fallback...")
             
             try:
-                # Import Crawl4AI for protected sites
-                from crawl4ai import AsyncWebCrawler
+                # Use a warm browser from the shared pool for protected sites
+                from src.browser_pool import get_browser_pool
                 
-                async with AsyncWebCrawler(verbose=False) as crawler:
-                    crawl4ai_result = await crawler.arun(url=url)
+                async with get_browser_pool().lease() as crawler:
+                    async with host_slot(url) as slot:
+                        crawl4ai_result = await crawler.arun(url=url)
+                        slot.record(getattr(crawl4ai_result, 'status_code', None),
+                                    retry_after_from_headers(getattr(crawl4ai_result, 'response_headers', None)))
                     
                     if crawl4ai_result.success and crawl4ai_result.cleaned_html:
                         # Extract content from Crawl4AI result
@@ -156,6 +263,8 @@ async def crawl_single_page(
                         if len(crawl4ai_content) > 200:  # Reasonable content found
                             crawl_time = time.time() - start_time
                             print(f"✅ [{url}] Crawl4AI fallback successful ({len(crawl4ai_content)} chars)")
+                            if page_cache:
+                                await page_cache.put_async(url, crawl4ai_content, "text", {'extraction_method': "crawl4ai_fallback"})
                             
                             return PageCrawlResult(
                                 url=url,
@@ -178,8 +287,10 @@ async def crawl_single_page(
                 extraction_method="all_methods_failed"
             )
         
-        # Extract clean content using Trafilatura (removes boilerplate by default)
-        content = trafilatura.extract(downloaded)
+        # Extract clean content using Trafilatura (removes boilerplate by default).
+        # Extraction is CPU-bound, so keep it off the event loop as well.
+        loop = asyncio.get_running_loop()
+        content = await loop.run_in_executor(None, trafilatura.extract, downloaded)
         trafilatura_content = content.strip() if content else ""
         trafilatura_length = len(trafilatura_content)
         
@@ -268,7 +379,8 @@ async def crawl_single_page(
                 extraction_method="no_content"
             )
         
-        # Clean and limit content
+        # Clean and limit content (the cache keeps the full text)
+        full_content = final_content
         if len(final_content) > max_content_length:
             final_content = final_content[:max_content_length] + "... [TRUNCATED]"
         
@@ -292,6 +404,14 @@ async def crawl_single_page(
             except:
                 title = ""
         
+        if page_cache:
+            await page_cache.put_async(url, full_content, "text", {
+                'title': title,
+                'extraction_method': extraction_method,
+                'etag': fetch_result.etag,
+                'last_modified': fetch_result.last_modified
+            })
+        
         crawl_time = time.time() - start_time
         
         print(f"✅ [{url}] Extracted successfully ({len(final_content)} chars, {crawl_time:.2f}s) via {extraction_method}")
@@ -303,7 +423,10 @@ async def crawl_single_page(
             title=title,
             content_length=len(final_content),
             crawl_time=crawl_time,
-            extraction_method=extraction_method
+            extraction_method=extraction_method,
+            etag=fetch_result.etag,
+            last_modified=fetch_result.last_modified,
+            content_hash=content_hash(full_content)
         )
         
     except Exception as e:
@@ -321,22 +444,117 @@ async def crawl_single_page(
 # No additional content cleaning functions needed - Trafilatura handles boilerplate removal
 
 
+def _order_by_priority(
+    full_urls: List[str],
+    selected_paths: List[str],
+    path_priorities: Optional[Dict[str, float]]
+) -> List[str]:
+    """Order URLs by LLM selection priority (highest first), keeping selection order on ties."""
+    if not path_priorities:
+        return list(full_urls)
+    priority_by_url = {
+        url: path_priorities.get(path, path_priorities.get(url, 0.0))
+        for url, path in zip(full_urls, selected_paths)
+    }
+    return sorted(full_urls, key=lambda url: -priority_by_url[url])
+
+
+async def _crawl_until_budget(
+    urls: List[str],
+    crawl_page: Callable[[str], Awaitable[PageCrawlResult]],
+    budget: CrawlBudget,
+    deadline_at: Optional[float],
+    prior_results: List[PageCrawlResult]
+):
+    """
+    Crawl URLs (in priority order) until the budget is met or the deadline passes.
+
+    Every URL gets a task up front; the caller's semaphore decides how many run at
+    once, and since asyncio semaphores are FIFO the highest-priority pages start
+    first. As soon as the budget is met, everything still queued or in flight is
+    cancelled.
+
+    Args:
+        urls: URLs to crawl, highest priority first
+        crawl_page: Coroutine function crawling one URL
+        budget: Content budget to stop at
+        deadline_at: Absolute time.time() deadline, or None
+        prior_results: Results from earlier phases that count towards the budget
+
+    Returns:
+        Tuple of (completed page results, cancelled URLs in priority order, stop reason)
+    """
+    successful_pages = sum(1 for r in prior_results if r.success)
+    total_chars = sum(r.content_length for r in prior_results if r.success)
+    stop_reason = budget.stop_reason(successful_pages, total_chars)
+    if stop_reason:
+        return [], list(urls), stop_reason
+
+    tasks = {asyncio.ensure_future(crawl_page(url)): url for url in urls}
+    pending = set(tasks)
+    results = []
+
+    while pending and not stop_reason:
+        timeout = None
+        if deadline_at is not None:
+            timeout = deadline_at - time.time()
+            if timeout <= 0:
+                stop_reason = f"deadline reached ({budget.deadline_seconds}s)"
+                break
+
+        done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+        for task in done:
+            try:
+                result = task.result()
+            except Exception as e:
+                result = PageCrawlResult(
+                    url=tasks[task],
+                    success=False,
+                    error=f"Exception: {str(e)}",
+                    extraction_method="exception"
+                )
+            results.append(result)
+            if result.success:
+                successful_pages += 1
+                total_chars += result.content_length
+
+        stop_reason = budget.stop_reason(successful_pages, total_chars)
+
+    if pending:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    cancelled_urls = [url for task, url in tasks.items() if task in pending]
+    return results, cancelled_urls, stop_reason
+
+
 async def crawl_selected_pages(
     base_url: str,
     selected_paths: List[str],
     timeout_seconds: int = 30,
     max_content_per_page: int = 10000,
-    max_concurrent: int = 5
+    max_concurrent: int = 5,
+    path_priorities: Optional[Dict[str, float]] = None,
+    budget: Optional[CrawlBudget] = None
 ) -> BatchCrawlResult:
     """
     Crawl multiple pages concurrently and aggregate content.
     
+    Pages are crawled in LLM priority order. Once the content budget is met or
+    its deadline passes, remaining pages are cancelled and the partial results
+    are aggregated.
+    
     Args:
         base_url: Base website URL
         selected_paths: List of paths to crawl (from LLM selection)
         timeout_seconds: Timeout per page
         max_content_per_page: Maximum content per page
         max_concurrent: Maximum concurrent crawls
+        path_priorities: Selection priority per path (LinkSelectionResult.path_priorities)
+        budget: When to stop early; an unset max_pages uses the adaptive
+            early-completion threshold
         
     Returns:
         BatchCrawlResult with aggregated content and individual page results
@@ -356,6 +574,8 @@ async def crawl_selected_pages(
     print(f"⚡ Max concurrent: {max_concurrent}, timeout: {timeout_seconds}s")
     
     start_time = time.time()
+    budget = budget or CrawlBudget()
+    deadline_at = start_time + budget.deadline_seconds if budget.deadline_seconds else None
     
     # Convert paths to full URLs
     full_urls = []
@@ -365,6 +585,9 @@ async def crawl_selected_pages(
         else:
             full_urls.append(urljoin(base_url, path))
     
+    # Highest-value pages first, so an early stop keeps the best content
+    full_urls = _order_by_priority(full_urls, selected_paths, path_priorities)
+    
     # 🧠 INTELLIGENT CRAWLING STRATEGY
     # Test a few URLs first to assess website responsiveness
     print(f"🧪 Testing website responsiveness with first 3 URLs...")
@@ -382,11 +605,10 @@ async def crawl_selected_pages(
                 url, base_url, timeout_seconds, max_content_per_page
             )
     
-    # Test website responsiveness
+    # Test website responsiveness (char budget and deadline already apply here)
     test_start_time = time.time()
-    test_results = await asyncio.gather(
-        *[test_crawl_with_semaphore(url) for url in test_urls],
-        return_exceptions=True
+    test_results, cancelled_urls, stop_reason = await _crawl_until_budget(
+        test_urls, test_crawl_with_semaphore, budget, deadline_at, []
     )
     test_duration = time.time() - test_start_time
     
@@ -396,9 +618,7 @@ async def crawl_selected_pages(
     test_timeouts = 0
     
     for result in test_results:
-        if isinstance(result, Exception):
-            test_failures += 1
-        elif result.success:
+        if result.success:
             test_successes += 1
         else:
             test_failures += 1
@@ -438,6 +658,9 @@ async def crawl_selected_pages(
         adaptive_concurrent = max_concurrent
         early_completion_threshold = max(8, len(full_urls) * 3 // 4)  # Complete with 75% success
     
+    if budget.max_pages is None:
+        budget = replace(budget, max_pages=early_completion_threshold)
+    
     print(f"🎛️ Adaptive settings: timeout={adaptive_timeout}s, concurrent={adaptive_concurrent}, early_complete={early_completion_threshold}")
     
     # Create adaptive semaphore for remaining URLs
@@ -450,13 +673,16 @@ async def crawl_selected_pages(
                 url, base_url, adaptive_timeout, max_content_per_page
             )
     
-    # Crawl remaining URLs with adaptive settings
-    if remaining_urls:
+    # Crawl remaining URLs with adaptive settings until the budget is met
+    if stop_reason:
+        cancelled_urls += remaining_urls
+        remaining_results = []
+    elif remaining_urls:
         print(f"🌐 Crawling {len(remaining_urls)} remaining URLs with adaptive settings...")
-        remaining_results = await asyncio.gather(
-            *[crawl_with_adaptive_semaphore(url) for url in remaining_urls],
-            return_exceptions=True
+        remaining_results, remaining_cancelled, stop_reason = await _crawl_until_budget(
+            remaining_urls, crawl_with_adaptive_semaphore, budget, deadline_at, test_results
         )
+        cancelled_urls += remaining_cancelled
     else:
         remaining_results = []
     
@@ -468,45 +694,35 @@ async def crawl_selected_pages(
     failed_results = []
     errors = []
     
-    for i, result in enumerate(page_results):
-        if isinstance(result, Exception):
-            failed_result = PageCrawlResult(
-                url=full_urls[i],
-                success=False,
-                error=f"Exception: {str(result)}",
-                extraction_method="exception"
-            )
-            failed_results.append(failed_result)
-            errors.append(f"{full_urls[i]}: {str(result)}")
-        elif result.success:
+    for result in page_results:
+        if result.success:
             successful_results.append(result)
         else:
             failed_results.append(result)
             errors.append(f"{result.url}: {result.error}")
     
-    # 🎯 EARLY COMPLETION CHECK
-    # Check if we have enough successful content to complete early
-    total_content_length = sum(r.content_length for r in successful_results)
-    min_content_threshold = 5000  # Minimum 5KB of content
+    cancelled_results = [
+        PageCrawlResult(
+            url=url,
+            success=False,
+            error=f"Cancelled: {stop_reason}",
+            extraction_method="cancelled"
+        )
+        for url in cancelled_urls
+    ]
     
-    early_completion_met = (
-        len(successful_results) >= early_completion_threshold and 
-        total_content_length >= min_content_threshold
-    )
+    total_content_length = sum(r.content_length for r in successful_results)
     
-    if early_completion_met and len(successful_results) < len(full_urls):
-        print(f"🎯 Early completion triggered: {len(successful_results)}/{len(full_urls)} pages successful")
+    if cancelled_results:
+        print(f"🎯 Early completion triggered: {stop_reason}")
         print(f"📄 Content gathered: {total_content_length:,} characters from {len(successful_results)} pages")
-        print(f"⚡ Skipping remaining pages to optimize processing time")
+        print(f"⚡ Cancelled {len(cancelled_results)} remaining pages to optimize processing time")
     elif len(successful_results) > 0:
         print(f"✅ Content extraction completed: {len(successful_results)}/{len(full_urls)} pages successful")
         print(f"📄 Total content: {total_content_length:,} characters")
     else:
         print(f"❌ No pages successfully crawled from {base_url}")
     
-    # Aggregate content from successful pages
-    aggregated_content = _aggregate_page_content(successful_results, base_url)
-    
     total_crawl_time = time.time() - start_time
     
     result = BatchCrawlResult(
@@ -516,26 +732,38 @@ async def crawl_selected_pages(
         failed_pages=len(failed_results),
         total_content_length=total_content_length,
         total_crawl_time=total_crawl_time,
-        aggregated_content=aggregated_content,
-        page_results=successful_results + failed_results,
-        errors=errors
+        page_results=successful_results + failed_results + cancelled_results,
+        errors=errors,
+        cancelled_pages=len(cancelled_results),
+        stop_reason=stop_reason if cancelled_results else ""
     )
     
+    # Aggregate content from successful pages
+    result.aggregated_content = _aggregate_page_content(successful_results, base_url, result)
+    
     print(f"✅ Batch crawl completed in {total_crawl_time:.2f}s")
     print(f"   Successful: {result.successful_pages}/{result.total_pages}")
     print(f"   Total content: {result.total_content_length:,} characters")
     print(f"   Failed: {result.failed_pages} pages")
+    if result.cancelled_pages:
+        print(f"   Cancelled: {result.cancelled_pages} pages ({result.stop_reason})")
     
     return result
 
 
-def _aggregate_page_content(successful_results: List[PageCrawlResult], base_url: str) -> str:
+def _aggregate_page_content(
+    successful_results: List[PageCrawlResult],
+    base_url: str,
+    crawl_result: Optional[BatchCrawlResult] = None
+) -> str:
     """
     Aggregate content from multiple pages into a comprehensive text summary.
     
     Args:
         successful_results: List of successful page crawl results
         base_url: Base website URL for context
+        crawl_result: Batch result whose scheduler stats (early stop, cancelled
+            pages) are appended to the summary footer
         
     Returns:
         Aggregated content text optimized for company intelligence analysis
@@ -591,6 +819,18 @@ def _aggregate_page_content(successful_results: List[PageCrawlResult], base_url:
     for result in sorted_results:
         content_blocks.append(f"  - {result.url}")
     
+    # Scheduler stats, so downstream extraction knows the content is partial
+    if crawl_result is not None and crawl_result.cancelled_pages:
+        cancelled = [r.url for r in crawl_result.page_results if r.extraction_method == "cancelled"]
+        content_blocks.extend([
+            f"Crawl stopped early: {crawl_result.stop_reason}",
+            f"Pages cancelled: {crawl_result.cancelled_pages} of {crawl_result.total_pages}",
+            f"Pages failed: {crawl_result.failed_pages}",
+            f"URLs cancelled:",
+        ])
+        for url in cancelled:
+            content_blocks.append(f"  - {url}")
+    
     return "\n".join(content_blocks)
 
 
@@ -599,7 +839,9 @@ def crawl_selected_pages_sync(
     selected_paths: List[str],
     timeout_seconds: int = 30,
     max_content_per_page: int = 10000,
-    max_concurrent: int = 5
+    max_concurrent: int = 5,
+    path_priorities: Optional[Dict[str, float]] = None,
+    budget: Optional[CrawlBudget] = None
 ) -> BatchCrawlResult:
     """
     Synchronous wrapper for crawl_selected_pages().
@@ -610,15 +852,25 @@ def crawl_selected_pages_sync(
         timeout_seconds: Timeout per page
         max_content_per_page: Maximum content per page
         max_concurrent: Maximum concurrent crawls
+        path_priorities: Selection priority per path
+        budget: When to stop early
         
     Returns:
         BatchCrawlResult with aggregated content
     """
+    async def _crawl_and_close_pool():
+        try:
+            return await crawl_selected_pages(
+                base_url, selected_paths, timeout_seconds,
+                max_content_per_page, max_concurrent,
+                path_priorities=path_priorities, budget=budget
+            )
+        finally:
+            # asyncio.run() discards the loop, so release its connection pool too
+            await close_page_fetcher()
+
     try:
-        return asyncio.run(crawl_selected_pages(
-            base_url, selected_paths, timeout_seconds, 
-            max_content_per_page, max_concurrent
-        ))
+        return asyncio.run(_crawl_and_close_pool())
     except Exception as e:
         logger.error(f"Error in sync wrapper for {base_url}: {e}")
         return BatchCrawlResult(
@@ -10,6 +10,10 @@ This tool aggregates results from:
 2. Sitemap.xml Parsing (content structure discovery)  
 3. Robots.txt Analysis (crawling rules and restrictions)
 
+Each source, and the www/non-www probe, is cached per domain by
+src/discovery_cache.py, so repeat discovery of a recently seen domain does
+not touch the network.
+
 Adapted from antoine/critter.py for Theodore integration.
 """
 
@@ -18,7 +22,7 @@ import logging
 import os
 import time
 import requests
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set
 from urllib.parse import urlparse
 
 # Load environment variables
@@ -36,7 +40,7 @@ except ImportError:
 # Import crawler modules (using src prefix for Theodore)
 try:
     from src.crawl_header_for_links import extract_header_footer_links, strip_domains_from_links
-    from src.crawl_sitemap_xml import extract_sitemap_paths
+    from src.crawl_sitemap_xml import extract_sitemap_urls, strip_domains_from_sitemap
     from src.crawl_robots_txt import extract_robots_paths
     CRAWLERS_AVAILABLE = True
     print("✅ All crawler modules imported successfully")
@@ -44,6 +48,8 @@ except ImportError as e:
     print(f"❌ Failed to import crawler modules: {e}")
     CRAWLERS_AVAILABLE = False
 
+from src.discovery_cache import get_discovery_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -63,6 +69,14 @@ def normalize_domain_url(url: str) -> str:
     parsed = urlparse(url)
     domain = parsed.netloc
     
+    # The www/non-www probe costs up to two HEAD requests; reuse a recent answer
+    cache = get_discovery_cache()
+    cache_variant = parsed.path or "/"
+    cached = cache.lookup(url, "canonical_url", cache_variant) if cache else None
+    if cached and cached.fresh:
+        print(f"🔄 Domain normalized (cached): {url} → {cached.payload['url']}")
+        return cached.payload['url']
+    
     # If domain already has www, try both variants
     # If domain doesn't have www, try both variants
     
@@ -91,6 +105,8 @@ def normalize_domain_url(url: str) -> str:
                 # Use the final URL after redirects
                 final_url = response.url
                 print(f"🔄 Domain normalized: {url} → {final_url}")
+                if cache:
+                    cache.store(url, "canonical_url", {'url': final_url}, variant=cache_variant)
                 return final_url
         except:
             continue
@@ -122,6 +138,7 @@ class WebsiteDiscoveryResult:
         self.restricted_paths = []      # Disallowed in robots.txt
         self.allowed_paths = []         # Explicitly allowed in robots.txt
         self.sitemap_references = []    # Sitemap URLs from robots.txt
+        self.sitemap_lastmod = {}       # {path: lastmod} for sitemap entries that declare one
         
         # Discovery method tracking
         self.path_sources = {}          # {path: [source1, source2]}
@@ -175,7 +192,7 @@ async def discover_all_paths(
         # Run all discovery methods concurrently with timeout using normalized URL
         discovery_tasks = [
             _discover_header_footer_paths(normalized_url),
-            _discover_sitemap_paths(normalized_url, locale_filter),
+            _discover_sitemap_paths(normalized_url, locale_filter, result.sitemap_lastmod),
             _discover_robots_paths(normalized_url, user_agent_filter)
         ]
         
@@ -256,12 +273,23 @@ async def _discover_header_footer_paths(base_url: str) -> Dict:
         raise
 
 
-async def _discover_sitemap_paths(base_url: str, locale_filter: str = None) -> List[str]:
-    """Discover paths from sitemap.xml."""
+async def _discover_sitemap_paths(
+    base_url: str,
+    locale_filter: str = None,
+    lastmod_by_path: Optional[Dict[str, str]] = None
+) -> List[str]:
+    """Discover paths from sitemap.xml, recording each entry's lastmod in `lastmod_by_path`."""
     print("🗺️ Discovering sitemap content paths...")
     
     try:
-        paths = await extract_sitemap_paths(base_url, locale_filter)
+        entries = await extract_sitemap_urls(base_url, locale_filter)
+        paths = strip_domains_from_sitemap(entries, base_url)
+        
+        # Kept for incremental re-research (see src/page_manifest.py)
+        if lastmod_by_path is not None:
+            for entry in entries:
+                if entry.lastmod:
+                    lastmod_by_path[strip_domains_from_sitemap([entry], base_url)[0]] = entry.lastmod
         return paths
     
     except Exception as e:
@@ -82,6 +82,8 @@ except ImportError:
         page_results: List[PageCrawlResult] = None
         errors: List[str] = None
 
+from src.llm_cache import discard_cached_response, get_llm_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -112,6 +114,9 @@ class OpenRouterResponse:
     cost_usd: float = 0.0
     response_time: float = 0.0
     error: str = ""
+    cached: bool = False
+    cost_saved_usd: float = 0.0  # Cost of the original call when served from the LLM cache
+    cache_key: str = ""  # LLM cache entry holding this response, if any
 
 
 class OpenRouterClient:
@@ -128,23 +133,56 @@ class OpenRouterClient:
             "Content-Type": "application/json"
         }
     
-    def call_llm(self, prompt: str, timeout: int = 120) -> OpenRouterResponse:
-        """Make a request to OpenRouter API"""
+    def _calculate_cost(self, input_tokens: int, output_tokens: int) -> float:
+        """Nova Pro pricing: $0.80 per million input, $3.20 per million output"""
+        input_cost = (input_tokens / 1_000_000) * 0.80
+        output_cost = (output_tokens / 1_000_000) * 3.20
+        return input_cost + output_cost
+
+    def call_llm(self, prompt: str, timeout: int = 120, use_cache: bool = True) -> OpenRouterResponse:
+        """
+        Make a request to OpenRouter API
+
+        Responses are served from the shared LLM cache when the same model,
+        prompt and parameters were answered before; `use_cache=False` forces a
+        fresh call (which then replaces the cached response).
+        """
         
         start_time = time.time()
         
+        generation_params = {
+            "temperature": 0.1,  # Low temperature for consistency
+            "max_tokens": 8000,  # Sufficient for JSON response
+            "top_p": 0.9,
+            "frequency_penalty": 0,
+            "presence_penalty": 0,
+            "response_format": {"type": "json_object"}  # Request JSON format
+        }
+        
+        llm_cache = get_llm_cache()
+        if llm_cache:
+            hit = llm_cache.lookup(self.model, prompt, generation_params, use_cache=use_cache)
+            if hit:
+                print(f"♻️ LLM cache hit ({hit.tokens:,} tokens, ${hit.cost_usd:.4f} saved)")
+                return OpenRouterResponse(
+                    success=True,
+                    content=hit.content,
+                    model=hit.usage.get("model", self.model),
+                    usage=hit.usage,
+                    cost_usd=0.0,
+                    response_time=time.time() - start_time,
+                    cached=True,
+                    cost_saved_usd=hit.cost_usd,
+                    cache_key=hit.key
+                )
+        
         try:
             payload = {
                 "model": self.model,
                 "messages": [
                     {"role": "user", "content": prompt}
                 ],
-                "temperature": 0.1,  # Low temperature for consistency
-                "max_tokens": 8000,  # Sufficient for JSON response
-                "top_p": 0.9,
-                "frequency_penalty": 0,
-                "presence_penalty": 0,
-                "response_format": {"type": "json_object"}  # Request JSON format
+                **generation_params
             }
             
             response = requests.post(
@@ -170,19 +208,24 @@ class OpenRouterClient:
                 # Calculate cost (Nova Pro pricing)
                 input_tokens = usage.get("prompt_tokens", 0)
                 output_tokens = usage.get("completion_tokens", 0)
+                total_cost = self._calculate_cost(input_tokens, output_tokens)
+                model_used = data.get("model", self.model)
                 
-                # Nova Pro pricing: $0.80 per million input, $3.20 per million output
-                input_cost = (input_tokens / 1_000_000) * 0.80
-                output_cost = (output_tokens / 1_000_000) * 3.20
-                total_cost = input_cost + output_cost
+                cache_key = ""
+                if llm_cache:
+                    cache_key = llm_cache.store(self.model, prompt, generation_params, content,
+                                                usage={**usage, "model": model_used},
+                                                tokens=usage.get("total_tokens", input_tokens + output_tokens),
+                                                cost_usd=total_cost)
                 
                 return OpenRouterResponse(
                     success=True,
                     content=content,
-                    model=data.get("model", self.model),
+                    model=model_used,
                     usage=usage,
                     cost_usd=total_cost,
-                    response_time=response_time
+                    response_time=response_time,
+                    cache_key=cache_key
                 )
             else:
                 error_msg = f"API error {response.status_code}: {response.text}"
@@ -381,7 +424,8 @@ def extract_company_fields(
     batch_result: BatchCrawlResult,
     company_name: str,
     llm_client: Optional[OpenRouterClient] = None,
-    debug: bool = False
+    debug: bool = False,
+    use_cache: bool = True
 ) -> FieldExtractionResult:
     """
     Extract structured fields from aggregated company content
@@ -391,6 +435,7 @@ def extract_company_fields(
         company_name: Name of the company
         llm_client: Optional pre-initialized OpenRouter client
         debug: Enable debug logging
+        use_cache: Serve a cached LLM response for an identical prompt (False forces a fresh call)
         
     Returns:
         FieldExtractionResult with extracted fields and metadata
@@ -431,7 +476,7 @@ def extract_company_fields(
     
     # Call LLM for extraction
     print(f"\n🤖 Calling Nova Pro for field extraction...")
-    llm_response = llm_client.call_llm(prompt)
+    llm_response = llm_client.call_llm(prompt, use_cache=use_cache)
     
     if not llm_response.success:
         return FieldExtractionResult(
@@ -444,6 +489,8 @@ def extract_company_fields(
     extracted_fields = parse_extraction_response(llm_response.content)
     
     if not extracted_fields:
+        # A malformed or truncated response must not be replayed from the cache
+        discard_cached_response(llm_response.cache_key)
         return FieldExtractionResult(
             success=False,
             error="Failed to parse LLM response into structured fields",
@@ -495,7 +542,10 @@ def extract_company_fields(
     processing_time = time.time() - start_time
     
     print(f"\n✅ Extracted {len(extracted_fields)} fields in {processing_time:.1f}s")
-    print(f"💰 Cost: ${llm_response.cost_usd:.4f}")
+    if llm_response.cached:
+        print(f"💰 Cost: $0.0000 (cached response, ${llm_response.cost_saved_usd:.4f} saved)")
+    else:
+        print(f"💰 Cost: ${llm_response.cost_usd:.4f}")
     print(f"🎯 Confidence: {overall_confidence:.0%}")
     
     return FieldExtractionResult(
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Antoine Async Page Fetcher
+==========================
+
+Non-blocking HTML downloader used by the antoine crawling phase.
+
+`trafilatura.fetch_url` is synchronous, so calling it from `crawl_single_page`
+blocked the event loop and serialized every page of a company crawl. This module
+provides a pooled async fetcher that:
+
+- shares one connection pool per event loop (keep-alive reuse per host)
+- negotiates HTTP/2 when `httpx` and `h2` are installed, HTTP/1.1 via aiohttp otherwise
+- caps concurrent requests per host
+- takes a slot from the shared host scheduler (crawl-delay, global and
+  per-host caps, 429/503 backoff) and retries throttled requests once the
+  host's backoff allows
+- streams response bodies and stops reading at a byte limit
+
+The decoded HTML is handed to trafilatura's extractor as text.
+
+Usage:
+    fetcher = get_page_fetcher()
+    result = await fetcher.fetch("https://example.com/about")
+    if result.success:
+        text = trafilatura.extract(result.html)
+"""
+
+import asyncio
+import logging
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+from src.host_scheduler import HostThrottledError, THROTTLE_STATUSES, host_slot
+from src.ssl_config import get_ssl_context, should_verify_ssl
+
+try:
+    import httpx
+    import h2  # noqa: F401 - presence check, httpx needs it for HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = (
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
+)
+
+DEFAULT_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+# Content types trafilatura can do something useful with
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain', 'application/xml', 'text/xml')
+
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class FetchResult:
+    """Result from fetching a single URL"""
+    url: str
+    success: bool
+    status: int = 0
+    final_url: str = ""
+    html: str = ""
+    content_type: str = ""
+    bytes_read: int = 0
+    truncated: bool = False
+    http_version: str = ""
+    fetch_time: float = 0.0
+    error: str = ""
+    etag: str = ""
+    last_modified: str = ""
+    not_modified: bool = False  # 304 answer to a conditional request
+    retry_after: str = ""
+
+
+@dataclass
+class FetcherStats:
+    """Running counters for a fetcher instance"""
+    requests: int = 0
+    successes: int = 0
+    failures: int = 0
+    truncated: int = 0
+    bytes_read: int = 0
+    total_fetch_time: float = 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            'requests': self.requests,
+            'successes': self.successes,
+            'failures': self.failures,
+            'truncated': self.truncated,
+            'bytes_read': self.bytes_read,
+            'avg_fetch_time': self.total_fetch_time / self.requests if self.requests else 0.0,
+        }
+
+
+def _decode_body(body: bytes, charset: Optional[str]) -> str:
+    """Decode a response body using the declared charset, falling back to UTF-8."""
+    for encoding in (charset, 'utf-8'):
+        if not encoding:
+            continue
+        try:
+            return body.decode(encoding)
+        except (LookupError, UnicodeDecodeError):
+            continue
+    return body.decode('utf-8', errors='replace')
+
+
+def _is_html(content_type: str) -> bool:
+    if not content_type:
+        return True  # Many servers omit it; let the extractor decide
+    return content_type.split(';')[0].strip().lower() in HTML_CONTENT_TYPES
+
+
+class AsyncPageFetcher:
+    """
+    Pooled, streaming HTTP fetcher for crawl pages.
+
+    One instance owns one connection pool and must be used from the event loop
+    that created it. Use `get_page_fetcher()` to share an instance across all
+    pages crawled on the current loop.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_per_host: int = 6,
+        max_body_bytes: int = 5 * 1024 * 1024,
+        timeout_seconds: float = 30,
+        keepalive_seconds: float = 30,
+        user_agent: str = DEFAULT_USER_AGENT,
+        verify_ssl: Optional[bool] = None,
+        prefer_http2: bool = True,
+        max_throttle_retries: int = 2
+    ):
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.max_body_bytes = max_body_bytes
+        self.timeout_seconds = timeout_seconds
+        self.keepalive_seconds = keepalive_seconds
+        self.headers = {'User-Agent': user_agent, **DEFAULT_HEADERS}
+        self.verify_ssl = should_verify_ssl() if verify_ssl is None else verify_ssl
+        self.use_http2 = prefer_http2 and HTTP2_AVAILABLE
+        self.max_throttle_retries = max_throttle_retries
+
+        self.stats = FetcherStats()
+        self._client = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def backend(self) -> str:
+        return "httpx-h2" if self.use_http2 else "aiohttp"
+
+    def _get_client(self):
+        """Create the underlying pooled client on first use (needs a running loop)."""
+        if self._client is None:
+            ssl_context = get_ssl_context(self.verify_ssl)
+            if self.use_http2:
+                self._client = httpx.AsyncClient(
+                    http2=True,
+                    verify=ssl_context,
+                    follow_redirects=True,
+                    headers=self.headers,
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_connections,
+                        keepalive_expiry=self.keepalive_seconds
+                    )
+                )
+            else:
+                connector = aiohttp.TCPConnector(
+                    ssl=ssl_context,
+                    limit=self.max_connections,
+                    limit_per_host=self.max_per_host,
+                    keepalive_timeout=self.keepalive_seconds,
+                    ttl_dns_cache=300
+                )
+                self._client = aiohttp.ClientSession(connector=connector, headers=self.headers)
+            logger.debug(f"Created {self.backend} connection pool")
+        return self._client
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc.lower()
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_per_host)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    async def fetch(
+        self,
+        url: str,
+        timeout_seconds: Optional[float] = None,
+        max_body_bytes: Optional[int] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> FetchResult:
+        """
+        Download a page without blocking the event loop.
+
+        Args:
+            url: Absolute URL to fetch
+            timeout_seconds: Total time budget for the request (defaults to the fetcher's)
+            max_body_bytes: Stop reading the body after this many bytes
+            headers: Extra request headers
+
+        Returns:
+            FetchResult with decoded HTML or error details
+        """
+        if self._closed:
+            raise RuntimeError("AsyncPageFetcher is closed")
+
+        timeout = timeout_seconds or self.timeout_seconds
+        limit = max_body_bytes or self.max_body_bytes
+        start_time = time.time()
+
+        for attempt in range(self.max_throttle_retries + 1):
+            try:
+                async with host_slot(url) as slot:
+                    async with self._host_semaphore(url):
+                        if self.use_http2:
+                            result = await asyncio.wait_for(self._fetch_httpx(url, limit, headers), timeout)
+                        else:
+                            result = await asyncio.wait_for(self._fetch_aiohttp(url, limit, headers), timeout)
+                    slot.record(result.status, result.retry_after or None)
+            except HostThrottledError as e:
+                if attempt == 0:
+                    result = FetchResult(url=url, success=False, error=str(e))
+                break  # Keep the throttled response from the previous attempt
+            except asyncio.TimeoutError:
+                result = FetchResult(url=url, success=False, error=f"Timeout after {timeout}s")
+            except Exception as e:
+                result = FetchResult(url=url, success=False, error=f"{type(e).__name__}: {e}")
+            if result.status not in THROTTLE_STATUSES:
+                break
+            # The next slot for this host is only granted after its backoff
+
+        result.fetch_time = time.time() - start_time
+        self._record(result)
+        return result
+
+    async def _fetch_aiohttp(self, url: str, limit: int, headers: Optional[Dict[str, str]]) -> FetchResult:
+        session = self._get_client()
+        async with session.get(url, headers=headers, allow_redirects=True) as response:
+            result = FetchResult(
+                url=url,
+                success=False,
+                status=response.status,
+                final_url=str(response.url),
+                content_type=response.headers.get('Content-Type', ''),
+                http_version=f"HTTP/{response.version.major}.{response.version.minor}",
+                etag=response.headers.get('ETag', ''),
+                last_modified=response.headers.get('Last-Modified', ''),
+                retry_after=response.headers.get('Retry-After', '')
+            )
+            if not self._check_response(result):
+                return result
+
+            chunks = []
+            async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                chunks.append(chunk)
+                result.bytes_read += len(chunk)
+                if result.bytes_read >= limit:
+                    result.truncated = True
+                    break
+            return self._finish(result, b''.join(chunks)[:limit], response.charset)
+
+    async def _fetch_httpx(self, url: str, limit: int, headers: Optional[Dict[str, str]]) -> FetchResult:
+        client = self._get_client()
+        async with client.stream('GET', url, headers=headers) as response:
+            result = FetchResult(
+                url=url,
+                success=False,
+                status=response.status_code,
+                final_url=str(response.url),
+                content_type=response.headers.get('Content-Type', ''),
+                http_version=response.http_version,
+                etag=response.headers.get('ETag', ''),
+                last_modified=response.headers.get('Last-Modified', ''),
+                retry_after=response.headers.get('Retry-After', '')
+            )
+            if not self._check_response(result):
+                return result
+
+            chunks = []
+            async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                chunks.append(chunk)
+                result.bytes_read += len(chunk)
+                if result.bytes_read >= limit:
+                    result.truncated = True
+                    break
+            return self._finish(result, b''.join(chunks)[:limit], response.charset_encoding)
+
+    @staticmethod
+    def _check_response(result: FetchResult) -> bool:
+        if result.status == 304:
+            # Conditional request: the caller's cached copy is still current
+            result.not_modified = True
+            result.success = True
+            return False
+        if result.status >= 400:
+            result.error = f"HTTP {result.status}"
+            return False
+        if not _is_html(result.content_type):
+            result.error = f"Unsupported content type: {result.content_type}"
+            return False
+        return True
+
+    @staticmethod
+    def _finish(result: FetchResult, body: bytes, charset: Optional[str]) -> FetchResult:
+        result.html = _decode_body(body, charset)
+        result.success = bool(result.html.strip())
+        if not result.success:
+            result.error = "Empty response body"
+        return result
+
+    def _record(self, result: FetchResult):
+        self.stats.requests += 1
+        self.stats.bytes_read += result.bytes_read
+        self.stats.total_fetch_time += result.fetch_time
+        if result.success:
+            self.stats.successes += 1
+        else:
+            self.stats.failures += 1
+        if result.truncated:
+            self.stats.truncated += 1
+
+    async def close(self):
+        """Close the connection pool."""
+        self._closed = True
+        client, self._client = self._client, None
+        if client is None:
+            return
+        if self.use_http2:
+            await client.aclose()
+        else:
+            await client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+
+# One shared fetcher per event loop - aiohttp/httpx pools are loop-bound
+_shared_fetchers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncPageFetcher]" = weakref.WeakKeyDictionary()
+
+
+def get_page_fetcher(**kwargs) -> AsyncPageFetcher:
+    """
+    Get the fetcher shared by all crawls on the running event loop.
+
+    Keyword arguments are only used when a new fetcher has to be created.
+    """
+    loop = asyncio.get_running_loop()
+    fetcher = _shared_fetchers.get(loop)
+    if fetcher is None or fetcher.closed:
+        fetcher = AsyncPageFetcher(**kwargs)
+        _shared_fetchers[loop] = fetcher
+    return fetcher
+
+
+async def close_page_fetcher():
+    """Close the shared fetcher of the running event loop, if any."""
+    fetcher = _shared_fetchers.pop(asyncio.get_running_loop(), None)
+    if fetcher is not None:
+        await fetcher.close()
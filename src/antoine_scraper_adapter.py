@@ -19,6 +19,7 @@ Usage:
 """
 
 import logging
+import os
 import time
 import uuid
 import re
@@ -32,8 +33,9 @@ from src.progress_logger import log_processing_phase
 # Import antoine components
 from src.antoine_discovery import discover_all_paths_sync
 from src.antoine_selection import filter_valuable_links_sync
-from src.antoine_crawler import crawl_selected_pages_sync
+from src.antoine_crawler import crawl_selected_pages_sync, CrawlBudget
 from src.antoine_extraction import extract_company_fields
+from src.page_manifest import PageManifest, PageManifestStore, refresh_manifest_pages_sync
 
 logger = logging.getLogger(__name__)
 
@@ -105,25 +107,53 @@ class AntoineScraperAdapter:
     but uses antoine's enhanced pipeline internally.
     """
     
-    def __init__(self, config: CompanyIntelligenceConfig, bedrock_client=None):
+    def __init__(
+        self,
+        config: CompanyIntelligenceConfig,
+        bedrock_client=None,
+        incremental: Optional[bool] = None,
+        manifest_store: Optional[PageManifestStore] = None,
+        max_manifest_age_days: float = 30
+    ):
+        """
+        Args:
+            config: Theodore configuration
+            bedrock_client: Optional Bedrock client (kept for interface compatibility)
+            incremental: Reuse the page manifest from earlier runs (defaults to
+                the ANTOINE_INCREMENTAL_RESEARCH environment variable)
+            manifest_store: Where page manifests are kept (defaults to data/page_manifests/)
+            max_manifest_age_days: Run the full pipeline again once a manifest's
+                last full run is older than this, so new pages get discovered
+        """
         self.config = config
         self.bedrock_client = bedrock_client
-        logger.info("Antoine scraper adapter initialized")
+        if incremental is None:
+            incremental = os.getenv('ANTOINE_INCREMENTAL_RESEARCH', 'false').lower() == 'true'
+        self.incremental = incremental
+        self.manifest_store = manifest_store or PageManifestStore()
+        self.max_manifest_age_days = max_manifest_age_days
+        logger.info(f"Antoine scraper adapter initialized{' (incremental mode)' if incremental else ''}")
     
-    def scrape_company(self, company: CompanyData, job_id: str = None) -> CompanyData:
+    def scrape_company(self, company: CompanyData, job_id: str = None, incremental: Optional[bool] = None) -> CompanyData:
         """
         Scrape company using antoine's 4-phase pipeline.
         
         This method provides the same interface as IntelligentCompanyScraperSync.scrape_company()
         but uses antoine's enhanced pipeline internally.
         
+        In incremental mode a company with a recent page manifest skips discovery
+        and selection: its pages are re-checked with conditional requests and field
+        extraction only runs if one of them changed. Full runs record the manifest.
+        
         Args:
             company: CompanyData object with at least name and website
             job_id: Optional job ID for progress tracking
+            incremental: Override the adapter's incremental setting for this call
             
         Returns:
             CompanyData object with extracted fields
         """
+        use_incremental = self.incremental if incremental is None else incremental
         
         # Start timing
         start_time = time.time()
@@ -138,6 +168,11 @@ class AntoineScraperAdapter:
             return company
         
         try:
+            if use_incremental:
+                refreshed = self._incremental_refresh(company, job_id, start_time)
+                if refreshed is not None:
+                    return refreshed
+            
             # Phase 1: Discovery with Locale-Specific Filtering
             if job_id:
                 log_processing_phase(job_id, "discovery", "🔍 Discovering website paths...")
@@ -302,7 +337,10 @@ class AntoineScraperAdapter:
                 crawl_base_url,
                 selection_result.selected_paths,
                 timeout_seconds=30,
-                max_concurrent=10
+                max_concurrent=10,
+                path_priorities=selection_result.path_priorities,
+                # Extraction truncates content at 80k chars, so stop once we have that much
+                budget=CrawlBudget(max_chars=80000, deadline_seconds=90)
             )
             
             if not crawl_result.aggregated_content:
@@ -311,6 +349,8 @@ class AntoineScraperAdapter:
                 return company
             
             logger.info(f"✅ Phase 3: Crawled {crawl_result.successful_pages} pages, {len(crawl_result.aggregated_content)} chars")
+            if crawl_result.cancelled_pages:
+                logger.info(f"⚡ Phase 3: Cancelled {crawl_result.cancelled_pages} pages ({crawl_result.stop_reason})")
             
             # Phase 4: Extraction
             if job_id:
@@ -329,27 +369,8 @@ class AntoineScraperAdapter:
             
             logger.info(f"✅ Phase 4: Extracted {len(extraction_result.extracted_fields)} fields")
             
-            # Apply extracted fields to company object
-            self._apply_extracted_fields_to_company(company, extraction_result.extracted_fields)
-            
-            # Track LLM costs and tokens from extraction
-            company.total_input_tokens = extraction_result.tokens_used
-            company.total_output_tokens = extraction_result.tokens_used  # Estimate - actual may vary
-            company.total_cost_usd = extraction_result.cost_usd
-            
-            # Initialize LLM calls breakdown if not exists
-            if not hasattr(company, 'llm_calls_breakdown') or company.llm_calls_breakdown is None:
-                company.llm_calls_breakdown = []
-            
-            # Add extraction LLM call to breakdown
-            company.llm_calls_breakdown.append({
-                'model': extraction_result.model_used,
-                'purpose': 'field_extraction',
-                'input_tokens': extraction_result.tokens_used,
-                'output_tokens': extraction_result.tokens_used,  # Estimate
-                'cost_usd': extraction_result.cost_usd,
-                'timestamp': datetime.utcnow().isoformat()
-            })
+            # Apply extracted fields and LLM costs to company object
+            self._apply_extraction_result(company, extraction_result)
             
             # Also track selection costs if available
             if hasattr(selection_result, 'cost_usd') and selection_result.cost_usd > 0:
@@ -372,6 +393,15 @@ class AntoineScraperAdapter:
             # Update timestamps
             company.last_updated = datetime.utcnow()
             
+            if use_incremental:
+                self._save_manifest(PageManifest.from_crawl(
+                    crawl_base_url,
+                    crawl_result,
+                    selection_result.selected_paths,
+                    extraction_result.extracted_fields,
+                    discovery_result.sitemap_lastmod
+                ))
+            
             logger.info(f"✅ Antoine pipeline completed successfully for {company.name} in {company.crawl_duration:.1f}s")
             
             return company
@@ -383,6 +413,105 @@ class AntoineScraperAdapter:
             company.crawl_duration = time.time() - start_time
             return company
     
+    def _incremental_refresh(self, company: CompanyData, job_id: Optional[str], start_time: float) -> Optional[CompanyData]:
+        """
+        Refresh a company from its page manifest instead of the full pipeline.
+        
+        Returns:
+            The updated company, or None when there is no recent manifest and the
+            full pipeline should run (and record one)
+        """
+        manifest = self.manifest_store.load(company.website)
+        if manifest is None or not manifest.pages:
+            logger.info(f"📒 No page manifest for {company.website}, running full pipeline")
+            return None
+        if manifest.age_days() > self.max_manifest_age_days:
+            logger.info(f"📒 Page manifest for {manifest.domain} is {manifest.age_days():.0f} days old, running full pipeline")
+            return None
+        
+        if job_id:
+            log_processing_phase(job_id, "crawling", "♻️ Checking known pages for changes...")
+        
+        crawl_base_url = company.website
+        if not crawl_base_url.startswith(('http://', 'https://')):
+            crawl_base_url = f"https://{crawl_base_url}"
+        
+        try:
+            refresh = refresh_manifest_pages_sync(
+                manifest, crawl_base_url, locale_filter=extract_locale_from_url(company.website)
+            )
+        except Exception as e:
+            logger.warning(f"Incremental refresh failed for {company.website}, running full pipeline: {e}")
+            return None
+
+        if refresh.changed:
+            logger.info(f"♻️ {len(refresh.changed_urls)}/{len(refresh.pages)} pages changed for {company.name}, re-extracting fields")
+            if job_id:
+                log_processing_phase(job_id, "extraction", "🧠 Extracting company fields...")
+            
+            extraction_result = extract_company_fields(refresh.crawl_result, company.name or "Unknown Company")
+            if not extraction_result.success:
+                company.scrape_status = "failed"
+                company.scrape_error = f"Field extraction failed: {extraction_result.error}"
+                company.crawl_duration = time.time() - start_time
+                return company
+            
+            self._apply_extraction_result(company, extraction_result)
+            manifest.extracted_fields = extraction_result.extracted_fields
+            manifest.raw_content = refresh.crawl_result.aggregated_content[:10000]
+        else:
+            # Nothing material changed: reuse the fields from the last extraction
+            logger.info(f"♻️ No page changes for {company.name}, skipping field extraction")
+            self._apply_extracted_fields_to_company(company, manifest.extracted_fields)
+            company.total_input_tokens = 0
+            company.total_output_tokens = 0
+            company.total_cost_usd = 0.0
+        
+        manifest.pages = {page.url: page for page in refresh.pages}
+        manifest.updated_at = datetime.utcnow().isoformat()
+        self._save_manifest(manifest)
+        
+        company.scrape_status = "success"
+        company.crawl_duration = time.time() - start_time
+        company.pages_crawled = list(manifest.selected_paths)
+        company.scraped_urls = list(manifest.selected_paths)
+        company.crawl_depth = len(manifest.selected_paths)
+        company.raw_content = manifest.raw_content
+        company.last_updated = datetime.utcnow()
+        
+        logger.info(f"✅ Incremental refresh completed for {company.name} in {company.crawl_duration:.1f}s")
+        return company
+    
+    def _save_manifest(self, manifest: PageManifest):
+        """Persist a page manifest; failures only cost the next run its head start."""
+        try:
+            self.manifest_store.save(manifest)
+        except Exception as e:
+            logger.warning(f"Could not save page manifest for {manifest.domain}: {e}")
+    
+    def _apply_extraction_result(self, company: CompanyData, extraction_result):
+        """Apply extracted fields and record the extraction's LLM usage on the company."""
+        self._apply_extracted_fields_to_company(company, extraction_result.extracted_fields)
+        
+        # Track LLM costs and tokens from extraction
+        company.total_input_tokens = extraction_result.tokens_used
+        company.total_output_tokens = extraction_result.tokens_used  # Estimate - actual may vary
+        company.total_cost_usd = extraction_result.cost_usd
+        
+        # Initialize LLM calls breakdown if not exists
+        if not hasattr(company, 'llm_calls_breakdown') or company.llm_calls_breakdown is None:
+            company.llm_calls_breakdown = []
+        
+        # Add extraction LLM call to breakdown
+        company.llm_calls_breakdown.append({
+            'model': extraction_result.model_used,
+            'purpose': 'field_extraction',
+            'input_tokens': extraction_result.tokens_used,
+            'output_tokens': extraction_result.tokens_used,  # Estimate
+            'cost_usd': extraction_result.cost_usd,
+            'timestamp': datetime.utcnow().isoformat()
+        })
+    
     def _apply_extracted_fields_to_company(self, company: CompanyData, extracted_fields: dict):
         """
         Apply extracted fields from antoine to CompanyData object.
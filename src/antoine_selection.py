@@ -14,6 +14,7 @@ import asyncio
 import json
 import logging
 import os
+import re
 import time
 import requests
 from typing import List, Dict, Optional
@@ -32,8 +33,37 @@ try:
 except ImportError:
     print("⚠️ python-dotenv not available, using system environment variables")
 
+from src.llm_cache import discard_cached_response, get_llm_cache
+
 logger = logging.getLogger(__name__)
 
+# Crawl priority of a selected path by the first path segment naming a page
+# type: company, team and commercial pages carry most of the extracted fields,
+# blog/news-style pages least. Unmatched paths sit in between.
+HOMEPAGE_PRIORITY = 0.9
+DEFAULT_PATH_PRIORITY = 0.6
+PATH_PRIORITY_KEYWORDS = [
+    (0.95, {'about', 'company', 'who', 'story', 'mission', 'overview'}),
+    (0.9, {'team', 'leadership', 'management', 'founders', 'people', 'executives'}),
+    (0.85, {'pricing', 'plans', 'products', 'product', 'solutions', 'services', 'platform', 'features'}),
+    (0.8, {'contact', 'locations', 'offices', 'headquarters'}),
+    (0.7, {'customers', 'clients', 'case', 'partners', 'careers', 'jobs', 'investors'}),
+    (0.4, {'blog', 'news', 'press', 'articles', 'events', 'resources', 'insights', 'media', 'webinars'}),
+]
+
+
+def path_priority(path: str) -> float:
+    """Crawl priority (0-1) of a selected path from the page type its segments name."""
+    segments = [segment for segment in path.lower().strip('/').split('/') if segment]
+    if not segments:
+        return HOMEPAGE_PRIORITY
+    for segment in segments:
+        words = set(re.split(r'[-_.]+', segment))
+        for priority, keywords in PATH_PRIORITY_KEYWORDS:
+            if words & keywords:
+                return priority
+    return DEFAULT_PATH_PRIORITY
+
 
 @dataclass
 class OpenRouterResponse:
@@ -45,6 +75,8 @@ class OpenRouterResponse:
     cost_usd: float
     processing_time: float
     error: Optional[str] = None
+    cached: bool = False
+    cache_key: str = ""  # LLM cache entry holding this response, if any
 
 
 @dataclass
@@ -79,10 +111,17 @@ class OpenRouterClient:
         self.model = model
         self.base_url = "https://openrouter.ai/api/v1"
         
-    def analyze_paths(self, prompt: str, timeout: int = 45) -> OpenRouterResponse:
+    def _calculate_cost(self, tokens_used: int) -> float:
+        """Rough estimate - Nova Pro is ~$0.0008/1K tokens"""
+        return (tokens_used / 1000) * 0.0008
+
+    def analyze_paths(self, prompt: str, timeout: int = 45, use_cache: bool = True) -> OpenRouterResponse:
         """
         Send prompt to Nova Pro via OpenRouter.
         No fallbacks, no heuristics - if this fails, the whole thing fails.
+
+        Identical prompts are answered from the shared LLM cache unless
+        `use_cache` is False.
         """
         headers = {
             "Authorization": f"Bearer {self.api_key}",
@@ -102,9 +141,25 @@ class OpenRouterClient:
             "temperature": 0.1,  # Low temperature for consistent analysis
             "max_tokens": 4000
         }
+        generation_params = {"temperature": payload["temperature"], "max_tokens": payload["max_tokens"]}
         
         start_time = time.time()
         
+        llm_cache = get_llm_cache()
+        if llm_cache:
+            hit = llm_cache.lookup(self.model, prompt, generation_params, use_cache=use_cache)
+            if hit:
+                return OpenRouterResponse(
+                    success=True,
+                    content=hit.content,
+                    model_used=hit.usage.get("model", self.model),
+                    tokens_used=hit.tokens,
+                    cost_usd=0.0,
+                    processing_time=time.time() - start_time,
+                    cached=True,
+                    cache_key=hit.key
+                )
+        
         try:
             response = requests.post(
                 f"{self.base_url}/chat/completions",
@@ -136,8 +191,12 @@ class OpenRouterClient:
             usage = data.get("usage", {})
             tokens_used = usage.get("total_tokens", 0)
             
-            # Calculate cost (rough estimate - Nova Pro is ~$0.0008/1K tokens)
-            cost_usd = (tokens_used / 1000) * 0.0008
+            cost_usd = self._calculate_cost(tokens_used)
+            
+            cache_key = ""
+            if llm_cache:
+                cache_key = llm_cache.store(self.model, prompt, generation_params, content,
+                                            usage={**usage, "model": model_used}, tokens=tokens_used, cost_usd=cost_usd)
             
             return OpenRouterResponse(
                 success=True,
@@ -145,7 +204,8 @@ class OpenRouterClient:
                 model_used=model_used,
                 tokens_used=tokens_used,
                 cost_usd=cost_usd,
-                processing_time=processing_time
+                processing_time=processing_time,
+                cache_key=cache_key
             )
             
         except requests.exceptions.Timeout:
@@ -216,11 +276,13 @@ async def filter_valuable_links(
     base_url: str,
     min_confidence: float = 0.6,
     timeout_seconds: int = 60,
-    _is_retry: bool = False  # Internal parameter to track retry state
+    _is_retry: bool = False,  # Internal parameter to track retry state
+    use_cache: bool = True
 ) -> LinkSelectionResult:
     """
     Filter paths using Nova Pro LLM via OpenRouter.
     Automatically retries with lower confidence if fewer than 8 paths selected.
+    Set use_cache=False to bypass the LLM response cache for this call.
     """
     
     # Filter to first-level paths if too many paths
@@ -263,7 +325,7 @@ async def filter_valuable_links(
         print(f"🔄 Sending to Nova Pro via OpenRouter...")
         
         # Call Nova Pro
-        response = client.analyze_paths(prompt, timeout_seconds)
+        response = client.analyze_paths(prompt, timeout_seconds, use_cache=use_cache)
         
         if not response.success:
             return LinkSelectionResult(
@@ -285,7 +347,10 @@ async def filter_valuable_links(
         print(f"✅ Nova Pro response received")
         print(f"🏷️  Model: {response.model_used}")
         print(f"🔢 Tokens: {response.tokens_used:,}")
-        print(f"💰 Cost: ${response.cost_usd:.4f}")
+        if response.cached:
+            print(f"♻️ Served from LLM cache - no cost")
+        else:
+            print(f"💰 Cost: ${response.cost_usd:.4f}")
         
         # Parse Nova Pro response
         try:
@@ -345,11 +410,12 @@ async def filter_valuable_links(
                     base_url,
                     min_confidence=0.3,  # Lower threshold
                     timeout_seconds=timeout_seconds,
-                    _is_retry=True  # Mark as retry
+                    _is_retry=True,  # Mark as retry
+                    use_cache=use_cache
                 )
             
             # Create path metadata using explanations or defaults
-            path_priorities = {path: 0.8 for path in selected_paths}  # Default high confidence
+            path_priorities = {path: path_priority(path) for path in selected_paths}
             path_reasoning = {}
             for path in selected_paths:
                 if path in path_explanations:
@@ -380,6 +446,8 @@ async def filter_valuable_links(
             )
             
         except json.JSONDecodeError as e:
+            # A malformed or truncated response must not be replayed from the cache
+            discard_cached_response(response.cache_key)
             return LinkSelectionResult(
                 success=False,
                 selected_paths=[],
@@ -397,6 +465,7 @@ async def filter_valuable_links(
             )
             
         except Exception as e:
+            discard_cached_response(response.cache_key)
             return LinkSelectionResult(
                 success=False,
                 selected_paths=[],
@@ -435,14 +504,16 @@ def filter_valuable_links_sync(
     all_paths: List[str], 
     base_url: str,
     min_confidence: float = 0.6,
-    timeout_seconds: int = 60
+    timeout_seconds: int = 60,
+    use_cache: bool = True
 ) -> LinkSelectionResult:
     """
     Synchronous wrapper for filter_valuable_links().
     NO HEURISTICS. If Nova Pro fails, the entire operation fails.
     """
     try:
-        return asyncio.run(filter_valuable_links(all_paths, base_url, min_confidence, timeout_seconds))
+        return asyncio.run(filter_valuable_links(all_paths, base_url, min_confidence, timeout_seconds,
+                                                 use_cache=use_cache))
     except Exception as e:
         logger.error(f"Error in Nova Pro filtering for {base_url}: {e}")
         return LinkSelectionResult(
@@ -4,10 +4,14 @@ AWS Bedrock integration for company intelligence analysis
 
 import json
 import logging
+import os
+from concurrent.futures import Future
 from typing import List, Optional, Dict, Any
 import boto3
 from botocore.exceptions import ClientError
 from src.models import CompanyData, CompanyIntelligenceConfig
+from src.llm_cache import get_llm_cache
+from src.embedding_service import EmbeddingService, get_embedding_cache
 
 logger = logging.getLogger(__name__)
 
@@ -23,26 +27,39 @@ class BedrockClient:
         )
         self.embedding_model = config.bedrock_embedding_model
         self.analysis_model = config.bedrock_analysis_model
+        
+        # Cached, micro-batched embedding queue shared by every thread using this client
+        self.embeddings = EmbeddingService(
+            self._invoke_embedding_model,
+            self.embedding_model,
+            cache=get_embedding_cache(),
+            max_concurrency=int(os.getenv('EMBEDDING_MAX_CONCURRENCY', '8'))
+        )
+    
+    def _invoke_embedding_model(self, cleaned_text: str) -> List[float]:
+        """Single Titan embedding call; raises on failure"""
+        body = json.dumps({
+            "inputText": cleaned_text
+        })
+        
+        response = self.bedrock_runtime.invoke_model(
+            body=body,
+            modelId=self.embedding_model,
+            accept="application/json",
+            contentType="application/json"
+        )
+        
+        response_body = json.loads(response.get('body').read())
+        return response_body.get('embedding')
+    
+    def submit_embedding(self, text: str) -> Future:
+        """Queue text for embedding and return a Future, so callers can keep working meanwhile"""
+        return self.embeddings.submit(self._clean_text_for_embedding(text))
     
     def generate_embedding(self, text: str) -> Optional[List[float]]:
-        """Generate embedding vector for text using Titan"""
+        """Generate embedding vector for text using Titan (served from the embedding cache when possible)"""
         try:
-            # Clean and truncate text
-            cleaned_text = self._clean_text_for_embedding(text)
-            
-            body = json.dumps({
-                "inputText": cleaned_text
-            })
-            
-            response = self.bedrock_runtime.invoke_model(
-                body=body,
-                modelId=self.embedding_model,
-                accept="application/json",
-                contentType="application/json"
-            )
-            
-            response_body = json.loads(response.get('body').read())
-            return response_body.get('embedding')
+            return self.submit_embedding(text).result()
             
         except ClientError as e:
             logger.error(f"Bedrock embedding error: {e}")
@@ -275,12 +292,8 @@ class BedrockClient:
         return cleaned
     
     def batch_generate_embeddings(self, texts: List[str]) -> List[Optional[List[float]]]:
-        """Generate embeddings for multiple texts"""
-        embeddings = []
-        for text in texts:
-            embedding = self.generate_embedding(text)
-            embeddings.append(embedding)
-        return embeddings
+        """Generate embeddings for multiple texts concurrently; failed texts come back as None"""
+        return self.embeddings.embed_many(self._clean_text_for_embedding(text) for text in texts)
     
     def generate_text(self, prompt: str, max_tokens: int = 4000) -> str:
         """Generate text using the LLM for general purpose prompts"""
@@ -341,8 +354,37 @@ class BedrockClient:
             logger.error(f"Error generating text: {e}")
             return ""
 
-    def generate_text_with_usage(self, prompt: str, max_tokens: int = 4000) -> Dict[str, Any]:
-        """Generate text and return both response and usage statistics"""
+    def generate_text_with_usage(self, prompt: str, max_tokens: int = 4000, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Generate text and return both response and usage statistics.
+
+        Identical prompts are answered from the shared LLM cache; the usage of a
+        cached response reports cost_usd 0.0 and what the call would have cost
+        as cost_saved_usd. Pass use_cache=False to force a fresh call.
+        The result's cache_key lets a caller that can't parse the text drop it
+        with discard_cached_response().
+        """
+        generation_params = {"max_tokens": max_tokens, "temperature": 0.7}
+        llm_cache = get_llm_cache()
+        if llm_cache:
+            hit = llm_cache.lookup(self.analysis_model, prompt, generation_params, use_cache=use_cache)
+            if hit:
+                input_tokens = hit.usage.get("input_tokens", 0)
+                output_tokens = hit.usage.get("output_tokens", 0)
+                return {
+                    "text": hit.content,
+                    "cache_key": hit.key,
+                    "usage": {
+                        "input_tokens": input_tokens,
+                        "output_tokens": output_tokens,
+                        "total_tokens": input_tokens + output_tokens,
+                        "cost_usd": 0.0,
+                        "cost_saved_usd": self._calculate_cost(input_tokens, output_tokens),
+                        "cached": True,
+                        "model": self.analysis_model
+                    }
+                }
+        
         try:
             # Check if using Nova (inference profile) or Anthropic model
             if "nova" in self.analysis_model.lower():
@@ -398,8 +440,15 @@ class BedrockClient:
                 if response_body.get('content') and len(response_body['content']) > 0:
                     response_text = response_body['content'][0].get('text', '')
             
+            cache_key = ""
+            if llm_cache:
+                cache_key = llm_cache.store(self.analysis_model, prompt, generation_params, response_text,
+                                            usage=usage_data, tokens=usage_data["total_tokens"],
+                                            cost_usd=usage_data["cost_usd"])
+            
             return {
                 "text": response_text,
+                "cache_key": cache_key,
                 "usage": usage_data
             }
             
@@ -0,0 +1,378 @@
+"""
+Shared Headless Browser Pool
+============================
+
+Process-wide pool of warm Crawl4AI browsers.
+
+Every scraping path used to open its own `AsyncWebCrawler`, so each company (and
+for the antoine fallback, each page) paid Chromium startup cost. Callers run in
+many different event loops - the batch processor and Flask handlers call
+`asyncio.run()` per company - while a Playwright browser is bound to the loop
+that launched it. The pool therefore owns a dedicated event-loop thread; browsers
+live there, and leased crawlers marshal `arun`/`arun_many` calls onto it.
+
+Features:
+- leasing with a cap on live browsers (`max_browsers`)
+- recycling after `max_pages_per_browser` pages or `max_browser_age` seconds
+- health checks on browsers that have been idle for a while, and after errors
+- warm-up so the first company doesn't wait for Chromium
+- stats for monitoring (`get_stats()`)
+
+Usage:
+    async with get_browser_pool().lease() as crawler:
+        result = await crawler.arun(url=url, config=config)
+"""
+
+import asyncio
+import atexit
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+from src.ssl_config import get_browser_args, should_verify_ssl
+
+logger = logging.getLogger(__name__)
+
+# Crawl4AI renders "raw:" URLs without touching the network
+HEALTH_CHECK_URL = "raw:<html><body>ok</body></html>"
+HEALTH_CHECK_TIMEOUT = 10
+
+
+def _default_crawler_factory():
+    """Create the headless Chromium crawler used throughout Theodore."""
+    from crawl4ai import AsyncWebCrawler
+
+    return AsyncWebCrawler(
+        headless=True,
+        browser_type="chromium",
+        verbose=False,
+        browser_args=get_browser_args(ignore_ssl=not should_verify_ssl())
+    )
+
+
+class PooledBrowser:
+    """A started crawler plus the bookkeeping used for recycling decisions"""
+
+    def __init__(self, browser_id: int, crawler: Any):
+        self.browser_id = browser_id
+        self.crawler = crawler
+        self.created_at = time.time()
+        self.last_used = self.created_at
+        self.pages_served = 0
+        self.healthy = True
+
+
+class LeasedCrawler:
+    """
+    Crawler handle returned by `BrowserPool.lease()`.
+
+    Exposes the `arun` / `arun_many` subset of `AsyncWebCrawler` and runs the
+    calls on the pool's event loop, whatever loop the caller is on.
+    """
+
+    def __init__(self, pool: "BrowserPool", browser: PooledBrowser):
+        self._pool = pool
+        self._browser = browser
+
+    @property
+    def browser_id(self) -> int:
+        return self._browser.browser_id
+
+    async def arun(self, url: str, config=None, **kwargs):
+        return await self._pool._run_on_pool(
+            self._pool._invoke(self._browser, "arun", 1, url=url, config=config, **kwargs)
+        )
+
+    async def arun_many(self, urls: List[str], config=None, **kwargs):
+        return await self._pool._run_on_pool(
+            self._pool._invoke(self._browser, "arun_many", len(urls), urls=urls, config=config, **kwargs)
+        )
+
+
+class BrowserPool:
+    """
+    Pool of warm headless browsers shared by every scraper in the process.
+
+    A lease gives exclusive use of one browser; concurrency inside a lease is
+    up to the caller (e.g. `arun_many`). When all `max_browsers` are leased,
+    new leases wait up to `lease_timeout` seconds.
+    """
+
+    def __init__(
+        self,
+        max_browsers: int = 4,
+        max_pages_per_browser: int = 200,
+        max_browser_age: float = 1800,
+        health_check_interval: float = 60,
+        lease_timeout: float = 120,
+        crawler_factory: Optional[Callable[[], Any]] = None
+    ):
+        self.max_browsers = max_browsers
+        self.max_pages_per_browser = max_pages_per_browser
+        self.max_browser_age = max_browser_age
+        self.health_check_interval = health_check_interval
+        self.lease_timeout = lease_timeout
+        self.crawler_factory = crawler_factory or _default_crawler_factory
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+
+        # Only touched from the pool loop
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._idle: List[PooledBrowser] = []
+        self._leased: Dict[int, PooledBrowser] = {}
+        self._next_id = 1
+
+        self.stats = {
+            'leases': 0,
+            'launches': 0,
+            'recycled': 0,
+            'health_check_failures': 0,
+            'browser_errors': 0,
+            'pages_served': 0,
+            'total_lease_wait': 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Event loop plumbing
+    # ------------------------------------------------------------------
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._closed:
+                raise RuntimeError("BrowserPool has been shut down")
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run_loop():
+                    asyncio.set_event_loop(loop)
+                    self._slots = asyncio.Semaphore(self.max_browsers)
+                    ready.set()
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=run_loop, name="browser_pool", daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+                logger.info(f"Browser pool started (max {self.max_browsers} browsers)")
+        return self._loop
+
+    def _submit(self, coro):
+        """Schedule a coroutine on the pool loop; returns a concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_started())
+
+    async def _run_on_pool(self, coro):
+        """Await a coroutine on the pool loop from any other event loop."""
+        return await asyncio.wrap_future(self._submit(coro))
+
+    # ------------------------------------------------------------------
+    # Pool loop internals
+    # ------------------------------------------------------------------
+
+    async def _launch(self) -> PooledBrowser:
+        crawler = self.crawler_factory()
+        await crawler.start()
+        browser = PooledBrowser(self._next_id, crawler)
+        self._next_id += 1
+        self.stats['launches'] += 1
+        logger.debug(f"Launched pooled browser #{browser.browser_id}")
+        return browser
+
+    async def _close_browser(self, browser: PooledBrowser):
+        try:
+            await browser.crawler.close()
+        except Exception as e:
+            logger.warning(f"Error closing pooled browser #{browser.browser_id}: {e}")
+
+    def _should_recycle(self, browser: PooledBrowser) -> bool:
+        return (
+            not browser.healthy
+            or browser.pages_served >= self.max_pages_per_browser
+            or time.time() - browser.created_at >= self.max_browser_age
+        )
+
+    async def _health_check(self, browser: PooledBrowser) -> bool:
+        try:
+            result = await asyncio.wait_for(browser.crawler.arun(url=HEALTH_CHECK_URL), HEALTH_CHECK_TIMEOUT)
+            healthy = bool(getattr(result, 'success', False))
+        except Exception:
+            healthy = False
+        if not healthy:
+            self.stats['health_check_failures'] += 1
+            logger.warning(f"Pooled browser #{browser.browser_id} failed health check")
+        return healthy
+
+    async def _acquire(self) -> PooledBrowser:
+        await asyncio.wait_for(self._slots.acquire(), self.lease_timeout)
+        try:
+            while self._idle:
+                browser = self._idle.pop()  # LIFO keeps the warmest browser in use
+                if self._should_recycle(browser):
+                    self.stats['recycled'] += 1
+                    await self._close_browser(browser)
+                    continue
+                if time.time() - browser.last_used >= self.health_check_interval:
+                    if not await self._health_check(browser):
+                        await self._close_browser(browser)
+                        continue
+                break
+            else:
+                browser = await self._launch()
+        except BaseException:
+            self._slots.release()
+            raise
+
+        self._leased[browser.browser_id] = browser
+        self.stats['leases'] += 1
+        return browser
+
+    async def _release(self, browser: PooledBrowser):
+        self._leased.pop(browser.browser_id, None)
+        browser.last_used = time.time()
+        try:
+            if self._closed or self._should_recycle(browser):
+                if not self._closed:
+                    self.stats['recycled'] += 1
+                await self._close_browser(browser)
+            else:
+                self._idle.append(browser)
+        finally:
+            self._slots.release()
+
+    async def _invoke(self, browser: PooledBrowser, method: str, pages: int, **kwargs):
+        browser.pages_served += pages
+        self.stats['pages_served'] += pages
+        try:
+            return await getattr(browser.crawler, method)(**kwargs)
+        except Exception:
+            # Crawl4AI reports page failures on the result; a raised error usually
+            # means the browser itself is in trouble, so retire it on release.
+            browser.healthy = False
+            self.stats['browser_errors'] += 1
+            raise
+
+    async def _warm_up(self, count: int) -> int:
+        launched = 0
+        while (len(self._idle) + len(self._leased) < min(count, self.max_browsers)):
+            try:
+                self._idle.append(await self._launch())
+                launched += 1
+            except Exception as e:
+                logger.warning(f"Browser pool warm-up failed: {e}")
+                break
+        return launched
+
+    async def _close_all(self):
+        idle, self._idle = self._idle, []
+        await asyncio.gather(*[self._close_browser(b) for b in idle], return_exceptions=True)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    @asynccontextmanager
+    async def lease(self):
+        """
+        Lease a warm browser for the duration of the `async with` block.
+
+        Usable from any event loop. Raises asyncio.TimeoutError when no
+        browser frees up within `lease_timeout`.
+        """
+        start = time.time()
+        future = self._submit(self._acquire())
+        try:
+            browser = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # The acquire may have completed just as we were cancelled - give it back
+            def _release_if_acquired(f):
+                if not f.cancelled() and f.exception() is None:
+                    self._submit(self._release(f.result()))
+            future.add_done_callback(_release_if_acquired)
+            raise
+        # Callers run on their own threads, so this counter is shared between them
+        with self._start_lock:
+            self.stats['total_lease_wait'] += time.time() - start
+
+        try:
+            yield LeasedCrawler(self, browser)
+        finally:
+            # Shielded so the release still completes if the caller is being cancelled
+            await asyncio.shield(asyncio.wrap_future(self._submit(self._release(browser))))
+
+    def warm_up(self, count: Optional[int] = None, wait: bool = False) -> int:
+        """
+        Launch browsers ahead of demand.
+
+        Args:
+            count: Number of browsers to have ready (defaults to max_browsers)
+            wait: Block until they are started; otherwise warm up in the background
+
+        Returns:
+            Number of browsers launched (0 when not waiting)
+        """
+        future = self._submit(self._warm_up(count or self.max_browsers))
+        if wait:
+            return future.result()
+        return 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of pool usage for monitoring endpoints and batch reports."""
+        with self._start_lock:
+            stats = dict(self.stats)
+        stats.update({
+            'max_browsers': self.max_browsers,
+            'max_pages_per_browser': self.max_pages_per_browser,
+            'browsers_idle': len(self._idle),
+            'browsers_leased': len(self._leased),
+            'avg_lease_wait': stats['total_lease_wait'] / stats['leases'] if stats['leases'] else 0.0,
+            'running': self._loop is not None and not self._closed,
+        })
+        return stats
+
+    def shutdown(self, timeout: float = 30):
+        """Close all idle browsers and stop the pool thread."""
+        with self._start_lock:
+            if self._closed:
+                return
+            self._closed = True
+            loop = self._loop
+
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_all(), loop).result(timeout)
+        except Exception as e:
+            logger.warning(f"Error closing browser pool: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join(timeout)
+        logger.info(f"Browser pool shut down: {self.get_stats()}")
+
+
+_browser_pool: Optional[BrowserPool] = None
+_browser_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Get the process-wide browser pool, creating it on first use."""
+    global _browser_pool
+    with _browser_pool_lock:
+        if _browser_pool is None:
+            _browser_pool = BrowserPool(
+                max_browsers=int(os.getenv('BROWSER_POOL_MAX_BROWSERS', '4')),
+                max_pages_per_browser=int(os.getenv('BROWSER_POOL_MAX_PAGES', '200'))
+            )
+            atexit.register(_browser_pool.shutdown)
+        return _browser_pool
+
+
+def get_browser_pool_stats() -> Dict[str, Any]:
+    """Pool stats without forcing the pool (and its thread) into existence."""
+    if _browser_pool is None:
+        return {'running': False}
+    return _browser_pool.get_stats()
@@ -0,0 +1,466 @@
+"""
+Company Metadata Mirror
+=======================
+
+Local SQLite copy of the company metadata stored in Pinecone, used by the
+listing and lookup endpoints (`/api/search`, `/api/database`,
+`/api/companies/details`). Those used to query Pinecone with a zero vector
+and `top_k` 50-100, then filter the matches in Python, so they only ever saw
+an arbitrary slice of the index, paid a network round trip per keystroke and
+couldn't paginate or sort.
+
+`PineconeClient` writes through on every upsert, metadata update, delete and
+clear, so the mirror stays current with everything stored through it. An
+empty mirror is seeded from the index (`sync_from_index`); after that the
+mirror is resynced in the background once it is older than
+COMPANY_MIRROR_MAX_AGE_HOURS, which picks up writes that bypassed the client
+and drops companies deleted from the index.
+
+- `companies` holds the flat columns the endpoints sort and filter on plus
+  the full metadata as JSON
+- `companies_fts` is an external-content FTS5 index over name, website,
+  industry and business model, maintained by triggers, for prefix search; on
+  SQLite builds without FTS5 search falls back to LIKE matching
+- WAL mode; safe to share between threads and processes
+
+Configuration (environment):
+- COMPANY_MIRROR_ENABLED  "false" disables the mirror (default "true")
+- COMPANY_MIRROR_PATH     SQLite database file (default data/company_mirror/companies.db)
+- COMPANY_MIRROR_MAX_AGE_HOURS  resync from Pinecone after this long (default 24; 0 never resyncs)
+
+Usage:
+    mirror = get_company_mirror()
+    if mirror:
+        rows, total = mirror.list_companies(page=2, per_page=50, sort="industry")
+        suggestions = mirror.search("stri", limit=5)
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Sort keys accepted from API callers, mapped to columns
+SORT_COLUMNS = {
+    'name': 'name_key',
+    'industry': 'industry COLLATE NOCASE',
+    'business_model': 'business_model COLLATE NOCASE',
+    'stage': 'company_stage COLLATE NOCASE',
+    'last_updated': 'last_updated',
+    'founding_year': 'founding_year',
+    'job_listings_count': 'job_listings_count',
+    'total_cost_usd': 'total_cost_usd',
+}
+MAX_PER_PAGE = 500
+FETCH_BATCH_SIZE = 100
+DEFAULT_MAX_AGE_SECONDS = 24 * 3600
+
+
+def name_key(name: str) -> str:
+    """Lowercased name without spaces and punctuation, as `/api/search` has always matched on."""
+    return re.sub(r'[\s.,]+', '', (name or '').lower())
+
+
+def _fts_query(query: str) -> str:
+    """Turn free text into an FTS5 prefix query: every token must match as a prefix."""
+    tokens = re.findall(r'\w+', query.lower())
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+class CompanyMetadataMirror:
+    """
+    SQLite mirror of Pinecone company metadata.
+
+    Args:
+        path: Database file (data/company_mirror/companies.db when omitted)
+    """
+
+    def __init__(self, path: str = None):
+        if path is None:
+            project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            path = os.path.join(project_root, 'data', 'company_mirror', 'companies.db')
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS companies (
+                id TEXT PRIMARY KEY,
+                company_name TEXT NOT NULL,
+                name_key TEXT NOT NULL,
+                website TEXT,
+                industry TEXT,
+                business_model TEXT,
+                company_stage TEXT,
+                founding_year INTEGER,
+                job_listings_count INTEGER,
+                total_cost_usd REAL,
+                last_updated TEXT,
+                metadata TEXT NOT NULL,
+                mirrored_at REAL NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_companies_name_key ON companies(name_key)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_companies_industry ON companies(industry COLLATE NOCASE)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_companies_last_updated ON companies(last_updated)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        try:
+            # External-content FTS index kept in sync by triggers, keyed on the companies rowid
+            self._db.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS companies_fts USING fts5(
+                    company_name, website, industry, business_model,
+                    content='companies', content_rowid='rowid',
+                    tokenize="unicode61 tokenchars '.'"
+                );
+                CREATE TRIGGER IF NOT EXISTS companies_fts_insert AFTER INSERT ON companies BEGIN
+                    INSERT INTO companies_fts (rowid, company_name, website, industry, business_model)
+                    VALUES (new.rowid, new.company_name, new.website, new.industry, new.business_model);
+                END;
+                CREATE TRIGGER IF NOT EXISTS companies_fts_delete AFTER DELETE ON companies BEGIN
+                    INSERT INTO companies_fts (companies_fts, rowid, company_name, website, industry, business_model)
+                    VALUES ('delete', old.rowid, old.company_name, old.website, old.industry, old.business_model);
+                END;
+                CREATE TRIGGER IF NOT EXISTS companies_fts_update AFTER UPDATE ON companies BEGIN
+                    INSERT INTO companies_fts (companies_fts, rowid, company_name, website, industry, business_model)
+                    VALUES ('delete', old.rowid, old.company_name, old.website, old.industry, old.business_model);
+                    INSERT INTO companies_fts (rowid, company_name, website, industry, business_model)
+                    VALUES (new.rowid, new.company_name, new.website, new.industry, new.business_model);
+                END;
+            """)
+            self.fts_enabled = True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 unavailable, company search falls back to LIKE: {e}")
+            self.fts_enabled = False
+        self._db.commit()
+        self._stats = {'upserts': 0, 'deletes': 0, 'searches': 0, 'lists': 0}
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def upsert(self, company_id: str, metadata: Dict[str, Any]):
+        """Insert or replace one company's metadata."""
+        self.upsert_many([(company_id, metadata)])
+
+    def upsert_many(self, items: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """Insert or replace many companies in one transaction; returns the number written."""
+        rows = [self._row(company_id, metadata or {}) for company_id, metadata in items if company_id]
+        if not rows:
+            return 0
+        with self._lock:
+            with self._db:
+                # ON CONFLICT keeps the rowid, so the FTS update trigger (not delete + insert) fires
+                self._db.executemany("""
+                    INSERT INTO companies (
+                        id, company_name, name_key, website, industry, business_model, company_stage,
+                        founding_year, job_listings_count, total_cost_usd, last_updated, metadata, mirrored_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        company_name = excluded.company_name, name_key = excluded.name_key,
+                        website = excluded.website, industry = excluded.industry,
+                        business_model = excluded.business_model, company_stage = excluded.company_stage,
+                        founding_year = excluded.founding_year, job_listings_count = excluded.job_listings_count,
+                        total_cost_usd = excluded.total_cost_usd, last_updated = excluded.last_updated,
+                        metadata = excluded.metadata, mirrored_at = excluded.mirrored_at
+                """, rows)
+            self._stats['upserts'] += len(rows)
+        return len(rows)
+
+    def delete(self, company_id: str):
+        with self._lock:
+            with self._db:
+                self._db.execute("DELETE FROM companies WHERE id = ?", (company_id,))
+            self._stats['deletes'] += 1
+
+    def clear(self):
+        with self._lock:
+            with self._db:
+                self._db.execute("DELETE FROM companies")
+                self._db.execute("DELETE FROM meta WHERE key = 'last_sync'")
+
+    @staticmethod
+    def _row(company_id: str, metadata: Dict[str, Any]) -> Tuple:
+        name = metadata.get('company_name') or metadata.get('name') or 'Unknown'
+
+        def as_number(value, cast):
+            try:
+                return cast(value) if value not in (None, '', 'Unknown') else None
+            except (TypeError, ValueError):
+                return None
+
+        return (
+            company_id,
+            name,
+            name_key(name),
+            metadata.get('website', ''),
+            metadata.get('industry', 'Unknown'),
+            metadata.get('business_model_type') or metadata.get('business_model', 'Unknown'),
+            metadata.get('company_stage', 'Unknown'),
+            as_number(metadata.get('founding_year'), int),
+            as_number(metadata.get('job_listings_count'), int),
+            as_number(metadata.get('total_cost_usd'), float),
+            metadata.get('last_updated', ''),
+            json.dumps(metadata, default=str),
+            time.time(),
+        )
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def count(self, industry: Optional[str] = None) -> int:
+        with self._lock:
+            if industry:
+                return self._db.execute(
+                    "SELECT COUNT(*) FROM companies WHERE industry = ? COLLATE NOCASE", (industry,)
+                ).fetchone()[0]
+            return self._db.execute("SELECT COUNT(*) FROM companies").fetchone()[0]
+
+    def get(self, company_id: str) -> Optional[Dict[str, Any]]:
+        """Full metadata for one company, or None if it isn't mirrored."""
+        with self._lock:
+            row = self._db.execute("SELECT metadata FROM companies WHERE id = ?", (company_id,)).fetchone()
+        return json.loads(row['metadata']) if row else None
+
+    def list_companies(
+        self,
+        page: int = 1,
+        per_page: int = 100,
+        sort: str = 'name',
+        order: str = 'asc',
+        industry: Optional[str] = None,
+        query: Optional[str] = None
+    ) -> Tuple[List[Tuple[str, Dict[str, Any]]], int]:
+        """
+        One page of companies.
+
+        Args:
+            page: 1-based page number
+            per_page: Page size (capped at MAX_PER_PAGE)
+            sort: Key of SORT_COLUMNS; unknown keys sort by name
+            order: "asc" or "desc"
+            industry: Only companies in this industry (case-insensitive)
+            query: Only companies matching this text (same matching as `search`)
+
+        Returns:
+            ([(company_id, metadata), ...], total matching companies)
+        """
+        per_page = max(1, min(int(per_page), MAX_PER_PAGE))
+        page = max(1, int(page))
+        column = SORT_COLUMNS.get(sort, SORT_COLUMNS['name'])
+        direction = 'DESC' if str(order).lower() == 'desc' else 'ASC'
+
+        where, params = [], []
+        if industry:
+            where.append("industry = ? COLLATE NOCASE")
+            params.append(industry)
+        if query:
+            clause, clause_params = self._match_clause(query)
+            where.append(clause)
+            params.extend(clause_params)
+        where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+
+        with self._lock:
+            total = self._db.execute(f"SELECT COUNT(*) FROM companies {where_sql}", params).fetchone()[0]
+            rows = self._db.execute(
+                f"SELECT id, metadata FROM companies {where_sql} "
+                f"ORDER BY {column} IS NULL, {column} {direction}, name_key ASC LIMIT ? OFFSET ?",
+                params + [per_page, (page - 1) * per_page]
+            ).fetchall()
+            self._stats['lists'] += 1
+        return [(row['id'], json.loads(row['metadata'])) for row in rows], total
+
+    def search(self, query: str, limit: int = 5) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Companies whose name starts with `query`, shortest names first.
+
+        Mirrors the old `/api/search` ranking: name-prefix matches (ignoring
+        spaces and punctuation) win; only when there are none, and the query
+        is at least 3 characters, do word-prefix matches on any indexed field
+        (e.g. "cloud" -> "Acme Cloud", industry "Cloud Software") count.
+        """
+        key = name_key(query)
+        if not key:
+            return []
+        with self._lock:
+            self._stats['searches'] += 1
+            rows = self._db.execute(
+                "SELECT id, metadata FROM companies WHERE name_key >= ? AND name_key < ? "
+                "ORDER BY length(company_name), name_key LIMIT ?",
+                (key, key + '\uffff', limit)
+            ).fetchall()
+            if not rows and len(key) >= 3:
+                clause, params = self._match_clause(query)
+                rows = self._db.execute(
+                    f"SELECT id, metadata FROM companies WHERE {clause} "
+                    f"ORDER BY length(company_name), name_key LIMIT ?",
+                    params + [limit]
+                ).fetchall()
+        return [(row['id'], json.loads(row['metadata'])) for row in rows]
+
+    def _match_clause(self, query: str) -> Tuple[str, List[Any]]:
+        fts_query = _fts_query(query)
+        if self.fts_enabled and fts_query:
+            return "rowid IN (SELECT rowid FROM companies_fts WHERE companies_fts MATCH ?)", [fts_query]
+        like = f"%{name_key(query)}%"
+        return "(name_key LIKE ? OR lower(industry) LIKE ? OR lower(website) LIKE ?)", [like, like, like]
+
+    # ------------------------------------------------------------------
+    # Seeding from Pinecone
+    # ------------------------------------------------------------------
+
+    def sync_from_index(self, index, dimension: int = 1536) -> int:
+        """
+        Copy every vector's metadata from a Pinecone index into the mirror.
+
+        Uses `index.list()` + `fetch` to page through all ids (serverless
+        indexes); on indexes without list support it falls back to one
+        zero-vector query with the maximum top_k. After a complete listing,
+        companies that were not seen (deleted from the index) are dropped;
+        rows written through during the sync are kept.
+
+        Returns:
+            Number of companies mirrored
+        """
+        started = time.time()
+        synced = 0
+        complete = True
+        try:
+            for ids in index.list():
+                ids = list(ids)
+                for i in range(0, len(ids), FETCH_BATCH_SIZE):
+                    fetched = index.fetch(ids=ids[i:i + FETCH_BATCH_SIZE])
+                    synced += self.upsert_many(
+                        (vector_id, vector.metadata or {}) for vector_id, vector in fetched.vectors.items()
+                    )
+        except Exception as e:
+            logger.info(f"Index listing unavailable ({e}), seeding mirror from a metadata query")
+            result = index.query(vector=[0.0] * dimension, top_k=10000, include_metadata=True, include_values=False)
+            synced = self.upsert_many((match.id, match.metadata or {}) for match in result.matches)
+            complete = len(result.matches) < 10000
+
+        with self._lock:
+            with self._db:
+                if complete:
+                    pruned = self._db.execute("DELETE FROM companies WHERE mirrored_at < ?", (started,)).rowcount
+                    self._stats['deletes'] += pruned
+                self._db.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('last_sync', ?)", (str(time.time()),)
+                )
+        logger.info(f"Company mirror synced with {synced} companies")
+        return synced
+
+    def is_stale(self, max_age_seconds: float) -> bool:
+        """True if the mirror was never synced, or last synced more than `max_age_seconds` ago."""
+        last_sync = self.last_sync()
+        return last_sync is None or (max_age_seconds > 0 and time.time() - last_sync > max_age_seconds)
+
+    def last_sync(self) -> Optional[float]:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = 'last_sync'").fetchone()
+        return float(row['value']) if row else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        last_sync = self.last_sync()
+        with self._lock:
+            stats = dict(self._stats)
+        return {
+            **stats,
+            'companies': self.count(),
+            'fts_enabled': self.fts_enabled,
+            'last_sync': last_sync,
+            'path': self.path,
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_company_mirror: Optional[CompanyMetadataMirror] = None
+_company_mirror_configured = False
+_company_mirror_lock = threading.Lock()
+_resync_thread: Optional[threading.Thread] = None
+
+
+def get_company_mirror() -> Optional[CompanyMetadataMirror]:
+    """
+    Get the process-wide company metadata mirror, creating it on first use.
+
+    Returns None when the mirror is disabled (COMPANY_MIRROR_ENABLED=false) or
+    the database can't be opened; callers then query Pinecone directly.
+    """
+    global _company_mirror, _company_mirror_configured
+    with _company_mirror_lock:
+        if not _company_mirror_configured:
+            _company_mirror_configured = True
+            if os.getenv('COMPANY_MIRROR_ENABLED', 'true').lower() != 'false':
+                try:
+                    _company_mirror = CompanyMetadataMirror(os.getenv('COMPANY_MIRROR_PATH') or None)
+                except Exception as e:
+                    logger.warning(f"Company mirror disabled: {e}")
+                    _company_mirror = None
+        return _company_mirror
+
+
+def set_company_mirror(mirror: Optional[CompanyMetadataMirror]):
+    """Install the shared mirror explicitly (None disables it)."""
+    global _company_mirror, _company_mirror_configured
+    with _company_mirror_lock:
+        _company_mirror = mirror
+        _company_mirror_configured = True
+
+
+def get_company_mirror_stats() -> Dict[str, Any]:
+    """Mirror stats without forcing the mirror into existence."""
+    if _company_mirror is None:
+        return {'enabled': False}
+    return {'enabled': True, **_company_mirror.get_stats()}
+
+
+def ensure_company_mirror(index, dimension: int = 1536) -> Optional[CompanyMetadataMirror]:
+    """
+    The shared mirror, seeded from `index` if it has never been synced.
+
+    A mirror older than COMPANY_MIRROR_MAX_AGE_HOURS is resynced in a
+    background thread while the current copy keeps serving.
+
+    Returns None if the mirror is disabled or seeding failed, so the caller
+    can fall back to querying Pinecone.
+    """
+    global _resync_thread
+    mirror = get_company_mirror()
+    if mirror is None:
+        return None
+    if mirror.last_sync() is None:
+        try:
+            mirror.sync_from_index(index, dimension)
+        except Exception as e:
+            logger.warning(f"Company mirror seeding failed: {e}")
+            return None
+        return mirror
+
+    max_age = float(os.getenv('COMPANY_MIRROR_MAX_AGE_HOURS', DEFAULT_MAX_AGE_SECONDS / 3600)) * 3600
+    if mirror.is_stale(max_age):
+        with _company_mirror_lock:
+            if _resync_thread is None or not _resync_thread.is_alive():
+                _resync_thread = threading.Thread(
+                    target=_resync, args=(mirror, index, dimension), name="company-mirror-resync", daemon=True
+                )
+                _resync_thread.start()
+    return mirror
+
+
+def _resync(mirror: CompanyMetadataMirror, index, dimension: int):
+    try:
+        mirror.sync_from_index(index, dimension)
+    except Exception as e:
+        logger.warning(f"Company mirror resync failed: {e}")
@@ -7,6 +7,12 @@ Sitemap XML Crawler Tool
 Extracts all URLs from website sitemap.xml files and outputs clean path-only URLs
 without domains. Handles both regular sitemaps and sitemap index files.
 
+Large enterprise sites publish sitemap indexes with hundreds of children, often
+gzipped. All sitemap files are fetched over one session with a bounded number of
+requests in flight, each file is stream-parsed (gzip decompressed on the fly)
+instead of being loaded whole, and crawling stops once `max_urls` page URLs have
+been collected.
+
 Usage:
     # Async usage
     paths = await extract_sitemap_paths("https://example.com")
@@ -23,10 +29,15 @@ import logging
 import os
 import time
 import xml.etree.ElementTree as ET
-from typing import Dict, List
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
 from urllib.parse import urljoin, urlparse
 import aiohttp
 
+from src.discovery_cache import NEGATIVE_TTL_SECONDS, get_discovery_cache, revalidate, validator_from_headers
+from src.host_scheduler import apply_robots_crawl_delay, host_slot
+
 # Load environment variables
 try:
     from dotenv import load_dotenv
@@ -44,6 +55,14 @@ logger = logging.getLogger(__name__)
 # Standard user agent for compatibility
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
 
+# Sitemap crawling limits
+DEFAULT_MAX_URLS = 10000              # stop once this many page URLs are collected
+DEFAULT_MAX_CONCURRENCY = 8           # sitemap files downloaded at the same time
+MAX_INDEX_DEPTH = 3                   # levels of nested sitemap indexes followed
+MAX_SITEMAP_BYTES = 50 * 1024 * 1024  # sitemaps.org limit for one uncompressed file
+CHUNK_SIZE = 64 * 1024
+GZIP_MAGIC = b'\x1f\x8b'
+
 
 def _should_include_url(url: str, locale_filter: str = None) -> bool:
     """Check if a URL should be included based on locale filtering."""
@@ -108,15 +127,334 @@ class SitemapEntry:
     
     def __repr__(self):
         return f"SitemapEntry(url='{self.url}', lastmod='{self.lastmod}')"
+    
+    def to_dict(self) -> Dict[str, Optional[str]]:
+        return {'url': self.url, 'lastmod': self.lastmod, 'changefreq': self.changefreq, 'priority': self.priority}
+
+
+def _local_name(tag: str) -> str:
+    """Strip the XML namespace from an element tag."""
+    return tag.rsplit('}', 1)[-1]
+
 
+class SitemapStreamParser:
+    """
+    Incremental parser for a single sitemap document.
 
-async def extract_sitemap_urls(base_url: str, locale_filter: str = None) -> List[SitemapEntry]:
+    Raw response bytes are fed in chunk by chunk. Gzip (.xml.gz) is detected from
+    the magic bytes and decompressed on the fly, and `<url>` / `<sitemap>` records
+    are returned as soon as each element closes. Parsed elements are discarded,
+    so memory stays flat however large the file is. Documents that don't start
+    with '<' are treated as plain-text sitemaps (one URL per line).
+    """
+
+    def __init__(self, max_bytes: int = MAX_SITEMAP_BYTES):
+        self.max_bytes = max_bytes
+        self.kind = None  # 'urlset', 'sitemapindex' or 'text'
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self._head = b''
+        self._decompressor = None
+        self._format_known = False
+        self._xml = None
+        self._root = None
+        self._depth = 0
+        self._text_tail = b''
+
+    @property
+    def is_index(self) -> bool:
+        return self.kind == 'sitemapindex'
+
+    @property
+    def exhausted(self) -> bool:
+        """True once the uncompressed size limit has been reached."""
+        return self.bytes_out >= self.max_bytes
+
+    def feed(self, chunk: bytes) -> List[Tuple[str, Dict[str, str]]]:
+        """
+        Feed raw response bytes.
+
+        Returns:
+            Completed records as ('url' | 'sitemap', {child tag: text}) tuples
+        """
+        self.bytes_in += len(chunk)
+
+        # Need two bytes to recognise the gzip header
+        if not self._format_known:
+            self._head += chunk
+            if len(self._head) < 2:
+                return []
+            chunk, self._head = self._head, b''
+            if chunk.startswith(GZIP_MAGIC):
+                self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            self._format_known = True
+
+        if self._decompressor is not None:
+            # Bounded output guards against decompression bombs
+            chunk = self._decompressor.decompress(chunk, self.max_bytes - self.bytes_out + 1)
+        return self._feed_document(chunk)
+
+    def close(self) -> List[Tuple[str, Dict[str, str]]]:
+        """Flush buffered input once the response is fully read."""
+        records = []
+        if not self._format_known and self._head:
+            self._format_known = True
+            records.extend(self._feed_document(self._head))
+        elif self._decompressor is not None and not self.exhausted:
+            records.extend(self._feed_document(self._decompressor.flush()))
+
+        if self.kind == 'text':
+            records.extend(self._text_records([self._text_tail]))
+            self._text_tail = b''
+        elif self._xml is not None:
+            self._xml.close()
+            records.extend(self._xml_records())
+        return records
+
+    def _feed_document(self, data: bytes) -> List[Tuple[str, Dict[str, str]]]:
+        if not data:
+            return []
+        data = data[:max(0, self.max_bytes - self.bytes_out)]
+        self.bytes_out += len(data)
+
+        if self.kind is None and self._xml is None:
+            stripped = data.lstrip(b'\xef\xbb\xbf \t\r\n')
+            if not stripped:
+                return []
+            if stripped.startswith(b'<'):
+                self._xml = ET.XMLPullParser(events=('start', 'end'))
+            else:
+                self.kind = 'text'
+
+        if self.kind == 'text':
+            lines = (self._text_tail + data).split(b'\n')
+            self._text_tail = lines.pop()
+            return self._text_records(lines)
+
+        self._xml.feed(data)
+        return self._xml_records()
+
+    def _xml_records(self) -> List[Tuple[str, Dict[str, str]]]:
+        records = []
+        for event, elem in self._xml.read_events():
+            if event == 'start':
+                if self._depth == 0:
+                    self._root = elem
+                    self.kind = 'sitemapindex' if _local_name(elem.tag) == 'sitemapindex' else 'urlset'
+                self._depth += 1
+                continue
+
+            self._depth -= 1
+            if self._depth != 1:
+                continue
+
+            # Direct child of <urlset> / <sitemapindex>: read it, then drop it
+            name = _local_name(elem.tag)
+            if name in ('url', 'sitemap'):
+                fields = {_local_name(child.tag): (child.text or '').strip() for child in elem}
+                if fields.get('loc'):
+                    records.append((name, fields))
+            self._root.remove(elem)
+        return records
+
+    @staticmethod
+    def _text_records(lines: List[bytes]) -> List[Tuple[str, Dict[str, str]]]:
+        records = []
+        for raw_line in lines:
+            line = raw_line.decode('utf-8', errors='replace').strip()
+            if line.startswith('http'):
+                records.append(('url', {'loc': line}))
+        return records
+
+
+@dataclass
+class SitemapCrawlStats:
+    """What a sitemap crawl fetched and why it stopped"""
+    sitemaps_fetched: int = 0
+    sitemaps_failed: int = 0
+    sitemaps_skipped: int = 0
+    bytes_downloaded: int = 0
+    urls_found: int = 0
+    url_cap_reached: bool = False
+    elapsed: float = 0.0
+
+
+class SitemapCrawler:
+    """
+    Concurrent, streaming sitemap crawler over a single HTTP session.
+
+    Sitemap indexes fan out to their child sitemaps, which are downloaded with at
+    most `max_concurrency` requests in flight. Every document is stream-parsed, and
+    once `max_urls` page URLs have been collected the remaining downloads are
+    cancelled. Entries are returned in sitemap order (parent before children),
+    not download-completion order.
+
+    Args:
+        session: aiohttp session shared by every sitemap request
+        domain: Only page URLs on this netloc are kept
+        locale_filter: Optional locale filter applied to sitemaps and page URLs
+        max_urls: Stop after collecting this many unique page URLs
+        max_concurrency: Sitemap files downloaded at the same time
+        timeout_seconds: Timeout per sitemap file
+        max_index_depth: How many levels of nested sitemap indexes are followed
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        domain: str,
+        locale_filter: str = None,
+        max_urls: int = DEFAULT_MAX_URLS,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        timeout_seconds: float = 15,
+        max_index_depth: int = MAX_INDEX_DEPTH
+    ):
+        self.session = session
+        self.domain = domain
+        self.locale_filter = locale_filter
+        self.max_urls = max_urls
+        self.max_concurrency = max_concurrency
+        self.timeout_seconds = timeout_seconds
+        self.max_index_depth = max_index_depth
+
+        self.stats = SitemapCrawlStats()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pending: Set[asyncio.Task] = set()
+        self._seen_sitemaps: Set[str] = set()
+        self._seen_urls: Set[str] = set()
+        self._entries: Dict[Tuple[int, ...], List[SitemapEntry]] = {}
+        self._child_counts: Dict[Tuple[int, ...], int] = {}
+        self.validators: Dict[str, Dict[str, str]] = {}  # HTTP validators of the top-level sitemap files
+
+    async def crawl(self, sitemap_urls: List[str]) -> List[SitemapEntry]:
+        """Fetch `sitemap_urls` and every nested sitemap they reference."""
+        start_time = time.time()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        for position, sitemap_url in enumerate(sitemap_urls):
+            self._schedule(sitemap_url, 0, (position,))
+
+        try:
+            while self._pending and not self.stats.url_cap_reached:
+                done, _ = await asyncio.wait(self._pending, return_when=asyncio.FIRST_COMPLETED)
+                self._pending -= done
+        finally:
+            for task in self._pending:
+                task.cancel()
+            if self._pending:
+                await asyncio.gather(*self._pending, return_exceptions=True)
+            self._pending.clear()
+
+        entries = [entry for order in sorted(self._entries) for entry in self._entries[order]]
+        self.stats.urls_found = len(entries)
+        self.stats.elapsed = time.time() - start_time
+
+        print(f"Total sitemap URLs extracted: {len(entries)} from {self.stats.sitemaps_fetched} sitemap(s) "
+              f"in {self.stats.elapsed:.2f}s ({self.stats.bytes_downloaded / 1024:.0f} KB)")
+        if self.stats.url_cap_reached:
+            print(f"Stopped early: URL cap of {self.max_urls} reached")
+        return entries
+
+    def _schedule(self, sitemap_url: str, depth: int, order: Tuple[int, ...]):
+        if sitemap_url in self._seen_sitemaps or self.stats.url_cap_reached:
+            return
+        self._seen_sitemaps.add(sitemap_url)
+
+        if not _should_include_url(sitemap_url, self.locale_filter):
+            print(f"Skipping {sitemap_url} (locale filter: {self.locale_filter})")
+            self.stats.sitemaps_skipped += 1
+            return
+        if depth > self.max_index_depth:
+            logger.debug(f"Skipping {sitemap_url}: sitemap index nesting deeper than {self.max_index_depth}")
+            self.stats.sitemaps_skipped += 1
+            return
+
+        self._pending.add(asyncio.ensure_future(self._process_sitemap(sitemap_url, depth, order)))
+
+    def _handle_records(self, records, depth: int, order: Tuple[int, ...]):
+        entries = self._entries.setdefault(order, [])
+        for kind, fields in records:
+            if kind == 'sitemap':
+                child = self._child_counts.get(order, 0)
+                self._child_counts[order] = child + 1
+                self._schedule(fields['loc'], depth + 1, order + (child,))
+                continue
+
+            url = fields['loc']
+            if url in self._seen_urls or self.stats.url_cap_reached:
+                continue
+            # Only include URLs from the same domain and matching locale filter
+            if urlparse(url).netloc != self.domain or not _should_include_url(url, self.locale_filter):
+                continue
+
+            self._seen_urls.add(url)
+            entries.append(SitemapEntry(
+                url=url,
+                lastmod=fields.get('lastmod') or None,
+                changefreq=fields.get('changefreq') or None,
+                priority=fields.get('priority') or None
+            ))
+            if len(self._seen_urls) >= self.max_urls:
+                self.stats.url_cap_reached = True
+
+    async def _process_sitemap(self, sitemap_url: str, depth: int, order: Tuple[int, ...]):
+        async with self._semaphore:
+            if self.stats.url_cap_reached:
+                return
+
+            parser = SitemapStreamParser()
+            try:
+                async with host_slot(sitemap_url) as slot, self.session.get(
+                    sitemap_url, timeout=aiohttp.ClientTimeout(total=self.timeout_seconds)
+                ) as response:
+                    slot.record(response.status, response.headers.get('Retry-After'))
+                    if response.status != 200:
+                        print(f"Warning: Failed to fetch {sitemap_url}: HTTP {response.status}")
+                        self.stats.sitemaps_failed += 1
+                        return
+                    if depth == 0:
+                        self.validators[sitemap_url] = validator_from_headers(response.headers)
+
+                    async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                        self._handle_records(parser.feed(chunk), depth, order)
+                        if self.stats.url_cap_reached or parser.exhausted:
+                            break
+                    else:
+                        self._handle_records(parser.close(), depth, order)
+
+                self.stats.sitemaps_fetched += 1
+                kind = "sitemap index" if parser.is_index else "sitemap"
+                print(f"Processed {kind} {sitemap_url}: {len(self._entries.get(order, []))} URLs"
+                      + (f", {self._child_counts[order]} nested sitemap(s)" if order in self._child_counts else ""))
+
+            except ET.ParseError as e:
+                # Records parsed before the error are kept
+                print(f"Error: Failed to parse XML from {sitemap_url}: {e}")
+                self.stats.sitemaps_failed += 1
+            except Exception as e:
+                logger.error(f"Error parsing sitemap {sitemap_url}: {type(e).__name__}: {e}")
+                self.stats.sitemaps_failed += 1
+            finally:
+                self.stats.bytes_downloaded += parser.bytes_in
+
+
+async def extract_sitemap_urls(
+    base_url: str,
+    locale_filter: str = None,
+    max_urls: int = DEFAULT_MAX_URLS,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    use_cache: bool = True
+) -> List[SitemapEntry]:
     """
     Extract all URLs from website sitemap.xml files.
     
     Args:
         base_url: The website URL to extract sitemap from
         locale_filter: Optional locale filter (e.g., 'en-us') to only process URLs from specific locale
+        max_urls: Stop once this many page URLs have been collected
+        max_concurrency: Maximum sitemap files downloaded at the same time
+        use_cache: Serve entries from the discovery cache; when False the sitemap is
+            always fetched (and the cache updated), e.g. to read current lastmod values
         
     Returns:
         List of SitemapEntry objects containing URL and metadata
@@ -130,32 +468,52 @@ async def extract_sitemap_urls(base_url: str, locale_filter: str = None) -> List
     domain = parsed_url.netloc
     
     discovered_entries = []
-    processed_sitemaps = set()  # Avoid processing same sitemap twice
+    
+    # Entries from an earlier run: served within the TTL, or after robots.txt and every
+    # top-level sitemap file answer "not modified"
+    cache = get_discovery_cache()
+    cache_variant = f"{locale_filter or ''}|{max_urls}"
+    cached = cache.lookup(base_url, "sitemap", cache_variant) if cache and use_cache else None
+    if cached and (cached.fresh or await revalidate(cached.validators)):
+        if not cached.fresh:
+            cache.mark_revalidated(cached)
+        print(f"Using {len(cached.payload)} cached sitemap URLs for {domain} ({cached.age:.0f}s old)")
+        return [SitemapEntry(**entry) for entry in cached.payload]
     
     try:
-        # Step 1: Try to find sitemap.xml
-        sitemap_urls = await _discover_sitemap_urls(base_url)
-        
-        if not sitemap_urls:
-            print("Warning: No sitemap.xml found")
-            return []
-        
-        print(f"Found {len(sitemap_urls)} sitemap file(s)")
-        
-        # Step 2: Process each sitemap file (with locale filtering)
-        for sitemap_url in sitemap_urls:
-            if sitemap_url not in processed_sitemaps:
-                # Apply locale filtering to sitemap URLs
-                if not _should_include_url(sitemap_url, locale_filter):
-                    print(f"Skipping {sitemap_url} (locale filter: {locale_filter})")
-                    continue
-                
-                processed_sitemaps.add(sitemap_url)
-                entries = await _parse_sitemap_file(sitemap_url, domain, locale_filter)
-                discovered_entries.extend(entries)
-                print(f"Processed {sitemap_url}: {len(entries)} URLs")
-        
-        print(f"Total sitemap URLs extracted: {len(discovered_entries)}")
+        # One session (and connection pool) for robots.txt, indexes and every child sitemap
+        async with aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=max_concurrency, limit_per_host=max_concurrency),
+            headers={"User-Agent": USER_AGENT}
+        ) as session:
+            # Step 1: Try to find sitemap.xml
+            validators: Dict[str, Dict[str, str]] = {}
+            probe_errors: List[str] = []
+            sitemap_urls = await _discover_sitemap_urls(base_url, session, validators, probe_errors)
+            
+            if not sitemap_urls:
+                print("Warning: No sitemap.xml found")
+                # Only a definite "no sitemap" is cached, and briefly; a timeout or
+                # server error must not hide the sitemap until the TTL runs out
+                if cache and not probe_errors:
+                    cache.store(base_url, "sitemap", [], validators, variant=cache_variant,
+                                ttl=NEGATIVE_TTL_SECONDS)
+                return []
+            
+            print(f"Found {len(sitemap_urls)} sitemap file(s)")
+            
+            # Step 2: Stream every sitemap file, following indexes concurrently
+            crawler = SitemapCrawler(
+                session, domain, locale_filter,
+                max_urls=max_urls, max_concurrency=max_concurrency
+            )
+            discovered_entries = await crawler.crawl(sitemap_urls)
+            
+            # Partial results (a sitemap failed) are not cached
+            if cache and not crawler.stats.sitemaps_failed:
+                validators.update(crawler.validators)
+                cache.store(base_url, "sitemap", [entry.to_dict() for entry in discovered_entries],
+                            validators, variant=cache_variant)
         
     except Exception as e:
         logger.error(f"Error extracting sitemap from {base_url}: {e}")
@@ -164,211 +522,83 @@ async def extract_sitemap_urls(base_url: str, locale_filter: str = None) -> List
     return discovered_entries
 
 
-async def _discover_sitemap_urls(base_url: str) -> List[str]:
-    """Discover sitemap URLs from robots.txt and common locations."""
+async def _discover_sitemap_urls(
+    base_url: str,
+    session: aiohttp.ClientSession,
+    validators: Optional[Dict[str, Dict[str, str]]] = None,
+    errors: Optional[List[str]] = None
+) -> List[str]:
+    """
+    Discover sitemap URLs from robots.txt and common locations.
+    
+    robots.txt validators go to `validators`; probes that failed without a
+    definite answer (network errors, 429, 5xx) are appended to `errors`.
+    """
+    if errors is None:
+        errors = []
     
     sitemap_urls = []
+    timeout = aiohttp.ClientTimeout(total=10)
     
     try:
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=10),
-            headers={"User-Agent": USER_AGENT}
-        ) as session:
+        # Method 1: Check robots.txt for sitemap references
+        robots_url = urljoin(base_url, '/robots.txt')
+        try:
+            async with host_slot(robots_url) as slot, session.get(robots_url, timeout=timeout) as response:
+                slot.record(response.status, response.headers.get('Retry-After'))
+                if response.status == 429 or response.status >= 500:
+                    errors.append(f"{robots_url}: HTTP {response.status}")
+                if response.status == 200:
+                    robots_content = await response.text()
+                    apply_robots_crawl_delay(base_url, robots_content)
+                    if validators is not None:
+                        validators[robots_url] = validator_from_headers(response.headers)
+                    for line in robots_content.split('\n'):
+                        line = line.strip()
+                        if line.lower().startswith('sitemap:'):
+                            sitemap_url = line.split(':', 1)[1].strip()
+                            sitemap_urls.append(sitemap_url)
+                    
+                    if sitemap_urls:
+                        print(f"Found {len(sitemap_urls)} sitemap(s) in robots.txt")
+        except Exception as e:
+            errors.append(f"{robots_url}: {e}")
+            logger.debug(f"Failed to check robots.txt: {e}")
+        
+        # Method 2: Try common sitemap locations if none found in robots.txt
+        if not sitemap_urls:
+            common_locations = [
+                '/sitemap.xml',
+                '/sitemap_index.xml',
+                '/sitemaps/sitemap.xml',
+                '/sitemap/sitemap.xml',
+                '/sitemap.xml.gz'
+            ]
             
-            # Method 1: Check robots.txt for sitemap references
-            robots_url = urljoin(base_url, '/robots.txt')
-            try:
-                async with session.get(robots_url) as response:
-                    if response.status == 200:
-                        robots_content = await response.text()
-                        for line in robots_content.split('\n'):
-                            line = line.strip()
-                            if line.lower().startswith('sitemap:'):
-                                sitemap_url = line.split(':', 1)[1].strip()
+            for location in common_locations:
+                sitemap_url = urljoin(base_url, location)
+                try:
+                    async with host_slot(sitemap_url) as slot, session.get(sitemap_url, timeout=timeout) as response:
+                        slot.record(response.status, response.headers.get('Retry-After'))
+                        if response.status == 429 or response.status >= 500:
+                            errors.append(f"{sitemap_url}: HTTP {response.status}")
+                        if response.status == 200:
+                            content_type = response.headers.get('content-type', '').lower()
+                            if 'xml' in content_type or 'gzip' in content_type:
                                 sitemap_urls.append(sitemap_url)
-                        
-                        if sitemap_urls:
-                            print(f"Found {len(sitemap_urls)} sitemap(s) in robots.txt")
-            except Exception as e:
-                logger.debug(f"Failed to check robots.txt: {e}")
-            
-            # Method 2: Try common sitemap locations if none found in robots.txt
-            if not sitemap_urls:
-                common_locations = [
-                    '/sitemap.xml',
-                    '/sitemap_index.xml',
-                    '/sitemaps/sitemap.xml',
-                    '/sitemap/sitemap.xml'
-                ]
-                
-                for location in common_locations:
-                    sitemap_url = urljoin(base_url, location)
-                    try:
-                        async with session.get(sitemap_url) as response:
-                            if response.status == 200:
-                                content_type = response.headers.get('content-type', '')
-                                if 'xml' in content_type.lower():
-                                    sitemap_urls.append(sitemap_url)
-                                    print(f"Found sitemap at: {location}")
-                                    break
-                    except Exception:
-                        continue
+                                print(f"Found sitemap at: {location}")
+                                break
+                except Exception as e:
+                    errors.append(f"{sitemap_url}: {e}")
+                    continue
     
     except Exception as e:
+        errors.append(str(e))
         logger.error(f"Failed to discover sitemaps: {e}")
     
     return sitemap_urls
 
 
-async def _parse_sitemap_file(sitemap_url: str, domain: str, locale_filter: str = None) -> List[SitemapEntry]:
-    """Parse a single sitemap XML file and extract URLs."""
-    
-    entries = []
-    
-    try:
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=15),
-            headers={"User-Agent": USER_AGENT}
-        ) as session:
-            
-            async with session.get(sitemap_url) as response:
-                if response.status != 200:
-                    print(f"Warning: Failed to fetch {sitemap_url}: HTTP {response.status}")
-                    return []
-                
-                content = await response.text()
-                
-                try:
-                    root = ET.fromstring(content)
-                    
-                    # Handle sitemap index files (contain references to other sitemaps)
-                    if _is_sitemap_index(root):
-                        print(f"Processing sitemap index: {sitemap_url}")
-                        nested_entries = await _parse_sitemap_index(root, domain, locale_filter)
-                        entries.extend(nested_entries)
-                    
-                    # Handle regular sitemap files (contain actual URLs)
-                    else:
-                        print(f"Processing sitemap: {sitemap_url}")
-                        entries = _parse_sitemap_urls(root, domain, locale_filter)
-                
-                except ET.ParseError as e:
-                    print(f"Error: Failed to parse XML from {sitemap_url}: {e}")
-                    
-                    # Try to parse as plain text sitemap (fallback)
-                    entries = _parse_plain_text_sitemap(content, domain)
-    
-    except Exception as e:
-        logger.error(f"Error parsing sitemap {sitemap_url}: {e}")
-    
-    return entries
-
-
-def _is_sitemap_index(root: ET.Element) -> bool:
-    """Check if XML root is a sitemap index file."""
-    return (root.tag.endswith('sitemapindex') or 
-            any(child.tag.endswith('sitemap') for child in root))
-
-
-async def _parse_sitemap_index(root: ET.Element, domain: str, locale_filter: str = None) -> List[SitemapEntry]:
-    """Parse sitemap index file and recursively process nested sitemaps."""
-    
-    entries = []
-    
-    # Define XML namespaces
-    namespaces = {
-        '': 'http://www.sitemaps.org/schemas/sitemap/0.9',
-        'ns': 'http://www.sitemaps.org/schemas/sitemap/0.9'
-    }
-    
-    # Find all sitemap references
-    sitemap_refs = []
-    
-    # Try both with and without namespace
-    for ns_prefix in ['', 'ns:']:
-        sitemap_elements = root.findall(f'.//{ns_prefix}sitemap', namespaces if ns_prefix else {})
-        for sitemap_elem in sitemap_elements:
-            loc_elem = sitemap_elem.find(f'{ns_prefix}loc', namespaces if ns_prefix else {})
-            if loc_elem is not None and loc_elem.text:
-                sitemap_refs.append(loc_elem.text)
-    
-    print(f"Found {len(sitemap_refs)} nested sitemap(s)")
-    
-    # Process each nested sitemap (with locale filtering)
-    for sitemap_ref in sitemap_refs:
-        # Apply locale filtering to nested sitemap URLs
-        if not _should_include_url(sitemap_ref, locale_filter):
-            print(f"Skipping nested sitemap {sitemap_ref} (locale filter: {locale_filter})")
-            continue
-            
-        nested_entries = await _parse_sitemap_file(sitemap_ref, domain, locale_filter)
-        entries.extend(nested_entries)
-    
-    return entries
-
-
-def _parse_sitemap_urls(root: ET.Element, domain: str, locale_filter: str = None) -> List[SitemapEntry]:
-    """Parse regular sitemap file and extract URL entries."""
-    
-    entries = []
-    
-    # Find all URL entries with namespace handling
-    url_elements = []
-    
-    # Try different namespace patterns
-    patterns = [
-        './/url',
-        './/{http://www.sitemaps.org/schemas/sitemap/0.9}url'
-    ]
-    
-    for pattern in patterns:
-        url_elements = root.findall(pattern)
-        if url_elements:
-            break
-    
-    for url_elem in url_elements:
-        # Extract URL and metadata with namespace handling
-        loc_elem = (url_elem.find('loc') or 
-                   url_elem.find('{http://www.sitemaps.org/schemas/sitemap/0.9}loc'))
-        lastmod_elem = (url_elem.find('lastmod') or 
-                       url_elem.find('{http://www.sitemaps.org/schemas/sitemap/0.9}lastmod'))
-        changefreq_elem = (url_elem.find('changefreq') or 
-                          url_elem.find('{http://www.sitemaps.org/schemas/sitemap/0.9}changefreq'))
-        priority_elem = (url_elem.find('priority') or 
-                        url_elem.find('{http://www.sitemaps.org/schemas/sitemap/0.9}priority'))
-        
-        if loc_elem is not None and loc_elem.text:
-            url = loc_elem.text.strip()
-            
-            # Only include URLs from the same domain and matching locale filter
-            parsed_url = urlparse(url)
-            if parsed_url.netloc == domain and _should_include_url(url, locale_filter):
-                entry = SitemapEntry(
-                    url=url,
-                    lastmod=lastmod_elem.text.strip() if lastmod_elem is not None and lastmod_elem.text else None,
-                    changefreq=changefreq_elem.text.strip() if changefreq_elem is not None and changefreq_elem.text else None,
-                    priority=priority_elem.text.strip() if priority_elem is not None and priority_elem.text else None
-                )
-                entries.append(entry)
-    
-    return entries
-
-
-def _parse_plain_text_sitemap(content: str, domain: str) -> List[SitemapEntry]:
-    """Parse plain text sitemap as fallback (one URL per line)."""
-    
-    entries = []
-    
-    for line in content.split('\n'):
-        line = line.strip()
-        if line and line.startswith('http'):
-            parsed_url = urlparse(line)
-            if parsed_url.netloc == domain:
-                entries.append(SitemapEntry(url=line))
-    
-    return entries
-
-
 def strip_domains_from_sitemap(sitemap_entries: List[SitemapEntry], base_url: str) -> List[str]:
     """
     Remove domains from sitemap URLs to get clean path-only URLs.
@@ -419,19 +649,24 @@ def strip_domains_from_sitemap(sitemap_entries: List[SitemapEntry], base_url: st
     return paths
 
 
-async def extract_sitemap_paths(base_url: str, locale_filter: str = None) -> List[str]:
+async def extract_sitemap_paths(
+    base_url: str,
+    locale_filter: str = None,
+    max_urls: int = DEFAULT_MAX_URLS
+) -> List[str]:
     """
     Extract all sitemap URLs and return as domain-free paths.
     
     Args:
         base_url: Website URL to extract sitemap from
         locale_filter: Optional locale filter (e.g., 'en-us') to only process URLs from specific locale
+        max_urls: Stop once this many page URLs have been collected
         
     Returns:
         List of path-only URLs without domains
     """
     # Get full sitemap entries (with locale filtering)
-    sitemap_entries = await extract_sitemap_urls(base_url, locale_filter)
+    sitemap_entries = await extract_sitemap_urls(base_url, locale_filter, max_urls=max_urls)
     
     # Strip domains to get clean paths
     paths = strip_domains_from_sitemap(sitemap_entries, base_url)
@@ -439,19 +674,24 @@ async def extract_sitemap_paths(base_url: str, locale_filter: str = None) -> Lis
     return paths
 
 
-def extract_sitemap_paths_sync(base_url: str, locale_filter: str = None) -> List[str]:
+def extract_sitemap_paths_sync(
+    base_url: str,
+    locale_filter: str = None,
+    max_urls: int = DEFAULT_MAX_URLS
+) -> List[str]:
     """
     Synchronous wrapper for extract_sitemap_paths().
     
     Args:
         base_url: Website URL to extract sitemap from
         locale_filter: Optional locale filter (e.g., 'en-us') to only process URLs from specific locale
+        max_urls: Stop once this many page URLs have been collected
         
     Returns:
         List of path-only URLs without domains
     """
     try:
-        return asyncio.run(extract_sitemap_paths(base_url, locale_filter))
+        return asyncio.run(extract_sitemap_paths(base_url, locale_filter, max_urls))
     except Exception as e:
         logger.error(f"Error in sync wrapper for {base_url}: {e}")
         return []
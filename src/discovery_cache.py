@@ -0,0 +1,303 @@
+"""
+Discovery Cache
+===============
+
+Persistent per-domain cache for the website discovery crawlers
+(`crawl_robots_txt`, `crawl_sitemap_xml`, `crawl_header_for_links`) and the
+canonical-URL probe in `antoine_discovery`. Every research run used to
+re-download and re-parse robots.txt, every sitemap file and the rendered
+homepage navigation, even for a domain researched an hour earlier.
+
+- Entries are keyed by (domain, kind, variant) and store the parsed result
+  as JSON: robots rules, sitemap entries, header/footer links
+- Each entry keeps the HTTP validators (ETag / Last-Modified) of the
+  documents it was built from, and a TTL
+- Within the TTL an entry is returned without touching the network, so
+  `discover_all_paths` answers in milliseconds for recently seen domains
+- After the TTL, `revalidate` sends conditional GETs for the source
+  documents; if none changed the entry is refreshed in place, otherwise
+  the crawler rebuilds it
+- SQLite in WAL mode (data/discovery_cache/discovery.db), shared by threads
+  and processes
+
+Configuration (environment):
+- DISCOVERY_CACHE_ENABLED    "false" disables the cache (default "true")
+- DISCOVERY_CACHE_PATH       SQLite database file
+- DISCOVERY_CACHE_TTL        seconds an entry is served without revalidation (default 86400)
+
+Usage:
+    cache = get_discovery_cache()
+    entry = cache.lookup(url, "robots") if cache else None
+    if entry and (entry.fresh or await revalidate(entry.validators)):
+        return entry.payload
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+from src.host_scheduler import host_slot
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+# "Nothing found" answers expire sooner, so a site that adds the document is seen soon
+NEGATIVE_TTL_SECONDS = 60 * 60
+REVALIDATE_TIMEOUT_SECONDS = 10
+
+
+def domain_key(url: str) -> str:
+    """Cache key for a site: the lower-cased host name, plus the port if one is given."""
+    parsed = urlparse(url if '//' in url else f'//{url}')
+    host = (parsed.hostname or url).lower()
+    return f"{host}:{parsed.port}" if parsed.port else host
+
+
+def validator_from_headers(headers: Any) -> Dict[str, str]:
+    """ETag / Last-Modified from a response header mapping (missing ones omitted)."""
+    validator = {}
+    if not headers:
+        return validator
+    lowered = {str(key).lower(): value for key, value in dict(headers).items()}
+    if lowered.get('etag'):
+        validator['etag'] = lowered['etag']
+    if lowered.get('last-modified'):
+        validator['last_modified'] = lowered['last-modified']
+    return validator
+
+
+def conditional_headers(validator: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """If-None-Match / If-Modified-Since headers for a stored validator."""
+    headers = {}
+    if validator and validator.get('etag'):
+        headers['If-None-Match'] = validator['etag']
+    if validator and validator.get('last_modified'):
+        headers['If-Modified-Since'] = validator['last_modified']
+    return headers
+
+
+@dataclass
+class DiscoveryEntry:
+    """One cached discovery result"""
+    domain: str
+    kind: str
+    variant: str
+    payload: Any
+    validators: Dict[str, Dict[str, str]] = field(default_factory=dict)  # {source url: validator}
+    fetched_at: float = 0.0
+    ttl: float = DEFAULT_TTL_SECONDS
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    @property
+    def fresh(self) -> bool:
+        return self.age < self.ttl
+
+
+class DiscoveryCache:
+    """
+    Per-domain store of parsed discovery results. Safe to share between
+    threads; several processes may share one database file (WAL mode).
+
+    Args:
+        path: Database file (data/discovery_cache/discovery.db when omitted)
+        ttl: Default seconds an entry is served without revalidation
+    """
+
+    def __init__(self, path: str = None, ttl: float = DEFAULT_TTL_SECONDS):
+        if path is None:
+            project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            path = os.path.join(project_root, 'data', 'discovery_cache', 'discovery.db')
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._stats = {'fresh_hits': 0, 'stale_hits': 0, 'misses': 0, 'stores': 0, 'revalidated': 0}
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS discovery (
+                domain TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                variant TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                validators TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                ttl REAL NOT NULL,
+                PRIMARY KEY (domain, kind, variant)
+            )
+        """)
+        self._db.commit()
+
+    def lookup(self, url: str, kind: str, variant: str = "") -> Optional[DiscoveryEntry]:
+        """Stored entry for the URL's domain (fresh or stale), or None."""
+        domain = domain_key(url)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT payload, validators, fetched_at, ttl FROM discovery WHERE domain = ? AND kind = ? AND variant = ?",
+                (domain, kind, variant)
+            ).fetchone()
+            if row is None:
+                self._stats['misses'] += 1
+                return None
+            entry = DiscoveryEntry(domain, kind, variant, json.loads(row[0]), json.loads(row[1]), row[2], row[3])
+            self._stats['fresh_hits' if entry.fresh else 'stale_hits'] += 1
+            return entry
+
+    def store(
+        self,
+        url: str,
+        kind: str,
+        payload: Any,
+        validators: Optional[Dict[str, Dict[str, str]]] = None,
+        variant: str = "",
+        ttl: Optional[float] = None
+    ) -> DiscoveryEntry:
+        """Save a freshly built result with the validators of its source documents."""
+        entry = DiscoveryEntry(domain_key(url), kind, variant, payload, validators or {}, time.time(),
+                               self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO discovery (domain, kind, variant, payload, validators, fetched_at, ttl) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (entry.domain, kind, variant, json.dumps(payload), json.dumps(entry.validators),
+                 entry.fetched_at, entry.ttl)
+            )
+            self._db.commit()
+            self._stats['stores'] += 1
+        return entry
+
+    def mark_revalidated(self, entry: DiscoveryEntry):
+        """Source documents are unchanged: restart the entry's TTL."""
+        entry.fetched_at = time.time()
+        with self._lock:
+            self._db.execute(
+                "UPDATE discovery SET fetched_at = ? WHERE domain = ? AND kind = ? AND variant = ?",
+                (entry.fetched_at, entry.domain, entry.kind, entry.variant)
+            )
+            self._db.commit()
+            self._stats['revalidated'] += 1
+
+    def invalidate(self, url: str, kind: Optional[str] = None):
+        """Drop one domain's entries (all kinds unless `kind` is given)."""
+        with self._lock:
+            if kind:
+                self._db.execute("DELETE FROM discovery WHERE domain = ? AND kind = ?", (domain_key(url), kind))
+            else:
+                self._db.execute("DELETE FROM discovery WHERE domain = ?", (domain_key(url),))
+            self._db.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM discovery").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM discovery")
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = self._db.execute("SELECT COUNT(*) FROM discovery").fetchone()[0]
+            stats['domains'] = self._db.execute("SELECT COUNT(DISTINCT domain) FROM discovery").fetchone()[0]
+        stats['path'] = self.path
+        stats['ttl_seconds'] = self.ttl
+        return stats
+
+
+async def revalidate(
+    validators: Dict[str, Dict[str, str]],
+    session: Optional[aiohttp.ClientSession] = None,
+    timeout_seconds: float = REVALIDATE_TIMEOUT_SECONDS
+) -> bool:
+    """
+    Conditional GET for every source document of an entry.
+
+    Returns True only when all of them answer 304 (or 200 with an identical
+    validator). Entries without validators can't be revalidated.
+    """
+    if not validators or not all(validators.values()):
+        return False
+
+    async def unchanged(client: aiohttp.ClientSession, url: str, validator: Dict[str, str]) -> bool:
+        try:
+            async with host_slot(url) as slot, client.get(
+                url, headers=conditional_headers(validator), allow_redirects=True,
+                timeout=aiohttp.ClientTimeout(total=timeout_seconds)
+            ) as response:
+                slot.record(response.status, response.headers.get('Retry-After'))
+                if response.status == 304:
+                    return True
+                current = validator_from_headers(response.headers)
+                return response.status == 200 and bool(current) and current == validator
+        except Exception as e:
+            logger.debug(f"Revalidation of {url} failed: {e}")
+            return False
+
+    async def check_all(client: aiohttp.ClientSession) -> bool:
+        results = await asyncio.gather(*(unchanged(client, url, v) for url, v in validators.items()))
+        return all(results)
+
+    if session is not None:
+        return await check_all(session)
+    async with aiohttp.ClientSession() as own_session:
+        return await check_all(own_session)
+
+
+_discovery_cache: Optional[DiscoveryCache] = None
+_discovery_cache_configured = False
+_discovery_cache_lock = threading.Lock()
+
+
+def get_discovery_cache() -> Optional[DiscoveryCache]:
+    """
+    Get the process-wide discovery cache, creating it on first use.
+
+    Returns None when disabled (DISCOVERY_CACHE_ENABLED=false) or the
+    database can't be opened; discovery then always hits the network.
+    """
+    global _discovery_cache, _discovery_cache_configured
+    with _discovery_cache_lock:
+        if not _discovery_cache_configured:
+            _discovery_cache_configured = True
+            if os.getenv('DISCOVERY_CACHE_ENABLED', 'true').lower() != 'false':
+                try:
+                    _discovery_cache = DiscoveryCache(
+                        os.getenv('DISCOVERY_CACHE_PATH') or None,
+                        ttl=float(os.getenv('DISCOVERY_CACHE_TTL', DEFAULT_TTL_SECONDS))
+                    )
+                except Exception as e:
+                    logger.warning(f"Discovery cache disabled: {e}")
+                    _discovery_cache = None
+        return _discovery_cache
+
+
+def set_discovery_cache(cache: Optional[DiscoveryCache]):
+    """Install the shared cache explicitly (None disables caching)."""
+    global _discovery_cache, _discovery_cache_configured
+    with _discovery_cache_lock:
+        _discovery_cache = cache
+        _discovery_cache_configured = True
+
+
+def get_discovery_cache_stats() -> Dict[str, Any]:
+    """Cache stats without forcing the cache into existence."""
+    if _discovery_cache is None:
+        return {'enabled': False}
+    return {'enabled': True, **_discovery_cache.get_stats()}
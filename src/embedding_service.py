@@ -0,0 +1,343 @@
+"""
+Embedding Service
+=================
+
+Cached, concurrent embedding generation behind `BedrockClient`. Titan
+embeds one text per `invoke_model` call, and `batch_generate_embeddings`
+used to make those calls one after another, re-embedding the same company
+text every time a company was reprocessed.
+
+- `EmbeddingCache` persists vectors keyed by SHA-256 of (model, text) as
+  float32 blobs in SQLite (data/embedding_cache/embeddings.db), so unchanged
+  text is never embedded twice, across runs and processes
+- `EmbeddingService` is a micro-batching queue: any thread can `submit` a
+  text and get a Future. A dispatcher thread collects submissions for a few
+  milliseconds, resolves the whole batch against the cache in one query,
+  collapses duplicate texts (including ones already in flight) and fans the
+  misses out to a bounded worker pool
+- Backpressure: at most `max_concurrency` model calls run at once and at most
+  `max_pending` texts wait in the queue; `submit` blocks beyond that instead
+  of queueing unbounded work
+
+Configuration (environment):
+- EMBEDDING_CACHE_ENABLED      "false" disables the persistent cache (default "true")
+- EMBEDDING_CACHE_PATH         SQLite database file
+- EMBEDDING_MAX_CONCURRENCY    concurrent model calls (default 8)
+
+Usage:
+    service = EmbeddingService(invoke_titan, model_id, cache=get_embedding_cache())
+    futures = [service.submit(text) for text in texts]   # returns immediately
+    vectors = [future.result() for future in futures]
+"""
+
+import hashlib
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_MAX_BATCH_SIZE = 32
+DEFAULT_MAX_WAIT_SECONDS = 0.01
+DEFAULT_MAX_PENDING = 256
+
+_STOP = object()
+
+
+def make_embedding_key(model: str, text: str) -> str:
+    """SHA-256 over the model id and the exact text sent to the model."""
+    return hashlib.sha256(f"{model}\n{text}".encode('utf-8')).hexdigest()
+
+
+def pack_vector(vector: List[float]) -> bytes:
+    return array('f', vector).tobytes()
+
+
+def unpack_vector(blob: bytes) -> List[float]:
+    vector = array('f')
+    vector.frombytes(blob)
+    return vector.tolist()
+
+
+class EmbeddingCache:
+    """
+    Persistent embedding store. Safe to share between threads; several
+    processes may share one database file (WAL mode).
+
+    Args:
+        path: Database file (data/embedding_cache/embeddings.db when omitted)
+    """
+
+    def __init__(self, path: str = None):
+        if path is None:
+            project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            path = os.path.join(project_root, 'data', 'embedding_cache', 'embeddings.db')
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                dimension INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                stored_at REAL NOT NULL
+            )
+        """)
+        self._db.commit()
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Cached vectors for whichever of `keys` are present."""
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows = self._db.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                found.update((key, unpack_vector(blob)) for key, blob in rows)
+        return found
+
+    def put(self, key: str, model: str, vector: List[float]):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO embeddings (key, model, dimension, vector, stored_at) VALUES (?, ?, ?, ?, ?)",
+                (key, model, len(vector), pack_vector(vector), time.time())
+            )
+            self._db.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM embeddings")
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class EmbeddingService:
+    """
+    Micro-batching, cached front end for a single-text embedding function.
+
+    Args:
+        embed_fn: Calls the model for one text; returns the vector or raises
+        model: Model id, part of the cache key
+        cache: EmbeddingCache (None disables persistence)
+        max_concurrency: Model calls in flight at once
+        max_batch_size: Submissions collected per dispatch
+        max_wait: Seconds the dispatcher waits for a batch to fill
+        max_pending: Queued submissions before `submit` blocks
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[str], List[float]],
+        model: str,
+        cache: Optional[EmbeddingCache] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait: float = DEFAULT_MAX_WAIT_SECONDS,
+        max_pending: int = DEFAULT_MAX_PENDING
+    ):
+        self.embed_fn = embed_fn
+        self.model = model
+        self.cache = cache
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='embedding')
+        self._inflight: Dict[str, List[Future]] = {}
+        self._lock = threading.Lock()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._stats = {'requests': 0, 'cache_hits': 0, 'deduplicated': 0, 'model_calls': 0,
+                       'errors': 0, 'batches': 0}
+
+    def submit(self, text: str) -> Future:
+        """Queue `text` for embedding; blocks only while the queue is full."""
+        future: Future = Future()
+        self._ensure_dispatcher()
+        self._queue.put((text, future))
+        return future
+
+    def embed(self, text: str) -> List[float]:
+        """Embed one text (raises if the model call fails)."""
+        return self.submit(text).result()
+
+    def embed_many(self, texts: Iterable[str]) -> List[Optional[List[float]]]:
+        """Embed many texts concurrently; failed texts come back as None."""
+        futures = [self.submit(text) for text in texts]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                logger.error(f"Embedding failed: {e}")
+                results.append(None)
+        return results
+
+    def _ensure_dispatcher(self):
+        with self._lock:
+            if self._dispatcher is None or not self._dispatcher.is_alive():
+                self._dispatcher = threading.Thread(target=self._dispatch_loop, name='embedding-dispatcher', daemon=True)
+                self._dispatcher.start()
+
+    def _dispatch_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.max_wait
+            stopping = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            try:
+                self._dispatch(batch)
+            except Exception as e:
+                logger.error(f"Embedding dispatch failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            if stopping:
+                return
+
+    def _dispatch(self, batch: List[Tuple[str, Future]]):
+        by_key: Dict[str, Tuple[str, List[Future]]] = {}
+        for text, future in batch:
+            key = make_embedding_key(self.model, text)
+            by_key.setdefault(key, (text, []))[1].append(future)
+
+        cached = self.cache.get_many(list(by_key)) if self.cache else {}
+        with self._lock:
+            self._stats['batches'] += 1
+            self._stats['requests'] += len(batch)
+            self._stats['cache_hits'] += sum(len(by_key[key][1]) for key in cached)
+
+        to_compute = []
+        for key, (text, futures) in by_key.items():
+            if key in cached:
+                for future in futures:
+                    future.set_result(cached[key])
+                continue
+            with self._lock:
+                waiting = self._inflight.get(key)
+                if waiting is not None:
+                    # Same text is already being embedded; share that call
+                    waiting.extend(futures)
+                    self._stats['deduplicated'] += len(futures)
+                    continue
+                self._inflight[key] = list(futures)
+                self._stats['deduplicated'] += len(futures) - 1
+            to_compute.append((key, text))
+
+        for key, text in to_compute:
+            self._slots.acquire()  # Backpressure: the dispatcher stalls while all slots are busy
+            self._executor.submit(self._compute, key, text)
+
+    def _compute(self, key: str, text: str):
+        try:
+            vector = self.embed_fn(text)
+            if not vector:
+                raise ValueError("Model returned no embedding")
+            if self.cache:
+                try:
+                    self.cache.put(key, self.model, vector)
+                except Exception as e:
+                    logger.warning(f"Embedding cache write failed: {e}")
+            outcome, error = vector, None
+        except Exception as e:
+            outcome, error = None, e
+        finally:
+            self._slots.release()
+
+        with self._lock:
+            futures = self._inflight.pop(key, [])
+            self._stats['model_calls'] += 1
+            if error:
+                self._stats['errors'] += 1
+        for future in futures:
+            if error:
+                future.set_exception(error)
+            else:
+                future.set_result(outcome)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['in_flight'] = len(self._inflight)
+        stats['queued'] = self._queue.qsize()
+        stats['hit_rate'] = round(stats['cache_hits'] / stats['requests'], 3) if stats['requests'] else 0.0
+        if self.cache:
+            stats['cached_vectors'] = self.cache.count()
+        return stats
+
+    def close(self):
+        """Stop the dispatcher after queued work is dispatched, then wait for model calls."""
+        if self._dispatcher is not None and self._dispatcher.is_alive():
+            self._queue.put(_STOP)
+            self._dispatcher.join()
+        self._executor.shutdown(wait=True)
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+_embedding_cache_configured = False
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """
+    Get the process-wide persistent embedding cache, creating it on first use.
+
+    Returns None when disabled (EMBEDDING_CACHE_ENABLED=false) or the database
+    can't be opened; embeddings are then always computed.
+    """
+    global _embedding_cache, _embedding_cache_configured
+    with _embedding_cache_lock:
+        if not _embedding_cache_configured:
+            _embedding_cache_configured = True
+            if os.getenv('EMBEDDING_CACHE_ENABLED', 'true').lower() != 'false':
+                try:
+                    _embedding_cache = EmbeddingCache(os.getenv('EMBEDDING_CACHE_PATH') or None)
+                except Exception as e:
+                    logger.warning(f"Embedding cache disabled: {e}")
+                    _embedding_cache = None
+        return _embedding_cache
+
+
+def set_embedding_cache(cache: Optional[EmbeddingCache]):
+    """Install the shared cache explicitly (None disables caching)."""
+    global _embedding_cache, _embedding_cache_configured
+    with _embedding_cache_lock:
+        _embedding_cache = cache
+        _embedding_cache_configured = True
+
+
+def get_embedding_cache_stats() -> Dict[str, Any]:
+    """Cache stats without forcing the cache into existence."""
+    if _embedding_cache is None:
+        return {'enabled': False}
+    return {'enabled': True, 'cached_vectors': _embedding_cache.count(), 'path': _embedding_cache.path}
@@ -418,12 +418,8 @@ class FieldMetricsService:
                 metadata.update(session_data)
                 
                 # Update in Pinecone
-                self.pinecone_client.index.update(
-                    id=session.company_id,
-                    set_metadata=metadata
-                )
-                
-                logger.info(f"Stored field extraction metrics for {session.company_name}")
+                if self.pinecone_client.set_company_metadata(session.company_id, metadata):
+                    logger.info(f"Stored field extraction metrics for {session.company_name}")
                 
         except Exception as e:
             logger.error(f"Failed to store session metrics: {e}")
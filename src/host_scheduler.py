@@ -0,0 +1,463 @@
+"""
+Host Scheduler
+==============
+
+Process-wide politeness scheduler shared by every crawler that talks to
+company websites: `AsyncPageFetcher` (AntoineCrawler), the Crawl4AI calls in
+`IntelligentCompanyScraper` and `AntoineCrawler`, and the robots.txt,
+sitemap and header-link crawlers. Each of those used to bound its own
+concurrency only, so three companies processed side by side could put three
+times the intended load on a shared CDN while other hosts sat idle.
+
+- Global cap on requests in flight across all hosts, threads and event loops
+- Per-host cap on requests in flight; it is halved when the host throttles
+  us and grows back by one after a run of clean responses
+- Per-host minimum spacing between request starts, taken from the robots.txt
+  `Crawl-delay` for `*` (capped) or a configured default
+- 429 / 503 responses put the host in backoff until `Retry-After` (seconds
+  or HTTP date) or, without one, for an exponentially growing delay; other
+  requests to that host wait it out instead of failing too
+- A request that would have to wait longer than `max_wait` fails fast with
+  `HostThrottledError` instead of sleeping through a company's time budget
+
+Configuration (environment):
+- HOST_SCHEDULER_ENABLED           "false" turns scheduling off (default "true")
+- HOST_SCHEDULER_MAX_CONCURRENCY   requests in flight across all hosts (default 32)
+- HOST_SCHEDULER_MAX_PER_HOST      requests in flight per host (default 4)
+- HOST_SCHEDULER_DEFAULT_DELAY     seconds between request starts per host (default 0)
+- HOST_SCHEDULER_MAX_CRAWL_DELAY   cap on robots.txt Crawl-delay in seconds (default 10)
+- HOST_SCHEDULER_MAX_WAIT          longest wait before failing fast (default 30)
+
+Usage:
+    async with host_slot(url) as slot:
+        response = await session.get(url)
+        slot.record(response.status, response.headers.get('Retry-After'))
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 32
+DEFAULT_MAX_PER_HOST = 4
+DEFAULT_MAX_CRAWL_DELAY = 10.0
+DEFAULT_MAX_WAIT = 30.0
+DEFAULT_BASE_BACKOFF = 2.0
+DEFAULT_MAX_BACKOFF = 120.0
+
+# Statuses that mean "slow down" rather than "this page is broken"
+THROTTLE_STATUSES = (429, 503)
+
+
+class HostThrottledError(Exception):
+    """The host is in backoff (or crawl-delay) for longer than the caller may wait."""
+
+
+def host_key(url: str) -> str:
+    """Scheduling key for a URL: the lower-cased host name (a bare host is accepted too)."""
+    parsed = urlparse(url if '//' in url else f'//{url}')
+    return (parsed.hostname or url).lower()
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds to wait from a Retry-After header value.
+
+    Accepts delta-seconds ("120") or an HTTP date; returns None when absent
+    or unparseable.
+    """
+    if value is None:
+        return None
+    value = str(value).strip()
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+    return max(0.0, retry_at - (now if now is not None else time.time()))
+
+
+def retry_after_from_headers(headers: Any) -> Optional[str]:
+    """Retry-After from a response header mapping of any casing (or None)."""
+    if not headers:
+        return None
+    try:
+        value = headers.get('Retry-After') or headers.get('retry-after')
+    except AttributeError:
+        return None
+    if value is None and isinstance(headers, dict):
+        value = next((v for k, v in headers.items() if str(k).lower() == 'retry-after'), None)
+    return value
+
+
+def parse_crawl_delay(robots_text: str, user_agent: str = '*') -> Optional[float]:
+    """
+    Crawl-delay that applies to `user_agent` in a robots.txt body.
+
+    A section naming the agent wins over the `*` section; consecutive
+    User-agent lines share the rules that follow them.
+    """
+    delays: Dict[str, float] = {}
+    group: List[str] = []
+    in_rules = False
+    for raw_line in robots_text.splitlines():
+        line = raw_line.split('#', 1)[0].strip()
+        if ':' not in line:
+            continue
+        directive, value = (part.strip() for part in line.split(':', 1))
+        directive = directive.lower()
+        if directive == 'user-agent':
+            if in_rules:
+                group, in_rules = [], False
+            group.append(value.lower())
+        elif directive == 'crawl-delay':
+            in_rules = True
+            try:
+                delay = float(value)
+            except ValueError:
+                continue
+            for agent in group:
+                delays.setdefault(agent, delay)
+        else:
+            in_rules = True
+    agent = user_agent.lower()
+    if agent in delays:
+        return delays[agent]
+    return delays.get('*')
+
+
+@dataclass
+class HostState:
+    """Scheduling state and counters for one host"""
+    host: str
+    limit: int
+    active: int = 0
+    crawl_delay: float = 0.0
+    next_start: float = 0.0
+    backoff_until: float = 0.0
+    consecutive_throttles: int = 0
+    clean_streak: int = 0
+    requests: int = 0
+    throttled: int = 0
+    waited_seconds: float = 0.0
+
+
+class HostSlot:
+    """A granted request slot; `record` the response so the scheduler can adapt."""
+
+    def __init__(self, scheduler: Optional["HostScheduler"], url: str):
+        self.scheduler = scheduler
+        self.url = url
+        self.status: Optional[int] = None
+        self.retry_after: Optional[str] = None
+
+    def record(self, status: Optional[int], retry_after: Optional[str] = None):
+        self.status = status
+        self.retry_after = retry_after
+
+
+class HostScheduler:
+    """
+    Thread-safe per-host and global admission control for crawl requests.
+
+    Waiters on any thread or event loop are woken whenever a slot is
+    released, and re-check their host's limits.
+
+    Args:
+        max_concurrency: Requests in flight across all hosts
+        max_per_host: Requests in flight per host
+        default_delay: Seconds between request starts per host without a Crawl-delay
+        max_crawl_delay: Upper bound applied to robots.txt Crawl-delay values
+        max_wait: Longest time-based wait before `HostThrottledError`
+        base_backoff: First backoff for a throttle response without Retry-After
+        max_backoff: Upper bound for any backoff, including Retry-After
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_per_host: int = DEFAULT_MAX_PER_HOST,
+        default_delay: float = 0.0,
+        max_crawl_delay: float = DEFAULT_MAX_CRAWL_DELAY,
+        max_wait: float = DEFAULT_MAX_WAIT,
+        base_backoff: float = DEFAULT_BASE_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_per_host = max(1, max_per_host)
+        self.default_delay = max(0.0, default_delay)
+        self.max_crawl_delay = max_crawl_delay
+        self.max_wait = max_wait
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, HostState] = {}
+        self._active = 0
+        self._peak_active = 0
+        self._waiters: List[Any] = []  # (loop, future) pairs and threading.Events
+        self._stats = {'granted': 0, 'throttle_responses': 0, 'fast_failures': 0, 'waits': 0}
+
+    def _state(self, host: str) -> HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = HostState(host=host, limit=self.max_per_host, crawl_delay=self.default_delay)
+            self._hosts[host] = state
+        return state
+
+    def set_crawl_delay(self, url: str, seconds: Optional[float]):
+        """Apply a robots.txt Crawl-delay (None clears it back to the default)."""
+        delay = self.default_delay if seconds is None else min(max(0.0, float(seconds)), self.max_crawl_delay)
+        with self._lock:
+            self._state(host_key(url)).crawl_delay = max(delay, self.default_delay)
+        if seconds:
+            logger.info(f"Crawl-delay for {host_key(url)}: {delay:.1f}s")
+
+    def apply_robots(self, url: str, robots_text: str, user_agent: str = '*') -> Optional[float]:
+        """Parse a robots.txt body and apply its Crawl-delay; returns the parsed value."""
+        delay = parse_crawl_delay(robots_text or '', user_agent)
+        if delay is not None:
+            self.set_crawl_delay(url, delay)
+        return delay
+
+    def _try_acquire(self, host: str) -> Tuple[bool, Optional[float]]:
+        """Take a slot if allowed. Otherwise return the time-based wait (None = wait for a release)."""
+        now = time.monotonic()
+        state = self._state(host)
+        ready_at = max(state.next_start, state.backoff_until)
+        if ready_at > now:
+            return False, ready_at - now
+        if self._active >= self.max_concurrency or state.active >= state.limit:
+            return False, None
+        state.active += 1
+        state.requests += 1
+        state.next_start = now + state.crawl_delay
+        self._active += 1
+        self._peak_active = max(self._peak_active, self._active)
+        self._stats['granted'] += 1
+        return True, 0.0
+
+    def _check_wait(self, host: str, wait: Optional[float], deadline: float):
+        if wait is not None and time.monotonic() + wait > deadline:
+            self._stats['fast_failures'] += 1
+            raise HostThrottledError(f"{host} is throttled for another {wait:.1f}s")
+
+    async def acquire(self, url: str, max_wait: Optional[float] = None) -> HostSlot:
+        """Wait for a slot on the running event loop."""
+        host = host_key(url)
+        loop = asyncio.get_running_loop()
+        deadline = time.monotonic() + (self.max_wait if max_wait is None else max_wait)
+        started = time.monotonic()
+        while True:
+            with self._lock:
+                acquired, wait = self._try_acquire(host)
+                if acquired:
+                    self._hosts[host].waited_seconds += time.monotonic() - started
+                    return HostSlot(self, url)
+                self._check_wait(host, wait, deadline)
+                waiter = loop.create_future()
+                self._waiters.append((loop, waiter))
+                self._stats['waits'] += 1
+            try:
+                await asyncio.wait({waiter}, timeout=wait)
+            finally:
+                if not waiter.done():
+                    waiter.cancel()
+                with self._lock:
+                    if (loop, waiter) in self._waiters:
+                        self._waiters.remove((loop, waiter))
+
+    def acquire_sync(self, url: str, max_wait: Optional[float] = None) -> HostSlot:
+        """Blocking variant of `acquire` for synchronous callers."""
+        host = host_key(url)
+        deadline = time.monotonic() + (self.max_wait if max_wait is None else max_wait)
+        started = time.monotonic()
+        while True:
+            with self._lock:
+                acquired, wait = self._try_acquire(host)
+                if acquired:
+                    self._hosts[host].waited_seconds += time.monotonic() - started
+                    return HostSlot(self, url)
+                self._check_wait(host, wait, deadline)
+                event = threading.Event()
+                self._waiters.append(event)
+                self._stats['waits'] += 1
+            event.wait(wait)
+            with self._lock:
+                if event in self._waiters:
+                    self._waiters.remove(event)
+
+    def release(self, slot: HostSlot):
+        """Return a slot and feed its recorded response into the host's limits."""
+        host = host_key(slot.url)
+        with self._lock:
+            state = self._state(host)
+            state.active = max(0, state.active - 1)
+            self._active = max(0, self._active - 1)
+            if isinstance(slot.status, int):
+                self._observe(state, slot.status, slot.retry_after)
+            waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if isinstance(waiter, threading.Event):
+                waiter.set()
+                continue
+            loop, future = waiter
+            try:
+                loop.call_soon_threadsafe(_resolve, future)
+            except RuntimeError:
+                pass  # The waiter's loop is closed
+
+    def record_response(self, url: str, status: int, retry_after: Optional[str] = None):
+        """Feed a response seen outside a slot (e.g. a retry inside a library) into the host's limits."""
+        if not isinstance(status, int):
+            return
+        with self._lock:
+            self._observe(self._state(host_key(url)), status, retry_after)
+
+    def _observe(self, state: HostState, status: int, retry_after: Optional[str]):
+        if status in THROTTLE_STATUSES:
+            state.throttled += 1
+            state.consecutive_throttles += 1
+            state.clean_streak = 0
+            self._stats['throttle_responses'] += 1
+            delay = parse_retry_after(retry_after)
+            if delay is None:
+                delay = self.base_backoff * (2 ** (state.consecutive_throttles - 1))
+            delay = min(delay, self.max_backoff)
+            state.backoff_until = max(state.backoff_until, time.monotonic() + delay)
+            state.limit = max(1, state.limit // 2)
+            logger.warning(f"{state.host} answered {status}; backing off {delay:.1f}s, "
+                           f"per-host limit now {state.limit}")
+        elif 0 < status < 400:
+            state.consecutive_throttles = 0
+            if state.limit < self.max_per_host:
+                state.clean_streak += 1
+                if state.clean_streak >= state.limit:
+                    state.limit += 1
+                    state.clean_streak = 0
+
+    @asynccontextmanager
+    async def slot(self, url: str, max_wait: Optional[float] = None):
+        """`async with scheduler.slot(url) as slot:` around one request."""
+        granted = await self.acquire(url, max_wait)
+        try:
+            yield granted
+        finally:
+            self.release(granted)
+
+    def get_host_stats(self, url: str) -> Dict[str, Any]:
+        with self._lock:
+            state = self._state(host_key(url))
+            now = time.monotonic()
+            return {
+                'host': state.host,
+                'active': state.active,
+                'limit': state.limit,
+                'crawl_delay': state.crawl_delay,
+                'backoff_remaining': round(max(0.0, state.backoff_until - now), 3),
+                'requests': state.requests,
+                'throttled': state.throttled,
+                'waited_seconds': round(state.waited_seconds, 3),
+            }
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            stats = dict(self._stats)
+            stats.update({
+                'active': self._active,
+                'peak_active': self._peak_active,
+                'max_concurrency': self.max_concurrency,
+                'max_per_host': self.max_per_host,
+                'hosts': len(self._hosts),
+                'hosts_backing_off': sum(1 for state in self._hosts.values() if state.backoff_until > now),
+                'hosts_with_crawl_delay': sum(1 for state in self._hosts.values() if state.crawl_delay > 0),
+                'waiting': len(self._waiters),
+            })
+            return stats
+
+
+def _resolve(future: "asyncio.Future"):
+    if not future.done():
+        future.set_result(None)
+
+
+_host_scheduler: Optional[HostScheduler] = None
+_host_scheduler_configured = False
+_host_scheduler_lock = threading.Lock()
+
+
+def get_host_scheduler() -> Optional[HostScheduler]:
+    """
+    Get the process-wide host scheduler, creating it on first use.
+
+    Returns None when disabled (HOST_SCHEDULER_ENABLED=false); crawlers then
+    only apply their own concurrency limits.
+    """
+    global _host_scheduler, _host_scheduler_configured
+    with _host_scheduler_lock:
+        if not _host_scheduler_configured:
+            _host_scheduler_configured = True
+            if os.getenv('HOST_SCHEDULER_ENABLED', 'true').lower() != 'false':
+                _host_scheduler = HostScheduler(
+                    max_concurrency=int(os.getenv('HOST_SCHEDULER_MAX_CONCURRENCY', DEFAULT_MAX_CONCURRENCY)),
+                    max_per_host=int(os.getenv('HOST_SCHEDULER_MAX_PER_HOST', DEFAULT_MAX_PER_HOST)),
+                    default_delay=float(os.getenv('HOST_SCHEDULER_DEFAULT_DELAY', 0)),
+                    max_crawl_delay=float(os.getenv('HOST_SCHEDULER_MAX_CRAWL_DELAY', DEFAULT_MAX_CRAWL_DELAY)),
+                    max_wait=float(os.getenv('HOST_SCHEDULER_MAX_WAIT', DEFAULT_MAX_WAIT))
+                )
+        return _host_scheduler
+
+
+def set_host_scheduler(scheduler: Optional[HostScheduler]):
+    """Install the shared scheduler explicitly (None disables scheduling)."""
+    global _host_scheduler, _host_scheduler_configured
+    with _host_scheduler_lock:
+        _host_scheduler = scheduler
+        _host_scheduler_configured = True
+
+
+def get_host_scheduler_stats() -> Dict[str, Any]:
+    """Scheduler stats without forcing the scheduler into existence."""
+    if _host_scheduler is None:
+        return {'enabled': False}
+    return {'enabled': True, **_host_scheduler.get_stats()}
+
+
+@asynccontextmanager
+async def host_slot(url: str, max_wait: Optional[float] = None):
+    """
+    Slot from the shared scheduler around one request to `url`.
+
+    Yields a HostSlot either way; when scheduling is disabled `record` is a no-op.
+    """
+    scheduler = get_host_scheduler()
+    if scheduler is None:
+        yield HostSlot(None, url)
+        return
+    async with scheduler.slot(url, max_wait) as granted:
+        yield granted
+
+
+def apply_robots_crawl_delay(url: str, robots_text: str):
+    """Feed a fetched robots.txt body to the shared scheduler (no-op when disabled)."""
+    scheduler = get_host_scheduler()
+    if scheduler is not None:
+        try:
+            scheduler.apply_robots(url, robots_text)
+        except Exception as e:
+            logger.debug(f"Could not apply robots.txt crawl-delay for {url}: {e}")
@@ -15,6 +15,7 @@ from typing import Dict, List, Set, Optional, Tuple
 from urllib.parse import urljoin, urlparse, urlencode
 from urllib.robotparser import RobotFileParser
 import xml.etree.ElementTree as ET
+from types import SimpleNamespace
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 
@@ -29,11 +30,16 @@ except ImportError:
     GEMINI_AVAILABLE = False
     genai_types = None
 
-from crawl4ai import AsyncWebCrawler, CrawlerRunConfig
+from crawl4ai import CrawlerRunConfig
 from crawl4ai.async_configs import CacheMode
 from src.models import CompanyData, CompanyIntelligenceConfig
 from src.progress_logger import log_processing_phase, start_company_processing, complete_company_processing, progress_logger
-from src.ssl_config import get_aiohttp_connector, get_browser_args, should_verify_ssl
+from src.ssl_config import get_aiohttp_connector, should_verify_ssl
+from src.browser_pool import get_browser_pool, LeasedCrawler
+from src.page_cache import get_page_cache
+from src.host_scheduler import HostThrottledError, apply_robots_crawl_delay, host_slot, retry_after_from_headers
+from src.llm_cache import discard_cached_response, get_llm_cache, make_cache_key
+from src.link_discovery_engine import FrontierLinkDiscovery, is_excluded_link, score_link
 
 logger = logging.getLogger(__name__)
 
@@ -65,6 +71,7 @@ class IntelligentCompanyScraper:
             'store/', 'location/', 'outlet', 'dealers'
         ]
         self.concurrent_limit = 10  # Concurrent requests limit
+        self.link_discovery_workers = 6  # Pages fetched at once during link discovery
         self.session_timeout = aiohttp.ClientTimeout(total=10)  # Reduced for fast research
         
         # Initialize Gemini client if available
@@ -400,14 +407,8 @@ class IntelligentCompanyScraper:
                                            current_url=base_url, status_message="Recursive crawling")
                         progress_logger.add_to_progress_log(job_id, f"🔍 Starting recursive crawling from: {base_url}")
                     
-                    # ✅ Use Crawl4AI for recursive crawling with timeout protection
-                    browser_args = get_browser_args(ignore_ssl=not should_verify_ssl())
-                    async with AsyncWebCrawler(
-                        headless=True,
-                        browser_type="chromium",
-                        verbose=False,
-                        browser_args=browser_args
-                    ) as crawler:
+                    # ✅ Use a warm pooled Crawl4AI browser for recursive crawling with timeout protection
+                    async with get_browser_pool().lease() as crawler:
                         try:
                             # Add timeout protection for recursive crawling
                             remaining_time = 30 - (time.time() - start_time)
@@ -415,11 +416,11 @@ class IntelligentCompanyScraper:
                                 print(f"⏰ Insufficient time for recursive crawling ({remaining_time:.1f}s remaining)", flush=True)
                                 crawled_links = set()
                             else:
-                                crawled_links = await asyncio.wait_for(
-                                    self._recursive_link_discovery(
-                                        crawler, base_url, domain, max_depth=self.max_depth, job_id=job_id
-                                    ),
-                                    timeout=min(remaining_time, 25)  # Use remaining time, max 25 seconds
+                                # The engine stops itself at the budget and keeps partial results
+                                crawled_links = await self._recursive_link_discovery(
+                                    crawler, base_url, domain, max_depth=self.max_depth,
+                                    time_budget=min(remaining_time, 25),  # Use remaining time, max 25 seconds
+                                    job_id=job_id
                                 )
                             all_links.update(crawled_links)
                         except asyncio.TimeoutError:
@@ -463,9 +464,11 @@ class IntelligentCompanyScraper:
         links = set()
         
         try:
-            async with session.get(robots_url) as response:
+            async with host_slot(robots_url) as slot, session.get(robots_url) as response:
+                slot.record(response.status, response.headers.get('Retry-After'))
                 if response.status == 200:
                     content = await response.text()
+                    apply_robots_crawl_delay(base_url, content)
                     
                     # Extract sitemap URLs
                     sitemap_pattern = r'Sitemap:\s*(.+)'
@@ -497,7 +500,8 @@ class IntelligentCompanyScraper:
         
         for sitemap_url in sitemap_urls:
             try:
-                async with session.get(sitemap_url) as response:
+                async with host_slot(sitemap_url) as slot, session.get(sitemap_url) as response:
+                    slot.record(response.status, response.headers.get('Retry-After'))
                     if response.status == 200:
                         content = await response.text()
                         
@@ -532,7 +536,8 @@ class IntelligentCompanyScraper:
         links = set()
         
         try:
-            async with session.get(sitemap_url) as response:
+            async with host_slot(sitemap_url) as slot, session.get(sitemap_url) as response:
+                slot.record(response.status, response.headers.get('Retry-After'))
                 if response.status == 200:
                     content = await response.text()
                     root = ET.fromstring(content)
@@ -549,122 +554,76 @@ class IntelligentCompanyScraper:
     
     async def _recursive_link_discovery(
         self, 
-        crawler: "AsyncWebCrawler", 
+        crawler: "LeasedCrawler", 
         base_url: str, 
         domain: str, 
         max_depth: int,
-        visited: Optional[Set[str]] = None,
-        current_depth: int = 0,
+        time_budget: float = 25,
         job_id: str = None
     ) -> Set[str]:
         """
-        Recursively discover links by crawling pages with Crawl4AI for enhanced compatibility
-        """
-        if visited is None:
-            visited = set()
-        
-        if current_depth >= max_depth:
-            return set()
-        
-        # SAFETY: Limit total URLs processed to prevent infinite loops
-        if len(visited) >= 200:  # Maximum 200 URLs total
-            print(f"🛑 Recursive discovery hit 200 URL limit, stopping to prevent infinite loops")
-            return set()
-        
-        discovered_links = set()
+        Discover links breadth-first with Crawl4AI, fetching several pages at once.
         
-        # SAFETY: Don't re-visit the same URL
-        if base_url in visited:
-            return set()
-        
-        visited.add(base_url)
-        
-        try:
-            print(f"🔍 Crawling depth {current_depth}: {base_url}")
+        Shallow, high-value pages (same keywords as heuristic page selection) are
+        crawled first; whatever has been found when the time budget runs out is returned.
+        """
+        # ✅ Use Crawl4AI for link discovery to handle JavaScript and complex sites
+        config = CrawlerRunConfig(
+            user_agent=BROWSER_USER_AGENT,
+            word_count_threshold=1,  # Very low threshold for link discovery
+            css_selector="a[href], nav, footer, .menu, .navigation",  # Focus on navigation elements
+            excluded_tags=["script", "style"],
+            cache_mode=CacheMode.ENABLED,
+            page_timeout=15000,  # Shorter timeout for link discovery
+            verbose=False,
+            simulate_user=True,      # Anti-bot bypass
+            magic=True,              # Enhanced compatibility
+            js_code=[
+                # Simple JS to reveal hidden navigation
+                """
+                try {
+                    // Expand any collapsed menus
+                    document.querySelectorAll('[data-toggle], .dropdown-toggle, .menu-toggle').forEach(btn => {
+                        if (btn.click) btn.click();
+                    });
+                } catch (e) { console.log('Menu expansion blocked:', e); }
+                """
+            ]
+        )
+        
+        async def fetch_html(url: str) -> Optional[str]:
+            async with host_slot(url) as slot:
+                result = await crawler.arun(url=url, config=config)
+                if result:
+                    slot.record(getattr(result, 'status_code', None),
+                                retry_after_from_headers(getattr(result, 'response_headers', None)))
+            return result.html if result and result.html else None
+        
+        def on_page(url: str, depth: int):
+            print(f"🔍 Crawling depth {depth}: {url}")
             if job_id:
                 log_processing_phase(job_id, "Link Discovery", "running", 
-                                   current_url=base_url, 
-                                   status_message=f"Crawling depth {current_depth}")
-                progress_logger.add_to_progress_log(job_id, f"🔍 Crawling depth {current_depth}: {base_url}")
-            
-            # ✅ Use Crawl4AI for link discovery to handle JavaScript and complex sites
-            config = CrawlerRunConfig(
-                user_agent=BROWSER_USER_AGENT,
-                word_count_threshold=1,  # Very low threshold for link discovery
-                css_selector="a[href], nav, footer, .menu, .navigation",  # Focus on navigation elements
-                excluded_tags=["script", "style"],
-                cache_mode=CacheMode.ENABLED,
-                page_timeout=15000,  # Shorter timeout for link discovery
-                verbose=False,
-                simulate_user=True,      # Anti-bot bypass
-                magic=True,              # Enhanced compatibility
-                js_code=[
-                    # Simple JS to reveal hidden navigation
-                    """
-                    try {
-                        // Expand any collapsed menus
-                        document.querySelectorAll('[data-toggle], .dropdown-toggle, .menu-toggle').forEach(btn => {
-                            if (btn.click) btn.click();
-                        });
-                    } catch (e) { console.log('Menu expansion blocked:', e); }
-                    """
-                ]
-            )
-            
-            # Add timeout protection for individual page crawling
-            try:
-                result = await asyncio.wait_for(
-                    crawler.arun(url=base_url, config=config),
-                    timeout=15  # 15 second timeout per page
-                )
-            except asyncio.TimeoutError:
-                print(f"⏰ Page crawling timed out for {base_url}")
-                if job_id:
-                    progress_logger.add_to_progress_log(job_id, f"⏰ Timed out crawling {base_url}")
-                return discovered_links
-            except Exception as page_error:
-                error_type = type(page_error).__name__ 
-                error_msg = str(page_error)
-                print(f"❌ Page crawling failed for {base_url}: {error_type}")
-                if job_id:
-                    progress_logger.add_to_progress_log(job_id, f"❌ Failed to crawl {base_url}: {error_type}")
-                return discovered_links
-            
-            if result and result.html:
-                soup = BeautifulSoup(result.html, 'html.parser')
-                
-                # Extract all links
-                links_found = 0
-                for link in soup.find_all('a', href=True):
-                    href = link['href']
-                    full_url = urljoin(base_url, href)
-                    
-                    # Only follow links on same domain
-                    if urlparse(full_url).netloc == domain:
-                        discovered_links.add(full_url)
-                        links_found += 1
-                        
-                        # SAFETY: Limit links per page to prevent explosion
-                        if links_found >= 50:  # Max 50 links per page
-                            break
-                        
-                        # Recursively crawl if not visited and within depth limit
-                        if full_url not in visited and current_depth < max_depth - 1:
-                            recursive_links = await self._recursive_link_discovery(
-                                crawler, full_url, domain, max_depth, visited, current_depth + 1, job_id
-                            )
-                            discovered_links.update(recursive_links)
-                            
-                            # SAFETY: Add delay and check total time
-                            await asyncio.sleep(0.2)
-                
-                print(f"  📄 Found {links_found} links on this page")
-            else:
-                print(f"  ❌ No content retrieved from {base_url}")
-                                
-        except Exception as e:
-            logger.warning(f"Error in recursive discovery for {base_url}: {e}")
-            print(f"  ❌ Error crawling {base_url}: {e}")
+                                   current_url=url, 
+                                   status_message=f"Crawling depth {depth}")
+                progress_logger.add_to_progress_log(job_id, f"🔍 Crawling depth {depth}: {url}")
+        
+        engine = FrontierLinkDiscovery(
+            fetch_html,
+            domain,
+            max_depth=max_depth,
+            max_urls=200,  # SAFETY: Maximum 200 URLs total
+            max_workers=self.link_discovery_workers,
+            max_links_per_page=50,  # SAFETY: Max 50 links per page
+            page_timeout=15,  # 15 second timeout per page
+            on_page=on_page
+        )
+        discovered_links = await engine.run(base_url, time_budget=time_budget)
+        
+        stats = engine.stats
+        print(f"  📄 Discovery crawled {stats.pages_fetched} pages ({stats.pages_failed} failed), "
+              f"{stats.pages_per_second:.1f} pages/s, per depth: {stats.pages_per_depth}")
+        if job_id and stats.timed_out:
+            progress_logger.add_to_progress_log(job_id, "⏰ Recursive crawling hit its time budget - continuing with discovered links")
         
         return discovered_links
     
@@ -674,16 +633,6 @@ class IntelligentCompanyScraper:
         """
         filtered = set()
         
-        # Exclude patterns
-        exclude_patterns = [
-            r'\.pdf$', r'\.jpg$', r'\.png$', r'\.gif$', r'\.css$', r'\.js$',
-            r'\.ico$', r'\.svg$', r'\.woff$', r'\.ttf$', r'\.mp4$', r'\.zip$',
-            r'/wp-admin/', r'/admin/', r'/login', r'/logout', r'/cart', r'/checkout',
-            r'#', r'javascript:', r'mailto:', r'tel:', r'ftp:'
-        ]
-        
-        exclude_regex = '|'.join(exclude_patterns)
-        
         for link in links:
             try:
                 # Normalize URL
@@ -697,7 +646,7 @@ class IntelligentCompanyScraper:
                 clean_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
                 
                 # Skip if matches exclude patterns
-                if re.search(exclude_regex, clean_url, re.IGNORECASE):
+                if is_excluded_link(clean_url):
                     continue
                 
                 # Skip very long URLs (likely not useful)
@@ -903,6 +852,7 @@ Select pages with STRUCTURED DATA we can extract, not blog posts or general cont
                         pass
                     
                     logger.warning("LLM response was not a JSON array, falling back to heuristic")
+                    self._discard_llm_response(prompt)
                     return self._heuristic_page_selection(all_links)
                     
             except json.JSONDecodeError as e:
@@ -923,6 +873,7 @@ Select pages with STRUCTURED DATA we can extract, not blog posts or general cont
                     pass
                 
                 logger.warning("Failed to parse LLM response as JSON, falling back to heuristic")
+                self._discard_llm_response(prompt)
                 return self._heuristic_page_selection(all_links)
                 
         except asyncio.TimeoutError:
@@ -938,35 +889,8 @@ Select pages with STRUCTURED DATA we can extract, not blog posts or general cont
         """
         Fallback: Heuristic-based page selection when LLM is unavailable
         """
-        # Priority keywords for missing data extraction
-        high_priority = ['contact', 'about', 'team', 'leadership', 'careers', 'jobs']  # Pages with location, founding year, employee count
-        medium_priority = ['products', 'services', 'solutions', 'partners', 'integrations', 'security', 'compliance']
-        low_priority = ['pricing', 'customers', 'news', 'press', 'blog', 'resources']
-        
-        scored_links = []
-        
-        for link in all_links:
-            score = 0
-            link_lower = link.lower()
-            
-            # Homepage gets highest priority
-            if link.endswith('/') or link.count('/') <= 3:
-                score += 100
-            
-            # Score based on keywords
-            for keyword in high_priority:
-                if keyword in link_lower:
-                    score += 50
-                    
-            for keyword in medium_priority:
-                if keyword in link_lower:
-                    score += 25
-                    
-            for keyword in low_priority:
-                if keyword in link_lower:
-                    score += 10
-            
-            scored_links.append((link, score))
+        # Score by homepage/keyword priority (same scoring that orders link discovery)
+        scored_links = [(link, score_link(link)) for link in all_links]
         
         # Sort by score and return top pages
         scored_links.sort(key=lambda x: x[1], reverse=True)
@@ -991,6 +915,7 @@ Select pages with STRUCTURED DATA we can extract, not blog posts or general cont
         CRITICAL IMPROVEMENT:
         - Before: New AsyncWebCrawler per page (3-5x slower)
         - After: Single AsyncWebCrawler for all pages (optimal performance)
+        - Now: That browser is leased from the process-wide pool, so it is already warm
         """
         if not urls:
             return []
@@ -1003,19 +928,38 @@ Select pages with STRUCTURED DATA we can extract, not blog posts or general cont
             from src.progress_logger import progress_logger
             progress_logger.add_to_progress_log(job_id, f"📄 PHASE 3: Starting optimized content extraction from {total_pages} pages")
         
-        print(f"📄 OPTIMIZED EXTRACTION: Processing {total_pages} pages with single browser instance", flush=True)
-        
         start_time = time.time()
         
-        # ✅ CRITICAL FIX: Single AsyncWebCrawler instance for ALL pages with SSL configuration
-        browser_args = get_browser_args(ignore_ssl=not should_verify_ssl())
+        # Pages extracted by an earlier run (or a retry) come from the shared page cache
+        page_cache = get_page_cache()
+        urls_to_crawl = urls
+        if page_cache:
+            urls_to_crawl = []
+            for url in urls:
+                cached = await page_cache.get_async(url, "crawl4ai")
+                if cached is None:
+                    urls_to_crawl.append(url)
+                    continue
+                page_contents.append({'url': url, 'content': cached.content})
+                self.scraped_pages.append({
+                    "url": url,
+                    "content_length": len(cached.content),
+                    "content_source": cached.meta.get('content_source', 'page_cache'),
+                    "page_number": len(page_contents)
+                })
+                print(f"💾 [{len(page_contents)}/{total_pages}] Cached: {len(cached.content):,} chars - {url}", flush=True)
+        cached_count = len(page_contents)
+        
+        if not urls_to_crawl:
+            print(f"💾 All {total_pages} pages served from page cache", flush=True)
+            if job_id:
+                progress_logger.add_to_progress_log(job_id, f"💾 All {total_pages} pages served from page cache")
+            return page_contents
+        
+        print(f"📄 OPTIMIZED EXTRACTION: Processing {len(urls_to_crawl)} pages with single browser instance", flush=True)
         
-        async with AsyncWebCrawler(
-            headless=True,
-            browser_type="chromium",
-            verbose=False,
-            browser_args=browser_args
-        ) as crawler:
+        # ✅ CRITICAL FIX: Single browser for ALL pages, leased warm from the shared pool
+        async with get_browser_pool().lease() as crawler:
             
             # Try enhanced configuration first, fall back to basic if it fails
             try:
@@ -1085,19 +1029,31 @@ Select pages with STRUCTURED DATA we can extract, not blog posts or general cont
                     verbose=False
                 )
             
-            print(f"   🚀 Processing all {total_pages} URLs concurrently with single browser...", flush=True)
+            print(f"   🚀 Processing all {len(urls_to_crawl)} URLs concurrently with single browser...", flush=True)
             
-            # ✅ CRITICAL FIX: Use arun_many() with single browser instance and enhanced error handling
+            async def polite_arun(url: str):
+                # Shared host scheduler: crawl-delay, per-host cap and 429/503 backoff
+                try:
+                    async with host_slot(url) as slot:
+                        result = await crawler.arun(url=url, config=config)
+                        slot.record(getattr(result, 'status_code', None),
+                                    retry_after_from_headers(getattr(result, 'response_headers', None)))
+                        return result
+                except HostThrottledError as e:
+                    logger.warning(f"Skipping {url}: {e}")
+                    return SimpleNamespace(url=url, success=False, error_message=str(e))
+            
+            # ✅ CRITICAL FIX: One browser instance for every page, admitted per host by the scheduler
             try:
                 results = await asyncio.wait_for(
-                    crawler.arun_many(urls, config=config),
+                    asyncio.gather(*(polite_arun(url) for url in urls_to_crawl)),
                     timeout=300  # 5 minute timeout for all pages
                 )
             except asyncio.TimeoutError:
                 logger.warning(f"Browser operations timed out after 5 minutes for {len(urls)} pages")
                 if job_id:
                     progress_logger.add_to_progress_log(job_id, "⚠️ Browser operations timed out - using partial results")
-                return []  # Return empty results instead of failing completely
+                return page_contents  # Cached pages only, instead of failing completely
             except Exception as browser_error:
                 # Handle Playwright and browser-specific errors
                 error_type = type(browser_error).__name__
@@ -1117,11 +1073,11 @@ Select pages with STRUCTURED DATA we can extract, not blog posts or general cont
                         progress_logger.add_to_progress_log(job_id, f"❌ Browser error: {error_type}")
                 
                 logger.error(f"Full browser error traceback: {traceback.format_exc()}")
-                return []  # Return empty results instead of crashing
+                return page_contents  # Cached pages only, instead of crashing
             
             # Process results and maintain Theodore's expected format
             for i, result in enumerate(results):
-                current_page = i + 1
+                current_page = cached_count + i + 1
                 
                 if result.success:
                     # Try to get the best available content
@@ -1142,6 +1098,9 @@ Select pages with STRUCTURED DATA we can extract, not blog posts or general cont
                         content_source = "extracted_content"
                     
                     if content:
+                        if page_cache:
+                            await page_cache.put_async(result.url, content, "crawl4ai", {'content_source': content_source})
+                        
                         # Track scraped page (maintain compatibility)
                         page_info = {
                             "url": result.url,
@@ -1253,9 +1212,26 @@ Write in a professional, concise style suitable for sales team consumption."""
             # Fallback: Simple content summary
             return f"Content extracted from {len(page_contents)} pages for {company_name}. Manual analysis required."
     
-    async def _call_llm_async(self, prompt: str, job_id: str = None) -> str:
+    def _llm_cache_key_parts(self) -> Tuple[str, Dict]:
+        """Cache identity for _call_llm_async: the Gemini -> Bedrock chain and Gemini's generation settings"""
+        chain = []
+        if self.gemini_client:
+            chain.append(getattr(self.gemini_client, 'model_name', 'gemini'))
+        if self.bedrock_client:
+            chain.append(getattr(self.bedrock_client, 'analysis_model', 'bedrock'))
+        return f"intelligent_scraper:{'|'.join(chain)}", {"max_output_tokens": 1000, "temperature": 0.7}
+    
+    def _discard_llm_response(self, prompt: str):
+        """Drop the cached answer to a prompt whose response could not be parsed"""
+        cache_model, cache_params = self._llm_cache_key_parts()
+        discard_cached_response(make_cache_key(cache_model, prompt, cache_params))
+    
+    async def _call_llm_async(self, prompt: str, job_id: str = None, use_cache: bool = True) -> str:
         """
         Call LLM asynchronously - supports Gemini, Bedrock, and fallback options
+
+        Answers for an identical prompt come from the shared LLM cache unless
+        use_cache is False.
         """
         # Track LLM call
         self.llm_call_count += 1
@@ -1267,6 +1243,17 @@ Write in a professional, concise style suitable for sales team consumption."""
             "success": False
         }
         
+        llm_cache = get_llm_cache()
+        cache_model, cache_params = self._llm_cache_key_parts()
+        if llm_cache:
+            hit = llm_cache.lookup(cache_model, prompt, cache_params, use_cache=use_cache)
+            if hit:
+                print(f"♻️ LLM CALL #{self.llm_call_count}: served from cache ({hit.usage.get('model', cache_model)})")
+                call_info.update({"model": f"{hit.usage.get('model', cache_model)} (cached)",
+                                  "response_length": len(hit.content), "success": True, "cached": True})
+                self.llm_call_log.append(call_info)
+                return hit.content
+        
         # Try Gemini first (1M token context, faster)
         if self.gemini_client:
             try:
@@ -1359,6 +1346,11 @@ Write in a professional, concise style suitable for sales team consumption."""
                     call_info["response_length"] = len(response.text)
                     call_info["success"] = True
                     self.llm_call_log.append(call_info)
+                    if llm_cache:
+                        usage_metadata = getattr(response, 'usage_metadata', None)
+                        llm_cache.store(cache_model, prompt, cache_params, response.text.strip(),
+                                        usage={"model": "Gemini 2.0 Flash"},
+                                        tokens=getattr(usage_metadata, 'total_token_count', 0) or 0)
                     return response.text.strip()
             except Exception as e:
                 call_info["error"] = str(e)
@@ -1378,6 +1370,8 @@ Write in a professional, concise style suitable for sales team consumption."""
                 call_info["response_length"] = len(response)
                 call_info["success"] = True
                 self.llm_call_log.append(call_info)
+                if llm_cache:
+                    llm_cache.store(cache_model, prompt, cache_params, response, usage={"model": call_info["model"]})
                 return response
             except Exception as e:
                 call_info["error"] = str(e)
@@ -0,0 +1,256 @@
+"""
+Frontier-Based Link Discovery Engine
+====================================
+
+Concurrent breadth-first crawler used by IntelligentCompanyScraper to find
+navigation links on a company website.
+
+The old recursive walk went depth-first, one page at a time, sleeping 0.2s
+between pages, and usually ran out of its 30s budget long before reaching the
+200-URL visit limit. This engine keeps a priority frontier ordered by
+(depth, keyword score) and drains it with a bounded pool of workers:
+
+- shallow pages first, so the budget is spent on navigation hubs
+- within a depth, URLs matching the same business keywords used for heuristic
+  page selection (contact, about, products, ...) are fetched first
+- excluded URLs (assets, admin, login, cart, ...) are never fetched
+- per-depth quotas stop a single huge listing page from eating the budget
+- when the time budget runs out, links found so far are returned
+
+Usage:
+    engine = FrontierLinkDiscovery(fetch_html, domain, max_workers=6)
+    links = await engine.run(base_url, time_budget=25)
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+# URLs never worth crawling (shared with IntelligentCompanyScraper._filter_and_normalize_links)
+LINK_EXCLUDE_PATTERNS = [
+    r'\.pdf$', r'\.jpg$', r'\.png$', r'\.gif$', r'\.css$', r'\.js$',
+    r'\.ico$', r'\.svg$', r'\.woff$', r'\.ttf$', r'\.mp4$', r'\.zip$',
+    r'/wp-admin/', r'/admin/', r'/login', r'/logout', r'/cart', r'/checkout',
+    r'#', r'javascript:', r'mailto:', r'tel:', r'ftp:'
+]
+LINK_EXCLUDE_REGEX = re.compile('|'.join(LINK_EXCLUDE_PATTERNS), re.IGNORECASE)
+
+# Priority keywords for missing data extraction (shared with heuristic page selection)
+HIGH_PRIORITY_KEYWORDS = ['contact', 'about', 'team', 'leadership', 'careers', 'jobs']  # Location, founding year, employee count
+MEDIUM_PRIORITY_KEYWORDS = ['products', 'services', 'solutions', 'partners', 'integrations', 'security', 'compliance']
+LOW_PRIORITY_KEYWORDS = ['pricing', 'customers', 'news', 'press', 'blog', 'resources']
+
+
+def is_excluded_link(url: str) -> bool:
+    """True for links that should never be crawled or returned."""
+    return bool(LINK_EXCLUDE_REGEX.search(url))
+
+
+def score_link(url: str) -> int:
+    """Keyword score used to rank pages (higher is more valuable)."""
+    score = 0
+    url_lower = url.lower()
+
+    # Homepage and top-level pages
+    if url.endswith('/') or url.count('/') <= 3:
+        score += 100
+
+    for keyword in HIGH_PRIORITY_KEYWORDS:
+        if keyword in url_lower:
+            score += 50
+    for keyword in MEDIUM_PRIORITY_KEYWORDS:
+        if keyword in url_lower:
+            score += 25
+    for keyword in LOW_PRIORITY_KEYWORDS:
+        if keyword in url_lower:
+            score += 10
+
+    return score
+
+
+def _normalize(url: str) -> str:
+    """Drop fragment and query so the same page isn't queued twice."""
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+
+
+@dataclass
+class DiscoveryStats:
+    """What a discovery run did with its budget"""
+    pages_fetched: int = 0
+    pages_failed: int = 0
+    links_found: int = 0
+    pages_per_depth: Dict[int, int] = field(default_factory=dict)
+    skipped_by_quota: int = 0
+    elapsed: float = 0.0
+    timed_out: bool = False
+
+    @property
+    def pages_per_second(self) -> float:
+        return self.pages_fetched / self.elapsed if self.elapsed else 0.0
+
+
+class FrontierLinkDiscovery:
+    """
+    Breadth-first, priority-ordered link discovery with a bounded worker pool.
+
+    Args:
+        fetch_html: Coroutine returning a page's HTML (or None on failure)
+        domain: Only links on this netloc are followed and returned
+        max_depth: Pages are fetched at depths 0..max_depth-1
+        max_urls: Maximum pages fetched in total
+        max_workers: Concurrent page fetches
+        max_links_per_page: Links taken from each page
+        depth_quotas: Maximum pages fetched per depth; defaults scale with max_urls
+        page_timeout: Seconds allowed per page fetch
+        on_page: Optional callback(url, depth) for progress reporting
+    """
+
+    def __init__(
+        self,
+        fetch_html: Callable[[str], Awaitable[Optional[str]]],
+        domain: str,
+        max_depth: int = 3,
+        max_urls: int = 200,
+        max_workers: int = 6,
+        max_links_per_page: int = 50,
+        depth_quotas: Optional[Dict[int, int]] = None,
+        page_timeout: float = 15,
+        on_page: Optional[Callable[[str, int], None]] = None
+    ):
+        self.fetch_html = fetch_html
+        self.domain = domain
+        self.max_depth = max_depth
+        self.max_urls = max_urls
+        self.max_workers = max_workers
+        self.max_links_per_page = max_links_per_page
+        self.depth_quotas = depth_quotas or self._default_quotas(max_depth, max_urls)
+        self.page_timeout = page_timeout
+        self.on_page = on_page
+
+        self.stats = DiscoveryStats()
+        self._frontier = []  # heap of (depth, -score, seq, url)
+        self._seq = itertools.count()
+        self._queued: Set[str] = set()
+        self._discovered: Set[str] = set()
+        self._fetched_total = 0
+
+    @staticmethod
+    def _default_quotas(max_depth: int, max_urls: int) -> Dict[int, int]:
+        """Homepage, then roughly a quarter of the budget for depth 1 and the rest deeper."""
+        quotas = {0: 1}
+        if max_depth > 1:
+            quotas[1] = max(1, max_urls // 4) if max_depth > 2 else max_urls - 1
+        for depth in range(2, max_depth):
+            quotas[depth] = max_urls
+        return quotas
+
+    def _enqueue(self, url: str, depth: int):
+        if depth >= self.max_depth or url in self._queued:
+            return
+        self._queued.add(url)
+        heapq.heappush(self._frontier, (depth, -score_link(url), next(self._seq), url))
+
+    def _extract_links(self, html: str, page_url: str) -> List[str]:
+        soup = BeautifulSoup(html, 'html.parser')
+        links = []
+        for anchor in soup.find_all('a', href=True):
+            full_url = urljoin(page_url, anchor['href'])
+            parsed = urlparse(full_url)
+            if parsed.netloc != self.domain or parsed.scheme not in ('http', 'https'):
+                continue
+            links.append(full_url)
+            if len(links) >= self.max_links_per_page:
+                break
+        return links
+
+    def _next_item(self):
+        """Pop the best URL whose depth still has quota, or None when drained."""
+        while self._frontier:
+            depth, _, _, url = heapq.heappop(self._frontier)
+            if self.stats.pages_per_depth.get(depth, 0) >= self.depth_quotas.get(depth, self.max_urls):
+                self.stats.skipped_by_quota += 1
+                continue
+            self.stats.pages_per_depth[depth] = self.stats.pages_per_depth.get(depth, 0) + 1
+            self._fetched_total += 1
+            return depth, url
+        return None
+
+    async def _process(self, url: str, depth: int):
+        if self.on_page:
+            self.on_page(url, depth)
+        try:
+            html = await asyncio.wait_for(self.fetch_html(url), self.page_timeout)
+        except Exception as e:
+            logger.debug(f"Link discovery fetch failed for {url}: {type(e).__name__}: {e}")
+            html = None
+
+        if not html:
+            self.stats.pages_failed += 1
+            return
+
+        self.stats.pages_fetched += 1
+        for link in self._extract_links(html, url):
+            self._discovered.add(link)
+            normalized = _normalize(link)
+            if not is_excluded_link(normalized):
+                self._enqueue(normalized, depth + 1)
+
+    async def run(self, start_url: str, time_budget: float = 25) -> Set[str]:
+        """
+        Discover links starting from `start_url` within `time_budget` seconds.
+
+        Returns:
+            All same-domain links found (including ones found on the last pages
+            before the budget ran out)
+        """
+        start_time = time.time()
+        self._enqueue(_normalize(start_url), 0)
+
+        in_flight: Set[asyncio.Task] = set()
+        deadline = start_time + time_budget
+
+        try:
+            while True:
+                # Keep every worker slot busy while there is frontier left
+                while len(in_flight) < self.max_workers and self._fetched_total < self.max_urls:
+                    item = self._next_item()
+                    if item is None:
+                        break
+                    depth, url = item
+                    in_flight.add(asyncio.ensure_future(self._process(url, depth)))
+
+                if not in_flight:
+                    break
+
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    self.stats.timed_out = True
+                    break
+                done, in_flight = await asyncio.wait(
+                    in_flight, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+        self.stats.elapsed = time.time() - start_time
+        self.stats.links_found = len(self._discovered)
+        logger.info(
+            f"Link discovery: {self.stats.pages_fetched} pages, {self.stats.links_found} links "
+            f"in {self.stats.elapsed:.1f}s ({self.stats.pages_per_second:.1f} pages/s"
+            f"{', budget exhausted' if self.stats.timed_out else ''})"
+        )
+        return set(self._discovered)
@@ -0,0 +1,369 @@
+"""
+LLM Response Cache
+==================
+
+Deterministic cache of LLM responses keyed on model, normalized prompt and
+generation parameters. Shared by the OpenRouter field extraction
+(`antoine_extraction`), Nova Pro page selection (`antoine_selection`),
+`IntelligentCompanyScraper._call_llm_async` and
+`BedrockClient.generate_text_with_usage`, so re-running a batch after a crash
+doesn't re-pay for prompts that were already answered.
+
+Backends are pluggable: `SQLiteLLMCacheBackend` (default, data/llm_cache/responses.db)
+and `MemoryLLMCacheBackend` (tests, throwaway runs). Any object with the same
+get / put / delete / count / clear methods can be passed to `LLMResponseCache`.
+
+Every hit records the tokens and cost the original call was charged (as
+computed by the client's own pricing, e.g. `BedrockClient._calculate_cost`),
+so reports can show what the cache saved.
+
+Configuration (environment):
+- LLM_CACHE_ENABLED    "false" disables the shared cache (default "true")
+- LLM_CACHE_PATH       SQLite database file
+- LLM_CACHE_TTL_HOURS  entry lifetime (default 168 = one week)
+
+Usage:
+    cache = get_llm_cache()
+    params = {"temperature": 0.1, "max_tokens": 4000}
+    hit = cache.lookup(model, prompt, params) if cache else None
+    if hit is None:
+        text, usage = call_model(prompt)
+        if cache:
+            cache.store(model, prompt, params, text, tokens=usage["total_tokens"], cost_usd=usage["cost_usd"])
+
+Store the response as soon as it arrives, and drop it again with
+`discard_cached_response(key)` if it then fails to parse, so a malformed
+or truncated answer is not replayed for the whole TTL.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Normalize line endings and trailing whitespace so cosmetic differences still hit."""
+    lines = prompt.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    return '\n'.join(line.rstrip() for line in lines).strip()
+
+
+def make_cache_key(model: str, prompt: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """SHA-256 over the model, normalized prompt and sorted generation parameters."""
+    material = json.dumps(
+        {'model': model, 'prompt': normalize_prompt(prompt), 'params': params or {}},
+        sort_keys=True, default=str, ensure_ascii=False
+    )
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class CachedLLMResponse:
+    """A cache hit"""
+    key: str
+    model: str
+    content: str
+    usage: Dict[str, Any]
+    tokens: int
+    cost_usd: float  # What the original call cost; a hit costs nothing
+    stored_at: float
+
+    @property
+    def age_seconds(self) -> float:
+        return time.time() - self.stored_at
+
+
+@dataclass
+class LLMCacheStats:
+    """Per-process cache counters"""
+    hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+    expired: int = 0
+    writes: int = 0
+    tokens_saved: int = 0
+    cost_saved_usd: float = 0.0
+    hits_by_model: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / (self.hits + self.misses) if self.hits + self.misses else 0.0
+
+
+class MemoryLLMCacheBackend:
+    """In-process backend; contents are lost when the process exits"""
+
+    def __init__(self):
+        self._rows: Dict[str, Tuple] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple]:
+        with self._lock:
+            return self._rows.get(key)
+
+    def put(self, key: str, row: Tuple):
+        with self._lock:
+            self._rows[key] = row
+
+    def delete(self, key: str):
+        with self._lock:
+            self._rows.pop(key, None)
+
+    def count(self) -> int:
+        return len(self._rows)
+
+    def clear(self):
+        with self._lock:
+            self._rows.clear()
+
+    def close(self):
+        pass
+
+
+class SQLiteLLMCacheBackend:
+    """
+    SQLite backend. Safe to share between threads; several processes may share
+    one database file (WAL mode, SQLite serializes writes).
+
+    Rows are (model, content, usage_json, tokens, cost_usd, stored_at).
+    """
+
+    def __init__(self, path: str = None):
+        if path is None:
+            project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            path = os.path.join(project_root, 'data', 'llm_cache', 'responses.db')
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                content TEXT NOT NULL,
+                usage TEXT,
+                tokens INTEGER NOT NULL DEFAULT 0,
+                cost_usd REAL NOT NULL DEFAULT 0,
+                stored_at REAL NOT NULL
+            )
+        """)
+        self._db.commit()
+
+    def get(self, key: str) -> Optional[Tuple]:
+        with self._lock:
+            return self._db.execute(
+                "SELECT model, content, usage, tokens, cost_usd, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+    def put(self, key: str, row: Tuple):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, model, content, usage, tokens, cost_usd, stored_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", (key, *row)
+            )
+            self._db.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._db.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class LLMResponseCache:
+    """
+    Response cache in front of any LLM client.
+
+    Args:
+        backend: Storage backend (SQLite at the default path when omitted)
+        ttl_seconds: Entries older than this are treated as misses and removed
+    """
+
+    def __init__(self, backend=None, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.backend = backend if backend is not None else SQLiteLLMCacheBackend()
+        self.ttl_seconds = ttl_seconds
+        self.stats = LLMCacheStats()
+        self._stats_lock = threading.Lock()
+
+    def lookup(
+        self,
+        model: str,
+        prompt: str,
+        params: Optional[Dict[str, Any]] = None,
+        use_cache: bool = True
+    ) -> Optional[CachedLLMResponse]:
+        """
+        Return the cached response, or None on a miss.
+
+        `use_cache=False` bypasses the read for this call; the fresh response
+        the caller then stores replaces the cached one.
+        """
+        if not use_cache:
+            with self._stats_lock:
+                self.stats.bypassed += 1
+            return None
+
+        key = make_cache_key(model, prompt, params)
+        row = self.backend.get(key)
+        if row is not None and time.time() - row[5] > self.ttl_seconds:
+            self.backend.delete(key)
+            with self._stats_lock:
+                self.stats.expired += 1
+            row = None
+
+        with self._stats_lock:
+            if row is None:
+                self.stats.misses += 1
+                return None
+            cached_model, content, usage, tokens, cost_usd, stored_at = row
+            self.stats.hits += 1
+            self.stats.tokens_saved += tokens
+            self.stats.cost_saved_usd += cost_usd
+            self.stats.hits_by_model[cached_model] = self.stats.hits_by_model.get(cached_model, 0) + 1
+
+        return CachedLLMResponse(
+            key=key, model=cached_model, content=content, usage=json.loads(usage or '{}'),
+            tokens=tokens, cost_usd=cost_usd, stored_at=stored_at
+        )
+
+    def store(
+        self,
+        model: str,
+        prompt: str,
+        params: Optional[Dict[str, Any]],
+        content: str,
+        usage: Optional[Dict[str, Any]] = None,
+        tokens: int = 0,
+        cost_usd: float = 0.0
+    ) -> str:
+        """
+        Cache a successful response. Empty responses are not stored.
+
+        Returns:
+            The cache key ("" if nothing was stored)
+        """
+        if not content:
+            return ""
+        key = make_cache_key(model, prompt, params)
+        self.backend.put(key, (model, content, json.dumps(usage or {}, default=str), int(tokens or 0),
+                               float(cost_usd or 0.0), time.time()))
+        with self._stats_lock:
+            self.stats.writes += 1
+        return key
+
+    def invalidate(self, model: str, prompt: str, params: Optional[Dict[str, Any]] = None):
+        """Drop one cached response."""
+        self.backend.delete(make_cache_key(model, prompt, params))
+
+    def discard(self, key: str):
+        """Drop a cached response by key, e.g. one its caller could not parse."""
+        if key:
+            self.backend.delete(key)
+
+    def clear(self):
+        """Remove every cached response."""
+        self.backend.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of cache usage for monitoring endpoints and batch reports."""
+        with self._stats_lock:
+            return {
+                'backend': type(self.backend).__name__,
+                'entries': self.backend.count(),
+                'hits': self.stats.hits,
+                'misses': self.stats.misses,
+                'hit_rate': self.stats.hit_rate,
+                'bypassed': self.stats.bypassed,
+                'expired': self.stats.expired,
+                'writes': self.stats.writes,
+                'tokens_saved': self.stats.tokens_saved,
+                'cost_saved_usd': round(self.stats.cost_saved_usd, 6),
+                'hits_by_model': dict(self.stats.hits_by_model),
+                'ttl_seconds': self.ttl_seconds,
+            }
+
+    def report(self) -> str:
+        """Human-readable savings report."""
+        stats = self.get_stats()
+        return (
+            f"LLM cache: {stats['entries']} responses, hit rate {stats['hit_rate']:.1%} "
+            f"({stats['hits']} hits / {stats['misses']} misses, {stats['bypassed']} bypassed)\n"
+            f"   Saved {stats['tokens_saved']:,} tokens, ${stats['cost_saved_usd']:.4f}"
+        )
+
+    def close(self):
+        self.backend.close()
+
+
+_llm_cache: Optional[LLMResponseCache] = None
+_llm_cache_configured = False
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    Get the process-wide LLM response cache, creating it on first use.
+
+    Returns None when the cache is disabled (LLM_CACHE_ENABLED=false) or the
+    database can't be opened; callers then always call the model.
+    """
+    global _llm_cache, _llm_cache_configured
+    with _llm_cache_lock:
+        if not _llm_cache_configured:
+            _llm_cache_configured = True
+            if os.getenv('LLM_CACHE_ENABLED', 'true').lower() != 'false':
+                try:
+                    _llm_cache = LLMResponseCache(
+                        backend=SQLiteLLMCacheBackend(os.getenv('LLM_CACHE_PATH') or None),
+                        ttl_seconds=float(os.getenv('LLM_CACHE_TTL_HOURS', '168')) * 3600
+                    )
+                except Exception as e:
+                    logger.warning(f"LLM cache disabled: {e}")
+                    _llm_cache = None
+        return _llm_cache
+
+
+def set_llm_cache(cache: Optional[LLMResponseCache]):
+    """Install the shared cache explicitly (None disables caching)."""
+    global _llm_cache, _llm_cache_configured
+    with _llm_cache_lock:
+        _llm_cache = cache
+        _llm_cache_configured = True
+
+
+def discard_cached_response(cache_key: str):
+    """
+    Drop a response that turned out to be unusable (malformed or truncated),
+    so the next identical call asks the model again instead of replaying it.
+    """
+    if cache_key and _llm_cache is not None:
+        _llm_cache.discard(cache_key)
+
+
+def get_llm_cache_stats() -> Dict[str, Any]:
+    """Cache stats without forcing the cache into existence."""
+    if _llm_cache is None:
+        return {'enabled': False}
+    return {'enabled': True, **_llm_cache.get_stats()}
@@ -5,7 +5,7 @@ Main processing pipeline for Theodore company intelligence system
 import os
 import csv
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator
 from datetime import datetime
 import json
 
@@ -19,6 +19,7 @@ from src.async_execution_manager import IntelligentCompanyScraperAsync
 from src.bedrock_client import BedrockClient
 from src.gemini_client import GeminiClient
 from src.pinecone_client import PineconeClient
+from src.staged_pipeline import Stage, StagedPipeline
 # from src.experimental.clustering import SectorClusteringEngine
 # from src.experimental.similarity_pipeline import SimilarityDiscoveryPipeline
 # from src.experimental.company_discovery import CompanyDiscoveryService
@@ -61,6 +62,9 @@ class TheodoreIntelligencePipeline:
         # self.similarity_pipeline.discovery_service = CompanyDiscoveryService(self.gemini_client)
         # self.similarity_pipeline.similarity_validator = SimilarityValidator(self.gemini_client)
         
+        # Stage metrics of the most recent _process_companies_batch run
+        self.last_batch_pipeline: Optional[StagedPipeline] = None
+        
         logger.info("Theodore Intelligence Pipeline initialized")
     
     def process_survey_csv(self, input_csv_path: str, output_csv_path: str) -> ProcessingJob:
@@ -68,22 +72,20 @@ class TheodoreIntelligencePipeline:
         
         # Create processing job
         job = ProcessingJob(
-            total_companies=0,  # Will be updated after loading CSV
+            total_companies=0,  # Estimated while the CSV streams in
             started_at=datetime.utcnow()
         )
         job.status = "running"
         
         try:
-            # Load survey data
-            logger.info(f"Loading survey data from {input_csv_path}")
-            survey_responses = self._load_survey_csv(input_csv_path)
-            job.total_companies = len(survey_responses)
+            # Stream survey data; companies enter the pipeline as rows are read
+            logger.info(f"Streaming survey data from {input_csv_path}")
+            survey_responses = self._iter_survey_csv(input_csv_path, job)
             
             # Convert to CompanyData objects
-            companies = self._convert_survey_to_companies(survey_responses)
+            companies = self._convert_survey_to_companies(survey_responses, job)
             
             # Process companies in batches
-            logger.info(f"Processing {len(companies)} companies")
             processed_companies = self._process_companies_batch(companies, job)
             
             # Generate sector clusters
@@ -226,27 +228,82 @@ class TheodoreIntelligencePipeline:
     
     def _load_survey_csv(self, csv_path: str) -> List[SurveyResponse]:
         """Load survey responses from CSV"""
-        survey_responses = []
-        
-        with open(csv_path, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            
-            for row in reader:
-                response = SurveyResponse(
-                    company_name=row.get('company_name', '').strip(),
-                    website=row.get('website', '').strip(),
-                    contact_email=row.get('contact_email', '').strip(),
-                    pain_points=row.get('pain_points', '').strip(),
-                    survey_date=datetime.utcnow(),  # Default to now
-                    survey_source=row.get('survey_source', 'csv_import')
-                )
-                
-                if response.company_name:  # Only add if we have a company name
-                    survey_responses.append(response)
-        
+        survey_responses = list(self._iter_survey_csv(csv_path))
         logger.info(f"Loaded {len(survey_responses)} survey responses")
         return survey_responses
     
+    def _iter_survey_csv(self, csv_path: str, job: Optional[ProcessingJob] = None) -> Iterator[SurveyResponse]:
+        """
+        Stream survey responses from CSV one row at a time.
+        
+        The file is never counted or held in memory. If a job is given, its
+        total_companies is estimated from the byte offset reached so far and
+        set to the exact count once the file is exhausted. A row that cannot
+        be decoded or parsed is logged, counted as failed and skipped.
+        """
+        total_bytes = os.path.getsize(csv_path)
+        bytes_read = 0
+        line_number = 0
+        count = 0
+        
+        with open(csv_path, 'rb') as file:
+            def lines() -> Iterator[str]:
+                nonlocal bytes_read, line_number, count
+                for raw_line in file:
+                    bytes_read += len(raw_line)
+                    line_number += 1
+                    try:
+                        line = raw_line.decode('utf-8-sig' if line_number == 1 else 'utf-8')
+                    except UnicodeDecodeError as e:
+                        count += 1
+                        self._record_row_failure(job, line_number, e)
+                        continue
+                    yield line
+            
+            reader = csv.DictReader(lines())
+            while True:
+                try:
+                    row = next(reader)
+                except StopIteration:
+                    break
+                except csv.Error as e:
+                    count += 1
+                    self._record_row_failure(job, line_number, e)
+                    continue
+                
+                try:
+                    response = SurveyResponse(
+                        company_name=(row.get('company_name') or '').strip(),
+                        website=(row.get('website') or '').strip(),
+                        contact_email=(row.get('contact_email') or '').strip(),
+                        pain_points=(row.get('pain_points') or '').strip(),
+                        survey_date=datetime.utcnow(),  # Default to now
+                        survey_source=row.get('survey_source') or 'csv_import'
+                    )
+                except Exception as e:
+                    count += 1
+                    self._record_row_failure(job, line_number, e)
+                    continue
+                
+                if not response.company_name:  # Only keep rows with a company name
+                    continue
+                
+                count += 1
+                if job is not None and bytes_read:
+                    job.total_companies = max(count, round(count * total_bytes / bytes_read))
+                yield response
+        
+        if job is not None:
+            job.total_companies = count
+        logger.info(f"Streamed {count} survey responses from {csv_path}")
+    
+    def _record_row_failure(self, job: Optional[ProcessingJob], row: Any, error: Exception):
+        """Log a survey row that could not be turned into a company and count it as failed"""
+        logger.warning(f"Skipping survey row {row}: {error}")
+        if job is not None:
+            job.failed_companies += 1
+            job.errors.append(f"Survey row {row}: {error}")
+    
     def _get_or_create_company(self, company_name: str, website: str, **kwargs) -> CompanyData:
         """Get existing company or create new one to prevent duplicates"""
         # Check if company already exists
@@ -276,63 +333,96 @@ class TheodoreIntelligencePipeline:
             logger.info(f"Creating new company entry for: {company_name}")
             return CompanyData(name=company_name, website=website, **kwargs)
     
-    def _convert_survey_to_companies(self, survey_responses: List[SurveyResponse]) -> List[CompanyData]:
-        """Convert survey responses to CompanyData objects"""
-        companies = []
-        
+    def _convert_survey_to_companies(
+        self,
+        survey_responses: Iterable[SurveyResponse],
+        job: Optional[ProcessingJob] = None
+    ) -> Iterator[CompanyData]:
+        """
+        Lazily convert survey responses to CompanyData objects.
+        
+        A response whose lookup fails (e.g. Pinecone unreachable) is logged and
+        counted as failed instead of ending the whole run.
+        """
         for response in survey_responses:
             website = response.website or f"https://{response.company_name.lower().replace(' ', '')}.com"
-            company = self._get_or_create_company(
-                company_name=response.company_name,
-                website=website,
-                pain_points=[response.pain_points] if response.pain_points else []
-            )
-            companies.append(company)
-        
-        return companies
-    
-    def _process_companies_batch(self, companies: List[CompanyData], job: ProcessingJob) -> List[CompanyData]:
-        """Process companies in batches"""
-        processed_companies = []
-        batch_size = self.config.batch_size
+            try:
+                company = self._get_or_create_company(
+                    company_name=response.company_name,
+                    website=website,
+                    pain_points=[response.pain_points] if response.pain_points else []
+                )
+            except Exception as e:
+                self._record_row_failure(job, response.company_name, e)
+                continue
+            yield company
+    
+    def _process_companies_batch(self, companies: Iterable[CompanyData], job: ProcessingJob) -> List[CompanyData]:
+        """
+        Process companies through a staged pipeline: scrape -> extract -> embed -> upsert.
+        
+        Each stage has its own workers and a bounded queue, so a company moves on as soon
+        as it is done with a stage, and companies are stored in Pinecone in small batches
+        as they finish instead of all at once at the end. companies may be a lazy
+        iterator; it is consumed as the first stage has room.
+        """
+        queue_size = self.config.pipeline_queue_size
+        pipeline = StagedPipeline(
+            [
+                Stage("scrape", self._scrape_stage, workers=self.config.pipeline_scrape_workers, queue_size=queue_size),
+                Stage("extract", self._extract_stage, workers=self.config.pipeline_extract_workers, queue_size=queue_size),
+                Stage("embed", self._embed_stage, workers=self.config.pipeline_embed_workers, queue_size=queue_size),
+                Stage("upsert", self._upsert_stage, workers=1, queue_size=queue_size * 2,
+                      batch_size=self.config.batch_size, batch_wait=2.0),
+            ],
+            on_error=lambda company, stage, error: job.errors.append(f"{company.name} ({stage}): {str(error)}")
+        )
+        self.last_batch_pipeline = pipeline
         
-        for i in range(0, len(companies), batch_size):
-            batch = companies[i:i + batch_size]
-            logger.info(f"Processing batch {i//batch_size + 1}/{(len(companies)-1)//batch_size + 1}")
-            
-            # Scrape websites
-            scraped_batch = self.scraper.batch_scrape_companies(batch)
-            
-            # Analyze with Bedrock and generate embeddings
-            for company in scraped_batch:
-                try:
-                    if company.scrape_status == "success":
-                        # AI analysis
-                        analysis_result = self.bedrock_client.analyze_company_content(company)
-                        self._apply_analysis_to_company(company, analysis_result)
-                        
-                        # Generate embedding
-                        embedding_text = self._prepare_embedding_text(company)
-                        company.embedding = self.bedrock_client.generate_embedding(embedding_text)
-                        
-                        job.processed_companies += 1
-                    else:
-                        job.failed_companies += 1
-                        
-                except Exception as e:
-                    logger.error(f"Error processing {company.name}: {str(e)}")
-                    job.failed_companies += 1
-                    job.errors.append(f"{company.name}: {str(e)}")
-                
-                processed_companies.append(company)
+        logger.info("Processing companies through staged pipeline")
+        result = pipeline.run(companies)
+        logger.info(pipeline.report())
         
-        # Batch upload to Pinecone
-        companies_with_embeddings = [c for c in processed_companies if c.embedding]
-        if companies_with_embeddings:
-            self.pinecone_client.batch_upsert_companies(companies_with_embeddings)
+        for company in result.outputs:
+            if company.scrape_status == "success" and company.embedding:
+                job.processed_companies += 1
+            else:
+                job.failed_companies += 1
+        job.failed_companies += len(result.failures)
+        processed_companies = result.outputs + [company for company, _, _ in result.failures]
         
         return processed_companies
     
+    def _scrape_stage(self, company: CompanyData) -> CompanyData:
+        """Pipeline stage: scrape the company website"""
+        return self.scraper.scrape_company(company)
+    
+    def _extract_stage(self, company: CompanyData) -> CompanyData:
+        """Pipeline stage: AI analysis of scraped content"""
+        if company.scrape_status == "success":
+            analysis_result = self.bedrock_client.analyze_company_content(company)
+            self._apply_analysis_to_company(company, analysis_result)
+        return company
+    
+    def _embed_stage(self, company: CompanyData) -> CompanyData:
+        """Pipeline stage: embedding (cached, shares the Bedrock embedding queue)"""
+        if company.scrape_status == "success":
+            company.embedding = self.bedrock_client.generate_embedding(self._prepare_embedding_text(company))
+        return company
+    
+    def _upsert_stage(self, companies: List[CompanyData]) -> List[CompanyData]:
+        """Pipeline stage: store a micro-batch of finished companies in Pinecone"""
+        companies_with_embeddings = [c for c in companies if c.embedding]
+        if companies_with_embeddings:
+            stored = self.pinecone_client.batch_upsert_companies(companies_with_embeddings)
+            if stored < len(companies_with_embeddings):
+                # The writer reports a count, not which ids failed, so the
+                # whole micro-batch is reported as failed
+                raise RuntimeError(
+                    f"Pinecone stored {stored} of {len(companies_with_embeddings)} companies"
+                )
+        return companies
+    
     def _generate_sector_clusters(self, companies: List[CompanyData], job: ProcessingJob) -> List[SectorCluster]:
         """Generate sector clusters from processed companies"""
         try:
@@ -604,4 +604,10 @@ class CompanyIntelligenceConfig(BaseModel):
     
     # Rate limiting
     requests_per_second: float = Field(default=2.0, description="Max requests per second")
-    batch_size: int = Field(default=10, description="Companies to process per batch")
\ No newline at end of file
+    batch_size: int = Field(default=10, description="Companies to process per batch")
+    
+    # Staged batch pipeline (scrape -> extract -> embed -> upsert)
+    pipeline_scrape_workers: int = Field(default=3, description="Concurrent website scrapes")
+    pipeline_extract_workers: int = Field(default=4, description="Concurrent AI analyses")
+    pipeline_embed_workers: int = Field(default=4, description="Concurrent embedding requests")
+    pipeline_queue_size: int = Field(default=10, description="Companies allowed to wait between stages")
@@ -0,0 +1,437 @@
+"""
+Content-Addressed Page Cache
+============================
+
+On-disk cache of fetched HTML and extracted page text, shared by every crawler
+path: the antoine crawler (trafilatura, BeautifulSoup and Crawl4AI fallbacks),
+IntelligentCompanyScraper's content extraction and v3 `core/crawler.py`. Retries
+and re-runs of the same company read pages from disk instead of the network.
+
+Layout (under data/page_cache/ by default):
+- blobs/ab/abcdef....z  zlib-compressed content, named by the SHA-256 of the
+  uncompressed bytes, so identical pages (www / non-www, trailing slashes,
+  mirrored locales) are stored once
+- index.db              SQLite index mapping (url, kind) -> content hash, with
+  stored/accessed timestamps for TTL expiry and size-based LRU eviction
+
+Kinds used by the crawlers:
+- "html"     raw HTML as downloaded
+- "text"     text extracted by the antoine / v3 trafilatura pipeline
+- "crawl4ai" content extracted by IntelligentCompanyScraper's browser crawl
+
+Configuration (environment):
+- PAGE_CACHE_ENABLED    "false" disables the shared cache (default "true")
+- PAGE_CACHE_DIR        cache directory
+- PAGE_CACHE_TTL_HOURS  entry lifetime (default 24)
+- PAGE_CACHE_MAX_MB     size cap for stored blobs (default 512)
+
+Usage:
+    cache = get_page_cache()
+    if cache:
+        hit = cache.get(url, "html")
+        if hit is None:
+            cache.put(url, html, "html")
+        print(cache.report())
+
+    # From a coroutine, keep SQLite, zlib and file IO off the event loop
+    hit = await cache.get_async(url, "html")
+    await cache.put_async(url, html, "html")
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+from urllib.parse import urldefrag
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 24 * 3600
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# Eviction frees space down to this fraction of max_bytes so it doesn't run on every put
+EVICTION_TARGET = 0.9
+
+
+@dataclass
+class CachedPage:
+    """A cache hit"""
+    url: str
+    kind: str
+    content: str
+    meta: Dict[str, Any]
+    stored_at: float
+
+    @property
+    def age_seconds(self) -> float:
+        return time.time() - self.stored_at
+
+
+@dataclass
+class PageCacheStats:
+    """Per-process cache counters"""
+    hits: Dict[str, int] = field(default_factory=dict)
+    misses: Dict[str, int] = field(default_factory=dict)
+    expired: int = 0
+    writes: int = 0
+    deduplicated_writes: int = 0  # Content already stored under another URL
+    evicted_entries: int = 0
+    bytes_served: int = 0  # Uncompressed bytes returned from cache instead of the network
+
+    def hit_rate(self, kind: Optional[str] = None) -> float:
+        if kind is None:
+            hits, misses = sum(self.hits.values()), sum(self.misses.values())
+        else:
+            hits, misses = self.hits.get(kind, 0), self.misses.get(kind, 0)
+        return hits / (hits + misses) if hits + misses else 0.0
+
+
+def _normalize_url(url: str) -> str:
+    return urldefrag(url.strip())[0]
+
+
+class PageCache:
+    """
+    Content-addressed, compressed page cache with TTL and size-based LRU eviction.
+
+    Safe to share between threads; several processes may also share a cache
+    directory (SQLite serializes index updates).
+
+    Args:
+        cache_dir: Directory holding the index and blobs
+        ttl_seconds: Entries older than this are treated as misses and removed
+        max_bytes: Compressed blob bytes kept before least-recently-used entries are evicted
+        compress_level: zlib level for stored blobs
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = None,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        compress_level: int = 6
+    ):
+        if cache_dir is None:
+            project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            cache_dir = os.path.join(project_root, 'data', 'page_cache')
+        self.cache_dir = cache_dir
+        self.blob_dir = os.path.join(cache_dir, 'blobs')
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.compress_level = compress_level
+
+        self.stats = PageCacheStats()
+        self._lock = threading.Lock()
+
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(cache_dir, 'index.db'), check_same_thread=False, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                meta TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (url, kind)
+            );
+            CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed_at);
+            CREATE INDEX IF NOT EXISTS idx_entries_hash ON entries(content_hash);
+            CREATE TABLE IF NOT EXISTS blobs (
+                content_hash TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                raw_size INTEGER NOT NULL
+            );
+        """)
+        self._db.commit()
+        # Running total of blob bytes, so puts don't sum the whole table
+        self._stored_bytes = self.total_bytes()
+
+    # ------------------------------------------------------------------
+    # Blob storage
+    # ------------------------------------------------------------------
+
+    def _blob_path(self, content_hash: str) -> str:
+        return os.path.join(self.blob_dir, content_hash[:2], f"{content_hash}.z")
+
+    def _write_blob(self, content_hash: str, raw: bytes) -> int:
+        path = self._blob_path(content_hash)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = zlib.compress(raw, self.compress_level)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return len(data)
+
+    def _delete_orphan_blobs(self, hashes) -> int:
+        """Delete blobs no entry points at any more; returns the bytes freed."""
+        freed = 0
+        for content_hash in set(hashes):
+            still_used = self._db.execute(
+                "SELECT 1 FROM entries WHERE content_hash = ? LIMIT 1", (content_hash,)
+            ).fetchone()
+            if still_used:
+                continue
+            row = self._db.execute("SELECT size FROM blobs WHERE content_hash = ?", (content_hash,)).fetchone()
+            freed += row[0] if row else 0
+            self._stored_bytes -= row[0] if row else 0
+            self._db.execute("DELETE FROM blobs WHERE content_hash = ?", (content_hash,))
+            try:
+                os.remove(self._blob_path(content_hash))
+            except FileNotFoundError:
+                pass
+        return freed
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, url: str, kind: str = "html") -> Optional[CachedPage]:
+        """Return the cached content for `url`, or None on a miss or expired entry."""
+        url = _normalize_url(url)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT content_hash, meta, stored_at FROM entries WHERE url = ? AND kind = ?", (url, kind)
+            ).fetchone()
+
+            page = None
+            if row is not None:
+                content_hash, meta, stored_at = row
+                if time.time() - stored_at > self.ttl_seconds:
+                    self.stats.expired += 1
+                    self._remove(url, kind, content_hash)
+                else:
+                    page = self._read(url, kind, content_hash, meta, stored_at)
+
+            if page is None:
+                self.stats.misses[kind] = self.stats.misses.get(kind, 0) + 1
+                return None
+
+            self._db.execute(
+                "UPDATE entries SET accessed_at = ? WHERE url = ? AND kind = ?", (time.time(), url, kind)
+            )
+            self._db.commit()
+            self.stats.hits[kind] = self.stats.hits.get(kind, 0) + 1
+            self.stats.bytes_served += len(page.content)
+            return page
+
+    def _read(self, url, kind, content_hash, meta, stored_at) -> Optional[CachedPage]:
+        try:
+            with open(self._blob_path(content_hash), 'rb') as f:
+                content = zlib.decompress(f.read()).decode('utf-8')
+        except (OSError, zlib.error, UnicodeDecodeError) as e:
+            logger.warning(f"Dropping unreadable page cache entry for {url}: {e}")
+            self._remove(url, kind, content_hash)
+            return None
+        return CachedPage(url=url, kind=kind, content=content, meta=json.loads(meta or '{}'), stored_at=stored_at)
+
+    def _remove(self, url: str, kind: str, content_hash: str):
+        self._db.execute("DELETE FROM entries WHERE url = ? AND kind = ?", (url, kind))
+        self._delete_orphan_blobs([content_hash])
+        self._db.commit()
+
+    def put(self, url: str, content: str, kind: str = "html", meta: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Store content for `url`.
+
+        Returns:
+            The content hash the entry points at
+        """
+        url = _normalize_url(url)
+        raw = content.encode('utf-8')
+        content_hash = hashlib.sha256(raw).hexdigest()
+        now = time.time()
+
+        with self._lock:
+            existing = self._db.execute(
+                "SELECT 1 FROM blobs WHERE content_hash = ?", (content_hash,)
+            ).fetchone()
+            if existing and os.path.exists(self._blob_path(content_hash)):
+                self.stats.deduplicated_writes += 1
+            else:
+                if existing:
+                    # Blob file went missing; its old row is replaced below
+                    self._stored_bytes -= self._db.execute(
+                        "SELECT size FROM blobs WHERE content_hash = ?", (content_hash,)
+                    ).fetchone()[0]
+                size = self._write_blob(content_hash, raw)
+                self._stored_bytes += size
+                self._db.execute(
+                    "INSERT OR REPLACE INTO blobs (content_hash, size, raw_size) VALUES (?, ?, ?)",
+                    (content_hash, size, len(raw))
+                )
+
+            previous = self._db.execute(
+                "SELECT content_hash FROM entries WHERE url = ? AND kind = ?", (url, kind)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (url, kind, content_hash, meta, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, kind, content_hash, json.dumps(meta or {}, default=str), now, now)
+            )
+            if previous and previous[0] != content_hash:
+                self._delete_orphan_blobs([previous[0]])
+            self.stats.writes += 1
+            self._evict_if_needed()
+            self._db.commit()
+        return content_hash
+
+    async def get_async(self, url: str, kind: str = "html") -> Optional[CachedPage]:
+        """`get` run in a worker thread, for callers on the event loop."""
+        return await asyncio.to_thread(self.get, url, kind)
+
+    async def put_async(
+        self, url: str, content: str, kind: str = "html", meta: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """`put` run in a worker thread, for callers on the event loop."""
+        return await asyncio.to_thread(self.put, url, content, kind, meta)
+
+    def invalidate(self, url: str, kind: Optional[str] = None):
+        """Drop the entries for `url` (all kinds unless `kind` is given)."""
+        url = _normalize_url(url)
+        with self._lock:
+            if kind is None:
+                rows = self._db.execute("SELECT kind, content_hash FROM entries WHERE url = ?", (url,)).fetchall()
+            else:
+                rows = self._db.execute(
+                    "SELECT kind, content_hash FROM entries WHERE url = ? AND kind = ?", (url, kind)
+                ).fetchall()
+            for row_kind, content_hash in rows:
+                self._remove(url, row_kind, content_hash)
+
+    def total_bytes(self) -> int:
+        """Compressed bytes currently stored."""
+        return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def _evict_if_needed(self):
+        if self._stored_bytes <= self.max_bytes:
+            return
+        # Other processes sharing the directory also add blobs, so resync before evicting
+        total = self.total_bytes()
+        self._stored_bytes = total
+        if total <= self.max_bytes:
+            return
+        target = self.max_bytes * EVICTION_TARGET
+        # Least recently used first; a blob is only freed once no entry references it
+        rows = self._db.execute("SELECT url, kind, content_hash FROM entries ORDER BY accessed_at")
+        for url, kind, content_hash in rows.fetchall():
+            if total <= target:
+                break
+            self._db.execute("DELETE FROM entries WHERE url = ? AND kind = ?", (url, kind))
+            self.stats.evicted_entries += 1
+            total -= self._delete_orphan_blobs([content_hash])
+        self._stored_bytes = total
+        logger.info(f"Page cache evicted down to {total / 1024 / 1024:.1f} MB")
+
+    def clear(self):
+        """Remove every entry and blob."""
+        with self._lock:
+            hashes = [row[0] for row in self._db.execute("SELECT content_hash FROM blobs").fetchall()]
+            self._db.execute("DELETE FROM entries")
+            self._delete_orphan_blobs(hashes)
+            self._db.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of cache usage for monitoring endpoints and batch reports."""
+        with self._lock:
+            entries = dict(self._db.execute("SELECT kind, COUNT(*) FROM entries GROUP BY kind").fetchall())
+            blob_count, stored, raw = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(raw_size), 0) FROM blobs"
+            ).fetchone()
+        return {
+            'hits': dict(self.stats.hits),
+            'misses': dict(self.stats.misses),
+            'hit_rate': self.stats.hit_rate(),
+            'hit_rate_by_kind': {
+                kind: self.stats.hit_rate(kind) for kind in set(self.stats.hits) | set(self.stats.misses)
+            },
+            'expired': self.stats.expired,
+            'writes': self.stats.writes,
+            'deduplicated_writes': self.stats.deduplicated_writes,
+            'evicted_entries': self.stats.evicted_entries,
+            'bytes_served': self.stats.bytes_served,
+            'entries': entries,
+            'blobs': blob_count,
+            'stored_bytes': stored,
+            'uncompressed_bytes': raw,
+            'max_bytes': self.max_bytes,
+            'ttl_seconds': self.ttl_seconds,
+        }
+
+    def report(self) -> str:
+        """Human-readable hit-rate report."""
+        stats = self.get_stats()
+        lines = [
+            f"Page cache: {sum(stats['entries'].values())} entries, {stats['blobs']} blobs, "
+            f"{stats['stored_bytes'] / 1024 / 1024:.1f} MB stored "
+            f"({stats['uncompressed_bytes'] / 1024 / 1024:.1f} MB uncompressed, "
+            f"limit {self.max_bytes / 1024 / 1024:.0f} MB)",
+            f"   Overall hit rate: {stats['hit_rate']:.1%} "
+            f"({sum(stats['hits'].values())} hits / {sum(stats['misses'].values())} misses)",
+        ]
+        for kind in sorted(stats['hit_rate_by_kind']):
+            lines.append(
+                f"   {kind}: {stats['hit_rate_by_kind'][kind]:.1%} "
+                f"({stats['hits'].get(kind, 0)} hits / {stats['misses'].get(kind, 0)} misses)"
+            )
+        lines.append(
+            f"   Served from cache: {stats['bytes_served'] / 1024:.0f} KB, expired: {stats['expired']}, "
+            f"evicted: {stats['evicted_entries']}, deduplicated writes: {stats['deduplicated_writes']}"
+        )
+        return "\n".join(lines)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_page_cache: Optional[PageCache] = None
+_page_cache_configured = False
+_page_cache_lock = threading.Lock()
+
+
+def get_page_cache() -> Optional[PageCache]:
+    """
+    Get the process-wide page cache, creating it on first use.
+
+    Returns None when the cache is disabled (PAGE_CACHE_ENABLED=false) or the
+    cache directory can't be opened; callers then simply go to the network.
+    """
+    global _page_cache, _page_cache_configured
+    with _page_cache_lock:
+        if not _page_cache_configured:
+            _page_cache_configured = True
+            if os.getenv('PAGE_CACHE_ENABLED', 'true').lower() != 'false':
+                try:
+                    _page_cache = PageCache(
+                        cache_dir=os.getenv('PAGE_CACHE_DIR') or None,
+                        ttl_seconds=float(os.getenv('PAGE_CACHE_TTL_HOURS', '24')) * 3600,
+                        max_bytes=int(float(os.getenv('PAGE_CACHE_MAX_MB', '512')) * 1024 * 1024)
+                    )
+                except Exception as e:
+                    logger.warning(f"Page cache disabled: {e}")
+                    _page_cache = None
+        return _page_cache
+
+
+def set_page_cache(cache: Optional[PageCache]):
+    """Install the shared cache explicitly (None disables caching)."""
+    global _page_cache, _page_cache_configured
+    with _page_cache_lock:
+        _page_cache = cache
+        _page_cache_configured = True
+
+
+def get_page_cache_stats() -> Dict[str, Any]:
+    """Cache stats without forcing the cache into existence."""
+    if _page_cache is None:
+        return {'enabled': False}
+    return {'enabled': True, **_page_cache.get_stats()}
@@ -0,0 +1,372 @@
+"""
+Per-Domain Page Manifest
+========================
+
+Local record of what the antoine pipeline crawled for a company, used for
+incremental re-research.
+
+A manifest keeps, per domain, the pages that fed the last field extraction -
+URL, sitemap lastmod, ETag, Last-Modified, content hash and extracted text -
+together with the extracted fields themselves. When the company is researched
+again, `AntoineScraperAdapter` can skip discovery and LLM page selection,
+re-check each page (sitemap lastmod first, then a conditional request), and
+skip `extract_company_fields` entirely when no page materially changed.
+
+Manifests are JSON files under data/page_manifests/, one per domain.
+
+Usage:
+    store = PageManifestStore()
+    manifest = store.load("https://example.com")
+    refresh = refresh_manifest_pages_sync(manifest, "https://example.com")
+    if not refresh.changed:
+        fields = manifest.extracted_fields
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from src.antoine_crawler import (
+    BatchCrawlResult, PageCrawlResult, _aggregate_page_content, content_hash, crawl_single_page
+)
+from src.antoine_fetcher import close_page_fetcher
+from src.crawl_sitemap_xml import extract_sitemap_urls, strip_domains_from_sitemap
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+# Sitemap entries fetched when checking lastmod on a refresh
+SITEMAP_LASTMOD_MAX_URLS = 5000
+
+
+def page_hash(result: PageCrawlResult) -> str:
+    """Hash of a crawled page's full text (its content may be truncated)."""
+    return result.content_hash or content_hash(result.content)
+
+
+def manifest_domain(url: str) -> str:
+    """Domain key for a company website ("https://www.Example.com/en" -> "example.com")."""
+    if not url.startswith(('http://', 'https://')):
+        url = f"https://{url}"
+    netloc = urlparse(url).netloc.lower()
+    return netloc[4:] if netloc.startswith('www.') else netloc
+
+
+@dataclass
+class ManifestPage:
+    """One crawled page and the validators used to detect changes to it"""
+    url: str
+    path: str
+    content_hash: str
+    content: str = ""
+    title: str = ""
+    etag: str = ""
+    last_modified: str = ""  # Last-Modified response header
+    lastmod: str = ""  # <lastmod> from the sitemap
+    fetched_at: str = ""
+
+
+@dataclass
+class PageManifest:
+    """Pages behind a company's last field extraction, plus the fields themselves"""
+    domain: str
+    base_url: str
+    pages: Dict[str, ManifestPage] = field(default_factory=dict)  # keyed by URL
+    selected_paths: List[str] = field(default_factory=list)
+    extracted_fields: Dict[str, Any] = field(default_factory=dict)
+    raw_content: str = ""
+    full_run_at: str = ""  # Last run that went through discovery and selection
+    updated_at: str = ""
+    version: int = MANIFEST_VERSION
+
+    def age_days(self) -> float:
+        """Days since the last full (non-incremental) run."""
+        if not self.full_run_at:
+            return float('inf')
+        return (datetime.utcnow() - datetime.fromisoformat(self.full_run_at)).total_seconds() / 86400
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PageManifest":
+        data = dict(data)
+        data['pages'] = {url: ManifestPage(**page) for url, page in data.get('pages', {}).items()}
+        return cls(**data)
+
+    @classmethod
+    def from_crawl(
+        cls,
+        base_url: str,
+        crawl_result: BatchCrawlResult,
+        selected_paths: List[str],
+        extracted_fields: Dict[str, Any],
+        sitemap_lastmod: Optional[Dict[str, str]] = None
+    ) -> "PageManifest":
+        """
+        Build a manifest from a full pipeline run.
+
+        Args:
+            base_url: Website URL the pages were crawled from
+            crawl_result: Phase 3 result; its successful pages are recorded
+            selected_paths: Paths chosen in phase 2
+            extracted_fields: Phase 4 fields, reused when nothing changes
+            sitemap_lastmod: {path: lastmod} from discovery
+        """
+        now = datetime.utcnow().isoformat()
+        manifest = cls(
+            domain=manifest_domain(base_url),
+            base_url=base_url,
+            selected_paths=list(selected_paths),
+            extracted_fields=extracted_fields,
+            raw_content=crawl_result.aggregated_content[:10000],
+            full_run_at=now,
+            updated_at=now
+        )
+        sitemap_lastmod = sitemap_lastmod or {}
+        for result in crawl_result.page_results:
+            if not result.success or not result.content:
+                continue
+            path = urlparse(result.url).path or '/'
+            manifest.pages[result.url] = ManifestPage(
+                url=result.url,
+                path=path,
+                content_hash=page_hash(result),
+                content=result.content,
+                title=result.title,
+                etag=result.etag,
+                last_modified=result.last_modified,
+                lastmod=sitemap_lastmod.get(path.rstrip('/') or '/', ''),
+                fetched_at=now
+            )
+        return manifest
+
+
+class PageManifestStore:
+    """Reads and writes page manifests as JSON files, one per domain"""
+
+    def __init__(self, storage_dir: str = None):
+        """Initialize manifest storage
+
+        Args:
+            storage_dir: Directory for manifest files. Defaults to data/page_manifests/
+        """
+        if storage_dir is None:
+            project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            storage_dir = os.path.join(project_root, 'data', 'page_manifests')
+        self.storage_dir = storage_dir
+
+    def _manifest_file(self, base_url: str) -> str:
+        safe_domain = re.sub(r'[^a-z0-9.-]', '_', manifest_domain(base_url))
+        return os.path.join(self.storage_dir, f"{safe_domain}.json")
+
+    def load(self, base_url: str) -> Optional[PageManifest]:
+        """Load the manifest for a website, or None if there isn't a usable one."""
+        path = self._manifest_file(base_url)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != MANIFEST_VERSION:
+                logger.info(f"Ignoring page manifest {path} (version {data.get('version')})")
+                return None
+            return PageManifest.from_dict(data)
+        except Exception as e:
+            logger.warning(f"Could not read page manifest {path}: {e}")
+            return None
+
+    def save(self, manifest: PageManifest):
+        """Write a manifest atomically (readers never see a half-written file)."""
+        os.makedirs(self.storage_dir, exist_ok=True)
+        path = self._manifest_file(manifest.base_url)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest.to_dict(), f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
+        logger.debug(f"Saved page manifest for {manifest.domain} ({len(manifest.pages)} pages)")
+
+    def delete(self, base_url: str):
+        path = self._manifest_file(base_url)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+@dataclass
+class ManifestRefreshResult:
+    """Outcome of re-checking a manifest's pages against the live site"""
+    crawl_result: BatchCrawlResult  # Stored content for unchanged pages, fresh content for changed ones
+    pages: List[ManifestPage]  # Updated manifest pages (validators, hashes, content)
+    changed_urls: List[str] = field(default_factory=list)
+    unchanged_urls: List[str] = field(default_factory=list)
+    failed_urls: List[str] = field(default_factory=list)  # Kept with their stored content
+    lastmod_unchanged: int = 0  # Skipped without a request
+    not_modified: int = 0  # 304 responses
+    same_content: int = 0  # Re-downloaded but identical after normalization
+    refresh_time: float = 0.0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.changed_urls)
+
+
+async def _current_sitemap_lastmod(base_url: str, locale_filter: str = None) -> Dict[str, str]:
+    # The discovery cache would answer with the lastmod values of the last run
+    entries = await extract_sitemap_urls(
+        base_url, locale_filter, max_urls=SITEMAP_LASTMOD_MAX_URLS, use_cache=False
+    )
+    return {
+        strip_domains_from_sitemap([entry], base_url)[0]: entry.lastmod
+        for entry in entries if entry.lastmod
+    }
+
+
+async def refresh_manifest_pages(
+    manifest: PageManifest,
+    base_url: str,
+    locale_filter: str = None,
+    timeout_seconds: int = 30,
+    max_concurrent: int = 10,
+    use_sitemap_lastmod: bool = True
+) -> ManifestRefreshResult:
+    """
+    Re-check every manifest page and re-extract only the ones that changed.
+
+    A page is unchanged when its sitemap lastmod is the same as last time, when
+    the server answers 304 to If-None-Match / If-Modified-Since, or when the
+    re-downloaded text hashes the same. Pages that fail to download keep their
+    stored content rather than forcing a re-extraction. The manifest itself is
+    not modified; apply `pages` once the refresh has been used successfully.
+
+    Args:
+        manifest: Manifest from the previous run
+        base_url: Website URL (with protocol)
+        locale_filter: Locale used when reading the sitemap
+        timeout_seconds: Timeout per page
+        max_concurrent: Maximum concurrent page checks
+        use_sitemap_lastmod: Read the sitemap when the manifest has lastmod values
+
+    Returns:
+        ManifestRefreshResult with a merged BatchCrawlResult ready for extraction
+    """
+    start_time = time.time()
+    now = datetime.utcnow().isoformat()
+    pages = list(manifest.pages.values())
+    refresh = ManifestRefreshResult(crawl_result=None, pages=[])
+
+    current_lastmod = {}
+    if use_sitemap_lastmod and any(page.lastmod for page in pages):
+        try:
+            current_lastmod = await _current_sitemap_lastmod(base_url, locale_filter)
+        except Exception as e:
+            logger.warning(f"Sitemap lastmod check failed for {base_url}: {e}")
+
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def check_page(page: ManifestPage):
+        lastmod = current_lastmod.get(page.path.rstrip('/') or '/', '')
+        if page.lastmod and lastmod == page.lastmod:
+            return page, lastmod, None
+        async with semaphore:
+            result = await crawl_single_page(
+                page.url, base_url, timeout_seconds,
+                validators={'etag': page.etag, 'last_modified': page.last_modified}
+            )
+        return page, lastmod, result
+
+    page_results = []
+    for page, lastmod, result in await asyncio.gather(*[check_page(page) for page in pages]):
+        updated = ManifestPage(**asdict(page))
+        updated.lastmod = lastmod or page.lastmod
+
+        if result is None:
+            refresh.lastmod_unchanged += 1
+            refresh.unchanged_urls.append(page.url)
+        elif result.not_modified:
+            refresh.not_modified += 1
+            refresh.unchanged_urls.append(page.url)
+            updated.etag, updated.last_modified = result.etag, result.last_modified
+        elif result.success and result.content:
+            updated.etag, updated.last_modified = result.etag, result.last_modified
+            updated.fetched_at = now
+            new_hash = page_hash(result)
+            if new_hash == page.content_hash:
+                refresh.same_content += 1
+                refresh.unchanged_urls.append(page.url)
+            else:
+                refresh.changed_urls.append(page.url)
+                updated.content_hash = new_hash
+                updated.content = result.content
+                updated.title = result.title or page.title
+        else:
+            refresh.failed_urls.append(page.url)
+
+        refresh.pages.append(updated)
+        page_results.append(PageCrawlResult(
+            url=updated.url,
+            success=True,
+            content=updated.content,
+            title=updated.title,
+            content_length=len(updated.content),
+            extraction_method="fresh" if page.url in refresh.changed_urls else "manifest"
+        ))
+
+    refresh.refresh_time = time.time() - start_time
+    refresh.crawl_result = BatchCrawlResult(
+        base_url=base_url,
+        total_pages=len(page_results),
+        successful_pages=len(page_results),
+        failed_pages=0,
+        total_content_length=sum(r.content_length for r in page_results),
+        total_crawl_time=refresh.refresh_time,
+        aggregated_content=_aggregate_page_content(page_results, base_url),
+        page_results=page_results
+    )
+
+    logger.info(
+        f"Manifest refresh for {manifest.domain}: {len(refresh.changed_urls)} changed, "
+        f"{len(refresh.unchanged_urls)} unchanged ({refresh.lastmod_unchanged} by lastmod, "
+        f"{refresh.not_modified} not modified, {refresh.same_content} same content), "
+        f"{len(refresh.failed_urls)} failed in {refresh.refresh_time:.1f}s"
+    )
+    return refresh
+
+
+def refresh_manifest_pages_sync(
+    manifest: PageManifest,
+    base_url: str,
+    locale_filter: str = None,
+    timeout_seconds: int = 30,
+    max_concurrent: int = 10
+) -> ManifestRefreshResult:
+    """
+    Synchronous wrapper for refresh_manifest_pages().
+
+    Args:
+        manifest: Manifest from the previous run
+        base_url: Website URL (with protocol)
+        locale_filter: Locale used when reading the sitemap
+        timeout_seconds: Timeout per page
+        max_concurrent: Maximum concurrent page checks
+
+    Returns:
+        ManifestRefreshResult with a merged BatchCrawlResult ready for extraction
+    """
+    async def _refresh_and_close_pool():
+        try:
+            return await refresh_manifest_pages(
+                manifest, base_url, locale_filter, timeout_seconds, max_concurrent
+            )
+        finally:
+            # asyncio.run() discards the loop, so release its connection pool too
+            await close_page_fetcher()
+
+    return asyncio.run(_refresh_and_close_pool())
@@ -0,0 +1,305 @@
+"""
+Pinecone Bulk Writer
+====================
+
+Concurrent bulk write engine behind `PineconeClient.batch_upsert_companies`
+and `PineconeClient.store_similarity_relationships`. Previously every batch
+of 100 vectors was sent only after the previous one returned, and every
+similarity edge cost its own fetch + update, so bulk imports were bound by
+round-trip latency rather than bandwidth.
+
+- Batches are packed by vector count *and* serialized payload size, so
+  metadata-heavy companies (raw_content, job listings) never push a request
+  over Pinecone's 2 MB limit and small vectors still fill a batch
+- Up to `max_parallel` batches are in flight at once
+- A batch rejected for its content (payload too large, invalid vector:
+  HTTP 400/413/422 or a client-side ValueError) is split in half and only the
+  halves are resent, isolating a bad vector without resending the rest of the
+  import
+- Connection errors, throttling and 5xx responses are retried with backoff
+  and then fail the whole batch; auth errors (401/403) fail it at once. None
+  of these are split, since smaller requests would fail the same way
+- Metadata updates are coalesced per id (later fields win) before being sent,
+  so N edits to one company become one `update` call
+
+Configuration (environment):
+- PINECONE_UPSERT_PARALLELISM  concurrent requests (default 8)
+- PINECONE_UPSERT_MAX_BYTES    payload budget per request (default 1.5 MB)
+
+Usage:
+    writer = PineconeBulkWriter(index)
+    result = writer.upsert(vectors)          # [{"id", "values", "metadata"}, ...]
+    writer.update_metadata([("id1", {"industry": "SaaS"}), ("id1", {"is_saas": True})])
+    print(result.report())
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Pinecone accepts at most 1000 vectors and 2 MB per upsert request
+MAX_BATCH_VECTORS = 1000
+DEFAULT_BATCH_VECTORS = 100
+DEFAULT_MAX_BATCH_BYTES = 1_500_000
+DEFAULT_MAX_PARALLEL = 8
+DEFAULT_MAX_RETRIES = 2
+FETCH_BATCH_SIZE = 100
+
+# Statuses that blame the request body, so splitting the batch can isolate
+# the offending vector, and statuses no retry can fix
+SPLITTABLE_STATUSES = {400, 413, 422}
+FATAL_STATUSES = {401, 403}
+
+
+# JSON-encoded float32 values run up to ~20 characters each; counting that flat
+# avoids serializing 1536 floats per vector just to size a batch
+BYTES_PER_VALUE = 20
+VECTOR_OVERHEAD_BYTES = 64
+
+
+def estimate_vector_bytes(vector: Dict[str, Any]) -> int:
+    """Approximate request payload of one vector (JSON-encoded id, values and metadata)."""
+    metadata = vector.get('metadata')
+    metadata_bytes = len(json.dumps(metadata, separators=(',', ':'), default=str).encode('utf-8')) if metadata else 0
+    return (VECTOR_OVERHEAD_BYTES + len(str(vector.get('id', ''))) + metadata_bytes
+            + BYTES_PER_VALUE * len(vector.get('values') or ()))
+
+
+def error_status(error: Exception) -> Optional[int]:
+    """HTTP status of a Pinecone / HTTP client exception, if it carries one."""
+    for source in (error, getattr(error, 'response', None)):
+        for attr in ('status', 'status_code'):
+            status = getattr(source, attr, None)
+            if isinstance(status, int):
+                return status
+    return None
+
+
+def is_request_error(error: Exception) -> bool:
+    """True when the batch content was rejected (oversized or invalid), not the transport."""
+    status = error_status(error)
+    if status is not None:
+        return status in SPLITTABLE_STATUSES
+    return isinstance(error, (ValueError, TypeError))
+
+
+@dataclass
+class BulkWriteResult:
+    """Outcome of a bulk upsert or metadata update"""
+    written: int = 0
+    failed_ids: List[str] = field(default_factory=list)
+    requests: int = 0
+    retries: int = 0
+    splits: int = 0
+    bytes_sent: int = 0
+    duration_seconds: float = 0.0
+
+    @property
+    def failed(self) -> int:
+        return len(self.failed_ids)
+
+    @property
+    def vectors_per_second(self) -> float:
+        return self.written / self.duration_seconds if self.duration_seconds else 0.0
+
+    def report(self) -> str:
+        return (
+            f"📦 Bulk write: {self.written} written, {self.failed} failed in {self.duration_seconds:.2f}s "
+            f"({self.vectors_per_second:.0f}/s, {self.requests} requests, {self.retries} retries, "
+            f"{self.bytes_sent / 1024 / 1024:.1f} MB)"
+        )
+
+
+class PineconeBulkWriter:
+    """
+    Concurrent, size-aware batch writer for a Pinecone index.
+
+    Args:
+        index: Pinecone Index (or anything with upsert / update / fetch)
+        max_batch_vectors: Vectors per upsert request
+        max_batch_bytes: Estimated payload bytes per upsert request
+        max_parallel: Requests in flight at once
+        max_retries: Retries of a batch failing with a transient error
+        retry_backoff: Base seconds between retries (doubled each attempt)
+    """
+
+    def __init__(
+        self,
+        index,
+        max_batch_vectors: int = DEFAULT_BATCH_VECTORS,
+        max_batch_bytes: int = None,
+        max_parallel: int = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        retry_backoff: float = 0.5
+    ):
+        self.index = index
+        self.max_batch_vectors = max(1, min(max_batch_vectors, MAX_BATCH_VECTORS))
+        self.max_batch_bytes = max_batch_bytes or int(os.getenv('PINECONE_UPSERT_MAX_BYTES', DEFAULT_MAX_BATCH_BYTES))
+        self.max_parallel = max(1, max_parallel or int(os.getenv('PINECONE_UPSERT_PARALLELISM', DEFAULT_MAX_PARALLEL)))
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._stats_lock = threading.Lock()
+
+    def plan_batches(self, vectors: Iterable[Dict[str, Any]]) -> List[Tuple[List[Dict[str, Any]], int]]:
+        """
+        Pack vectors greedily into batches bounded by count and payload bytes.
+
+        A single vector larger than the byte budget gets a batch of its own
+        (Pinecone will reject it, and the failure is isolated to that id).
+
+        Returns:
+            [(vectors, estimated_bytes), ...]
+        """
+        batches = []
+        current, current_bytes = [], 0
+        for vector in vectors:
+            size = estimate_vector_bytes(vector)
+            if current and (len(current) >= self.max_batch_vectors or current_bytes + size > self.max_batch_bytes):
+                batches.append((current, current_bytes))
+                current, current_bytes = [], 0
+            current.append(vector)
+            current_bytes += size
+        if current:
+            batches.append((current, current_bytes))
+        return batches
+
+    def upsert(self, vectors: List[Dict[str, Any]], namespace: Optional[str] = None) -> BulkWriteResult:
+        """Upsert all vectors with bounded parallelism; failed ids are reported, never raised."""
+        started = time.time()
+        result = BulkWriteResult()
+        batches = self.plan_batches(vectors)
+
+        def send(batch: List[Dict[str, Any]]):
+            if namespace:
+                self.index.upsert(vectors=batch, namespace=namespace)
+            else:
+                self.index.upsert(vectors=batch)
+
+        self._run(
+            [(batch, size) for batch, size in batches],
+            send,
+            result,
+            ids_of=lambda batch: [vector['id'] for vector in batch]
+        )
+        result.duration_seconds = time.time() - started
+        if result.failed:
+            logger.warning(f"Bulk upsert: {result.failed} vectors failed after retries")
+        logger.info(result.report())
+        return result
+
+    def update_metadata(
+        self,
+        updates: Iterable[Tuple[str, Dict[str, Any]]],
+        namespace: Optional[str] = None
+    ) -> BulkWriteResult:
+        """
+        Apply metadata updates, coalesced per id, with bounded parallelism.
+
+        Args:
+            updates: (id, fields) pairs; several pairs for one id are merged
+                in order so each id is updated once
+        """
+        started = time.time()
+        result = BulkWriteResult()
+        coalesced = coalesce_metadata_updates(updates)
+
+        def send(batch: List[Tuple[str, Dict[str, Any]]]):
+            (vector_id, metadata), = batch
+            if namespace:
+                self.index.update(id=vector_id, set_metadata=metadata, namespace=namespace)
+            else:
+                self.index.update(id=vector_id, set_metadata=metadata)
+
+        # Pinecone updates one id per call, so every update is its own "batch"
+        items = [([(vector_id, metadata)], 0) for vector_id, metadata in coalesced.items()]
+        self._run(items, send, result, ids_of=lambda batch: [vector_id for vector_id, _ in batch])
+        result.duration_seconds = time.time() - started
+        return result
+
+    def fetch_metadata(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch metadata for many ids in parallel chunks; missing ids are omitted."""
+        unique_ids = list(dict.fromkeys(ids))
+        chunks = [unique_ids[i:i + FETCH_BATCH_SIZE] for i in range(0, len(unique_ids), FETCH_BATCH_SIZE)]
+        metadata: Dict[str, Dict[str, Any]] = {}
+        if not chunks:
+            return metadata
+        with ThreadPoolExecutor(max_workers=min(self.max_parallel, len(chunks))) as executor:
+            for response in executor.map(lambda chunk: self.index.fetch(ids=chunk), chunks):
+                for vector_id, vector in response.vectors.items():
+                    metadata[vector_id] = dict(vector.metadata or {})
+        return metadata
+
+    def _run(
+        self,
+        batches: List[Tuple[List[Any], int]],
+        send: Callable[[List[Any]], None],
+        result: BulkWriteResult,
+        ids_of: Callable[[List[Any]], List[str]]
+    ):
+        if not batches:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.max_parallel, len(batches))) as executor:
+            pending = [executor.submit(self._send_with_retry, batch, size, send, result, ids_of)
+                       for batch, size in batches]
+            for future in pending:
+                future.result()
+
+    def _send_with_retry(
+        self,
+        batch: List[Any],
+        size: int,
+        send: Callable[[List[Any]], None],
+        result: BulkWriteResult,
+        ids_of: Callable[[List[Any]], List[str]]
+    ):
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(self.retry_backoff * (2 ** (attempt - 1)))
+            try:
+                send(batch)
+                with self._stats_lock:
+                    result.requests += 1
+                    result.written += len(batch)
+                    result.bytes_sent += size
+                return
+            except Exception as e:
+                last_error = e
+                logger.debug(f"Batch of {len(batch)} failed (attempt {attempt + 1}): {e}")
+                with self._stats_lock:
+                    result.requests += 1
+                # Resending the same content or credentials cannot succeed
+                if is_request_error(e) or error_status(e) in FATAL_STATUSES:
+                    break
+                with self._stats_lock:
+                    result.retries += 1 if attempt < self.max_retries else 0
+
+        if is_request_error(last_error) and len(batch) > 1:
+            # Retry only the failing part: split and resend each half on its own
+            middle = len(batch) // 2
+            with self._stats_lock:
+                result.splits += 1
+            for half in (batch[:middle], batch[middle:]):
+                half_size = size * len(half) // len(batch)
+                self._send_with_retry(half, half_size, send, result, ids_of)
+        else:
+            ids = ids_of(batch)
+            logger.error(f"Giving up on {ids[0]}" + (f" and {len(ids) - 1} more" if len(ids) > 1 else "")
+                         + f": {last_error}")
+            with self._stats_lock:
+                result.failed_ids.extend(ids)
+
+
+def coalesce_metadata_updates(updates: Iterable[Tuple[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """Merge (id, fields) pairs into one field dict per id, later pairs winning, first-seen id order kept."""
+    coalesced: Dict[str, Dict[str, Any]] = {}
+    for vector_id, fields in updates:
+        coalesced.setdefault(vector_id, {}).update(fields)
+    return coalesced
@@ -8,6 +8,8 @@ import uuid
 import json
 from pinecone import Pinecone, PodSpec
 from src.models import CompanyData, SimilarityRelation, CompanyIntelligenceConfig
+from src.company_mirror import get_company_mirror
+from src.pinecone_bulk_writer import PineconeBulkWriter
 
 logger = logging.getLogger(__name__)
 
@@ -87,6 +89,7 @@ class PineconeClient:
                 }]
             )
             
+            self._mirror_upsert([(company.id, metadata)])
             logger.info(f"Successfully stored {company.name} in Pinecone with metadata")
             return True
             
@@ -95,37 +98,80 @@ class PineconeClient:
             return False
     
     def batch_upsert_companies(self, companies: List[CompanyData], batch_size: int = 100) -> int:
-        """Batch upsert multiple companies to Pinecone"""
-        successful_upserts = 0
+        """Batch upsert multiple companies to Pinecone, sending batches concurrently"""
+        vectors = []
+        for company in companies:
+            if not company.embedding:
+                logger.warning(f"Skipping {company.name} - no embedding")
+                continue
+            
+            vectors.append({
+                "id": company.id,
+                "values": company.embedding,
+                "metadata": self._prepare_optimized_metadata(company)
+            })
         
-        for i in range(0, len(companies), batch_size):
-            batch = companies[i:i + batch_size]
-            
-            # Prepare batch vectors
-            vectors = []
-            for company in batch:
-                if not company.embedding:
-                    logger.warning(f"Skipping {company.name} - no embedding")
-                    continue
-                
-                # Prepare optimized metadata
-                metadata = self._prepare_optimized_metadata(company)
-                
-                vectors.append({
-                    "id": company.id,
-                    "values": company.embedding,
-                    "metadata": metadata
-                })
-            
-            if vectors:
-                try:
-                    self.index.upsert(vectors=vectors)
-                    successful_upserts += len(vectors)
-                    logger.info(f"Batch {i//batch_size + 1}: Upserted {len(vectors)} companies")
-                except Exception as e:
-                    logger.error(f"Batch upsert failed: {e}")
+        if not vectors:
+            return 0
         
-        return successful_upserts
+        result = self._get_bulk_writer(batch_size).upsert(vectors)
+        failed = set(result.failed_ids)
+        self._mirror_upsert([(vector["id"], vector["metadata"]) for vector in vectors if vector["id"] not in failed])
+        logger.info(f"Upserted {result.written}/{len(vectors)} companies in {result.requests} requests")
+        return result.written
+    
+    def _get_bulk_writer(self, batch_size: int = 100) -> PineconeBulkWriter:
+        """Bulk writer for this index (rebuilt if the batch size or index changes)"""
+        writer = getattr(self, '_bulk_writer', None)
+        if writer is None or writer.index is not self.index or writer.max_batch_vectors != batch_size:
+            writer = self._bulk_writer = PineconeBulkWriter(self.index, max_batch_vectors=batch_size)
+        return writer
+    
+    def update_company_metadata(self, company_id: str, values: List[float], metadata: Dict[str, Any]) -> bool:
+        """Re-upsert a vector with edited metadata, keeping the metadata mirror in step"""
+        try:
+            self.index.upsert(vectors=[(company_id, values, metadata)])
+            self._mirror_upsert([(company_id, metadata)])
+            return True
+        except Exception as e:
+            logger.error(f"Failed to update metadata for {company_id}: {e}")
+            return False
+    
+    def set_company_metadata(self, company_id: str, metadata: Dict[str, Any]) -> bool:
+        """Update a company's metadata in place (no vector re-upload), keeping the metadata mirror in step.
+
+        `metadata` is mirrored as given, so pass the full record rather than only the changed fields.
+        """
+        try:
+            self.index.update(id=company_id, set_metadata=metadata)
+            self._mirror_upsert([(company_id, metadata)])
+            return True
+        except Exception as e:
+            logger.error(f"Failed to update metadata for {company_id}: {e}")
+            return False
+    
+    def _mirror_upsert(self, items: List[Tuple[str, Dict[str, Any]]]):
+        """Write stored metadata through to the local mirror; never fails the Pinecone write"""
+        mirror = get_company_mirror()
+        if not mirror:
+            return
+        try:
+            mirror.upsert_many(items)
+        except Exception as e:
+            logger.warning(f"Company mirror write-through failed: {e}")
+    
+    def _mirror_delete(self, company_id: Optional[str]):
+        """Remove one company (or all of them, for None) from the local mirror"""
+        mirror = get_company_mirror()
+        if not mirror:
+            return
+        try:
+            if company_id is None:
+                mirror.clear()
+            else:
+                mirror.delete(company_id)
+        except Exception as e:
+            logger.warning(f"Company mirror delete failed: {e}")
     
     def find_similar_companies(self, company_id: str, top_k: int = 10, 
                              min_similarity: float = 0.7, 
@@ -365,6 +411,7 @@ class PineconeClient:
         """Delete a company from Pinecone"""
         try:
             self.index.delete(ids=[company_id])
+            self._mirror_delete(company_id)
             logger.info(f"Deleted company {company_id} from Pinecone")
             return True
             
@@ -377,6 +424,7 @@ class PineconeClient:
         try:
             # Delete all vectors in the default namespace
             self.index.delete(delete_all=True)
+            self._mirror_delete(None)
             logger.info("Successfully cleared all records from Pinecone index")
             return True
             
@@ -742,31 +790,72 @@ class PineconeClient:
         In production, consider a dedicated similarity index.
         """
         try:
-            from src.models import CompanySimilarity
-            
+            # Collect every edge per company first, so each company is fetched and updated once
+            additions: Dict[str, List[Tuple[str, 'CompanySimilarity']]] = {}
             for similarity in similarities:
-                # Update both companies' metadata with similarity info
-                self._add_similarity_to_company_metadata(
-                    similarity.original_company_id,
-                    similarity.similar_company_id,
-                    similarity
+                additions.setdefault(similarity.original_company_id, []).append(
+                    (similarity.similar_company_id, similarity)
                 )
                 
                 # Store bidirectional relationship if specified
                 if similarity.is_bidirectional:
-                    self._add_similarity_to_company_metadata(
-                        similarity.similar_company_id,
-                        similarity.original_company_id,
-                        similarity
+                    additions.setdefault(similarity.similar_company_id, []).append(
+                        (similarity.original_company_id, similarity)
                     )
             
-            logger.info(f"Stored {len(similarities)} similarity relationships")
+            writer = self._get_bulk_writer()
+            current = writer.fetch_metadata(list(additions))
+            updates = []
+            for company_id, edges in additions.items():
+                if company_id not in current:
+                    logger.warning(f"Company {company_id} not found for similarity update")
+                    continue
+                metadata = current[company_id]
+                if self._merge_similarities(metadata, edges):
+                    updates.append((company_id, metadata))
+            
+            result = writer.update_metadata(updates)
+            failed = set(result.failed_ids)
+            self._mirror_upsert([(company_id, metadata) for company_id, metadata in updates if company_id not in failed])
+            
+            logger.info(f"Stored {len(similarities)} similarity relationships "
+                        f"({result.written} metadata updates, {result.failed} failed)")
             return True
             
         except Exception as e:
             logger.error(f"Failed to store similarity relationships: {e}")
             return False
     
+    @staticmethod
+    def _merge_similarities(metadata: Dict[str, Any], edges: List[Tuple[str, 'CompanySimilarity']]) -> bool:
+        """Add new similarity edges to a company's `similar_companies` metadata; returns True if it changed"""
+        try:
+            existing_similarities = json.loads(metadata.get("similar_companies") or "[]")
+        except json.JSONDecodeError:
+            existing_similarities = []
+        
+        existing_ids = {sim.get('company_id') for sim in existing_similarities}
+        changed = False
+        for similar_company_id, similarity in edges:
+            if similar_company_id in existing_ids:
+                continue
+            existing_ids.add(similar_company_id)
+            existing_similarities.append({
+                "company_id": similar_company_id,
+                "company_name": similarity.similar_company_name,
+                "similarity_score": similarity.similarity_score,
+                "confidence": similarity.confidence,
+                "discovery_method": similarity.discovery_method,
+                "validation_methods": similarity.validation_methods,
+                "relationship_type": similarity.relationship_type,
+                "discovered_at": similarity.discovered_at.isoformat()
+            })
+            changed = True
+        
+        if changed:
+            metadata["similar_companies"] = json.dumps(existing_similarities)
+        return changed
+    
     def _add_similarity_to_company_metadata(self, 
                                           company_id: str, 
                                           similar_company_id: str,
@@ -784,42 +873,9 @@ class PineconeClient:
             
             metadata = fetch_response.vectors[company_id].metadata.copy()
             
-            # Initialize similarity list if not exists
-            similar_companies_key = "similar_companies"
-            if similar_companies_key not in metadata:
-                metadata[similar_companies_key] = json.dumps([])
-            
-            # Parse existing similarities
-            try:
-                existing_similarities = json.loads(metadata[similar_companies_key])
-            except json.JSONDecodeError:
-                existing_similarities = []
-            
-            # Check if relationship already exists
-            existing_ids = [sim.get('company_id') for sim in existing_similarities]
-            if similar_company_id not in existing_ids:
-                # Add new similarity
-                similarity_data = {
-                    "company_id": similar_company_id,
-                    "company_name": similarity.similar_company_name,
-                    "similarity_score": similarity.similarity_score,
-                    "confidence": similarity.confidence,
-                    "discovery_method": similarity.discovery_method,
-                    "validation_methods": similarity.validation_methods,
-                    "relationship_type": similarity.relationship_type,
-                    "discovered_at": similarity.discovered_at.isoformat()
-                }
-                
-                existing_similarities.append(similarity_data)
-                
-                # Update metadata
-                metadata[similar_companies_key] = json.dumps(existing_similarities)
-                
+            if self._merge_similarities(metadata, [(similar_company_id, similarity)]):
                 # Update in Pinecone
-                self.index.update(
-                    id=company_id,
-                    set_metadata=metadata
-                )
+                self.set_company_metadata(company_id, metadata)
                 
                 logger.debug(f"Added similarity {similar_company_id} to {company_id}")
             
@@ -0,0 +1,283 @@
+"""
+In-Process Progress Bus
+=======================
+
+Publish/subscribe channel between the progress loggers and the streaming
+endpoints. `ProgressLogger` publishes to "job:<job_id>" and
+`BatchProgressLogger` to "batch:<job_id>"; `/api/batch/stream/<job_id>`
+subscribes instead of polling the store once a second, so every viewer gets
+an update as soon as it is published and idle viewers cost a blocked thread
+rather than a polling loop.
+
+- Every event gets a process-wide increasing id, sent as the SSE `id:` field.
+  A reconnecting EventSource sends it back as Last-Event-ID and the stream
+  resumes from the per-topic history buffer. If the history no longer covers
+  the gap, `events_since` reports it so the endpoint can send a fresh snapshot.
+- Events published with a `coalesce_key` (full progress snapshots) collapse to
+  the latest one per key when a subscriber falls behind, so a burst of
+  updates reaches slow viewers as one event. Events without a key (log lines,
+  completion) are always delivered.
+
+Usage:
+    bus = get_progress_bus()
+    bus.publish("batch:abc", "progress", job, coalesce_key="progress")
+
+    for events in bus.subscribe("batch:abc", last_event_id=None, heartbeat=15):
+        if events is None:
+            ...  # heartbeat: nothing new within 15s
+        for event in events:
+            yield event.to_sse()
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_SIZE = 256
+DEFAULT_MAX_TOPICS = 1000
+# After the first new event, wait this long for the rest of a burst before delivering
+DEFAULT_COALESCE_INTERVAL = 0.25
+
+
+@dataclass
+class ProgressEvent:
+    """One published progress event"""
+    id: int
+    topic: str
+    event: str
+    data: Any
+    coalesce_key: Optional[str] = None
+    timestamp: float = 0.0
+
+    def to_sse(self, named: bool = False) -> str:
+        """
+        Format as a Server-Sent Events message.
+
+        Args:
+            named: Emit an `event:` line. Unnamed events reach EventSource.onmessage,
+                which is what the batch UI listens on.
+        """
+        lines = [f"id: {self.id}"]
+        if named:
+            lines.append(f"event: {self.event}")
+        lines.append(f"data: {json.dumps(self.data, default=str)}")
+        return "\n".join(lines) + "\n\n"
+
+
+def coalesce_events(events: List[ProgressEvent]) -> List[ProgressEvent]:
+    """Keep only the last event per coalesce_key, preserving order; keyless events all survive."""
+    last_by_key = {event.coalesce_key: event.id for event in events if event.coalesce_key}
+    return [event for event in events if not event.coalesce_key or last_by_key[event.coalesce_key] == event.id]
+
+
+class _Topic:
+    def __init__(self, lock: threading.Lock, history_size: int):
+        self.events: deque = deque(maxlen=history_size)
+        self.condition = threading.Condition(lock)
+        self.async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self.subscribers = 0
+        self.dropped_before = 0  # Highest id evicted from the history buffer
+
+
+class ProgressBus:
+    """
+    Thread-safe in-process progress bus with per-topic history.
+
+    Args:
+        history_size: Events kept per topic for Last-Event-ID resume
+        max_topics: Topics kept; the least recently published-to are dropped first
+        coalesce_interval: Seconds a subscriber waits after the first new event
+            for the rest of a burst, so it can be coalesced
+    """
+
+    def __init__(
+        self,
+        history_size: int = DEFAULT_HISTORY_SIZE,
+        max_topics: int = DEFAULT_MAX_TOPICS,
+        coalesce_interval: float = DEFAULT_COALESCE_INTERVAL
+    ):
+        self.history_size = history_size
+        self.max_topics = max_topics
+        self.coalesce_interval = coalesce_interval
+
+        self._lock = threading.Lock()
+        self._topics: "OrderedDict[str, _Topic]" = OrderedDict()
+        self._last_id = 0
+        self._stats = {'published': 0, 'delivered': 0, 'coalesced': 0}
+
+    def _topic(self, name: str) -> _Topic:
+        topic = self._topics.get(name)
+        if topic is None:
+            topic = self._topics[name] = _Topic(self._lock, self.history_size)
+            while len(self._topics) > self.max_topics:
+                oldest_name, oldest = next(iter(self._topics.items()))
+                if oldest.subscribers:
+                    self._topics.move_to_end(oldest_name)
+                    break
+                del self._topics[oldest_name]
+        return topic
+
+    @property
+    def last_event_id(self) -> int:
+        """Id of the most recent event on any topic."""
+        with self._lock:
+            return self._last_id
+
+    def publish(self, topic: str, event: str, data: Any, coalesce_key: Optional[str] = None) -> ProgressEvent:
+        """Publish an event and wake every subscriber of `topic`. Never blocks on subscribers."""
+        with self._lock:
+            self._last_id += 1
+            progress_event = ProgressEvent(
+                id=self._last_id, topic=topic, event=event, data=data,
+                coalesce_key=coalesce_key, timestamp=time.time()
+            )
+            state = self._topic(topic)
+            self._topics.move_to_end(topic)
+            if len(state.events) == state.events.maxlen:
+                state.dropped_before = state.events[0].id
+            state.events.append(progress_event)
+            self._stats['published'] += 1
+            state.condition.notify_all()
+            waiters, state.async_waiters = state.async_waiters, []
+
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_resolve, future)
+        return progress_event
+
+    def events_since(self, topic: str, last_event_id: Optional[int]) -> Tuple[List[ProgressEvent], bool]:
+        """
+        Buffered events after `last_event_id`.
+
+        Returns:
+            (events, complete) where complete is False if events after
+            last_event_id were already evicted (or the id is from an earlier
+            process), meaning the caller should resend a full snapshot
+        """
+        with self._lock:
+            return self._events_since(topic, last_event_id)
+
+    def _events_since(self, topic: str, last_event_id: Optional[int]) -> Tuple[List[ProgressEvent], bool]:
+        state = self._topics.get(topic)
+        after = last_event_id or 0
+        if state is None:
+            return [], last_event_id is None or after <= self._last_id
+        events = [event for event in state.events if event.id > after]
+        complete = after >= state.dropped_before and after <= self._last_id
+        return events, complete
+
+    def wait(self, topic: str, last_event_id: Optional[int], timeout: float) -> List[ProgressEvent]:
+        """Block until events newer than `last_event_id` exist on `topic` (or timeout); returns them coalesced."""
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            state = self._topic(topic)
+            state.subscribers += 1
+            try:
+                events, _ = self._events_since(topic, last_event_id)
+                while not events:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return []
+                    state.condition.wait(remaining)
+                    events, _ = self._events_since(topic, last_event_id)
+            finally:
+                state.subscribers -= 1
+
+        if self.coalesce_interval:
+            # Let the rest of a burst arrive so it collapses into one delivery
+            time.sleep(self.coalesce_interval)
+            events, _ = self.events_since(topic, last_event_id)
+        return self._deliver(events)
+
+    async def wait_async(self, topic: str, last_event_id: Optional[int], timeout: float) -> List[ProgressEvent]:
+        """`wait` for asyncio code (websocket handlers); doesn't tie up a thread."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            with self._lock:
+                events, _ = self._events_since(topic, last_event_id)
+                if events:
+                    break
+                future = loop.create_future()
+                self._topic(topic).async_waiters.append((loop, future))
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return []
+            try:
+                await asyncio.wait_for(future, remaining)
+            except asyncio.TimeoutError:
+                return []
+
+        if self.coalesce_interval:
+            await asyncio.sleep(self.coalesce_interval)
+            events, _ = self.events_since(topic, last_event_id)
+        return self._deliver(events)
+
+    def _deliver(self, events: List[ProgressEvent]) -> List[ProgressEvent]:
+        delivered = coalesce_events(events)
+        with self._lock:
+            self._stats['delivered'] += len(delivered)
+            self._stats['coalesced'] += len(events) - len(delivered)
+        return delivered
+
+    def subscribe(
+        self,
+        topic: str,
+        last_event_id: Optional[int] = None,
+        heartbeat: float = 15.0
+    ) -> Iterator[Optional[List[ProgressEvent]]]:
+        """
+        Iterate over batches of new events on `topic`, starting after `last_event_id`.
+
+        Yields None when `heartbeat` seconds pass without events, so callers can
+        send keep-alives, check for cross-process updates or give up.
+        """
+        cursor = last_event_id
+        while True:
+            events = self.wait(topic, cursor, heartbeat)
+            if not events:
+                yield None
+                continue
+            cursor = events[-1].id
+            yield events
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                'topics': len(self._topics),
+                'subscribers': sum(topic.subscribers for topic in self._topics.values()),
+                'last_event_id': self._last_id,
+            }
+
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+_progress_bus: Optional[ProgressBus] = None
+_progress_bus_lock = threading.Lock()
+
+
+def get_progress_bus() -> ProgressBus:
+    """Get the process-wide progress bus."""
+    global _progress_bus
+    with _progress_bus_lock:
+        if _progress_bus is None:
+            _progress_bus = ProgressBus()
+        return _progress_bus
+
+
+def publish_progress(topic: str, event: str, data: Any, coalesce_key: Optional[str] = None):
+    """Publish to the shared bus; failures are logged, never raised into the caller."""
+    try:
+        get_progress_bus().publish(topic, event, data, coalesce_key)
+    except Exception as e:
+        logger.warning(f"Progress bus publish failed for {topic}: {e}")
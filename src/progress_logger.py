@@ -3,37 +3,52 @@ Real-time progress logging system for web UI
 Provides live updates during company processing
 """
 
-import json
 import time
 import logging
 import os
 from typing import Dict, List, Optional
-from datetime import datetime
-from pathlib import Path
+from datetime import datetime, timedelta
 import threading
 
+from src.progress_store import ProgressStore, COMPANY, BATCH
+from src.progress_bus import publish_progress
+
 logger = logging.getLogger(__name__)
 
 
 class ProgressLogger:
     """
     Thread-safe progress logger for real-time UI updates
+
+    Jobs are persisted in a WAL-mode SQLite store (see progress_store.py), one
+    row per job, so updates cost one small indexed write instead of rewriting
+    every job's history. Processes sharing the database see each other's
+    updates without reloading anything.
+
+    Every change is also published to the in-process progress bus on topic
+    "job:<job_id>", so streaming endpoints are pushed updates.
     """
     
-    def __init__(self, log_file: str = "logs/processing_progress.json"):
+    def __init__(self, log_file: str = "logs/processing_progress.json", store: Optional[ProgressStore] = None):
+        # log_file is the legacy JSON file; its jobs are imported into the store once
         self.log_file = log_file
-        self.progress_data = {
-            "current_job": None,
-            "jobs": {},
-            "last_updated": None
-        }
-        self.lock = threading.Lock()
-        
-        # Ensure logs directory exists
-        Path(self.log_file).parent.mkdir(exist_ok=True)
+        self.store = store or ProgressStore(os.path.join(os.path.dirname(log_file) or ".", "progress.db"))
+        # Re-entrant: log_page_scraping and log_llm_call call add_to_progress_log while holding it
+        self.lock = threading.RLock()
         
-        # Load existing progress data or initialize empty
-        self._load_progress()
+        self.store.import_legacy_json(self.log_file, COMPANY)
+    
+    @property
+    def progress_data(self) -> Dict:
+        """Snapshot of every company job in the legacy {current_job, jobs, last_updated} shape"""
+        return {
+            "current_job": self.store.get_meta("current_job"),
+            "jobs": self.store.list_jobs(COMPANY),
+            "last_updated": self.store.get_meta("last_updated")
+        }
+    
+    def _touch(self) -> None:
+        self.store.set_meta("last_updated", datetime.now().isoformat())
     
     def start_job(self, job_id: str, company_name: str, total_phases: int = 4) -> None:
         """Start tracking a new processing job"""
@@ -52,30 +67,18 @@ class ProgressLogger:
                 "result_summary": None
             }
             
-            
-            self.progress_data["current_job"] = job_id
-            self.progress_data["jobs"][job_id] = job_data
-            self.progress_data["last_updated"] = datetime.now().isoformat()
-            
-            
-            self._save_progress()
+            self.store.put_job(job_data, COMPANY)
+            self.store.set_meta("current_job", job_id)
+            self._touch()
+            publish_progress(f"job:{job_id}", "progress", job_data, coalesce_key="progress")
             
             logger.info(f"Started processing job {job_id} for {company_name}")
     
     def update_phase(self, job_id: str, phase_name: str, status: str = "running", 
                     details: Optional[Dict] = None) -> None:
         """Update current phase progress"""
-        with self.lock:
-            if job_id not in self.progress_data["jobs"]:
-                # Try reloading progress data from file (subprocess case)
-                self._load_progress()
-                
-                if job_id not in self.progress_data["jobs"]:
-                    logger.warning(f"Job {job_id} not found for phase update")
-                    return
-            
-            job = self.progress_data["jobs"][job_id]
-            
+        
+        def apply(job: Dict) -> None:
             # Extract new details from parameters
             current_url = details.get("current_url") if details else None
             progress_step = details.get("progress_step") if details else None
@@ -117,26 +120,24 @@ class ProgressLogger:
             
             if not phase_found:
                 job["phases"].append(phase_data)
-                job["current_phase"] = len(job["phases"])
-            else:
-                # Update current phase number for running phases
-                job["current_phase"] = len(job["phases"])
-            
-            self.progress_data["last_updated"] = datetime.now().isoformat()
-            self._save_progress()
+            job["current_phase"] = len(job["phases"])
+        
+        with self.lock:
+            job = self.store.update_job(job_id, apply, COMPANY)
+            if job is None:
+                logger.warning(f"Job {job_id} not found for phase update")
+                return
             
+            self._touch()
+            publish_progress(f"job:{job_id}", "progress", job, coalesce_key="progress")
             logger.info(f"Job {job_id}: {phase_name} - {status}")
     
     def complete_job(self, job_id: str, success: bool = True, 
                     error: Optional[str] = None, result_summary: Optional[str] = None,
                     results: Optional[Dict] = None) -> None:
         """Mark job as completed"""
-        with self.lock:
-            if job_id not in self.progress_data["jobs"]:
-                logger.warning(f"Job {job_id} not found for completion")
-                return
-            
-            job = self.progress_data["jobs"][job_id]
+        
+        def apply(job: Dict) -> None:
             job["status"] = "completed" if success else "failed"
             job["end_time"] = datetime.now().isoformat()
             job["error"] = error
@@ -148,13 +149,19 @@ class ProgressLogger:
                 start = datetime.fromisoformat(job["start_time"])
                 end = datetime.now()
                 job["total_duration"] = (end - start).total_seconds()
+        
+        with self.lock:
+            job = self.store.update_job(job_id, apply, COMPANY)
+            if job is None:
+                logger.warning(f"Job {job_id} not found for completion")
+                return
+            publish_progress(f"job:{job_id}", "complete", job)
             
             # Clear current job if this was it
-            if self.progress_data["current_job"] == job_id:
-                self.progress_data["current_job"] = None
+            if self.store.get_meta("current_job") == job_id:
+                self.store.set_meta("current_job", None)
             
-            self.progress_data["last_updated"] = datetime.now().isoformat()
-            self._save_progress()
+            self._touch()
             
             status_msg = "completed successfully" if success else f"failed: {error}"
             logger.info(f"Job {job_id} {status_msg}")
@@ -163,73 +170,45 @@ class ProgressLogger:
         """Get current progress data"""
         with self.lock:
             if job_id:
-                job_data = self.progress_data["jobs"].get(job_id, {})
+                job_data = self.store.get_job(job_id, COMPANY)
                 if job_data:
                     return self._build_phase_structure(job_data)
                 return {}
-            return self.progress_data.copy()
+            return self.progress_data
+    
+    def find_running_job(self, company_name: str) -> Optional[str]:
+        """job_id of a job currently running for this company, if any"""
+        return self.store.find_running_job(company_name)
     
     def get_current_job_progress(self) -> Optional[Dict]:
         """Get progress for currently running job"""
         with self.lock:
-            current_job_id = self.progress_data.get("current_job")
-            
-            all_jobs = self.progress_data.get("jobs", {})
+            current_job_id = self.store.get_meta("current_job")
             
             if current_job_id:
-                
-                # CRITICAL FIX: Always reload from file to get latest subprocess updates
-                self._load_progress()
-                all_jobs = self.progress_data.get("jobs", {})  # Update with fresh data
-                
-                # If subprocess is writing, retry once after a short delay
-                if current_job_id in all_jobs:
-                    job_data = all_jobs[current_job_id]
-                    if len(job_data.get('phases', [])) == 0 and job_data.get('status') == 'running':
-                        import time
-                        time.sleep(0.1)  # Brief delay for file sync
-                        self._load_progress()
-                        all_jobs = self.progress_data.get("jobs", {})
-                
-                if current_job_id in all_jobs:
-                    job_data = all_jobs[current_job_id]
-                    
+                job_data = self.store.get_job(current_job_id, COMPANY)
+                if job_data:
                     # If current job is no longer running, clear it
                     if job_data.get('status') != 'running':
-                        self.progress_data["current_job"] = None
-                        self._save_progress()
+                        self.store.set_meta("current_job", None)
                     else:
                         return self._build_phase_structure(job_data)
-                else:
-                    pass
-            else:
-                pass
                 
             # If no current job, look for any running jobs (but clean up stale ones first)
             running_jobs = []
-            stale_jobs_cleaned = False
-            for job_id, job_data in all_jobs.items():
-                if job_data.get("status") == "running":
-                    # Check if job is stale (running for more than 15 minutes for concurrent implementation)
-                    start_time_str = job_data.get("start_time")
-                    if start_time_str:
-                        try:
-                            from datetime import datetime, timedelta
-                            start_time = datetime.fromisoformat(start_time_str)
-                            if datetime.now() - start_time > timedelta(minutes=15):
-                                job_data["status"] = "failed"
-                                job_data["error"] = "Job timed out after 15 minutes"
-                                job_data["end_time"] = datetime.now().isoformat()
-                                stale_jobs_cleaned = True
-                                continue  # Skip this job
-                        except:
-                            pass  # If we can't parse the time, treat as valid
-                    
-                    running_jobs.append((job_id, job_data))
-            
-            # Save progress if we cleaned up stale jobs
-            if stale_jobs_cleaned:
-                self._save_progress()
+            for job_id, job_data in self.store.list_jobs(COMPANY, status="running").items():
+                # Check if job is stale (running for more than 15 minutes for concurrent implementation)
+                start_time_str = job_data.get("start_time")
+                if start_time_str:
+                    try:
+                        start_time = datetime.fromisoformat(start_time_str)
+                        if datetime.now() - start_time > timedelta(minutes=15):
+                            self.store.update_job(job_id, self._mark_timed_out, COMPANY)
+                            continue  # Skip this job
+                    except ValueError:
+                        pass  # If we can't parse the time, treat as valid
+                
+                running_jobs.append((job_id, job_data))
                     
             if running_jobs:
                 # Return the most recent running job
@@ -238,6 +217,12 @@ class ProgressLogger:
                 
             return None
     
+    @staticmethod
+    def _mark_timed_out(job: Dict) -> None:
+        job["status"] = "failed"
+        job["error"] = "Job timed out after 15 minutes"
+        job["end_time"] = datetime.now().isoformat()
+    
     def _build_phase_structure(self, job_data: Dict) -> Dict:
         """Build phase structure for frontend consumption"""
         # Keep phases as an array for JavaScript compatibility
@@ -250,56 +235,45 @@ class ProgressLogger:
                          page_number: int, total_pages: int) -> None:
         """Log individual page scraping progress"""
         print(f"🔍 [{page_number}/{total_pages}] Scraping: {page_url}")
-        with self.lock:
-            if job_id not in self.progress_data["jobs"]:
-                return
-            
-            # Add to UI processing log
-            self.add_to_progress_log(job_id, f"🔍 Scraped page {page_number}/{total_pages}: {page_url} ({len(content_preview):,} chars)")
-            
+        
+        phase_updated = []
+        
+        def apply(job: Dict) -> None:
             # Update the current Content Extraction phase with page details
-            job = self.progress_data["jobs"][job_id]
-            phase_updated = False
             for phase in job["phases"]:
                 if phase["name"] == "Content Extraction" and phase["status"] == "running":
                     phase["current_page"] = page_url
                     phase["pages_completed"] = page_number
                     phase["total_pages"] = total_pages
                     phase["scraped_content_preview"] = content_preview[:500] + "..." if len(content_preview) > 500 else content_preview
-                    phase_updated = True
+                    phase_updated.append(True)
                     break
+        
+        with self.lock:
+            if not self.store.has_job(job_id):
+                return
             
+            # Add to UI processing log
+            self.add_to_progress_log(job_id, f"🔍 Scraped page {page_number}/{total_pages}: {page_url} ({len(content_preview):,} chars)")
+            
+            job = self.store.update_job(job_id, apply, COMPANY)
+            if job is not None:
+                publish_progress(f"job:{job_id}", "progress", job, coalesce_key="progress")
             if not phase_updated:
                 print(f"⚠️ DEBUG: No running Content Extraction phase found to update")
     
     def add_to_progress_log(self, job_id: str, message: str):
         """Add a message to the processing log for the UI"""
-        with self.lock:
-            if job_id in self.progress_data["jobs"]:
-                if "processing_log" not in self.progress_data["jobs"][job_id]:
-                    self.progress_data["jobs"][job_id]["processing_log"] = []
-                
-                # Check for duplicate messages to reduce spam
-                existing_logs = self.progress_data["jobs"][job_id]["processing_log"]
-                if existing_logs and existing_logs[-1]["message"] == message:
-                    return  # Skip duplicate message
-                
-                timestamp = datetime.now().strftime("%I:%M:%S %p")
-                self.progress_data["jobs"][job_id]["processing_log"].append({
-                    "timestamp": timestamp,
-                    "message": message
-                })
-                
-                # Keep only the last 50 log entries to prevent memory issues
-                if len(self.progress_data["jobs"][job_id]["processing_log"]) > 50:
-                    self.progress_data["jobs"][job_id]["processing_log"] = self.progress_data["jobs"][job_id]["processing_log"][-50:]
-                
-                self._save_progress()
+        # Single append; repeats of the last message are skipped and the
+        # store keeps only the last 50 entries per job
+        timestamp = datetime.now().strftime("%I:%M:%S %p")
+        if self.store.append_log(job_id, timestamp, message):
+            publish_progress(f"job:{job_id}", "log", {"timestamp": timestamp, "message": message})
     
     def log_llm_call(self, job_id: str, call_number: int, model: str, prompt_length: int, response_length: int = None):
         """Log LLM call to UI processing log"""
         with self.lock:
-            if job_id not in self.progress_data["jobs"]:
+            if not self.store.has_job(job_id):
                 return
             
             if response_length:
@@ -307,62 +281,23 @@ class ProgressLogger:
             else:
                 self.add_to_progress_log(job_id, f"🧠 LLM Call #{call_number}: {model} - sending {prompt_length:,} chars...")
             
-            self.progress_data["last_updated"] = datetime.now().isoformat()
+            self._touch()
             
             # Console logging for immediate feedback  
             print(f"🧠 LLM Call #{call_number}: {model} - {prompt_length:,} chars")
             
             logger.info(f"Job {job_id}: LLM Call #{call_number} - {model}")
     
-    def _load_progress(self) -> None:
-        """Load progress data from JSON file"""
-        try:
-            if Path(self.log_file).exists():
-                with open(self.log_file, 'r') as f:
-                    self.progress_data = json.load(f)
-                    logger.info(f"Loaded existing progress data with {len(self.progress_data.get('jobs', {}))} jobs")
-            else:
-                # File doesn't exist, save empty data
-                self._save_progress()
-                logger.info("Created new progress data file")
-        except Exception as e:
-            logger.warning(f"Failed to load progress data: {e}, using empty data")
-            self._save_progress()
-    
-    def _save_progress(self) -> None:
-        """Save progress data to file (thread-safe)"""
-        try:
-            with open(self.log_file, 'w') as f:
-                json.dump(self.progress_data, f, indent=2, default=str)
-                f.flush()  # Force flush to disk
-                os.fsync(f.fileno())  # Force sync to disk
-        except Exception as e:
-            logger.error(f"Failed to save progress data: {e}")
-    
     def cleanup_old_jobs(self, max_jobs: int = 50) -> None:
-        """Clean up old completed jobs to prevent file growth"""
+        """Clean up old completed jobs to keep the store small"""
         with self.lock:
-            jobs = self.progress_data["jobs"]
-            
-            if len(jobs) <= max_jobs:
+            if self.store.count_jobs(COMPANY) <= max_jobs:
                 return
             
-            # Sort jobs by completion time, keep most recent
-            completed_jobs = [
-                (job_id, job_data) for job_id, job_data in jobs.items()
-                if job_data.get("status") in ["completed", "failed"] and job_data.get("end_time")
-            ]
-            
-            if len(completed_jobs) > max_jobs // 2:
-                # Sort by end_time and remove oldest
-                completed_jobs.sort(key=lambda x: x[1]["end_time"])
-                jobs_to_remove = completed_jobs[:-max_jobs//2]
-                
-                for job_id, _ in jobs_to_remove:
-                    del jobs[job_id]
-                
-                self._save_progress()
-                logger.info(f"Cleaned up {len(jobs_to_remove)} old jobs")
+            # Keep the most recently finished half; running jobs are never removed
+            removed = self.store.delete_oldest_finished(COMPANY, keep=max_jobs // 2)
+            if removed:
+                logger.info(f"Cleaned up {removed} old jobs")
 
 
 # Global progress logger instance
@@ -384,12 +319,10 @@ def start_company_processing(company_name: str) -> tuple[str, bool]:
     import uuid
     
     # Check if there's already a running job for this company
-    with progress_logger.lock:
-        for job_data in progress_logger.progress_data["jobs"].values():
-            if (job_data.get("company_name") == company_name and 
-                job_data.get("status") == "running"):
-                logger.warning(f"Company {company_name} is already being processed in job {job_data.get('job_id')}")
-                return job_data.get('job_id'), False  # Existing job
+    existing_job_id = progress_logger.find_running_job(company_name)
+    if existing_job_id:
+        logger.warning(f"Company {company_name} is already being processed in job {existing_job_id}")
+        return existing_job_id, False  # Existing job
     
     # Generate unique job ID using UUID to prevent collisions
     job_id = f"company_{int(time.time() * 1000)}_{str(uuid.uuid4())[:8]}"
@@ -407,45 +340,21 @@ def complete_company_processing(job_id: str, success: bool, error: str = None, s
 # ============================================================================
 
 class BatchProgressLogger:
-    """Handles progress tracking for batch processing operations with file persistence"""
+    """
+    Handles progress tracking for batch processing operations, persisted in the
+    shared progress store and published to the progress bus on "batch:<job_id>"
+    """
     
-    def __init__(self):
+    def __init__(self, store: Optional[ProgressStore] = None):
         self.lock = threading.Lock()
-        self.batch_file = "logs/batch_progress.json"
-        self.batch_jobs = {}
-        self._load_batch_progress()
-    
-    def _load_batch_progress(self) -> None:
-        """Load batch progress data from JSON file"""
-        try:
-            if Path(self.batch_file).exists():
-                with open(self.batch_file, 'r') as f:
-                    self.batch_jobs = json.load(f)
-                    logger.info(f"Loaded existing batch progress data with {len(self.batch_jobs)} jobs")
-            else:
-                # File doesn't exist, save empty data
-                self._save_batch_progress()
-                logger.info("Created new batch progress data file")
-        except Exception as e:
-            logger.warning(f"Failed to load batch progress data: {e}, using empty data")
-            self.batch_jobs = {}
-            self._save_batch_progress()
-    
-    def _save_batch_progress(self) -> None:
-        """Save batch progress data to file (thread-safe)"""
-        try:
-            os.makedirs(os.path.dirname(self.batch_file), exist_ok=True)
-            with open(self.batch_file, 'w') as f:
-                json.dump(self.batch_jobs, f, indent=2, default=str)
-                f.flush()  # Force flush to disk
-                os.fsync(f.fileno())  # Force sync to disk
-        except Exception as e:
-            logger.error(f"Failed to save batch progress data: {e}")
+        self.batch_file = "logs/batch_progress.json"  # Legacy file, imported once
+        self.store = store or ProgressStore()
+        self.store.import_legacy_json(self.batch_file, BATCH)
     
     def start_batch_job(self, job_id: str, total_companies: int):
         """Start tracking a batch processing job"""
         with self.lock:
-            self.batch_jobs[job_id] = {
+            job = {
                 'job_id': job_id,
                 'total_companies': total_companies,
                 'processed': 0,
@@ -457,64 +366,63 @@ class BatchProgressLogger:
                 'current_company': 'Initializing...',
                 'companies': []
             }
-            self._save_batch_progress()
+            self.store.put_job(job, BATCH)
+            publish_progress(f"batch:{job_id}", "progress", job, coalesce_key="progress")
     
     def update_batch_progress(self, job_id: str, processed_count: int, message: str, current_company: str = None):
         """Update progress for a batch job"""
+        
+        def apply(job: Dict) -> None:
+            job['processed'] = processed_count
+            job['current_message'] = message
+            
+            # Don't update counts here - they will be set in complete_batch_job
+            # Just track the progress
+            
+            # Extract current company from message if not provided
+            if current_company:
+                job['current_company'] = current_company
+            elif 'Processing ' in message:
+                # Extract company name from "Processing CompanyName..." message
+                import re
+                match = re.search(r'Processing ([^.]+)\.\.\.', message)
+                if match:
+                    job['current_company'] = match.group(1)
+            elif 'Completed' in message or 'Failed' in message:
+                # Extract company name from completion messages
+                import re
+                match = re.search(r'(?:Completed|Failed) ([^:]+)', message)
+                if match:
+                    job['current_company'] = match.group(1)
+        
         with self.lock:
-            # Reload data to get updates from other processes
-            self._load_batch_progress()
-            
-            if job_id in self.batch_jobs:
-                self.batch_jobs[job_id]['processed'] = processed_count
-                self.batch_jobs[job_id]['current_message'] = message
-                
-                # Don't update counts here - they will be set in complete_batch_job
-                # Just track the progress
-                
-                # Extract current company from message if not provided
-                if current_company:
-                    self.batch_jobs[job_id]['current_company'] = current_company
-                elif 'Processing ' in message:
-                    # Extract company name from "Processing CompanyName..." message
-                    import re
-                    match = re.search(r'Processing ([^.]+)\.\.\.', message)
-                    if match:
-                        self.batch_jobs[job_id]['current_company'] = match.group(1)
-                elif 'Completed' in message or 'Failed' in message:
-                    # Extract company name from completion messages
-                    import re
-                    match = re.search(r'(?:Completed|Failed) ([^:]+)', message)
-                    if match:
-                        self.batch_jobs[job_id]['current_company'] = match.group(1)
-                
-                self._save_batch_progress()
+            # Read-modify-write in one transaction, so updates from other processes aren't lost
+            job = self.store.update_job(job_id, apply, BATCH)
+            if job is not None:
+                publish_progress(f"batch:{job_id}", "progress", job, coalesce_key="progress")
     
     def complete_batch_job(self, job_id: str, successful_count: int, failed_count: int, results: dict):
         """Complete a batch processing job"""
+        
+        def apply(job: Dict) -> None:
+            job['successful'] = successful_count
+            job['failed'] = failed_count
+            job['status'] = 'completed'
+            job['end_time'] = datetime.now().isoformat()
+            job['current_message'] = f'Completed: {successful_count} successful, {failed_count} failed'
+            job['results'] = results
+        
         with self.lock:
-            # Reload data to get updates from other processes
-            self._load_batch_progress()
-            
-            if job_id in self.batch_jobs:
-                job = self.batch_jobs[job_id]
-                job['successful'] = successful_count
-                job['failed'] = failed_count
-                job['status'] = 'completed'
-                job['end_time'] = datetime.now().isoformat()
-                job['current_message'] = f'Completed: {successful_count} successful, {failed_count} failed'
-                job['results'] = results
-                self._save_batch_progress()
+            job = self.store.update_job(job_id, apply, BATCH)
+            if job is not None:
+                publish_progress(f"batch:{job_id}", "complete", job)
     
     def get_batch_progress(self, job_id: str):
-        """Get progress for a specific batch job"""
-        with self.lock:
-            # Reload data to get updates from other processes
-            self._load_batch_progress()
-            return self.batch_jobs.get(job_id)
+        """Get progress for a specific batch job (single indexed lookup)"""
+        return self.store.get_job(job_id, BATCH, include_log=False)
 
 # Global batch progress logger instance
-batch_progress_logger = BatchProgressLogger()
+batch_progress_logger = BatchProgressLogger(store=progress_logger.store)
 
 # Add batch methods to the main progress_logger for compatibility
 def start_batch_job(job_id: str, total_companies: int):
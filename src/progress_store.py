@@ -0,0 +1,295 @@
+"""
+SQLite Progress Store
+=====================
+
+Persistence backend for `ProgressLogger` and `BatchProgressLogger`. It replaces
+the old whole-file JSON rewrites (logs/processing_progress.json and
+logs/batch_progress.json), which re-serialized and fsync'd every job on
+every update.
+
+- One row per job (company or batch), looked up by its job_id primary key
+- Processing-log messages are appended to their own table, so
+  `add_to_progress_log` is a single INSERT instead of a job rewrite
+- WAL journal with synchronous=NORMAL: commits append to the WAL and only
+  checkpoints fsync, so disk cost stays flat as concurrent jobs and job
+  history grow
+- Read-modify-write updates run in `BEGIN IMMEDIATE` transactions, so the web
+  app and scraper subprocesses sharing the file see each other's updates
+
+Legacy JSON files are imported once, the first time a logger opens the database.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = "logs/progress.db"
+MAX_LOG_ENTRIES = 50
+# Trim a job's processing log after this many appends (reads always return the last MAX_LOG_ENTRIES)
+LOG_TRIM_INTERVAL = 25
+
+COMPANY = "company"
+BATCH = "batch"
+
+
+class ProgressStore:
+    """
+    Job progress rows in a WAL-mode SQLite database.
+
+    Thread-safe; several processes may share one database file.
+
+    Args:
+        db_path: SQLite file (parent directory is created)
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        parent = os.path.dirname(db_path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._log_appends: Dict[str, int] = {}
+        # Autocommit mode: single statements commit on their own, multi-statement
+        # updates use transaction()
+        self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT,
+                company_name TEXT,
+                start_time TEXT,
+                end_time TEXT,
+                data TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_kind_status ON jobs(kind, status);
+            CREATE INDEX IF NOT EXISTS idx_jobs_kind_end ON jobs(kind, end_time);
+            CREATE TABLE IF NOT EXISTS job_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                message TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_job_log_job ON job_log(job_id, id);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+
+    @contextmanager
+    def transaction(self):
+        """Serialize a read-modify-write against other threads and processes."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._db
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    # ------------------------------------------------------------------
+    # Jobs
+    # ------------------------------------------------------------------
+
+    def _write_job(self, job: Dict[str, Any], kind: str):
+        data = {key: value for key, value in job.items() if key != "processing_log"}
+        self._db.execute(
+            "INSERT OR REPLACE INTO jobs (job_id, kind, status, company_name, start_time, end_time, data, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (job["job_id"], kind, job.get("status"), job.get("company_name"), job.get("start_time"),
+             job.get("end_time"), json.dumps(data, default=str), time.time())
+        )
+
+    def _read_log(self, job_id: str) -> List[Dict[str, str]]:
+        rows = self._db.execute(
+            "SELECT timestamp, message FROM job_log WHERE job_id = ? ORDER BY id DESC LIMIT ?",
+            (job_id, MAX_LOG_ENTRIES)
+        ).fetchall()
+        return [{"timestamp": timestamp, "message": message} for timestamp, message in reversed(rows)]
+
+    def _row_to_job(self, job_id: str, data: str, include_log: bool) -> Dict[str, Any]:
+        job = json.loads(data)
+        if include_log:
+            log = self._read_log(job_id)
+            if log:
+                job["processing_log"] = log
+        return job
+
+    def put_job(self, job: Dict[str, Any], kind: str = COMPANY):
+        """Insert or replace a job. A `processing_log` key is ignored (see append_log)."""
+        with self._lock:
+            self._write_job(job, kind)
+
+    def get_job(self, job_id: str, kind: Optional[str] = None, include_log: bool = True) -> Optional[Dict[str, Any]]:
+        """One job by id, with its recent processing log."""
+        with self._lock:
+            if kind is None:
+                row = self._db.execute("SELECT data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            else:
+                row = self._db.execute(
+                    "SELECT data FROM jobs WHERE job_id = ? AND kind = ?", (job_id, kind)
+                ).fetchone()
+            return self._row_to_job(job_id, row[0], include_log) if row else None
+
+    def update_job(
+        self,
+        job_id: str,
+        mutate: Callable[[Dict[str, Any]], Any],
+        kind: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Atomically apply `mutate(job)` to a stored job and write it back.
+
+        Returns:
+            The updated job, or None if it doesn't exist (mutate isn't called)
+        """
+        with self.transaction():
+            row = self._db.execute(
+                "SELECT data, kind FROM jobs WHERE job_id = ?" + (" AND kind = ?" if kind else ""),
+                (job_id, kind) if kind else (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            job = json.loads(row[0])
+            mutate(job)
+            self._write_job(job, row[1])
+            return job
+
+    def has_job(self, job_id: str) -> bool:
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM jobs WHERE job_id = ?", (job_id,)).fetchone() is not None
+
+    def list_jobs(self, kind: str = COMPANY, status: Optional[str] = None,
+                  include_log: bool = True) -> Dict[str, Dict[str, Any]]:
+        """Jobs of one kind (optionally one status), keyed by job_id in start order."""
+        with self._lock:
+            if status is None:
+                rows = self._db.execute(
+                    "SELECT job_id, data FROM jobs WHERE kind = ? ORDER BY start_time", (kind,)
+                ).fetchall()
+            else:
+                rows = self._db.execute(
+                    "SELECT job_id, data FROM jobs WHERE kind = ? AND status = ? ORDER BY start_time", (kind, status)
+                ).fetchall()
+            return {job_id: self._row_to_job(job_id, data, include_log) for job_id, data in rows}
+
+    def find_running_job(self, company_name: str) -> Optional[str]:
+        """job_id of a running company job for `company_name`, if any."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT job_id FROM jobs WHERE kind = ? AND status = 'running' AND company_name = ? LIMIT 1",
+                (COMPANY, company_name)
+            ).fetchone()
+            return row[0] if row else None
+
+    def count_jobs(self, kind: str = COMPANY) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM jobs WHERE kind = ?", (kind,)).fetchone()[0]
+
+    def delete_oldest_finished(self, kind: str, keep: int) -> int:
+        """Delete finished jobs beyond the `keep` most recently ended; returns how many were removed."""
+        with self.transaction():
+            rows = self._db.execute(
+                "SELECT job_id FROM jobs WHERE kind = ? AND status IN ('completed', 'failed') "
+                "AND end_time IS NOT NULL ORDER BY end_time DESC LIMIT -1 OFFSET ?", (kind, keep)
+            ).fetchall()
+            for (job_id,) in rows:
+                self._db.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+                self._db.execute("DELETE FROM job_log WHERE job_id = ?", (job_id,))
+            return len(rows)
+
+    # ------------------------------------------------------------------
+    # Processing log
+    # ------------------------------------------------------------------
+
+    def append_log(self, job_id: str, timestamp: str, message: str) -> bool:
+        """
+        Append a processing-log message to an existing job.
+
+        Skips unknown jobs and immediate repeats of the previous message.
+
+        Returns:
+            True if the message was stored
+        """
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO job_log (job_id, timestamp, message) "
+                "SELECT ?, ?, ? WHERE EXISTS (SELECT 1 FROM jobs WHERE job_id = ?) "
+                "AND (SELECT message FROM job_log WHERE job_id = ? ORDER BY id DESC LIMIT 1) IS NOT ?",
+                (job_id, timestamp, message, job_id, job_id, message)
+            )
+            if cursor.rowcount != 1:
+                return False
+
+            appends = self._log_appends.get(job_id, 0) + 1
+            self._log_appends[job_id] = appends
+            if appends % LOG_TRIM_INTERVAL == 0:
+                self._db.execute(
+                    "DELETE FROM job_log WHERE job_id = ? AND id <= "
+                    "(SELECT id FROM job_log WHERE job_id = ? ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                    (job_id, job_id, MAX_LOG_ENTRIES)
+                )
+            return True
+
+    # ------------------------------------------------------------------
+    # Metadata
+    # ------------------------------------------------------------------
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+            return row[0] if row else None
+
+    def set_meta(self, key: str, value: Optional[str]):
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    # ------------------------------------------------------------------
+    # Migration
+    # ------------------------------------------------------------------
+
+    def import_legacy_json(self, path: str, kind: str = COMPANY):
+        """One-time import of an old JSON progress file (logs/processing_progress.json or batch_progress.json)."""
+        flag = f"legacy_imported:{kind}"
+        with self._lock:
+            if self.get_meta(flag) or not os.path.exists(path):
+                return
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+            except Exception as e:
+                logger.warning(f"Skipping unreadable legacy progress file {path}: {e}")
+                data = {}
+
+            jobs = data.get("jobs", {}) if kind == COMPANY else data
+            with self.transaction():
+                for job_id, job in jobs.items():
+                    if not isinstance(job, dict):
+                        continue
+                    job.setdefault("job_id", job_id)
+                    self._write_job(job, kind)
+                    for entry in job.get("processing_log", [])[-MAX_LOG_ENTRIES:]:
+                        self._db.execute(
+                            "INSERT INTO job_log (job_id, timestamp, message) VALUES (?, ?, ?)",
+                            (job_id, entry.get("timestamp", ""), entry.get("message", ""))
+                        )
+                self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, '1')", (flag,))
+            if jobs:
+                logger.info(f"Imported {len(jobs)} {kind} jobs from {path}")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,289 @@
+"""
+Staged Pipeline Executor
+========================
+
+Thread-based multi-stage executor used by
+`TheodoreIntelligencePipeline._process_companies_batch`
+(scrape -> extract -> embed -> upsert). Each stage has its own worker
+threads and a bounded input queue, so a company moves to the next stage as
+soon as it finishes the current one: one slow website only occupies one
+scrape worker while other companies are already being analyzed, embedded
+and stored.
+
+- Bounded queues give backpressure: when a downstream stage falls behind,
+  upstream workers block on `put` instead of piling up work in memory
+- A stage can take micro-batches (`batch_size` > 1, e.g. Pinecone upserts);
+  a partial batch is flushed after `batch_wait` seconds
+- An exception fails only that item; it is reported with the stage name and
+  the rest of the run continues
+- Per-stage metrics: items in/out, failures, busy time, throughput and
+  current / peak queue depth
+
+Usage:
+    pipeline = StagedPipeline([
+        Stage("scrape", scrape_one, workers=3),
+        Stage("upsert", upsert_many, workers=1, batch_size=10),
+    ])
+    result = pipeline.run(companies)
+    print(pipeline.report())
+"""
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+@dataclass
+class Stage:
+    """
+    One pipeline stage.
+
+    Args:
+        name: Stage name used in metrics and failure reports
+        fn: Item -> item; for batch stages, list of items -> list of items (same order)
+        workers: Threads running this stage
+        queue_size: Items allowed to wait in front of this stage
+        batch_size: Items per call to `fn` (1 = one item per call)
+        batch_wait: Seconds to wait for a batch to fill before running a partial one
+    """
+    name: str
+    fn: Callable[[Any], Any]
+    workers: int = 1
+    queue_size: int = 10
+    batch_size: int = 1
+    batch_wait: float = 1.0
+
+
+@dataclass
+class StageMetrics:
+    """Live counters for one stage"""
+    name: str
+    workers: int
+    queue_capacity: int
+    items_in: int = 0
+    items_out: int = 0
+    failed: int = 0
+    calls: int = 0
+    busy_seconds: float = 0.0
+    max_queue_depth: int = 0
+    first_item_at: Optional[float] = None
+    last_item_at: Optional[float] = None
+
+    @property
+    def throughput(self) -> float:
+        """Items completed per second while the stage was active"""
+        if not self.items_out or self.first_item_at is None or self.last_item_at is None:
+            return 0.0
+        active = self.last_item_at - self.first_item_at
+        return self.items_out / active if active > 0 else float(self.items_out)
+
+    @property
+    def utilization(self) -> float:
+        """Share of worker time spent running the stage function"""
+        if self.first_item_at is None or self.last_item_at is None:
+            return 0.0
+        active = (self.last_item_at - self.first_item_at) * self.workers
+        return min(1.0, self.busy_seconds / active) if active > 0 else 0.0
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of a pipeline run"""
+    outputs: List[Any] = field(default_factory=list)
+    failures: List[Tuple[Any, str, Exception]] = field(default_factory=list)
+    duration_seconds: float = 0.0
+
+
+class StagedPipeline:
+    """
+    Runs items through stages concurrently with bounded hand-off queues.
+
+    Args:
+        stages: Stages in order
+        on_error: Optional callback (item, stage_name, exception) for failed items
+    """
+
+    def __init__(self, stages: List[Stage], on_error: Optional[Callable[[Any, str, Exception], None]] = None):
+        if not stages:
+            raise ValueError("StagedPipeline needs at least one stage")
+        self.stages = stages
+        self.on_error = on_error
+        self._lock = threading.Lock()
+        self._queues: List[queue.Queue] = []
+        self._metrics: Dict[str, StageMetrics] = {}
+
+    def run(self, items: Iterable[Any]) -> PipelineResult:
+        """
+        Push items through every stage and wait for the last one to drain.
+
+        An exception raised by `items` itself is re-raised once the stages
+        have drained.
+
+        Returns:
+            PipelineResult with outputs in input order and failed items
+        """
+        started = time.time()
+        result = PipelineResult()
+        self._queues = [queue.Queue(maxsize=max(1, stage.queue_size)) for stage in self.stages]
+        self._metrics = {
+            stage.name: StageMetrics(stage.name, stage.workers, max(1, stage.queue_size)) for stage in self.stages
+        }
+        remaining_workers = [stage.workers for stage in self.stages]
+        outputs: List[Tuple[int, Any]] = []
+
+        threads = []
+        for index, stage in enumerate(self.stages):
+            for worker in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._worker,
+                    args=(index, remaining_workers, outputs, result),
+                    name=f"pipeline-{stage.name}-{worker}",
+                    daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+
+        # Feed from the caller's thread; blocks while the first stage is saturated.
+        # If the input iterator raises, the items already fed still drain and
+        # every worker is stopped and joined before the error propagates.
+        try:
+            for sequence, item in enumerate(items):
+                self._put(0, (sequence, item))
+        finally:
+            for _ in range(self.stages[0].workers):
+                self._queues[0].put(_STOP)
+            for thread in threads:
+                thread.join()
+
+        result.outputs = [item for _, item in sorted(outputs, key=lambda entry: entry[0])]
+        result.duration_seconds = time.time() - started
+        return result
+
+    def _put(self, index: int, envelope: Tuple[int, Any]):
+        stage_queue = self._queues[index]
+        stage_queue.put(envelope)
+        with self._lock:
+            metrics = self._metrics[self.stages[index].name]
+            metrics.items_in += 1
+            metrics.max_queue_depth = max(metrics.max_queue_depth, stage_queue.qsize())
+
+    def _worker(self, index: int, remaining_workers: List[int], outputs: List[Tuple[int, Any]], result: PipelineResult):
+        stage = self.stages[index]
+        stage_queue = self._queues[index]
+        stopping = False
+
+        while not stopping:
+            envelope = stage_queue.get()
+            if envelope is _STOP:
+                break
+            batch = [envelope]
+            if stage.batch_size > 1:
+                deadline = time.monotonic() + stage.batch_wait
+                while len(batch) < stage.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        envelope = stage_queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if envelope is _STOP:
+                        stopping = True
+                        break
+                    batch.append(envelope)
+            self._run_stage(index, batch, outputs, result)
+
+        with self._lock:
+            remaining_workers[index] -= 1
+            last_worker = remaining_workers[index] == 0
+        if last_worker and index + 1 < len(self.stages):
+            for _ in range(self.stages[index + 1].workers):
+                self._queues[index + 1].put(_STOP)
+
+    def _run_stage(self, index: int, batch: List[Tuple[int, Any]], outputs: List[Tuple[int, Any]], result: PipelineResult):
+        stage = self.stages[index]
+        metrics = self._metrics[stage.name]
+        items = [item for _, item in batch]
+        started = time.time()
+        with self._lock:
+            if metrics.first_item_at is None:
+                metrics.first_item_at = started
+        try:
+            if stage.batch_size > 1:
+                produced = stage.fn(items)
+                if produced is None or len(produced) != len(items):
+                    produced = items
+            else:
+                produced = [stage.fn(items[0])]
+            failed = False
+        except Exception as e:
+            failed = True
+            logger.error(f"Stage '{stage.name}' failed for {len(items)} item(s): {e}")
+            for item in items:
+                if self.on_error:
+                    try:
+                        self.on_error(item, stage.name, e)
+                    except Exception as callback_error:
+                        logger.warning(f"Pipeline error callback failed: {callback_error}")
+            with self._lock:
+                result.failures.extend((item, stage.name, e) for item in items)
+
+        finished = time.time()
+        with self._lock:
+            metrics.calls += 1
+            metrics.busy_seconds += finished - started
+            metrics.last_item_at = finished
+            if failed:
+                metrics.failed += len(items)
+            else:
+                metrics.items_out += len(items)
+        if failed:
+            return
+
+        for (sequence, _), item in zip(batch, produced):
+            if index + 1 < len(self.stages):
+                self._put(index + 1, (sequence, item))
+            else:
+                with self._lock:
+                    outputs.append((sequence, item))
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage counters, throughput and queue depth (safe to call while running)"""
+        with self._lock:
+            snapshot = {}
+            for index, stage in enumerate(self.stages):
+                metrics = self._metrics.get(stage.name)
+                if metrics is None:
+                    continue
+                snapshot[stage.name] = {
+                    'workers': metrics.workers,
+                    'items_in': metrics.items_in,
+                    'items_out': metrics.items_out,
+                    'failed': metrics.failed,
+                    'calls': metrics.calls,
+                    'busy_seconds': round(metrics.busy_seconds, 3),
+                    'throughput_per_second': round(metrics.throughput, 3),
+                    'utilization': round(metrics.utilization, 3),
+                    'queue_depth': self._queues[index].qsize() if index < len(self._queues) else 0,
+                    'queue_capacity': metrics.queue_capacity,
+                    'max_queue_depth': metrics.max_queue_depth,
+                }
+            return snapshot
+
+    def report(self) -> str:
+        """One line per stage; the busiest stage with the fullest queue is the bottleneck"""
+        lines = ["📊 Pipeline stages:"]
+        for name, metrics in self.get_metrics().items():
+            lines.append(
+                f"   {name:<8} {metrics['items_out']:>4} done, {metrics['failed']} failed, "
+                f"{metrics['throughput_per_second']:.2f}/s, {metrics['utilization']:.0%} busy "
+                f"({metrics['workers']} workers), queue peak {metrics['max_queue_depth']}/{metrics['queue_capacity']}"
+            )
+        return "\n".join(lines)
@@ -86,13 +86,15 @@ class TestPineconeSimilarityMethods:
         
         assert result == True
         
-        # Should call fetch for each company involved
+        # Should fetch every company involved, batched into as few calls as possible
         expected_fetch_calls = ["company-a", "company-b", "company-c"]
-        actual_fetch_calls = [call[1]['ids'][0] for call in mock_pinecone_index.fetch.call_args_list]
-        assert set(actual_fetch_calls) == set(expected_fetch_calls)
+        actual_fetch_calls = [i for call in mock_pinecone_index.fetch.call_args_list for i in call[1]['ids']]
+        assert sorted(actual_fetch_calls) == sorted(expected_fetch_calls)
         
-        # Should call update for each relationship (bidirectional)
-        assert mock_pinecone_index.update.call_count >= len(sample_similarities)
+        # Updates are coalesced: one per company, company-a carrying both relationships
+        assert mock_pinecone_index.update.call_count == 3
+        updates = {call[1]['id']: call[1]['set_metadata'] for call in mock_pinecone_index.update.call_args_list}
+        assert len(json.loads(updates["company-a"]["similar_companies"])) == 2
     
     def test_store_similarity_relationships_company_not_found(self, pinecone_client, mock_pinecone_index, sample_similarities):
         """Test storage when company not found in index"""
@@ -0,0 +1,147 @@
+"""
+Test cases for the antoine crawler's early-termination scheduler
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import asyncio
+import time
+import unittest
+
+from src.antoine_crawler import (
+    BatchCrawlResult, CrawlBudget, PageCrawlResult,
+    _aggregate_page_content, _crawl_until_budget, _order_by_priority
+)
+from src.antoine_selection import path_priority
+
+
+def make_crawler(delays, content_length=3000):
+    """Fake crawl_page coroutine: each URL sleeps for its delay then succeeds"""
+    started = []
+    cancelled = []
+
+    async def crawl_page(url):
+        started.append(url)
+        try:
+            await asyncio.sleep(delays[url])
+        except asyncio.CancelledError:
+            cancelled.append(url)
+            raise
+        return PageCrawlResult(url=url, success=True, content="x" * content_length,
+                               content_length=content_length)
+
+    return crawl_page, started, cancelled
+
+
+class TestCrawlBudget(unittest.TestCase):
+
+    def test_page_budget_requires_min_chars(self):
+        budget = CrawlBudget(max_pages=2, min_chars=5000)
+        self.assertEqual(budget.stop_reason(3, 1000), "")
+        self.assertIn("page budget", budget.stop_reason(2, 6000))
+
+    def test_char_budget(self):
+        budget = CrawlBudget(max_chars=10000)
+        self.assertEqual(budget.stop_reason(50, 9999), "")
+        self.assertIn("content budget", budget.stop_reason(1, 10000))
+
+    def test_order_by_priority(self):
+        urls = ["https://a.com/", "https://a.com/about", "https://a.com/blog"]
+        paths = ["/", "/about", "/blog"]
+        ordered = _order_by_priority(urls, paths, {"/": 0.7, "/about": 0.9})
+        self.assertEqual(ordered, ["https://a.com/about", "https://a.com/", "https://a.com/blog"])
+        self.assertEqual(_order_by_priority(urls, paths, None), urls)
+
+    def test_selection_priorities_put_company_pages_before_blog(self):
+        paths = ["/blog/launch", "/news", "/contact-us", "/careers", "/en/pricing", "/our-team",
+                 "/about-us", "/", "/integrations"]
+        urls = [f"https://a.com{path}" for path in paths]
+        priorities = {path: path_priority(path) for path in paths}
+
+        ordered = _order_by_priority(urls, paths, priorities)
+
+        self.assertEqual([url[len("https://a.com"):] for url in ordered], [
+            "/about-us", "/our-team", "/", "/en/pricing", "/contact-us", "/careers", "/integrations",
+            "/blog/launch", "/news"
+        ])
+
+
+class TestCrawlUntilBudget(unittest.IsolatedAsyncioTestCase):
+
+    async def test_cancels_slow_tail_once_budget_met(self):
+        delays = {"fast1": 0.01, "fast2": 0.02, "slow1": 5, "slow2": 5}
+        crawl_page, _, cancelled = make_crawler(delays)
+
+        start = time.time()
+        results, cancelled_urls, reason = await _crawl_until_budget(
+            list(delays), crawl_page, CrawlBudget(max_pages=2, min_chars=5000), None, []
+        )
+
+        self.assertLess(time.time() - start, 1)
+        self.assertEqual({r.url for r in results}, {"fast1", "fast2"})
+        self.assertEqual(cancelled_urls, ["slow1", "slow2"])
+        self.assertEqual(sorted(cancelled), ["slow1", "slow2"])
+        self.assertIn("page budget", reason)
+
+    async def test_deadline_cancels_in_flight_pages(self):
+        delays = {"fast": 0.01, "slow": 5}
+        crawl_page, _, _ = make_crawler(delays)
+
+        results, cancelled_urls, reason = await _crawl_until_budget(
+            list(delays), crawl_page, CrawlBudget(deadline_seconds=0.2), time.time() + 0.2, []
+        )
+
+        self.assertEqual([r.url for r in results], ["fast"])
+        self.assertEqual(cancelled_urls, ["slow"])
+        self.assertIn("deadline", reason)
+
+    async def test_prior_results_count_towards_budget(self):
+        crawl_page, started, _ = make_crawler({"a": 0.01})
+        prior = [PageCrawlResult(url="p", success=True, content_length=20000)]
+
+        results, cancelled_urls, reason = await _crawl_until_budget(
+            ["a"], crawl_page, CrawlBudget(max_chars=10000), None, prior
+        )
+
+        self.assertEqual(results, [])
+        self.assertEqual(cancelled_urls, ["a"])
+        self.assertEqual(started, [])
+        self.assertIn("content budget", reason)
+
+    async def test_runs_everything_without_budget(self):
+        delays = {"a": 0.01, "b": 0.02}
+        crawl_page, _, _ = make_crawler(delays)
+
+        results, cancelled_urls, reason = await _crawl_until_budget(
+            list(delays), crawl_page, CrawlBudget(), None, []
+        )
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(cancelled_urls, [])
+        self.assertEqual(reason, "")
+
+
+class TestAggregateCancellationStats(unittest.TestCase):
+
+    def test_footer_reports_cancelled_pages(self):
+        page = PageCrawlResult(url="https://a.com/about", success=True, content="About us", content_length=8)
+        cancelled = PageCrawlResult(url="https://a.com/blog", success=False,
+                                    error="Cancelled: page budget met", extraction_method="cancelled")
+        batch = BatchCrawlResult(
+            base_url="https://a.com", total_pages=2, successful_pages=1, failed_pages=0,
+            total_content_length=8, total_crawl_time=1.0, page_results=[page, cancelled],
+            cancelled_pages=1, stop_reason="page budget met (1/1 pages)"
+        )
+
+        aggregated = _aggregate_page_content([page], "https://a.com", batch)
+
+        self.assertIn("Crawl stopped early: page budget met (1/1 pages)", aggregated)
+        self.assertIn("Pages cancelled: 1 of 2", aggregated)
+        self.assertIn("  - https://a.com/blog", aggregated)
+        self.assertNotIn("Crawl stopped early", _aggregate_page_content([page], "https://a.com"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Test cases for the async page fetcher used by the antoine crawler
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import asyncio
+import time
+import unittest
+
+from aiohttp import web
+
+from src.antoine_fetcher import AsyncPageFetcher, get_page_fetcher, close_page_fetcher
+
+
+class TestAsyncPageFetcher(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        """Start a local HTTP server with slow, large and binary pages"""
+        async def slow_page(request):
+            await asyncio.sleep(0.3)
+            return web.Response(text="<html><body><p>Slow page</p></body></html>", content_type="text/html")
+
+        async def large_page(request):
+            return web.Response(text="<html>" + "x" * 200000 + "</html>", content_type="text/html")
+
+        async def latin1_page(request):
+            return web.Response(body="<p>Société</p>".encode("latin-1"),
+                                headers={"Content-Type": "text/html; charset=iso-8859-1"})
+
+        async def image(request):
+            return web.Response(body=b"\x89PNG", content_type="image/png")
+
+        app = web.Application()
+        app.router.add_get("/slow/{n}", slow_page)
+        app.router.add_get("/large", large_page)
+        app.router.add_get("/latin1", latin1_page)
+        app.router.add_get("/image.png", image)
+
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+
+        self.fetcher = AsyncPageFetcher(max_per_host=10, prefer_http2=False)
+
+    async def asyncTearDown(self):
+        await self.fetcher.close()
+        await self.runner.cleanup()
+
+    async def test_concurrent_fetches_overlap(self):
+        """Ten 300ms pages should finish in well under 10 x 300ms"""
+        start = time.time()
+        results = await asyncio.gather(*[
+            self.fetcher.fetch(f"{self.base_url}/slow/{i}") for i in range(10)
+        ])
+        elapsed = time.time() - start
+
+        self.assertTrue(all(r.success for r in results))
+        self.assertIn("Slow page", results[0].html)
+        self.assertLess(elapsed, 1.5)
+
+    async def test_body_size_limit(self):
+        result = await self.fetcher.fetch(f"{self.base_url}/large", max_body_bytes=1024)
+        self.assertTrue(result.success)
+        self.assertTrue(result.truncated)
+        self.assertEqual(len(result.html), 1024)
+
+    async def test_declared_charset_is_used(self):
+        result = await self.fetcher.fetch(f"{self.base_url}/latin1")
+        self.assertIn("Société", result.html)
+
+    async def test_non_html_and_missing_pages_fail(self):
+        image = await self.fetcher.fetch(f"{self.base_url}/image.png")
+        missing = await self.fetcher.fetch(f"{self.base_url}/missing")
+
+        self.assertFalse(image.success)
+        self.assertIn("Unsupported content type", image.error)
+        self.assertFalse(missing.success)
+        self.assertEqual(missing.status, 404)
+        self.assertEqual(self.fetcher.stats.failures, 2)
+
+    async def test_timeout(self):
+        result = await self.fetcher.fetch(f"{self.base_url}/slow/1", timeout_seconds=0.05)
+        self.assertFalse(result.success)
+        self.assertIn("Timeout", result.error)
+
+    async def test_shared_fetcher_per_loop(self):
+        first = get_page_fetcher()
+        self.assertIs(first, get_page_fetcher())
+        await close_page_fetcher()
+        self.assertTrue(first.closed)
+        self.assertIsNot(first, get_page_fetcher())
+        await close_page_fetcher()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+"""
+Test cases for the shared headless browser pool
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import asyncio
+import threading
+import unittest
+from types import SimpleNamespace
+
+from src.browser_pool import BrowserPool
+
+
+class FakeCrawler:
+    """Stands in for AsyncWebCrawler; records which loop it runs on"""
+    instances = []
+
+    def __init__(self, fail_health_check=False):
+        self.started = False
+        self.closed = False
+        self.loops = set()
+        self.fail_health_check = fail_health_check
+        FakeCrawler.instances.append(self)
+
+    async def start(self):
+        self.started = True
+
+    async def close(self):
+        self.closed = True
+
+    async def arun(self, url, config=None):
+        self.loops.add(id(asyncio.get_running_loop()))
+        if url.startswith("raw:"):
+            return SimpleNamespace(success=not self.fail_health_check)
+        if url == "boom":
+            raise RuntimeError("Target page, context or browser has been closed")
+        await asyncio.sleep(0.01)
+        return SimpleNamespace(success=True, url=url)
+
+    async def arun_many(self, urls, config=None):
+        return [await self.arun(url, config) for url in urls]
+
+
+class TestBrowserPool(unittest.TestCase):
+
+    def setUp(self):
+        FakeCrawler.instances = []
+        self.pool = BrowserPool(max_browsers=2, max_pages_per_browser=3, lease_timeout=5,
+                                crawler_factory=FakeCrawler)
+
+    def tearDown(self):
+        self.pool.shutdown()
+
+    async def _crawl(self, urls):
+        async with self.pool.lease() as crawler:
+            return await crawler.arun_many(urls)
+
+    def test_browser_reused_across_event_loops(self):
+        """Separate asyncio.run() calls (one per company) share one warm browser"""
+        asyncio.run(self._crawl(["a"]))
+        asyncio.run(self._crawl(["b"]))
+
+        stats = self.pool.get_stats()
+        self.assertEqual(stats['launches'], 1)
+        self.assertEqual(stats['leases'], 2)
+        self.assertEqual(stats['browsers_idle'], 1)
+        # Every call ran on the pool's own loop
+        self.assertEqual(len(FakeCrawler.instances[0].loops), 1)
+
+    def test_recycles_after_max_pages(self):
+        asyncio.run(self._crawl(["a", "b", "c"]))
+        asyncio.run(self._crawl(["d"]))
+
+        stats = self.pool.get_stats()
+        self.assertEqual(stats['launches'], 2)
+        self.assertEqual(stats['recycled'], 1)
+        self.assertTrue(FakeCrawler.instances[0].closed)
+
+    def test_browser_error_retires_browser(self):
+        async def crawl_boom():
+            async with self.pool.lease() as crawler:
+                await crawler.arun("boom")
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(crawl_boom())
+        asyncio.run(self._crawl(["a"]))
+
+        self.assertEqual(self.pool.get_stats()['browser_errors'], 1)
+        self.assertEqual(self.pool.get_stats()['launches'], 2)
+
+    def test_failed_health_check_replaces_idle_browser(self):
+        pool = BrowserPool(max_browsers=1, health_check_interval=0,
+                           crawler_factory=lambda: FakeCrawler(fail_health_check=True))
+        try:
+            async def crawl():
+                async with pool.lease() as crawler:
+                    await crawler.arun("a")
+
+            asyncio.run(crawl())
+            asyncio.run(crawl())
+            self.assertEqual(pool.get_stats()['health_check_failures'], 1)
+            self.assertEqual(pool.get_stats()['launches'], 2)
+        finally:
+            pool.shutdown()
+
+    def test_leases_are_capped_across_threads(self):
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        async def hold_lease():
+            async with self.pool.lease():
+                with lock:
+                    active.append(1)
+                    peak.append(len(active))
+                await asyncio.sleep(0.05)
+                with lock:
+                    active.pop()
+
+        threads = [threading.Thread(target=lambda: asyncio.run(hold_lease())) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertLessEqual(max(peak), 2)
+        self.assertEqual(self.pool.get_stats()['leases'], 6)
+        self.assertLessEqual(self.pool.get_stats()['launches'], 2)
+        # Four of the six leases queue behind a 50ms hold
+        self.assertGreaterEqual(self.pool.get_stats()['total_lease_wait'], 0.1)
+
+    def test_warm_up_and_shutdown(self):
+        self.assertEqual(self.pool.warm_up(wait=True), 2)
+        asyncio.run(self._crawl(["a"]))
+        self.assertEqual(self.pool.get_stats()['launches'], 2)
+
+        self.pool.shutdown()
+        self.assertTrue(all(c.closed for c in FakeCrawler.instances))
+        self.assertFalse(self.pool.get_stats()['running'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+"""
+Test cases for the local company metadata mirror
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import src.company_mirror as company_mirror
+from src.company_mirror import CompanyMetadataMirror, ensure_company_mirror, set_company_mirror
+from src.models import CompanyData, CompanyIntelligenceConfig
+from src.pinecone_client import PineconeClient
+
+
+def metadata(name, industry="SaaS", **extra):
+    return {"company_name": name, "website": f"https://{name.lower().replace(' ', '')}.com",
+            "industry": industry, "business_model": "B2B", **extra}
+
+
+class TestCompanyMetadataMirror(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.mirror = CompanyMetadataMirror(os.path.join(self.tmp.name, "companies.db"))
+        self.mirror.upsert_many([
+            ("1", metadata("Stripe", "Fintech", founding_year=2010)),
+            ("2", metadata("Stripe Atlas", "Fintech", founding_year=2016)),
+            ("3", metadata("Acme Cloud", "Cloud Software", founding_year="Unknown")),
+            ("4", metadata("St. Jude Labs", "Healthcare", founding_year=1962)),
+        ])
+
+    def tearDown(self):
+        self.mirror.close()
+        self.tmp.cleanup()
+
+    def test_search_ranks_name_prefix_matches_like_the_old_endpoint(self):
+        names = [meta["company_name"] for _, meta in self.mirror.search("str")]
+        self.assertEqual(names, ["Stripe", "Stripe Atlas"])
+        # Spaces and punctuation are ignored in the name prefix
+        self.assertEqual([meta["company_name"] for _, meta in self.mirror.search("stj")], ["St. Jude Labs"])
+        # No name-prefix match: fall back to word-prefix search over indexed fields
+        self.assertEqual([meta["company_name"] for _, meta in self.mirror.search("clou")], ["Acme Cloud"])
+        self.assertEqual([meta["company_name"] for _, meta in self.mirror.search("atl")], ["Stripe Atlas"])
+        self.assertEqual(self.mirror.search("zz"), [])
+
+    def test_pagination_sorting_and_filters(self):
+        page, total = self.mirror.list_companies(page=1, per_page=2)
+        self.assertEqual(total, 4)
+        self.assertEqual([meta["company_name"] for _, meta in page], ["Acme Cloud", "St. Jude Labs"])
+        page, _ = self.mirror.list_companies(page=2, per_page=2)
+        self.assertEqual([company_id for company_id, _ in page], ["1", "2"])
+
+        page, _ = self.mirror.list_companies(sort="founding_year", order="desc")
+        self.assertEqual([company_id for company_id, _ in page], ["2", "1", "4", "3"])  # Unknown year last
+
+        page, total = self.mirror.list_companies(industry="fintech", query="atlas")
+        self.assertEqual((total, [company_id for company_id, _ in page]), (1, ["2"]))
+
+    def test_updates_and_deletes_keep_search_index_in_step(self):
+        self.mirror.upsert("1", metadata("Stripe Inc", "Payments"))
+        self.assertEqual(self.mirror.get("1")["industry"], "Payments")
+        self.assertEqual(self.mirror.list_companies(query="payments")[1], 1)
+        self.assertEqual(self.mirror.list_companies(query="fintech")[1], 1)
+
+        self.mirror.delete("2")
+        self.assertEqual([company_id for company_id, _ in self.mirror.search("stri")], ["1"])
+        self.mirror.clear()
+        self.assertEqual(self.mirror.count(), 0)
+        self.assertEqual(self.mirror.search("stri"), [])
+
+    def test_sync_from_index_pages_through_all_ids(self):
+        vectors = {f"id{i}": SimpleNamespace(metadata=metadata(f"Company {i}")) for i in range(250)}
+        index = MagicMock()
+        index.list.return_value = iter([list(vectors)[:120], list(vectors)[120:]])
+        index.fetch.side_effect = lambda ids: SimpleNamespace(vectors={i: vectors[i] for i in ids})
+
+        self.mirror.clear()
+        self.assertIsNone(self.mirror.last_sync())
+        self.assertEqual(self.mirror.sync_from_index(index), 250)
+        self.assertEqual(self.mirror.count(), 250)
+        self.assertIsNotNone(self.mirror.last_sync())
+        index.query.assert_not_called()
+
+    def test_resync_drops_companies_deleted_from_the_index(self):
+        vectors = {"1": SimpleNamespace(metadata=metadata("Stripe", "Payments")),
+                   "5": SimpleNamespace(metadata=metadata("Globex"))}
+        index = MagicMock()
+        index.list.return_value = iter([list(vectors)])
+        index.fetch.side_effect = lambda ids: SimpleNamespace(vectors={i: vectors[i] for i in ids})
+
+        self.assertEqual(self.mirror.sync_from_index(index), 2)
+        self.assertEqual(self.mirror.count(), 2)
+        self.assertEqual(self.mirror.get("1")["industry"], "Payments")
+        self.assertIsNone(self.mirror.get("3"))
+
+    def test_stale_mirror_is_resynced_in_the_background(self):
+        set_company_mirror(self.mirror)
+        self.addCleanup(set_company_mirror, None)
+        index = MagicMock()
+        index.list.return_value = iter([["1"]])
+        index.fetch.return_value = SimpleNamespace(vectors={"1": SimpleNamespace(metadata=metadata("Stripe"))})
+
+        # Fresh mirror: served as is
+        self.mirror.sync_from_index(MagicMock(list=MagicMock(return_value=iter([]))))
+        self.assertIs(ensure_company_mirror(index), self.mirror)
+        index.list.assert_not_called()
+
+        with patch.object(time, "time", return_value=time.time() + 2 * 24 * 3600):
+            self.assertTrue(self.mirror.is_stale(24 * 3600))
+            self.assertIs(ensure_company_mirror(index), self.mirror)
+            company_mirror._resync_thread.join(5)
+        index.list.assert_called_once()
+        self.assertEqual(self.mirror.count(), 1)
+
+
+class TestPineconeWriteThrough(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.mirror = CompanyMetadataMirror(os.path.join(self.tmp.name, "companies.db"))
+        set_company_mirror(self.mirror)
+        self.client = PineconeClient.__new__(PineconeClient)
+        self.client.config = CompanyIntelligenceConfig()
+        self.client.index = MagicMock()
+
+    def tearDown(self):
+        set_company_mirror(None)
+        self.mirror.close()
+        self.tmp.cleanup()
+
+    def test_upserts_deletes_and_clear_are_mirrored(self):
+        companies = [
+            CompanyData(id=f"c{i}", name=f"Company {i}", website=f"https://c{i}.com", embedding=[0.1, 0.2])
+            for i in range(3)
+        ]
+        self.assertTrue(self.client.upsert_company(companies[0]))
+        self.assertEqual(self.client.batch_upsert_companies(companies[1:]), 2)
+        self.assertEqual(self.mirror.count(), 3)
+        self.assertEqual(self.mirror.get("c2")["website"], "https://c2.com")
+
+        self.client.delete_company("c0")
+        self.assertIsNone(self.mirror.get("c0"))
+        self.client.clear_all_records()
+        self.assertEqual(self.mirror.count(), 0)
+
+    def test_metadata_updates_are_mirrored(self):
+        self.mirror.upsert("c1", metadata("Acme"))
+        updated = {**metadata("Acme"), "saas_classification": "Vertical SaaS"}
+
+        self.assertTrue(self.client.set_company_metadata("c1", updated))
+
+        self.client.index.update.assert_called_once_with(id="c1", set_metadata=updated)
+        self.assertEqual(self.mirror.get("c1")["saas_classification"], "Vertical SaaS")
+
+    def test_failed_pinecone_write_is_not_mirrored(self):
+        self.client.index.upsert.side_effect = RuntimeError("unavailable")
+        company = CompanyData(id="c1", name="Acme", website="https://acme.com", embedding=[0.1])
+        self.assertFalse(self.client.upsert_company(company))
+        self.assertFalse(self.client.update_company_metadata("c1", [0.1], {"company_name": "Acme"}))
+        self.client.index.update.side_effect = RuntimeError("unavailable")
+        self.assertFalse(self.client.set_company_metadata("c1", {"company_name": "Acme"}))
+        self.assertEqual(self.mirror.count(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
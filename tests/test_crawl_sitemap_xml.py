@@ -0,0 +1,143 @@
+"""
+Test cases for the streaming, concurrent sitemap crawler
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import asyncio
+import gzip
+import time
+import unittest
+
+from aiohttp import web
+
+from src.crawl_sitemap_xml import SitemapStreamParser, extract_sitemap_paths, extract_sitemap_urls
+from src.discovery_cache import set_discovery_cache
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+
+def urlset(urls):
+    body = "".join(f"<url><loc>{u}</loc><lastmod>2024-01-01</lastmod></url>" for u in urls)
+    return f'<?xml version="1.0" encoding="UTF-8"?><urlset {NS}>{body}</urlset>'
+
+
+def sitemapindex(locs):
+    body = "".join(f"<sitemap><loc>{loc}</loc></sitemap>" for loc in locs)
+    return f'<?xml version="1.0" encoding="UTF-8"?><sitemapindex {NS}>{body}</sitemapindex>'
+
+
+class TestSitemapStreamParser(unittest.TestCase):
+
+    def feed_in_chunks(self, data, size):
+        parser = SitemapStreamParser()
+        records = []
+        for i in range(0, len(data), size):
+            records.extend(parser.feed(data[i:i + size]))
+        records.extend(parser.close())
+        return parser, records
+
+    def test_urlset_parsed_incrementally(self):
+        data = urlset([f"https://a.com/p{i}" for i in range(100)]).encode()
+        parser, records = self.feed_in_chunks(data, 7)
+
+        self.assertEqual(parser.kind, "urlset")
+        self.assertEqual(len(records), 100)
+        self.assertEqual(records[0], ("url", {"loc": "https://a.com/p0", "lastmod": "2024-01-01"}))
+        # Parsed elements are dropped as we go
+        self.assertEqual(len(parser._root), 0)
+
+    def test_gzipped_index(self):
+        data = gzip.compress(sitemapindex(["https://a.com/s1.xml.gz", "https://a.com/s2.xml"]).encode())
+        parser, records = self.feed_in_chunks(data, 1)
+
+        self.assertTrue(parser.is_index)
+        self.assertEqual([r[1]["loc"] for r in records], ["https://a.com/s1.xml.gz", "https://a.com/s2.xml"])
+
+    def test_plain_text_sitemap(self):
+        _, records = self.feed_in_chunks(b"https://a.com/one\nnot a url\nhttps://a.com/two", 5)
+        self.assertEqual([r[1]["loc"] for r in records], ["https://a.com/one", "https://a.com/two"])
+
+    def test_size_limit(self):
+        parser = SitemapStreamParser(max_bytes=1000)
+        parser.feed(gzip.compress(urlset([f"https://a.com/p{i}" for i in range(500)]).encode()))
+        self.assertTrue(parser.exhausted)
+        self.assertEqual(parser.bytes_out, 1000)
+
+
+class TestSitemapCrawler(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        """Local site: robots.txt -> index -> 20 child sitemaps (half gzipped) of 50 URLs each"""
+        set_discovery_cache(None)  # Every test crawls the live local site
+        self.requests = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+        async def robots(request):
+            return web.Response(text=f"User-agent: *\nSitemap: {self.base_url}/sitemap_index.xml\n")
+
+        async def index(request):
+            children = [f"{self.base_url}/sitemap-{i}.xml" + (".gz" if i % 2 else "") for i in range(20)]
+            children.append(f"{self.base_url}/sitemap-0.xml")  # duplicate reference
+            return web.Response(text=sitemapindex(children), content_type="application/xml")
+
+        async def child(request):
+            self.requests.append(request.path)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            try:
+                await asyncio.sleep(0.2)
+            finally:
+                self.in_flight -= 1
+            n = int(request.match_info["n"])
+            urls = [f"{self.base_url}/section-{n}/page-{j}" for j in range(50)]
+            urls.append("https://other-domain.com/ignored")
+            body = urlset(urls).encode()
+            if request.path.endswith(".gz"):
+                return web.Response(body=gzip.compress(body), content_type="application/x-gzip")
+            return web.Response(body=body, content_type="application/xml")
+
+        app = web.Application()
+        app.router.add_get("/robots.txt", robots)
+        app.router.add_get("/sitemap_index.xml", index)
+        app.router.add_get("/sitemap-{n:\\d+}.xml", child)
+        app.router.add_get("/sitemap-{n:\\d+}.xml.gz", child)
+
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}"
+
+    async def asyncTearDown(self):
+        await self.runner.cleanup()
+
+    async def test_children_fetched_concurrently_with_bound(self):
+        start = time.time()
+        entries = await extract_sitemap_urls(self.base_url, max_concurrency=5)
+        elapsed = time.time() - start
+
+        self.assertEqual(len(entries), 1000)
+        self.assertEqual(len(self.requests), 20)
+        self.assertLessEqual(self.peak_in_flight, 5)
+        # 20 x 200ms serially would be 4s
+        self.assertLess(elapsed, 2.0)
+        # Sitemap order is kept regardless of completion order
+        self.assertEqual(entries[0].url, f"{self.base_url}/section-0/page-0")
+        self.assertEqual(entries[-1].url, f"{self.base_url}/section-19/page-49")
+        self.assertEqual(entries[0].lastmod, "2024-01-01")
+
+    async def test_stops_at_url_cap(self):
+        paths = await extract_sitemap_paths(self.base_url, max_urls=120)
+
+        self.assertEqual(len(paths), 120)
+        self.assertLess(len(self.requests), 20)
+        self.assertIn("/section-0/page-0", paths)
+
+
+if __name__ == '__main__':
+    unittest.main()
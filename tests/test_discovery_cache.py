@@ -0,0 +1,169 @@
+"""
+Test cases for the persistent per-domain discovery cache
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import tempfile
+import time
+import unittest
+
+from aiohttp import web
+
+from src.crawl_robots_txt import extract_robots_info
+from src.crawl_sitemap_xml import extract_sitemap_urls
+from src.discovery_cache import NEGATIVE_TTL_SECONDS, DiscoveryCache, domain_key, set_discovery_cache
+from src.host_scheduler import set_host_scheduler
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+
+class TestDiscoveryCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = DiscoveryCache(os.path.join(self.tmp.name, "discovery.db"), ttl=60)
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def test_entries_are_keyed_by_domain_kind_and_variant(self):
+        self.cache.store("https://Acme.com/about", "sitemap", ["/a"], {"https://acme.com/sitemap.xml": {"etag": '"v1"'}},
+                         variant="en-us")
+
+        entry = self.cache.lookup("https://acme.com/", "sitemap", "en-us")
+        self.assertEqual(entry.payload, ["/a"])
+        self.assertEqual(entry.validators["https://acme.com/sitemap.xml"], {"etag": '"v1"'})
+        self.assertTrue(entry.fresh)
+        self.assertIsNone(self.cache.lookup("https://acme.com/", "sitemap"))
+        self.assertIsNone(self.cache.lookup("https://acme.com/", "robots", "en-us"))
+        self.assertEqual(domain_key("http://127.0.0.1:8080/x"), "127.0.0.1:8080")
+
+    def test_stale_entries_persist_and_can_be_refreshed(self):
+        self.cache.store("acme.com", "robots", {"found": True}, ttl=0)
+        other = DiscoveryCache(self.cache.path)
+        entry = other.lookup("https://acme.com", "robots")
+        self.assertFalse(entry.fresh)
+
+        entry.ttl = 60
+        other.mark_revalidated(entry)
+        self.assertEqual(other.get_stats()["revalidated"], 1)
+        other.invalidate("acme.com")
+        self.assertEqual(other.count(), 0)
+        other.close()
+
+
+class TestCachedDiscovery(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        """Local site whose robots.txt and sitemap honour If-None-Match"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = DiscoveryCache(os.path.join(self.tmp.name, "discovery.db"))
+        set_discovery_cache(self.cache)
+        set_host_scheduler(None)
+        self.hits = {"robots": 0, "sitemap": 0, "not_modified": 0}
+        self.version = "v1"
+        self.status = None  # Set to make robots.txt and sitemap.xml answer with an error
+
+        def conditional(request, kind, body, content_type):
+            self.hits[kind] += 1
+            if self.status:
+                return web.Response(status=self.status)
+            etag = f'"{kind}-{self.version}"'
+            if request.headers.get("If-None-Match") == etag:
+                self.hits["not_modified"] += 1
+                return web.Response(status=304, headers={"ETag": etag})
+            return web.Response(text=body, content_type=content_type, headers={"ETag": etag})
+
+        async def robots(request):
+            body = f"User-agent: *\nDisallow: /admin\nCrawl-delay: 1\nSitemap: {self.base_url}/sitemap.xml\n"
+            return conditional(request, "robots", body, "text/plain")
+
+        async def sitemap(request):
+            pages = ["about", "pricing"] + (["careers"] if self.version == "v2" else [])
+            body = "".join(f"<url><loc>{self.base_url}/{page}</loc></url>" for page in pages)
+            return conditional(request, "sitemap", f'<?xml version="1.0"?><urlset {NS}>{body}</urlset>',
+                               "application/xml")
+
+        app = web.Application()
+        app.router.add_get("/robots.txt", robots)
+        app.router.add_get("/sitemap.xml", sitemap)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.base_url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+    async def asyncTearDown(self):
+        await self.runner.cleanup()
+        set_discovery_cache(None)
+        set_host_scheduler(None)
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def expire(self):
+        with self.cache._lock:
+            self.cache._db.execute("UPDATE discovery SET fetched_at = 0")
+            self.cache._db.commit()
+
+    async def test_fresh_sitemap_entries_skip_the_network(self):
+        first = await extract_sitemap_urls(self.base_url)
+        fetched = dict(self.hits)
+
+        started = time.monotonic()
+        again = await extract_sitemap_urls(self.base_url)
+        self.assertLess(time.monotonic() - started, 0.05)
+        self.assertEqual([e.url for e in again], [e.url for e in first])
+        self.assertEqual(self.hits, fetched)
+
+    async def test_stale_entries_are_revalidated_with_conditional_requests(self):
+        await extract_sitemap_urls(self.base_url)
+        self.expire()
+
+        entries = await extract_sitemap_urls(self.base_url)
+        self.assertEqual(len(entries), 2)
+        self.assertEqual(self.hits["not_modified"], 2)  # robots.txt and sitemap.xml
+        self.assertTrue(self.cache.lookup(self.base_url, "sitemap", "|10000").fresh)
+
+        # A changed document triggers a full rebuild
+        self.expire()
+        self.version = "v2"
+        entries = await extract_sitemap_urls(self.base_url)
+        self.assertEqual(len(entries), 3)
+
+    async def test_transient_failures_are_not_cached(self):
+        self.status = 503
+        self.assertEqual(await extract_sitemap_urls(self.base_url), [])
+        self.assertIsNone(self.cache.lookup(self.base_url, "sitemap", "|10000"))
+
+        self.status = None
+        entries = await extract_sitemap_urls(self.base_url)
+        self.assertEqual(len(entries), 2)
+
+    async def test_missing_sitemap_is_cached_briefly(self):
+        self.status = 404
+        self.assertEqual(await extract_sitemap_urls(self.base_url), [])
+        entry = self.cache.lookup(self.base_url, "sitemap", "|10000")
+        self.assertEqual(entry.payload, [])
+        self.assertEqual(entry.ttl, NEGATIVE_TTL_SECONDS)
+
+    async def test_robots_rules_are_cached_and_revalidated(self):
+        first = await extract_robots_info(self.base_url)
+        self.assertTrue(first.found)
+
+        cached = await extract_robots_info(self.base_url)
+        self.assertEqual(self.hits["robots"], 1)
+        self.assertEqual(cached.user_agents, first.user_agents)
+        self.assertEqual(cached.sitemaps, first.sitemaps)
+
+        self.expire()
+        revalidated = await extract_robots_info(self.base_url)
+        self.assertEqual((self.hits["robots"], self.hits["not_modified"]), (2, 1))
+        self.assertEqual(revalidated.user_agents["*"]["disallow"], ["/admin"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+"""
+Test cases for the cached, micro-batched embedding service
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import io
+import json
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from src.bedrock_client import BedrockClient
+from src.embedding_service import (
+    EmbeddingCache, EmbeddingService, make_embedding_key, pack_vector, set_embedding_cache, unpack_vector
+)
+from src.models import CompanyIntelligenceConfig
+
+
+class FakeModel:
+    """Embedding function with latency that tracks concurrency and call counts."""
+
+    def __init__(self, latency=0.0, fail_on=()):
+        self.latency = latency
+        self.fail_on = set(fail_on)
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, text):
+        with self._lock:
+            self.calls.append(text)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency)
+            if text in self.fail_on:
+                raise RuntimeError("throttled")
+            return [float(len(text)), 0.5, -1.25]
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class TestEmbeddingService(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = EmbeddingCache(os.path.join(self.tmp.name, "embeddings.db"))
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def test_vectors_round_trip_as_float32(self):
+        blob = pack_vector([0.1, -2.5, 3.0])
+        self.assertEqual(len(blob), 12)
+        self.assertEqual(unpack_vector(blob), [0.10000000149011612, -2.5, 3.0])
+
+    def test_cache_persists_across_services(self):
+        model = FakeModel()
+        service = EmbeddingService(model, "titan", cache=self.cache)
+        self.assertEqual(service.embed("acme"), [4.0, 0.5, -1.25])
+        service.close()
+
+        other = EmbeddingService(model, "titan", cache=EmbeddingCache(self.cache.path))
+        self.assertEqual(other.embed("acme"), [4.0, 0.5, -1.25])
+        self.assertEqual(len(model.calls), 1)
+        self.assertEqual(other.get_stats()["cache_hits"], 1)
+        # Model id is part of the key
+        self.assertNotEqual(make_embedding_key("titan", "acme"), make_embedding_key("titan-v2", "acme"))
+        other.close()
+
+    def test_fan_out_is_concurrent_and_bounded(self):
+        model = FakeModel(latency=0.05)
+        service = EmbeddingService(model, "titan", max_concurrency=4)
+        started = time.monotonic()
+        vectors = service.embed_many(f"company {i}" for i in range(16))
+
+        self.assertTrue(all(vectors))
+        self.assertEqual(model.max_in_flight, 4)
+        self.assertLess(time.monotonic() - started, 16 * 0.05 * 0.5)
+        service.close()
+
+    def test_submissions_from_many_threads_share_calls_for_identical_text(self):
+        model = FakeModel(latency=0.05)
+        service = EmbeddingService(model, "titan", cache=self.cache, max_wait=0.02)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(service.embed("same text"))) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 10)
+        self.assertEqual(model.calls, ["same text"])
+        self.assertEqual(service.get_stats()["deduplicated"], 9)
+        service.close()
+
+    def test_failures_are_reported_and_not_cached(self):
+        model = FakeModel(fail_on={"bad"})
+        service = EmbeddingService(model, "titan", cache=self.cache)
+        self.assertEqual(service.embed_many(["good", "bad"])[1], None)
+        with self.assertRaises(RuntimeError):
+            service.submit("bad").result()
+        self.assertEqual(self.cache.count(), 1)
+        self.assertEqual(model.calls.count("bad"), 2)
+        service.close()
+
+
+class TestBedrockEmbeddings(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        set_embedding_cache(EmbeddingCache(os.path.join(self.tmp.name, "embeddings.db")))
+
+    def tearDown(self):
+        set_embedding_cache(None)
+        self.tmp.cleanup()
+
+    @patch("src.bedrock_client.boto3.client")
+    def test_batch_generate_embeddings_uses_cache(self, mock_boto):
+        runtime = mock_boto.return_value
+        runtime.invoke_model.side_effect = lambda **kwargs: {
+            "body": io.BytesIO(json.dumps({"embedding": [1.0, 2.0]}).encode())
+        }
+        client = BedrockClient(CompanyIntelligenceConfig())
+
+        first = client.batch_generate_embeddings(["Acme   makes widgets", "Globex"])
+        again = client.batch_generate_embeddings(["Acme makes widgets", "Globex"])
+
+        self.assertEqual(first, [[1.0, 2.0], [1.0, 2.0]])
+        self.assertEqual(again, first)
+        self.assertEqual(runtime.invoke_model.call_count, 2)
+        self.assertEqual(client.generate_embedding("Globex"), [1.0, 2.0])
+        self.assertEqual(runtime.invoke_model.call_count, 2)
+        client.embeddings.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,195 @@
+"""
+Test cases for the shared per-host crawl scheduler
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import asyncio
+import threading
+import time
+import unittest
+from email.utils import formatdate
+
+from aiohttp import web
+
+from src.antoine_fetcher import AsyncPageFetcher
+from src.host_scheduler import (
+    HostScheduler, HostThrottledError, get_host_scheduler, parse_crawl_delay, parse_retry_after, set_host_scheduler
+)
+
+
+class TestParsing(unittest.TestCase):
+
+    def test_retry_after_seconds_and_http_date(self):
+        self.assertEqual(parse_retry_after("120"), 120.0)
+        self.assertAlmostEqual(parse_retry_after(formatdate(1_000_030, usegmt=True), now=1_000_000), 30.0)
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertIsNone(parse_retry_after(None))
+
+    def test_crawl_delay_for_star_group(self):
+        robots = (
+            "User-agent: Googlebot\nCrawl-delay: 1\n\n"
+            "User-agent: Bingbot\nUser-agent: *  # everyone else\nDisallow: /admin\nCrawl-delay: 5\n"
+        )
+        self.assertEqual(parse_crawl_delay(robots), 5.0)
+        self.assertEqual(parse_crawl_delay(robots, "googlebot"), 1.0)
+        self.assertIsNone(parse_crawl_delay("User-agent: *\nDisallow: /"))
+
+
+class TestHostScheduler(unittest.IsolatedAsyncioTestCase):
+
+    async def _run(self, scheduler, urls, duration=0.05):
+        starts = []
+        active = {"now": 0, "peak": 0}
+
+        async def request(url):
+            async with scheduler.slot(url) as slot:
+                starts.append((url, time.monotonic()))
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+                await asyncio.sleep(duration)
+                active["now"] -= 1
+                slot.record(200)
+
+        await asyncio.gather(*(request(url) for url in urls))
+        return starts, active["peak"]
+
+    async def test_per_host_and_global_caps(self):
+        scheduler = HostScheduler(max_concurrency=5, max_per_host=2)
+        urls = [f"https://a.com/{i}" for i in range(6)] + [f"https://b.com/{i}" for i in range(6)]
+        urls += [f"https://c.com/{i}" for i in range(6)]
+        _, peak = await self._run(scheduler, urls)
+
+        self.assertEqual(peak, 5)
+        self.assertEqual(scheduler.get_stats()["peak_active"], 5)
+        self.assertEqual(scheduler.get_host_stats("https://a.com/")["requests"], 6)
+
+    async def test_crawl_delay_spaces_requests_per_host_only(self):
+        scheduler = HostScheduler(max_per_host=4)
+        scheduler.apply_robots("https://slow.com", "User-agent: *\nCrawl-delay: 0.1\n")
+        starts, _ = await self._run(scheduler, ["https://slow.com/1", "https://slow.com/2", "https://slow.com/3",
+                                                "https://fast.com/1", "https://fast.com/2"], duration=0.0)
+
+        slow = sorted(at for url, at in starts if "slow" in url)
+        fast = sorted(at for url, at in starts if "fast" in url)
+        self.assertGreaterEqual(slow[2] - slow[0], 0.19)
+        self.assertLess(fast[1] - fast[0], 0.05)
+
+    async def test_crawl_delay_is_capped(self):
+        scheduler = HostScheduler(max_crawl_delay=2)
+        scheduler.apply_robots("https://x.com", "User-agent: *\nCrawl-delay: 3600\n")
+        self.assertEqual(scheduler.get_host_stats("x.com")["crawl_delay"], 2)
+
+    async def test_throttle_response_backs_off_and_halves_limit(self):
+        scheduler = HostScheduler(max_per_host=4, max_wait=5)
+        async with scheduler.slot("https://cdn.com/a") as slot:
+            slot.record(429, "0.2")
+
+        stats = scheduler.get_host_stats("https://cdn.com/")
+        self.assertEqual(stats["limit"], 2)
+        self.assertGreater(stats["backoff_remaining"], 0.1)
+
+        started = time.monotonic()
+        async with scheduler.slot("https://cdn.com/b") as slot:
+            slot.record(200)
+        self.assertGreaterEqual(time.monotonic() - started, 0.15)
+
+        # Other hosts are not held back
+        started = time.monotonic()
+        async with scheduler.slot("https://other.com/"):
+            pass
+        self.assertLess(time.monotonic() - started, 0.05)
+
+        # Clean responses grow the limit back
+        for _ in range(2):
+            async with scheduler.slot("https://cdn.com/c") as slot:
+                slot.record(200)
+        self.assertEqual(scheduler.get_host_stats("https://cdn.com/")["limit"], 3)
+
+    async def test_long_backoff_fails_fast(self):
+        scheduler = HostScheduler(max_wait=1)
+        scheduler.record_response("https://blocked.com/", 503, "60")
+        started = time.monotonic()
+        with self.assertRaises(HostThrottledError):
+            async with scheduler.slot("https://blocked.com/page"):
+                pass
+        self.assertLess(time.monotonic() - started, 0.1)
+        self.assertEqual(scheduler.get_stats()["fast_failures"], 1)
+
+    async def test_exponential_backoff_without_retry_after(self):
+        scheduler = HostScheduler(base_backoff=1, max_backoff=3)
+        for expected in (1, 2, 3):
+            scheduler.record_response("https://x.com", 429)
+            remaining = scheduler.get_host_stats("https://x.com")["backoff_remaining"]
+            self.assertAlmostEqual(remaining, expected, delta=0.1)
+
+    async def test_slots_are_shared_across_threads_and_loops(self):
+        scheduler = HostScheduler(max_per_host=1)
+        held = threading.Event()
+        release = threading.Event()
+
+        def hold_slot():
+            async def hold():
+                async with scheduler.slot("https://shared.com/1"):
+                    held.set()
+                    await asyncio.get_running_loop().run_in_executor(None, release.wait)
+            asyncio.run(hold())
+
+        thread = threading.Thread(target=hold_slot)
+        thread.start()
+        held.wait(2)
+
+        waiter = asyncio.ensure_future(scheduler.acquire("https://shared.com/2"))
+        await asyncio.sleep(0.05)
+        self.assertFalse(waiter.done())
+        release.set()
+        slot = await asyncio.wait_for(waiter, 2)
+        scheduler.release(slot)
+        thread.join(2)
+        self.assertEqual(scheduler.get_stats()["active"], 0)
+
+
+class TestFetcherUsesScheduler(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.calls = 0
+
+        async def flaky(request):
+            self.calls += 1
+            if self.calls == 1:
+                return web.Response(status=429, headers={"Retry-After": "0.2"})
+            return web.Response(text="<html><body><p>Back</p></body></html>", content_type="text/html")
+
+        app = web.Application()
+        app.router.add_get("/flaky", flaky)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.base_url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+        self.scheduler = HostScheduler(max_wait=5)
+        set_host_scheduler(self.scheduler)
+        self.fetcher = AsyncPageFetcher(prefer_http2=False)
+
+    async def asyncTearDown(self):
+        await self.fetcher.close()
+        await self.runner.cleanup()
+        set_host_scheduler(None)
+
+    async def test_throttled_fetch_is_retried_after_backoff(self):
+        started = time.monotonic()
+        result = await self.fetcher.fetch(f"{self.base_url}/flaky")
+
+        self.assertTrue(result.success)
+        self.assertIn("Back", result.html)
+        self.assertEqual(self.calls, 2)
+        self.assertGreaterEqual(time.monotonic() - started, 0.15)
+        self.assertIs(get_host_scheduler(), self.scheduler)
+        self.assertEqual(self.scheduler.get_stats()["throttle_responses"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Test cases for the frontier-based link discovery engine
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import asyncio
+import time
+import unittest
+
+from src.link_discovery_engine import FrontierLinkDiscovery, is_excluded_link, score_link
+
+DOMAIN = "example.com"
+BASE = f"https://{DOMAIN}"
+
+
+def page(*paths):
+    return "<html><body>" + "".join(f'<a href="{p}">{p}</a>' for p in paths) + "</body></html>"
+
+
+def make_site(delay=0.1):
+    """Fake site: homepage -> 20 section pages -> 5 leaf pages each"""
+    site = {f"{BASE}/": page("/about", "/contact", "/logo.png", "https://other.com/x",
+                             *[f"/section-{i}" for i in range(18)])}
+    for section in ["about", "contact"] + [f"section-{i}" for i in range(18)]:
+        site[f"{BASE}/{section}"] = page(*[f"/{section}/leaf-{j}" for j in range(5)])
+
+    fetched = []
+
+    async def fetch_html(url):
+        fetched.append(url)
+        await asyncio.sleep(delay)
+        return site.get(url)
+
+    return fetch_html, fetched
+
+
+class TestLinkScoring(unittest.TestCase):
+
+    def test_keyword_scores(self):
+        self.assertGreater(score_link(f"{BASE}/company/contact-us"), score_link(f"{BASE}/company/blog-post"))
+        self.assertGreater(score_link(f"{BASE}/a/b/products"), score_link(f"{BASE}/a/b/c"))
+
+    def test_exclusions(self):
+        self.assertTrue(is_excluded_link(f"{BASE}/logo.png"))
+        self.assertTrue(is_excluded_link(f"{BASE}/login"))
+        self.assertFalse(is_excluded_link(f"{BASE}/about"))
+
+
+class TestFrontierLinkDiscovery(unittest.IsolatedAsyncioTestCase):
+
+    async def test_concurrent_bfs_covers_site_within_budget(self):
+        fetch_html, fetched = make_site(delay=0.1)
+        engine = FrontierLinkDiscovery(fetch_html, DOMAIN, max_depth=2, max_workers=10)
+
+        start = time.time()
+        links = await engine.run(f"{BASE}/", time_budget=10)
+
+        # 21 pages at 100ms each: serial would take >2s
+        self.assertLess(time.time() - start, 1.0)
+        self.assertIn(f"{BASE}/section-17/leaf-4", links)
+        self.assertNotIn("https://other.com/x", links)
+        self.assertNotIn(f"{BASE}/logo.png", fetched)
+        self.assertEqual(engine.stats.pages_per_depth[0], 1)
+
+    async def test_high_value_pages_fetched_first(self):
+        fetch_html, fetched = make_site(delay=0.01)
+        engine = FrontierLinkDiscovery(fetch_html, DOMAIN, max_depth=2, max_workers=1)
+
+        await engine.run(f"{BASE}/", time_budget=10)
+
+        self.assertEqual(fetched[0], f"{BASE}/")
+        self.assertEqual(set(fetched[1:3]), {f"{BASE}/about", f"{BASE}/contact"})
+
+    async def test_depth_quota_and_url_limit(self):
+        fetch_html, fetched = make_site(delay=0.0)
+        engine = FrontierLinkDiscovery(fetch_html, DOMAIN, max_depth=3, max_urls=8,
+                                       depth_quotas={0: 1, 1: 3, 2: 100})
+
+        await engine.run(f"{BASE}/", time_budget=10)
+
+        self.assertEqual(len(fetched), 8)
+        self.assertEqual(engine.stats.pages_per_depth[1], 3)
+        self.assertGreater(engine.stats.skipped_by_quota, 0)
+
+    async def test_budget_returns_partial_results(self):
+        fetch_html, _ = make_site(delay=0.3)
+        engine = FrontierLinkDiscovery(fetch_html, DOMAIN, max_depth=3, max_workers=2)
+
+        start = time.time()
+        links = await engine.run(f"{BASE}/", time_budget=0.5)
+
+        self.assertLess(time.time() - start, 0.8)
+        self.assertTrue(engine.stats.timed_out)
+        self.assertIn(f"{BASE}/about", links)
+
+    async def test_failed_pages_are_counted(self):
+        async def failing_fetch(url):
+            raise RuntimeError("navigation failed")
+
+        engine = FrontierLinkDiscovery(failing_fetch, DOMAIN)
+        links = await engine.run(f"{BASE}/", time_budget=1)
+
+        self.assertEqual(links, set())
+        self.assertEqual(engine.stats.pages_failed, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
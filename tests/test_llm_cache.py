@@ -0,0 +1,171 @@
+"""
+Test cases for the LLM response cache
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import asyncio
+import io
+import json
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.antoine_extraction import OpenRouterClient, extract_company_fields
+from src.antoine_selection import filter_valuable_links
+from src.bedrock_client import BedrockClient
+from src.llm_cache import (
+    LLMResponseCache, MemoryLLMCacheBackend, SQLiteLLMCacheBackend, discard_cached_response, make_cache_key,
+    set_llm_cache
+)
+from src.models import CompanyIntelligenceConfig
+
+
+class TestLLMResponseCache(unittest.TestCase):
+
+    def test_key_normalizes_prompt_but_not_model_or_params(self):
+        key = make_cache_key("nova", "Describe Acme\r\n  ", {"temperature": 0.1, "max_tokens": 10})
+        self.assertEqual(key, make_cache_key("nova", "Describe Acme", {"max_tokens": 10, "temperature": 0.1}))
+        self.assertNotEqual(key, make_cache_key("haiku", "Describe Acme", {"temperature": 0.1, "max_tokens": 10}))
+        self.assertNotEqual(key, make_cache_key("nova", "Describe Acme", {"temperature": 0.7, "max_tokens": 10}))
+        self.assertNotEqual(key, make_cache_key("nova", "Describe Acme Corp", {"temperature": 0.1, "max_tokens": 10}))
+
+    def test_hit_records_tokens_and_cost_saved(self):
+        cache = LLMResponseCache(MemoryLLMCacheBackend())
+        self.assertIsNone(cache.lookup("nova", "prompt", {"t": 1}))
+        cache.store("nova", "prompt", {"t": 1}, "answer", usage={"input_tokens": 90}, tokens=100, cost_usd=0.002)
+
+        hit = cache.lookup("nova", "prompt", {"t": 1})
+        cache.lookup("nova", "prompt", {"t": 1})
+
+        self.assertEqual(hit.content, "answer")
+        self.assertEqual(hit.usage, {"input_tokens": 90})
+        stats = cache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (2, 1))
+        self.assertEqual(stats['tokens_saved'], 200)
+        self.assertAlmostEqual(stats['cost_saved_usd'], 0.004)
+        self.assertIn("Saved 200 tokens, $0.0040", cache.report())
+
+    def test_bypass_skips_read_and_refreshes(self):
+        cache = LLMResponseCache(MemoryLLMCacheBackend())
+        cache.store("nova", "prompt", None, "old")
+        self.assertIsNone(cache.lookup("nova", "prompt", use_cache=False))
+        cache.store("nova", "prompt", None, "new")
+        self.assertEqual(cache.lookup("nova", "prompt").content, "new")
+        self.assertEqual(cache.stats.bypassed, 1)
+
+    def test_ttl_and_empty_responses(self):
+        cache = LLMResponseCache(MemoryLLMCacheBackend(), ttl_seconds=0.05)
+        self.assertEqual(cache.store("nova", "prompt", None, ""), "")
+        cache.store("nova", "prompt", None, "answer")
+        time.sleep(0.1)
+        self.assertIsNone(cache.lookup("nova", "prompt"))
+        self.assertEqual(cache.stats.expired, 1)
+        self.assertEqual(cache.backend.count(), 0)
+
+    def test_sqlite_backend_persists(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "responses.db")
+            cache = LLMResponseCache(SQLiteLLMCacheBackend(path))
+            cache.store("nova", "prompt", {"t": 1}, "answer", tokens=5, cost_usd=0.1)
+            cache.close()
+
+            reopened = LLMResponseCache(SQLiteLLMCacheBackend(path))
+            self.assertEqual(reopened.lookup("nova", "prompt", {"t": 1}).tokens, 5)
+            reopened.close()
+
+
+class TestClientsUseLLMCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = LLMResponseCache(MemoryLLMCacheBackend())
+        set_llm_cache(self.cache)
+
+    def tearDown(self):
+        set_llm_cache(None)
+
+    @patch("src.antoine_extraction.requests.post")
+    def test_openrouter_second_call_is_free(self, post):
+        post.return_value = MagicMock(status_code=200, json=lambda: {
+            "choices": [{"message": {"content": '{"industry": "Widgets"}'}}],
+            "usage": {"prompt_tokens": 1000, "completion_tokens": 500, "total_tokens": 1500},
+            "model": "amazon/nova-pro-v1"
+        })
+        client = OpenRouterClient("sk-or-test")
+
+        first = client.call_llm("Extract fields for Acme")
+        second = client.call_llm("Extract fields for Acme")
+        client.call_llm("Extract fields for Acme", use_cache=False)
+
+        self.assertEqual(post.call_count, 2)
+        self.assertTrue(second.cached)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second.cost_usd, 0.0)
+        self.assertAlmostEqual(second.cost_saved_usd, first.cost_usd)
+        self.assertEqual(second.usage["total_tokens"], 1500)
+
+    @patch("src.antoine_extraction.requests.post")
+    def test_unparseable_extraction_is_not_replayed(self, post):
+        responses = iter(['{"industry": "Widg', '{"company_name": "Acme", "industry": "Widgets"}'])
+        post.side_effect = lambda *args, **kwargs: MagicMock(status_code=200, json=lambda content=next(responses): {
+            "choices": [{"message": {"content": content}}],
+            "usage": {"prompt_tokens": 1000, "completion_tokens": 500, "total_tokens": 1500}
+        })
+        batch = MagicMock(aggregated_content="Acme makes widgets.", page_results=[])
+        client = OpenRouterClient("sk-or-test")
+
+        first = extract_company_fields(batch, "Acme", llm_client=client)
+        second = extract_company_fields(batch, "Acme", llm_client=client)
+
+        self.assertFalse(first.success)
+        self.assertTrue(second.success)
+        self.assertEqual(post.call_count, 2)
+        self.assertEqual(self.cache.backend.count(), 1)
+
+    @patch.dict(os.environ, {"OPENROUTER_API_KEY": "sk-or-test"})
+    @patch("src.antoine_selection.requests.post")
+    def test_unparseable_selection_is_not_replayed(self, post):
+        paths = [f"/page-{i}" for i in range(10)]
+        responses = iter(['{"selected_paths": ["/page-1", ', json.dumps({"selected_paths": paths})])
+        post.side_effect = lambda *args, **kwargs: MagicMock(status_code=200, json=lambda content=next(responses): {
+            "choices": [{"message": {"content": content}}],
+            "usage": {"total_tokens": 800}
+        })
+
+        first = asyncio.run(filter_valuable_links(paths, "https://acme.com", _is_retry=True))
+        second = asyncio.run(filter_valuable_links(paths, "https://acme.com", _is_retry=True))
+
+        self.assertFalse(first.success)
+        self.assertEqual(second.selected_paths, paths)
+        self.assertEqual(post.call_count, 2)
+
+    @patch("src.bedrock_client.boto3.client")
+    def test_bedrock_usage_reports_cost_saved(self, boto_client):
+        runtime = boto_client.return_value
+        runtime.invoke_model.side_effect = lambda **kwargs: {"body": io.BytesIO(json.dumps({
+            "output": {"message": {"content": [{"text": "Acme makes widgets"}]}},
+            "usage": {"inputTokens": 2000, "outputTokens": 1000}
+        }).encode())}
+        client = BedrockClient(CompanyIntelligenceConfig(bedrock_analysis_model="amazon.nova-pro-v1:0"))
+
+        first = client.generate_text_with_usage("Summarize Acme")
+        second = client.generate_text_with_usage("Summarize Acme")
+
+        runtime.invoke_model.assert_called_once()
+        self.assertEqual(second["text"], "Acme makes widgets")
+        self.assertTrue(second["usage"]["cached"])
+        self.assertEqual(second["usage"]["cost_usd"], 0.0)
+        self.assertEqual(second["usage"]["cost_saved_usd"], first["usage"]["cost_usd"])
+        self.assertEqual(self.cache.stats.tokens_saved, 3000)
+
+        self.assertEqual(second["cache_key"], first["cache_key"])
+        discard_cached_response(second["cache_key"])
+        client.generate_text_with_usage("Summarize Acme")
+        self.assertEqual(runtime.invoke_model.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,186 @@
+"""
+Test cases for the content-addressed page cache
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import tempfile
+import threading
+import time
+import unittest
+
+from aiohttp import web
+
+from src.antoine_crawler import crawl_single_page
+from src.antoine_fetcher import close_page_fetcher
+from src.page_cache import PageCache, set_page_cache
+
+
+def article(topic):
+    paragraphs = "".join(f"<p>{topic} paragraph {i}: Acme builds reliable widgets for industrial customers "
+                         f"across North America and Europe.</p>" for i in range(8))
+    return f"<html><head><title>{topic}</title></head><body><main>{paragraphs}</main></body></html>"
+
+
+class TestPageCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = PageCache(self.tmp.name)
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def test_round_trip_with_meta(self):
+        self.cache.put("https://a.com/about#team", "<html>About</html>", "html", {"etag": '"v1"'})
+
+        hit = self.cache.get("https://a.com/about", "html")
+        self.assertEqual(hit.content, "<html>About</html>")
+        self.assertEqual(hit.meta, {"etag": '"v1"'})
+        self.assertIsNone(self.cache.get("https://a.com/about", "text"))
+        self.assertEqual(self.cache.stats.hit_rate("html"), 1.0)
+        self.assertEqual(self.cache.stats.hit_rate(), 0.5)
+
+    def test_identical_content_stored_once_and_compressed(self):
+        html = article("About") * 20
+        self.cache.put("https://a.com/about", html)
+        self.cache.put("https://www.a.com/about/", html)
+
+        stats = self.cache.get_stats()
+        self.assertEqual(stats['entries'], {"html": 2})
+        self.assertEqual(stats['blobs'], 1)
+        self.assertEqual(stats['deduplicated_writes'], 1)
+        self.assertLess(stats['stored_bytes'], stats['uncompressed_bytes'] / 5)
+
+    def test_replaced_and_invalidated_content_is_removed(self):
+        self.cache.put("https://a.com/", "old")
+        self.cache.put("https://a.com/", "new")
+        self.assertEqual(self.cache.get("https://a.com/").content, "new")
+        self.assertEqual(self.cache.get_stats()['blobs'], 1)
+
+        self.cache.invalidate("https://a.com/")
+        self.assertIsNone(self.cache.get("https://a.com/"))
+        self.assertEqual(self.cache.get_stats()['blobs'], 0)
+
+    def test_ttl_expiry(self):
+        cache = PageCache(self.tmp.name, ttl_seconds=0.05)
+        cache.put("https://a.com/", "page")
+        self.assertIsNotNone(cache.get("https://a.com/"))
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("https://a.com/"))
+        self.assertEqual(cache.stats.expired, 1)
+        cache.close()
+
+    def test_lru_eviction_by_size(self):
+        cache = PageCache(self.tmp.name, max_bytes=5500, compress_level=0)
+        for i in range(5):
+            cache.put(f"https://a.com/{i}", f"{i}" * 1000)
+        cache.get("https://a.com/0")  # recently used, survives
+        cache.put("https://a.com/5", "5" * 1000)
+
+        self.assertLessEqual(cache.total_bytes(), 5500)
+        self.assertIsNotNone(cache.get("https://a.com/0"))
+        self.assertIsNone(cache.get("https://a.com/1"))
+        self.assertGreater(cache.stats.evicted_entries, 0)
+        cache.close()
+
+    def test_stored_bytes_tracked_without_summing(self):
+        cache = PageCache(self.tmp.name, max_bytes=5500, compress_level=0)
+        for i in range(8):
+            cache.put(f"https://a.com/{i}", f"{i}" * 1000)
+        cache.put("https://a.com/0", "replaced")
+        cache.put("https://b.com/", "replaced")
+        cache.invalidate("https://a.com/7")
+        self.assertEqual(cache._stored_bytes, cache.total_bytes())
+
+        # Another process sharing the directory sees the current total on open
+        other = PageCache(self.tmp.name)
+        self.assertEqual(other._stored_bytes, cache.total_bytes())
+        other.close()
+        cache.close()
+
+    def test_report(self):
+        self.cache.put("https://a.com/", "page", "text")
+        self.cache.get("https://a.com/", "text")
+        self.cache.get("https://a.com/missing", "text")
+        report = self.cache.report()
+        self.assertIn("Overall hit rate: 50.0%", report)
+        self.assertIn("text: 50.0% (1 hits / 1 misses)", report)
+
+
+class TestCrawlerUsesPageCache(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.requests = []
+
+        async def page(request):
+            self.requests.append(request.path)
+            return web.Response(text=article("About Acme"), content_type="text/html")
+
+        app = web.Application()
+        app.router.add_get("/{page}", page)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.base_url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = PageCache(self.tmp.name)
+        set_page_cache(self.cache)
+
+    async def asyncTearDown(self):
+        set_page_cache(None)
+        await close_page_fetcher()
+        await self.runner.cleanup()
+        self.cache.close()
+        self.tmp.cleanup()
+
+    async def test_second_crawl_skips_network(self):
+        url = f"{self.base_url}/about"
+        first = await crawl_single_page(url, self.base_url)
+        second = await crawl_single_page(url, self.base_url)
+
+        self.assertTrue(first.success)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second.extraction_method, first.extraction_method)
+        self.assertEqual(self.requests, ["/about"])
+
+    async def test_cached_html_is_re_extracted_without_fetching(self):
+        url = f"{self.base_url}/about"
+        self.cache.put(url, article("Cached About"), "html")
+
+        result = await crawl_single_page(url, self.base_url)
+
+        self.assertIn("Cached About", result.content)
+        self.assertEqual(self.requests, [])
+        self.assertIsNotNone(self.cache.get(url, "text"))
+
+    async def test_conditional_recheck_bypasses_cache(self):
+        url = f"{self.base_url}/about"
+        await crawl_single_page(url, self.base_url)
+        await crawl_single_page(url, self.base_url, validators={"etag": '"v1"'})
+        self.assertEqual(self.requests, ["/about", "/about"])
+
+
+    async def test_cache_io_runs_off_the_event_loop(self):
+        threads = []
+        for name in ("get", "put"):
+            method = getattr(self.cache, name)
+
+            def recording(*args, _method=method, **kwargs):
+                threads.append(threading.get_ident())
+                return _method(*args, **kwargs)
+
+            setattr(self.cache, name, recording)
+
+        await crawl_single_page(f"{self.base_url}/about", self.base_url)
+
+        self.assertGreaterEqual(len(threads), 3)
+        self.assertNotIn(threading.get_ident(), threads)
+
+if __name__ == '__main__':
+    unittest.main()
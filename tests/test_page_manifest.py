@@ -0,0 +1,214 @@
+"""
+Test cases for page manifests and incremental re-research
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import asyncio
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from aiohttp import web
+
+from src.antoine_crawler import BatchCrawlResult, PageCrawlResult
+from src.antoine_extraction import FieldExtractionResult
+from src.antoine_scraper_adapter import AntoineScraperAdapter
+from src.models import CompanyData, CompanyIntelligenceConfig
+from src.page_cache import set_page_cache
+from src.page_manifest import PageManifest, PageManifestStore, content_hash, refresh_manifest_pages_sync
+
+
+def article(topic):
+    paragraphs = "".join(f"<p>{topic} paragraph {i}: Acme builds reliable widgets for industrial customers "
+                         f"across North America and Europe.</p>" for i in range(8))
+    return f"<html><head><title>{topic}</title></head><body><main><h1>{topic}</h1>{paragraphs}</main></body></html>"
+
+
+class FakeSite:
+    """Local site in a background thread; /about and /team send ETags, /news doesn't"""
+
+    def __init__(self):
+        self.pages = {
+            "/about": (article("About Acme"), '"about-v1"'),
+            "/team": (article("Our Team"), '"team-v1"'),
+            "/news": (article("Latest News"), None),
+        }
+        self.requests = []
+        self.conditional_hits = 0
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    async def _handler(self, request):
+        self.requests.append(request.path)
+        body, etag = self.pages[request.path]
+        if etag and request.headers.get("If-None-Match") == etag:
+            self.conditional_hits += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        headers = {"ETag": etag} if etag else {}
+        return web.Response(text=body, content_type="text/html", headers=headers)
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        app = web.Application()
+        app.router.add_get("/{page}", self._handler)
+        self.runner = web.AppRunner(app)
+        self.loop.run_until_complete(self.runner.setup())
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        self.loop.run_until_complete(site.start())
+        self.base_url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+        self._ready.set()
+        self.loop.run_forever()
+
+    def start(self):
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+
+
+def first_crawl(site):
+    """What a full pipeline run would have crawled"""
+    results = []
+    for path, (body, etag) in site.pages.items():
+        content = f"{path} text " * 50
+        results.append(PageCrawlResult(url=f"{site.base_url}{path}", success=True, content=content,
+                                       content_length=len(content), etag=etag or ""))
+    return BatchCrawlResult(base_url=site.base_url, total_pages=3, successful_pages=3, failed_pages=0,
+                            total_content_length=0, total_crawl_time=1.0,
+                            aggregated_content="aggregated", page_results=results)
+
+
+class TestPageManifest(unittest.TestCase):
+
+    def setUp(self):
+        set_page_cache(None)
+        self.site = FakeSite()
+        self.site.start()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = PageManifestStore(self.tmp.name)
+
+    def tearDown(self):
+        self.site.stop()
+        self.tmp.cleanup()
+
+    def test_content_hash_ignores_whitespace(self):
+        self.assertEqual(content_hash("Acme  builds\nwidgets "), content_hash("Acme builds widgets"))
+        self.assertNotEqual(content_hash("Acme builds widgets"), content_hash("Acme builds gadgets"))
+
+    def test_store_round_trip(self):
+        manifest = PageManifest.from_crawl("https://www.Example.com", first_crawl(self.site), ["/about"],
+                                           {"industry": "Widgets"}, {"/about": "2024-01-01"})
+        self.store.save(manifest)
+
+        loaded = self.store.load("example.com")
+        self.assertEqual(loaded.extracted_fields, {"industry": "Widgets"})
+        self.assertEqual(len(loaded.pages), 3)
+        self.assertEqual(loaded.pages[f"{self.site.base_url}/about"].etag, '"about-v1"')
+        self.assertLess(loaded.age_days(), 1)
+
+    def test_refresh_sends_conditional_requests(self):
+        manifest = PageManifest.from_crawl(self.site.base_url, first_crawl(self.site), [], {})
+        first = refresh_manifest_pages_sync(manifest, self.site.base_url)
+
+        # Stored content was synthetic, so the un-validated /news page reads as changed
+        self.assertEqual(first.not_modified, 2)
+        self.assertEqual(first.changed_urls, [f"{self.site.base_url}/news"])
+
+        manifest.pages = {page.url: page for page in first.pages}
+        second = refresh_manifest_pages_sync(manifest, self.site.base_url)
+        self.assertFalse(second.changed)
+        self.assertEqual(second.same_content, 1)
+
+        self.site.pages["/team"] = (article("Our New Team"), '"team-v2"')
+        third = refresh_manifest_pages_sync(manifest, self.site.base_url)
+        self.assertEqual(third.changed_urls, [f"{self.site.base_url}/team"])
+        self.assertIn("Our New Team", third.crawl_result.aggregated_content)
+        self.assertIn("/about text", third.crawl_result.aggregated_content)
+
+    def test_change_past_the_truncation_point_is_detected(self):
+        def long_article(ending):
+            paragraphs = "".join(f"<p>Paragraph {i}: Acme builds reliable widgets for industrial customers "
+                                 f"across North America and Europe.</p>" for i in range(200))
+            return f"<html><body><main><h1>News</h1>{paragraphs}<p>{ending}</p></main></body></html>"
+
+        self.site.pages["/news"] = (long_article("Acme opens a plant in Ohio."), None)
+        manifest = PageManifest.from_crawl(self.site.base_url, first_crawl(self.site), [], {})
+        manifest.pages = {page.url: page for page in refresh_manifest_pages_sync(manifest, self.site.base_url).pages}
+        self.assertTrue(manifest.pages[f"{self.site.base_url}/news"].content.endswith("[TRUNCATED]"))
+
+        self.site.pages["/news"] = (long_article("Acme opens a plant in Texas."), None)
+        refresh = refresh_manifest_pages_sync(manifest, self.site.base_url)
+        self.assertEqual(refresh.changed_urls, [f"{self.site.base_url}/news"])
+
+    def test_sitemap_lastmod_bypasses_discovery_cache(self):
+        manifest = PageManifest.from_crawl(self.site.base_url, first_crawl(self.site), [], {},
+                                           {"/about": "2024-01-01"})
+        with patch("src.page_manifest.extract_sitemap_urls", return_value=[]) as sitemap:
+            refresh_manifest_pages_sync(manifest, self.site.base_url)
+        self.assertIs(sitemap.call_args.kwargs["use_cache"], False)
+
+
+class TestIncrementalAdapter(unittest.TestCase):
+
+    def setUp(self):
+        set_page_cache(None)
+        self.site = FakeSite()
+        self.site.start()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = PageManifestStore(self.tmp.name)
+        self.adapter = AntoineScraperAdapter(CompanyIntelligenceConfig(), incremental=True,
+                                             manifest_store=self.store)
+
+        # Seed the manifest as a full run would, with real page text
+        manifest = PageManifest.from_crawl(self.site.base_url, first_crawl(self.site), ["/about", "/team", "/news"],
+                                           {"industry": "Industrial widgets", "location": "Toronto"})
+        manifest.pages = {page.url: page for page in refresh_manifest_pages_sync(manifest, self.site.base_url).pages}
+        self.store.save(manifest)
+
+    def tearDown(self):
+        self.site.stop()
+        self.tmp.cleanup()
+
+    def company(self):
+        return CompanyData(name="Acme", website=self.site.base_url)
+
+    @patch("src.antoine_scraper_adapter.discover_all_paths_sync")
+    @patch("src.antoine_scraper_adapter.extract_company_fields")
+    def test_unchanged_site_skips_extraction(self, extract, discover):
+        company = self.adapter.scrape_company(self.company())
+
+        extract.assert_not_called()
+        discover.assert_not_called()
+        self.assertEqual(company.scrape_status, "success")
+        self.assertEqual(company.industry, "Industrial widgets")
+        self.assertEqual(company.total_cost_usd, 0.0)
+        self.assertEqual(company.pages_crawled, ["/about", "/team", "/news"])
+
+    @patch("src.antoine_scraper_adapter.extract_company_fields")
+    def test_changed_page_is_re_extracted(self, extract):
+        extract.return_value = FieldExtractionResult(success=True, extracted_fields={"industry": "Robotics"},
+                                                     cost_usd=0.01, tokens_used=100, model_used="test")
+        self.site.pages["/about"] = (article("About Acme Robotics"), '"about-v2"')
+
+        company = self.adapter.scrape_company(self.company())
+
+        extract.assert_called_once()
+        self.assertIn("About Acme Robotics", extract.call_args[0][0].aggregated_content)
+        self.assertEqual(company.industry, "Robotics")
+        self.assertEqual(self.store.load(self.site.base_url).extracted_fields, {"industry": "Robotics"})
+
+        # The refreshed manifest now matches the site
+        extract.reset_mock()
+        self.adapter.scrape_company(self.company())
+        extract.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Test cases for the concurrent Pinecone bulk writer
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+from src.pinecone_bulk_writer import PineconeBulkWriter, coalesce_metadata_updates, estimate_vector_bytes
+
+
+class FakeIndex:
+    """In-memory index recording requests; rejects any batch containing a poisoned id."""
+
+    def __init__(self, latency=0.0, poisoned=(), flaky_failures=0):
+        self.latency = latency
+        self.poisoned = set(poisoned)
+        self.flaky_failures = flaky_failures
+        self.vectors = {}
+        self.upsert_sizes = []
+        self.updates = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def upsert(self, vectors, namespace=None):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency)
+            with self._lock:
+                self.upsert_sizes.append(len(vectors))
+                if self.flaky_failures:
+                    self.flaky_failures -= 1
+                    raise ConnectionError("transient")
+                if any(vector["id"] in self.poisoned for vector in vectors):
+                    raise ValueError("metadata too large")
+                self.vectors.update({vector["id"]: vector for vector in vectors})
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def update(self, id, set_metadata, namespace=None):
+        with self._lock:
+            self.updates.append((id, set_metadata))
+
+    def fetch(self, ids):
+        return SimpleNamespace(vectors={
+            i: SimpleNamespace(metadata=self.vectors[i]["metadata"]) for i in ids if i in self.vectors
+        })
+
+
+def make_vectors(count, metadata_bytes=10):
+    return [{"id": f"v{i}", "values": [0.1] * 8, "metadata": {"raw_content": "x" * metadata_bytes}}
+            for i in range(count)]
+
+
+class TestPineconeBulkWriter(unittest.TestCase):
+
+    def test_batches_respect_count_and_byte_limits(self):
+        vectors = make_vectors(10, metadata_bytes=1000)
+        size = estimate_vector_bytes(vectors[0])
+        writer = PineconeBulkWriter(FakeIndex(), max_batch_vectors=4, max_batch_bytes=size * 3)
+        self.assertEqual([len(batch) for batch, _ in writer.plan_batches(vectors)], [3, 3, 3, 1])
+
+        writer = PineconeBulkWriter(FakeIndex(), max_batch_vectors=4, max_batch_bytes=10_000_000)
+        self.assertEqual([len(batch) for batch, _ in writer.plan_batches(vectors)], [4, 4, 2])
+
+    def test_batches_run_concurrently(self):
+        index = FakeIndex(latency=0.05)
+        writer = PineconeBulkWriter(index, max_batch_vectors=10, max_parallel=4)
+        started = time.monotonic()
+        result = writer.upsert(make_vectors(160))
+
+        self.assertEqual(result.written, 160)
+        self.assertEqual(len(index.vectors), 160)
+        self.assertEqual(index.max_in_flight, 4)
+        self.assertLess(time.monotonic() - started, 16 * 0.05 * 0.6)
+
+    def test_transient_failures_are_retried(self):
+        index = FakeIndex(flaky_failures=2)
+        result = PineconeBulkWriter(index, max_batch_vectors=50, max_parallel=1, retry_backoff=0).upsert(make_vectors(100))
+        self.assertEqual((result.written, result.failed, result.retries), (100, 0, 2))
+
+    def test_only_the_failing_part_of_a_batch_is_retried(self):
+        index = FakeIndex(poisoned={"v5"})
+        writer = PineconeBulkWriter(index, max_batch_vectors=8, max_parallel=2, max_retries=0, retry_backoff=0)
+        result = writer.upsert(make_vectors(16))
+
+        self.assertEqual(result.failed_ids, ["v5"])
+        self.assertEqual(result.written, 15)
+        self.assertNotIn("v5", index.vectors)
+        # The clean batch went once; the poisoned one was bisected (8 -> 4+4 -> 2+2 -> 1+1)
+        self.assertEqual(sum(index.upsert_sizes), 8 + 8 + (4 + 4) + (2 + 2) + (1 + 1))
+
+    def test_transport_and_auth_failures_fail_the_batch_without_splitting(self):
+        class AuthError(Exception):
+            status = 401
+
+        for error, expected_calls in ((ConnectionError("connection refused"), 3), (AuthError("unauthorized"), 1)):
+            calls = []
+
+            class FailingIndex:
+                def upsert(self, vectors, namespace=None):
+                    calls.append(len(vectors))
+                    raise error
+
+            writer = PineconeBulkWriter(FailingIndex(), max_batch_vectors=100, max_retries=2, retry_backoff=0)
+            result = writer.upsert(make_vectors(100))
+
+            self.assertEqual(calls, [100] * expected_calls)
+            self.assertEqual((result.written, result.failed, result.splits), (0, 100, 0))
+
+    def test_metadata_updates_are_coalesced(self):
+        self.assertEqual(
+            coalesce_metadata_updates([("a", {"x": 1}), ("b", {"x": 2}), ("a", {"y": 3, "x": 4})]),
+            {"a": {"x": 4, "y": 3}, "b": {"x": 2}}
+        )
+        index = FakeIndex()
+        result = PineconeBulkWriter(index).update_metadata([("a", {"x": 1}), ("a", {"y": 2}), ("b", {"x": 3})])
+        self.assertEqual(result.written, 2)
+        self.assertEqual(sorted(index.updates, key=lambda u: u[0]), [("a", {"x": 1, "y": 2}), ("b", {"x": 3})])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+Test cases for the in-process progress bus
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import asyncio
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from src.progress_bus import ProgressBus, coalesce_events
+from src.progress_logger import BatchProgressLogger, ProgressLogger
+from src.progress_store import ProgressStore
+
+
+class TestProgressBus(unittest.TestCase):
+
+    def test_waiting_subscriber_is_woken_immediately(self):
+        bus = ProgressBus(coalesce_interval=0)
+        received = []
+
+        def viewer():
+            received.extend(bus.wait("batch:1", None, timeout=5))
+
+        thread = threading.Thread(target=viewer)
+        thread.start()
+        time.sleep(0.05)
+        started = time.monotonic()
+        bus.publish("batch:1", "progress", {"processed": 1}, coalesce_key="progress")
+        thread.join()
+
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual([event.data for event in received], [{"processed": 1}])
+
+    def test_many_viewers_share_one_publish(self):
+        bus = ProgressBus(coalesce_interval=0)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(bus.wait("batch:1", None, 5))) for _ in range(50)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        bus.publish("batch:1", "progress", {"processed": 1})
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(results), 50)
+        self.assertTrue(all(len(events) == 1 for events in results))
+
+    def test_burst_is_coalesced(self):
+        bus = ProgressBus(coalesce_interval=0.05)
+        for processed in range(20):
+            bus.publish("batch:1", "progress", {"processed": processed}, coalesce_key="progress")
+            if processed % 10 == 0:
+                bus.publish("batch:1", "log", {"message": f"line {processed}"})
+        bus.publish("batch:1", "complete", {"processed": 20})
+
+        events = bus.wait("batch:1", None, timeout=1)
+        self.assertEqual([event.event for event in events], ["log", "log", "progress", "complete"])
+        self.assertEqual(events[2].data, {"processed": 19})
+        self.assertEqual(bus.get_stats()["coalesced"], 19)
+
+    def test_resume_and_gap_detection(self):
+        bus = ProgressBus(history_size=3)
+        first = bus.publish("batch:1", "progress", {"processed": 1})
+        second = bus.publish("batch:1", "progress", {"processed": 2})
+
+        events, complete = bus.events_since("batch:1", first.id)
+        self.assertTrue(complete)
+        self.assertEqual(events, [second])
+
+        for processed in range(3, 7):
+            bus.publish("batch:1", "progress", {"processed": processed})
+        self.assertFalse(bus.events_since("batch:1", first.id)[1])
+        self.assertFalse(bus.events_since("batch:1", 999)[1])
+
+    def test_async_wait(self):
+        bus = ProgressBus(coalesce_interval=0)
+
+        async def scenario():
+            waiter = asyncio.create_task(bus.wait_async("job:1", None, timeout=5))
+            await asyncio.sleep(0.01)
+            threading.Thread(target=bus.publish, args=("job:1", "log", {"message": "hi"})).start()
+            return await asyncio.wait_for(waiter, 1)
+
+        self.assertEqual(asyncio.run(scenario())[0].data, {"message": "hi"})
+
+    def test_sse_format_defaults_to_unnamed_messages(self):
+        event = ProgressBus().publish("batch:1", "progress", {"processed": 1})
+        self.assertEqual(event.to_sse(), f'id: {event.id}\ndata: {{"processed": 1}}\n\n')
+        self.assertEqual(coalesce_events([event]), [event])
+
+
+class TestLoggersPublish(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.bus = ProgressBus(coalesce_interval=0)
+        patcher = patch("src.progress_bus.get_progress_bus", return_value=self.bus)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_batch_logger_publishes(self):
+        batch = BatchProgressLogger(store=ProgressStore(os.path.join(self.tmp.name, "progress.db")))
+        batch.start_batch_job("b1", 2)
+        batch.update_batch_progress("b1", 1, "Processing Acme...")
+        batch.complete_batch_job("b1", 2, 0, {})
+
+        events, _ = self.bus.events_since("batch:b1", None)
+        self.assertEqual([event.event for event in events], ["progress", "progress", "complete"])
+        self.assertEqual(events[1].data["current_company"], "Acme")
+
+    def test_progress_logger_publishes_phases_and_log_lines(self):
+        progress = ProgressLogger(os.path.join(self.tmp.name, "processing_progress.json"))
+        progress.start_job("j1", "Acme")
+        progress.update_phase("j1", "Link Discovery", "running")
+        progress.add_to_progress_log("j1", "Found 12 links")
+        progress.add_to_progress_log("j1", "Found 12 links")  # Duplicate, not stored or published
+        progress.complete_job("j1")
+
+        events, _ = self.bus.events_since("job:j1", None)
+        self.assertEqual([event.event for event in events], ["progress", "progress", "log", "complete"])
+        self.assertEqual(events[2].data["message"], "Found 12 links")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Test cases for the SQLite-backed progress store and loggers
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import json
+import tempfile
+import threading
+import unittest
+
+from src.progress_logger import BatchProgressLogger, ProgressLogger
+from src.progress_store import BATCH, COMPANY, MAX_LOG_ENTRIES, ProgressStore
+
+
+class TestProgressStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = ProgressStore(os.path.join(self.tmp.name, "progress.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_log_is_appended_deduplicated_and_trimmed(self):
+        self.store.put_job({"job_id": "j1", "status": "running", "processing_log": [{"message": "ignored"}]})
+        self.assertFalse(self.store.append_log("missing", "t", "hello"))
+        for i in range(MAX_LOG_ENTRIES + 30):
+            self.store.append_log("j1", "t", f"message {i}")
+        self.assertFalse(self.store.append_log("j1", "t", f"message {MAX_LOG_ENTRIES + 29}"))
+
+        log = self.store.get_job("j1")["processing_log"]
+        self.assertEqual(len(log), MAX_LOG_ENTRIES)
+        self.assertEqual(log[-1]["message"], f"message {MAX_LOG_ENTRIES + 29}")
+
+    def test_concurrent_updates_are_not_lost(self):
+        self.store.put_job({"job_id": "b1", "processed": 0}, BATCH)
+
+        def worker():
+            for _ in range(50):
+                self.store.update_job("b1", lambda job: job.update(processed=job["processed"] + 1))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.store.get_job("b1", BATCH)["processed"], 400)
+        self.assertIsNone(self.store.get_job("b1", COMPANY))
+
+    def test_second_connection_sees_updates(self):
+        other = ProgressStore(self.store.db_path)
+        self.store.put_job({"job_id": "j1", "status": "running", "company_name": "Acme"})
+        self.assertEqual(other.find_running_job("Acme"), "j1")
+        other.update_job("j1", lambda job: job.update(status="completed"))
+        self.assertIsNone(self.store.find_running_job("Acme"))
+        other.close()
+
+
+class TestProgressLoggers(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.tmp.name, "processing_progress.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_legacy_json_is_imported_once(self):
+        with open(self.log_file, "w") as f:
+            json.dump({"current_job": None, "jobs": {"old": {
+                "job_id": "old", "company_name": "Acme", "status": "completed", "phases": [],
+                "processing_log": [{"timestamp": "10:00:00 AM", "message": "done"}]
+            }}}, f)
+
+        ProgressLogger(self.log_file).store.close()
+        with open(self.log_file, "w") as f:
+            json.dump({"jobs": {}}, f)
+        progress = ProgressLogger(self.log_file)
+
+        self.assertEqual(progress.get_progress("old")["processing_log"][0]["message"], "done")
+        self.assertEqual(list(progress.get_progress()["jobs"]), ["old"])
+
+    def test_job_lifecycle(self):
+        progress = ProgressLogger(self.log_file)
+        progress.start_job("j1", "Acme")
+        progress.update_phase("j1", "Content Extraction", "running")
+        progress.log_page_scraping("j1", "https://acme.com/about", "About Acme", 1, 3)
+        progress.log_llm_call("j1", 1, "nova", 1000)
+
+        current = progress.get_current_job_progress()
+        self.assertEqual(current["job_id"], "j1")
+        self.assertEqual(current["phases"][0]["pages_completed"], 1)
+        self.assertEqual(len(current["processing_log"]), 2)
+
+        progress.update_phase("j1", "Content Extraction", "completed")
+        progress.complete_job("j1", success=True, result_summary="ok")
+        self.assertIsNone(progress.get_current_job_progress())
+        job = progress.get_progress("j1")
+        self.assertEqual(job["status"], "completed")
+        self.assertIsNotNone(job["phases"][0]["duration"])
+
+    def test_batch_progress(self):
+        batch = BatchProgressLogger(store=ProgressStore(os.path.join(self.tmp.name, "progress.db")))
+        batch.start_batch_job("b1", 3)
+        batch.update_batch_progress("b1", 1, "Processing Acme Corp...")
+        self.assertEqual(batch.get_batch_progress("b1")["current_company"], "Acme Corp")
+        batch.complete_batch_job("b1", 2, 1, {"ok": True})
+        self.assertEqual(batch.get_batch_progress("b1")["status"], "completed")
+        self.assertIsNone(batch.get_batch_progress("missing"))
+
+
+if __name__ == '__main__':
+    unittest.main()
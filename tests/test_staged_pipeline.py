@@ -0,0 +1,180 @@
+"""
+Test cases for the staged pipeline executor and the batch pipeline built on it
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from src.main_pipeline import TheodoreIntelligencePipeline
+from src.models import CompanyData, CompanyIntelligenceConfig, ProcessingJob
+from src.staged_pipeline import Stage, StagedPipeline
+
+
+class TestStagedPipeline(unittest.TestCase):
+
+    def test_downstream_starts_before_upstream_finishes(self):
+        events = []
+        lock = threading.Lock()
+
+        def scrape(item):
+            time.sleep(0.5 if item == 0 else 0.01)  # One slow website
+            with lock:
+                events.append(("scrape", item))
+            return item
+
+        def store(item):
+            with lock:
+                events.append(("store", item))
+            return item * 10
+
+        pipeline = StagedPipeline([Stage("scrape", scrape, workers=3), Stage("store", store, workers=1)])
+        result = pipeline.run(range(6))
+
+        self.assertEqual(result.outputs, [0, 10, 20, 30, 40, 50])  # Input order is kept
+        stored_before_slow_scrape = events.index(("scrape", 0))
+        self.assertTrue(any(event[0] == "store" for event in events[:stored_before_slow_scrape]))
+
+    def test_bounded_queue_applies_backpressure(self):
+        pipeline = StagedPipeline([
+            Stage("fast", lambda item: item, workers=2, queue_size=2),
+            Stage("slow", lambda item: time.sleep(0.01) or item, workers=1, queue_size=3),
+        ])
+        pipeline.run(range(40))
+        metrics = pipeline.get_metrics()
+        self.assertLessEqual(metrics["slow"]["max_queue_depth"], 3)
+        self.assertLessEqual(metrics["fast"]["max_queue_depth"], 2)
+        self.assertEqual(metrics["slow"]["items_out"], 40)
+
+    def test_batch_stage_and_failures(self):
+        batches = []
+
+        def extract(item):
+            if item == 3:
+                raise ValueError("bad page")
+            return item
+
+        def upsert(items):
+            batches.append(list(items))
+            return items
+
+        errors = []
+        pipeline = StagedPipeline(
+            [Stage("extract", extract, workers=2), Stage("upsert", upsert, batch_size=4, batch_wait=0.2)],
+            on_error=lambda item, stage, error: errors.append((item, stage))
+        )
+        result = pipeline.run(range(10))
+
+        self.assertEqual(result.outputs, [0, 1, 2, 4, 5, 6, 7, 8, 9])
+        self.assertEqual(errors, [(3, "extract")])
+        self.assertEqual([(item, stage) for item, stage, _ in result.failures], [(3, "extract")])
+        self.assertTrue(all(len(batch) <= 4 for batch in batches))
+        self.assertEqual(sorted(item for batch in batches for item in batch), result.outputs)
+        metrics = pipeline.get_metrics()
+        self.assertEqual((metrics["extract"]["failed"], metrics["upsert"]["items_out"]), (1, 9))
+        self.assertIn("upsert", pipeline.report())
+
+    def test_failing_input_stops_and_joins_every_stage(self):
+        stored = []
+
+        def items():
+            yield from range(3)
+            raise IOError("input truncated")
+
+        pipeline = StagedPipeline([
+            Stage("double", lambda item: item * 2, workers=2),
+            Stage("store", lambda items: stored.extend(items) or items, batch_size=4, batch_wait=5.0),
+        ])
+        started = time.monotonic()
+        with self.assertRaises(IOError):
+            pipeline.run(items())
+
+        self.assertLess(time.monotonic() - started, 5.0)  # Partial batch flushed by the stop sentinel
+        self.assertEqual(sorted(stored), [0, 2, 4])
+        self.assertFalse([t for t in threading.enumerate() if t.name.startswith("pipeline-")])
+
+
+class TestBatchPipeline(unittest.TestCase):
+
+    def test_companies_flow_through_all_stages_and_are_stored_incrementally(self):
+        theodore = TheodoreIntelligencePipeline.__new__(TheodoreIntelligencePipeline)
+        theodore.config = CompanyIntelligenceConfig(batch_size=2)
+        theodore.scraper = MagicMock()
+        theodore.bedrock_client = MagicMock()
+        theodore.pinecone_client = MagicMock()
+
+        def scrape(company):
+            company.scrape_status = "failed" if company.name == "Broken" else "success"
+            return company
+
+        theodore.scraper.scrape_company.side_effect = scrape
+        theodore.bedrock_client.analyze_company_content.return_value = {"industry": "SaaS"}
+        theodore.bedrock_client.generate_embedding.return_value = [0.1, 0.2]
+        theodore.pinecone_client.batch_upsert_companies.side_effect = len
+
+        companies = [CompanyData(name=name, website=f"https://{name.lower()}.com")
+                     for name in ("Acme", "Broken", "Globex", "Initech", "Umbrella")]
+        job = ProcessingJob(total_companies=len(companies))
+        processed = theodore._process_companies_batch(companies, job)
+
+        self.assertEqual([company.name for company in processed], ["Acme", "Broken", "Globex", "Initech", "Umbrella"])
+        self.assertEqual((job.processed_companies, job.failed_companies), (4, 1))
+        stored = [c.name for call in theodore.pinecone_client.batch_upsert_companies.call_args_list for c in call[0][0]]
+        self.assertEqual(sorted(stored), ["Acme", "Globex", "Initech", "Umbrella"])
+        self.assertGreaterEqual(theodore.pinecone_client.batch_upsert_companies.call_count, 2)
+        self.assertEqual(theodore.last_batch_pipeline.get_metrics()["scrape"]["items_out"], 5)
+
+    def test_short_upsert_count_fails_the_micro_batch(self):
+        theodore = TheodoreIntelligencePipeline.__new__(TheodoreIntelligencePipeline)
+        theodore.config = CompanyIntelligenceConfig(batch_size=2)
+        theodore.scraper = MagicMock()
+        theodore.bedrock_client = MagicMock()
+        theodore.pinecone_client = MagicMock()
+
+        def scrape(company):
+            company.scrape_status = "success"
+            return company
+
+        theodore.scraper.scrape_company.side_effect = scrape
+        theodore.bedrock_client.analyze_company_content.return_value = {"industry": "SaaS"}
+        theodore.bedrock_client.generate_embedding.return_value = [0.1, 0.2]
+        theodore.pinecone_client.batch_upsert_companies.side_effect = lambda companies: len(companies) - 1
+
+        companies = [CompanyData(name="Acme", website="https://acme.com")]
+        job = ProcessingJob(total_companies=1)
+        theodore._process_companies_batch(companies, job)
+
+        self.assertEqual((job.processed_companies, job.failed_companies), (0, 1))
+        self.assertIn("Pinecone stored 0 of 1", job.errors[0])
+
+    def test_bad_survey_rows_are_counted_as_failed(self):
+        theodore = TheodoreIntelligencePipeline.__new__(TheodoreIntelligencePipeline)
+        theodore.pinecone_client = MagicMock()
+
+        def find_company_by_name(name):
+            if name == "Globex":
+                raise ConnectionError("pinecone unreachable")
+            return None
+
+        theodore.pinecone_client.find_company_by_name.side_effect = find_company_by_name
+        with tempfile.NamedTemporaryFile("wb", suffix=".csv", delete=False) as f:
+            f.write(b"company_name,website\nAcme,https://acme.com\n\xff\xfeBroken,x\n"
+                    b"Globex,https://globex.com\nInitech,https://initech.com\n")
+        self.addCleanup(os.remove, f.name)
+
+        job = ProcessingJob(total_companies=0)
+        companies = list(theodore._convert_survey_to_companies(theodore._iter_survey_csv(f.name, job), job))
+
+        self.assertEqual([company.name for company in companies], ["Acme", "Initech"])
+        self.assertEqual((job.total_companies, job.failed_companies), (4, 2))
+        self.assertEqual(len(job.errors), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark recall@k vs. QPS of the local IVF-flat index against exact search
+
+Builds a flat and an IVF-flat LocalVectorIndex over the same synthetic,
+clustered 1536-d embeddings, then issues single-vector queries (like the
+similarity use cases do) and reports recall@k against the flat results plus
+queries per second for a sweep of nprobe values.
+
+Usage:
+    python scripts/benchmark_ann_index.py --vectors 50000 --queries 200 --nprobe 1 4 8 16 32
+"""
+
+import argparse
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from src.infrastructure.adapters.storage.local import LocalVectorConfig, LocalVectorIndex
+
+
+def make_embeddings(centers: np.ndarray, count: int, noise: float, rng: np.random.Generator) -> np.ndarray:
+    """Unit-length vectors scattered around cluster centres (real embeddings are far from uniform)."""
+    labels = rng.integers(0, len(centers), size=count)
+    vectors = centers[labels] + noise * rng.normal(size=(count, centers.shape[1])).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def build(index_type: str, vectors: np.ndarray, config: LocalVectorConfig, batch: int = 5000) -> LocalVectorIndex:
+    index = LocalVectorIndex.create(f"bench-{index_type}", vectors.shape[1], "cosine", config, index_type=index_type)
+    for start in range(0, len(vectors), batch):
+        chunk = vectors[start:start + batch]
+        index.upsert([(str(start + i), row, None) for i, row in enumerate(chunk)], "default")
+    return index
+
+
+def run_queries(index: LocalVectorIndex, queries: np.ndarray, k: int, nprobe=None):
+    results = []
+    started = time.perf_counter()
+    for query in queries:
+        hits = index.search([query], k, "default", nprobe=nprobe)[0]
+        results.append({stored.id for stored, _ in hits})
+    elapsed = time.perf_counter() - started
+    return results, len(queries) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--vectors", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--dimensions", type=int, default=1536)
+    parser.add_argument("--clusters", type=int, default=100, help="Clusters in the synthetic data")
+    parser.add_argument("--noise", type=float, default=1.0, help="Spread around each cluster centre")
+    parser.add_argument("--nlist", type=int, default=None, help="IVF cells (default 4 * sqrt(vectors))")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32, 64])
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"Generating {args.vectors} x {args.dimensions} vectors ...")
+    rng = np.random.default_rng(1)
+    centers = rng.normal(size=(args.clusters, args.dimensions)).astype(np.float32)
+    vectors = make_embeddings(centers, args.vectors, args.noise, rng)
+    queries = make_embeddings(centers, args.queries, args.noise, rng)
+
+    config = LocalVectorConfig(initial_capacity=args.vectors, max_vectors_per_index=args.vectors,
+                               ivf_nlist=args.nlist, ivf_min_train_size=1)
+    flat = build("flat", vectors, config)
+    ivf = build("ivf_flat", vectors, config)
+
+    started = time.perf_counter()
+    ivf.train()
+    print(f"IVF training: {ivf.ivf.cells} cells in {time.perf_counter() - started:.1f}s\n")
+
+    truth, flat_qps = run_queries(flat, queries, args.k)
+    print(f"{'index':<18}{'recall@' + str(args.k):>12}{'QPS':>10}{'speed-up':>10}")
+    print(f"{'flat (exact)':<18}{1.0:>12.3f}{flat_qps:>10.1f}{1.0:>10.1f}")
+
+    for nprobe in args.nprobe:
+        found, qps = run_queries(ivf, queries, args.k, nprobe=nprobe)
+        recall = np.mean([len(a & b) / args.k for a, b in zip(found, truth)])
+        print(f"{'ivf nprobe=' + str(nprobe):<18}{recall:>12.3f}{qps:>10.1f}{qps / flat_qps:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark MCP result deduplication with and without the candidate index
+
+Generates synthetic MCP results the way several providers report the same
+companies (case changes, legal suffixes, typos, alternate or differently
+formatted websites), then deduplicates them with MCPResultAggregator using
+the domain/MinHash-LSH candidate index and, on a subset, the original
+all-pairs comparison, reporting wall time and whether both produce the
+same groups.
+
+Usage:
+    python scripts/benchmark_mcp_dedup.py --results 10000 --baseline 2000
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.domain.entities.company import Company
+from src.core.domain.services.mcp_aggregator import DeduplicationStrategy, MCPResultAggregator
+from src.core.ports.mcp_search_tool import MCPToolInfo
+
+SYLLABLES = ["ra", "ko", "ve", "lin", "tor", "sa", "mi", "quant", "nex", "flo", "by", "te", "zen", "dat", "ar"]
+SUFFIXES = ["", " Inc", " Inc.", ", Inc.", " Labs", " AI", " Technologies", " Corp"]
+
+
+def random_name(rng: random.Random) -> str:
+    words = ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(rng.randint(1, 2))]
+    return " ".join(word.capitalize() for word in words)
+
+
+def variant(name: str, rng: random.Random) -> str:
+    roll = rng.random()
+    if roll < 0.3:
+        return name
+    if roll < 0.5:
+        return name.upper() if rng.random() < 0.5 else name.lower()
+    if roll < 0.8:
+        return name + rng.choice(SUFFIXES)
+    position = rng.randrange(len(name))
+    return name[:position] + rng.choice(string.ascii_lowercase) + name[position + 1:]
+
+
+def make_results(count: int, seed: int = 7):
+    """Synthetic (company, tool_info, confidence, metadata) tuples, ~3 mentions per company."""
+    rng = random.Random(seed)
+    tools = [MCPToolInfo(f"provider_{i}") for i in range(4)]
+    bases = [random_name(rng) for _ in range(max(1, count // 3))]
+    results = []
+    for _ in range(count):
+        base_index = rng.randrange(len(bases))
+        base = bases[base_index]
+        domain = base.lower().replace(" ", "") + f"{base_index}.com"
+        website_roll = rng.random()
+        if website_roll < 0.4:
+            website = f"https://{domain}"
+        elif website_roll < 0.6:
+            website = f"http://www.{domain}/about"
+        else:
+            # Regional or product site: only the name can tie it to the others
+            website = f"https://{base.lower().replace(' ', '-')}-{rng.randrange(3)}.io"
+        company = Company(
+            name=variant(base, rng),
+            website=website,
+            description=f"{base} builds {rng.choice(['software', 'hardware', 'data tools'])} for {rng.choice(['banks', 'retail', 'hospitals'])}."
+        )
+        results.append((company, rng.choice(tools), rng.uniform(0.5, 1.0), {}))
+    return results
+
+
+def groups(matches):
+    return [sorted(tool.tool_name + match.company.name for tool in match.source_tools) for match in matches]
+
+
+def dedupe(results, strategy: DeduplicationStrategy, use_dedup_index: bool):
+    aggregator = MCPResultAggregator(deduplication_strategy=strategy, use_dedup_index=use_dedup_index)
+    started = time.perf_counter()
+    matches = aggregator._deduplicate_companies(results)
+    return matches, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--results", type=int, default=10000)
+    parser.add_argument("--baseline", type=int, default=2000,
+                        help="Results also deduplicated all-pairs to check agreement (the O(n^2) path is slow)")
+    args = parser.parse_args()
+
+    results = make_results(args.results)
+    baseline = results[:args.baseline]
+
+    print(f"{'strategy':<12}{'results':>9}{'groups':>8}{'indexed s':>11}{'all-pairs s':>13}{'same groups':>13}")
+    for strategy in (DeduplicationStrategy.FUZZY, DeduplicationStrategy.SMART, DeduplicationStrategy.PERMISSIVE):
+        indexed, indexed_seconds = dedupe(results, strategy, True)
+        print(f"{strategy.value:<12}{len(results):>9}{len(indexed):>8}{indexed_seconds:>11.2f}{'-':>13}{'-':>13}")
+
+        subset_indexed, subset_seconds = dedupe(baseline, strategy, True)
+        subset_pairs, pairs_seconds = dedupe(baseline, strategy, False)
+        same = groups(subset_indexed) == groups(subset_pairs)
+        print(f"{strategy.value:<12}{len(baseline):>9}{len(subset_indexed):>8}{subset_seconds:>11.2f}"
+              f"{pairs_seconds:>13.2f}{str(same):>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,13 +7,14 @@ FastAPI router for company research endpoints with streaming progress.
 
 import asyncio
 from typing import Optional
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Request
 from fastapi.responses import StreamingResponse
 
 from ...infrastructure.container.application import ApplicationContainer
 from ...core.use_cases.research_company import ResearchCompanyUseCase
 from ...infrastructure.observability.logging import get_logger
 from ...infrastructure.observability.metrics import get_metrics_collector
+from ...infrastructure.observability.progress_bus import get_progress_bus
 from ..models.requests import ResearchRequest
 from ..models.responses import ResearchResponse, CompanyIntelligence
 from ..models.common import JobStatus
@@ -71,6 +72,7 @@ async def start_research(
     try:
         # Get research use case
         research_use_case = await container.get(ResearchCompanyUseCase)
+        research_use_case.progress_publisher = get_progress_bus().publish_progress
         
         # Start research job
         job_result = await research_use_case.execute(
@@ -262,6 +264,7 @@ async def cancel_research(
 @router.get("/{job_id}/stream", summary="Stream Research Progress")
 async def stream_research_progress(
     job_id: str,
+    http_request: Request,
     container: ApplicationContainer = Depends(get_container)
 ):
     """
@@ -270,9 +273,17 @@ async def stream_research_progress(
     Returns a Server-Sent Events (SSE) stream with real-time progress updates.
     Each event contains the current progress information in JSON format.
     
+    Updates are pushed from the progress event bus as the research use case
+    emits them. Reconnecting clients send Last-Event-ID to resume; bursts of
+    updates are coalesced to the latest snapshot.
+    
     This is an alternative to WebSocket for clients that prefer HTTP streaming.
     """
     
+    last_event_header = http_request.headers.get("last-event-id")
+    last_event_id = int(last_event_header) if last_event_header and last_event_header.isdigit() else None
+    bus = get_progress_bus()
+    
     async def generate_progress_stream():
         """Generate SSE stream of progress updates"""
         
@@ -285,31 +296,25 @@ async def stream_research_progress(
                 yield f"event: error\ndata: {{\"error\": \"Job not found: {job_id}\"}}\n\n"
                 return
             
-            # Stream progress updates
-            last_progress = None
+            cursor = last_event_id
+            missed, complete = bus.events_since(job_id, cursor)
+            if cursor is None or not complete:
+                # New client or a gap the history no longer covers: start from a snapshot
+                snapshot_id = bus.last_event_id
+                current_progress = await research_use_case.get_job_progress(job_id)
+                if current_progress:
+                    yield f"id: {snapshot_id}\nevent: progress\ndata: {current_progress.json()}\n\n"
+                    if current_progress.status in ["completed", "failed", "cancelled"]:
+                        yield f"event: complete\ndata: {{\"status\": \"{current_progress.status}\"}}\n\n"
+                        return
+                cursor = snapshot_id
             
-            while True:
-                try:
-                    # Get current progress
-                    current_progress = await research_use_case.get_job_progress(job_id)
-                    
-                    if current_progress != last_progress:
-                        # Progress changed, send update
-                        yield f"event: progress\ndata: {current_progress.json()}\n\n"
-                        last_progress = current_progress
-                        
-                        # Check if job is complete
-                        if current_progress.status in ["completed", "failed", "cancelled"]:
-                            yield f"event: complete\ndata: {{\"status\": \"{current_progress.status}\"}}\n\n"
-                            break
-                    
-                    # Wait before next check
-                    await asyncio.sleep(1)
-                    
-                except Exception as e:
-                    logger.error(f"Error streaming progress for job {job_id}: {e}")
-                    yield f"event: error\ndata: {{\"error\": \"Stream error: {str(e)}\"}}\n\n"
-                    break
+            async for events in bus.subscribe(job_id, cursor):
+                if events is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                for event in events:
+                    yield event.to_sse()
                     
         except Exception as e:
             logger.error(f"Failed to start progress stream for job {job_id}: {e}")
@@ -322,6 +327,6 @@ async def stream_research_progress(
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
             "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Headers": "Cache-Control"
+            "Access-Control-Allow-Headers": "Cache-Control, Last-Event-ID"
         }
-    )
\ No newline at end of file
+    )
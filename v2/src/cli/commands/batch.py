@@ -9,7 +9,7 @@ import asyncio
 import json
 import time
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
 import click
 from rich.console import Console
@@ -70,6 +70,7 @@ class BatchCommand:
         verbose: bool = False,
         max_retries: int = 2,
         priority: str = "medium",
+        shard: Optional[str] = None,
         **kwargs
     ) -> None:
         """Execute batch research processing with comprehensive options"""
@@ -90,9 +91,10 @@ class BatchCommand:
             
             # Create batch configuration
             input_source = BatchInputSource(
-                type=InputSourceType.CSV_FILE,
+                type=self._get_input_type(input_path),
                 path=str(input_path.absolute())
             )
+            shard_index, shard_count = self._parse_shard(shard)
             
             output_destination = BatchOutputDestination(
                 type=self._get_output_type(format),
@@ -105,7 +107,9 @@ class BatchCommand:
                 checkpoint_interval=checkpoint_interval,
                 max_retries=max_retries,
                 enable_progress_tracking=True,
-                include_metadata=True
+                include_metadata=True,
+                input_shard_index=shard_index,
+                input_shard_count=shard_count
             )
             
             # Dry run - validate input without processing
@@ -126,7 +130,9 @@ class BatchCommand:
                 max_concurrent=concurrency,
                 timeout_per_company=timeout,
                 checkpoint_interval=checkpoint_interval,
-                max_retries=max_retries
+                max_retries=max_retries,
+                input_shard_index=shard_index,
+                input_shard_count=shard_count
             )
             
             # Monitor progress
@@ -142,6 +148,29 @@ class BatchCommand:
                 import traceback
                 console.print(traceback.format_exc())
     
+    def _get_input_type(self, input_path: Path) -> InputSourceType:
+        """Get input source type from the input file extension"""
+        extension_mapping = {
+            '.xlsx': InputSourceType.EXCEL_FILE,
+            '.xlsm': InputSourceType.EXCEL_FILE,
+            '.json': InputSourceType.JSON_FILE,
+            '.jsonl': InputSourceType.JSON_FILE,
+            '.ndjson': InputSourceType.JSON_FILE
+        }
+        return extension_mapping.get(input_path.suffix.lower(), InputSourceType.CSV_FILE)
+    
+    def _parse_shard(self, shard: Optional[str]) -> Tuple[int, int]:
+        """Parse a 1-based "N/M" shard option into (index, count)"""
+        if not shard:
+            return 0, 1
+        try:
+            number, count = (int(part) for part in shard.split('/'))
+        except ValueError:
+            raise click.BadParameter(f"Expected N/M, got {shard!r}", param_hint='--shard')
+        if count < 1 or not 1 <= number <= count:
+            raise click.BadParameter(f"Shard {shard} is out of range", param_hint='--shard')
+        return number - 1, count
+    
     def _get_output_type(self, format_str: str) -> OutputDestinationType:
         """Convert format string to output destination type"""
         format_mapping = {
@@ -163,7 +192,8 @@ class BatchCommand:
             from src.core.use_cases.batch_processing import BatchInputProcessor
             processor = BatchInputProcessor()
             
-            async for company_data in processor.read_companies_from_csv(input_source.path):
+            reader = processor.open_reader(input_source)
+            async for company_data in processor.read_companies(reader):
                 company_count += 1
                 
                 # Validate company data
@@ -199,9 +229,8 @@ class BatchCommand:
             from src.core.use_cases.batch_processing import BatchInputProcessor
             processor = BatchInputProcessor()
             
-            company_count = 0
-            async for _ in processor.read_companies_from_csv(input_source.path):
-                company_count += 1
+            # Extrapolated from a sample so large inputs are not read twice
+            company_count = await processor.estimate_company_count(input_source)
             
             # Rough cost estimation (this would use actual cost models)
             estimated_cost_per_company = 0.15  # Example cost
@@ -245,7 +274,8 @@ class BatchCommand:
             
             content = (
                 f"📊 Progress: [{progress_bar}] {progress_info.completion_percentage:.1f}%\n"
-                f"✅ Completed: {progress_info.completed_companies}/{progress_info.total_companies}\n"
+                f"✅ Completed: {progress_info.completed_companies}/"
+                f"{'~' if progress_info.total_is_estimate else ''}{progress_info.total_companies}\n"
                 f"❌ Failed: {progress_info.failed_companies}\n"
                 f"⚡ Rate: {progress_info.processing_rate:.1f} companies/min\n"
                 f"💰 Cost: ${progress_info.cost_accumulated:.2f}\n"
@@ -454,13 +484,14 @@ def batch(ctx):
 @click.option('--max-retries', type=int, default=2, help='Maximum retry attempts per company')
 @click.option('--priority', type=click.Choice(['low', 'medium', 'high'], case_sensitive=False),
               default='medium', help='Job priority level')
+@click.option('--shard', type=str, help='Process only shard N of M of the input (e.g. 2/4)')
 @click.pass_context
 def research(ctx, input_file: str, output: str, format: str, concurrency: int, 
              timeout: int, job_name: Optional[str], checkpoint_interval: int,
              cost_estimate: bool, dry_run: bool, verbose: bool, max_retries: int,
-             priority: str) -> None:
+             priority: str, shard: Optional[str]) -> None:
     """
-    Process companies for research intelligence from CSV file.
+    Process companies for research intelligence from a CSV, Excel, JSON Lines or JSON array file.
     
     Examples:
     
@@ -479,6 +510,10 @@ def research(ctx, input_file: str, output: str, format: str, concurrency: int,
     \\b
     # Dry run to validate input
     theodore batch research companies.csv --dry-run
+    
+    \\b
+    # Split a large input across four workers (run once per shard)
+    theodore batch research companies.jsonl --shard 1/4 --output results-1.csv
     """
     
     # Get container from context
@@ -500,7 +535,8 @@ def research(ctx, input_file: str, output: str, format: str, concurrency: int,
         dry_run=dry_run,
         verbose=verbose,
         max_retries=max_retries,
-        priority=priority
+        priority=priority,
+        shard=shard
     ))
 
 
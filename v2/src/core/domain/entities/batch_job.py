@@ -84,6 +84,7 @@ class BatchOutputDestination:
 class BatchProgress:
     """Comprehensive batch progress tracking"""
     total_companies: int
+    total_is_estimate: bool = False  # extrapolated from the input read position
     completed_companies: int = 0
     failed_companies: int = 0
     skipped_companies: int = 0
@@ -98,6 +99,7 @@ class BatchProgress:
     processing_rate: float = 0.0  # companies per minute
     average_processing_time: float = 0.0  # seconds per company
     cost_accumulated: float = 0.0
+    slot_utilization: float = 0.0  # share of concurrency slots kept busy
     
     # Error tracking
     errors_by_type: Dict[str, int] = field(default_factory=dict)
@@ -145,6 +147,14 @@ class BatchConfiguration:
     checkpoint_interval: int = 10
     enable_progress_tracking: bool = True
     progress_update_interval: int = 5
+    journal_path: Optional[str] = None  # defaults to "<output path>.journal.jsonl"
+    journal_group_size: int = 25
+    restart_journal: bool = False
+    
+    # Input sharding: this worker processes shard input_shard_index of
+    # input_shard_count
+    input_shard_index: int = 0
+    input_shard_count: int = 1
     
     # Resource management
     memory_limit_mb: int = 2048
@@ -198,6 +208,9 @@ class BatchResultSummary:
     output_file_size: Optional[int] = None
     output_record_count: Optional[int] = None
     
+    # Scheduler information
+    slot_utilization: Optional[float] = None
+    
     @property
     def success_rate(self) -> float:
         """Calculate overall success rate"""
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Theodore v2 Company Data Model
+
+Flat company record used by the export, analytics and reporting engines.
+"""
+
+from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class CompanyData(BaseModel):
+    """Company record as exported and analyzed; fields beyond these are kept as extras"""
+    model_config = ConfigDict(extra="allow")
+
+    name: str = Field(..., min_length=1, description="Company name")
+    website: Optional[str] = Field(None, description="Company website URL")
+    industry: Optional[str] = Field(None, description="Primary industry")
+    location: Optional[str] = Field(None, description="Headquarters location")
+    description: Optional[str] = Field(None, description="Company overview")
+    employee_count: Optional[int] = Field(None, ge=0, description="Number of employees")
+    company_size: Optional[str] = Field(None, description="Employee count range")
+    founded_year: Optional[int] = Field(None, description="Year founded")
+    revenue: Optional[float] = Field(None, ge=0, description="Annual revenue in USD")
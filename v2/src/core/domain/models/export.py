@@ -18,6 +18,7 @@ class ExportFormat(str, Enum):
     """Supported export formats"""
     CSV = "csv"
     JSON = "json"
+    JSONL = "jsonl"
     EXCEL = "excel"
     PDF = "pdf"
     PARQUET = "parquet"
@@ -124,14 +125,20 @@ class ExportFilters(BaseModel):
 class OutputConfig(BaseModel):
     """Export output configuration"""
     
-    format: ExportFormat
+    # Unknown formats are kept as strings and rejected by the export engine
+    format: Union[ExportFormat, str] = Field(union_mode='left_to_right')
     file_path: Path
     
-    # Streaming options
+    # Streaming options (the engine rejects a non-positive threshold)
     stream_large_datasets: bool = False
-    streaming_threshold: int = Field(default=1000, gt=0)
+    streaming_threshold: int = Field(default=1000, ge=0)
     chunk_size: int = Field(default=1000, gt=0)
     
+    # Field selection and renaming
+    include_fields: List[str] = Field(default_factory=list)
+    exclude_fields: List[str] = Field(default_factory=list)
+    custom_columns: Dict[str, str] = Field(default_factory=dict)
+    
     # Compression and optimization
     compress: bool = False
     optimize_memory: bool = True
@@ -172,7 +179,7 @@ class ExportResult(BaseModel):
     file_size_bytes: int
     
     # Processing details
-    processing_time_seconds: float
+    processing_time_seconds: float = 0.0  # Set by the export engine once the export completes
     streaming_used: bool = False
     chunks_processed: Optional[int] = None
     
@@ -0,0 +1,229 @@
+"""
+Durable per-company outcome journal for batch jobs.
+
+This module provides an append-only JSON Lines journal that records the
+outcome of every company a batch job processes. Records are flushed and
+fsynced in groups, so a crash loses at most one group. A restarted job
+replays the journal to skip companies that already succeeded and to retry
+only the failures.
+
+Entries are keyed by the normalized company name and website rather than
+by input path or row number, so a journal copied from another machine
+resumes the same input there.
+"""
+
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_VERSION = 1
+
+
+@dataclass
+class JournalEntry:
+    """Latest recorded outcome of one company."""
+
+    key: str
+    company_name: str
+    status: str
+    row: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    attempts: int = 1
+
+    @property
+    def succeeded(self) -> bool:
+        return self.status == "success"
+
+
+class BatchJournal:
+    """
+    Append-only outcome journal with group commit.
+
+    Each line is one JSON record. The first line is a header
+    ({"type": "header", ...}) and every other line is an outcome
+    ({"type": "outcome", "key": ..., "status": ..., "row": {...}}).
+    The last outcome for a key wins on replay.
+
+    Writes are buffered by the OS and made durable (flush + fsync) every
+    group_size outcomes or group_interval seconds, whichever comes
+    first, and on sync()/close().
+    """
+
+    def __init__(
+        self,
+        path: str,
+        group_size: int = 25,
+        group_interval: float = 1.0
+    ):
+        self.path = path
+        self.group_size = max(1, group_size)
+        self.group_interval = group_interval
+        self.entries: Dict[str, JournalEntry] = {}
+        self.header: Dict[str, Any] = {}
+
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+        # Statistics
+        self.records_written = 0
+        self.syncs = 0
+
+    @staticmethod
+    def company_key(company_name: str, website: Optional[str] = None) -> str:
+        """Stable, path-independent key for a company row."""
+        name = " ".join((company_name or "").lower().split())
+        site = (website or "").strip().lower()
+        for prefix in ("https://", "http://"):
+            if site.startswith(prefix):
+                site = site[len(prefix):]
+        if site.startswith("www."):
+            site = site[4:]
+        return f"{name}|{site.rstrip('/')}"
+
+    def open(self, job_id: Optional[str] = None, restart: bool = False) -> Dict[str, JournalEntry]:
+        """
+        Replay the journal and open it for appending.
+
+        Args:
+            job_id: Job recorded in the header of a new journal
+            restart: Discard existing entries and start a new journal
+
+        Returns:
+            Latest entry per company key
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+
+        if restart or not os.path.exists(self.path):
+            self._file = open(self.path, "w", encoding="utf-8")
+            self.entries = {}
+            self.header = {
+                "type": "header",
+                "version": JOURNAL_VERSION,
+                "job_id": job_id,
+                "created_at": datetime.now(timezone.utc).isoformat()
+            }
+            self._append(self.header)
+            self.sync()
+            return self.entries
+
+        self._replay()
+        self._file = open(self.path, "a", encoding="utf-8")
+        return self.entries
+
+    def record(
+        self,
+        company_name: str,
+        website: Optional[str],
+        status: str,
+        row: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ) -> JournalEntry:
+        """Append the outcome of one company."""
+        key = self.company_key(company_name, website)
+        previous = self.entries.get(key)
+        entry = JournalEntry(
+            key=key,
+            company_name=company_name,
+            status=status,
+            row=row or {},
+            error=error,
+            attempts=previous.attempts + 1 if previous else 1
+        )
+        self.entries[key] = entry
+
+        self._append({
+            "type": "outcome",
+            "key": key,
+            "company_name": company_name,
+            "status": status,
+            "row": entry.row,
+            "error": error,
+            "attempts": entry.attempts,
+            "recorded_at": datetime.now(timezone.utc).isoformat()
+        })
+        self.records_written += 1
+        self._unsynced += 1
+
+        if (
+            self._unsynced >= self.group_size or
+            time.monotonic() - self._last_sync >= self.group_interval
+        ):
+            self.sync()
+        return entry
+
+    def completed(self, company_name: str, website: Optional[str] = None) -> Optional[JournalEntry]:
+        """Get the successful entry for a company, if it already succeeded."""
+        entry = self.entries.get(self.company_key(company_name, website))
+        return entry if entry and entry.succeeded else None
+
+    def sync(self) -> None:
+        """Make every appended record durable."""
+        if self._file is None:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self.syncs += 1
+
+    def close(self) -> None:
+        """Sync and close the journal."""
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def get_statistics(self) -> Dict[str, int]:
+        """Get journal statistics."""
+        succeeded = sum(1 for entry in self.entries.values() if entry.succeeded)
+        return {
+            "companies": len(self.entries),
+            "succeeded": succeeded,
+            "failed": len(self.entries) - succeeded,
+            "records_written": self.records_written,
+            "syncs": self.syncs
+        }
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, default=str, ensure_ascii=False) + "\n")
+
+    def _replay(self) -> None:
+        """Load entries, dropping a torn final line left by a crash."""
+        self.entries = {}
+        valid_length = 0
+
+        with open(self.path, "rb") as file:
+            for raw_line in file:
+                if not raw_line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(raw_line)
+                except ValueError:
+                    break
+                valid_length += len(raw_line)
+
+                if record.get("type") == "header":
+                    self.header = record
+                elif record.get("type") == "outcome":
+                    self.entries[record["key"]] = JournalEntry(
+                        key=record["key"],
+                        company_name=record.get("company_name", ""),
+                        status=record.get("status", "failed"),
+                        row=record.get("row") or {},
+                        error=record.get("error"),
+                        attempts=record.get("attempts", 1)
+                    )
+
+        if valid_length < os.path.getsize(self.path):
+            logger.warning(f"Truncating incomplete tail of batch journal {self.path}")
+            with open(self.path, "r+b") as file:
+                file.truncate(valid_length)
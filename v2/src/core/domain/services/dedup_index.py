@@ -0,0 +1,187 @@
+"""
+Candidate blocking index for company deduplication.
+
+This module provides a sublinear candidate index for fuzzy company
+deduplication: companies are blocked by normalized domain and by the
+character q-grams they share with a name, so the expensive pairwise
+similarity check only runs within a block instead of against every
+company kept so far.
+"""
+
+import math
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+
+class CompanyDedupIndex:
+    """
+    Candidate index over company names and domains.
+
+    Two blocks feed candidates:
+
+    - Domain: companies whose websites share a normalized domain. Same
+      domain means similarity 1.0, so this block is exact.
+    - Name: a q-gram count filter that is exact for
+      difflib.SequenceMatcher.ratio() on the lower-cased, stripped names.
+      A ratio r >= t over lengths a and b needs a common subsequence of
+      at least t * (a + b) / 2 characters, so the names are at most
+      d = floor((1 - t) * (a + b)) insertions/deletions apart. Each edit
+      destroys at most q padded q-grams, so the names still share at
+      least max(a, b) + q - 1 - q * d q-grams (counted with
+      multiplicity). Names whose lengths differ by more than d are never
+      candidates. When the bound is not positive, which happens for short
+      names and low thresholds, every name of a compatible length is a
+      candidate.
+
+    Name blocking only runs when a name match alone can reach the
+    threshold (min_name_similarity <= 1.0). With min_name_similarity <= 0
+    every position is a candidate, matching a full scan.
+
+    Positions are added with add(); re-adding a position (e.g. after its
+    company data was merged) adds the new keys while keeping the old ones,
+    which only widens the candidate set.
+    """
+
+    def __init__(self, min_name_similarity: float, shingle_size: int = 2):
+        self.min_name_similarity = min_name_similarity
+        self.shingle_size = shingle_size
+
+        self._positions: Set[int] = set()
+        self._by_domain: Dict[str, Set[int]] = defaultdict(set)
+
+        # One entry per distinct (position, normalized name)
+        self._entries: Dict[Tuple[int, str], int] = {}
+        self._entry_positions: List[int] = []
+        self._entry_lengths: List[int] = []
+        self._by_gram: Dict[Tuple[str, int], List[int]] = defaultdict(list)
+        self._by_length: Dict[int, List[int]] = defaultdict(list)
+        self._gram_keys: Dict[str, List[Tuple[str, int]]] = {}
+
+        # Statistics
+        self.candidate_lookups = 0
+        self.candidates_returned = 0
+
+    @property
+    def uses_name_blocking(self) -> bool:
+        """Whether names can match on their own at the configured threshold."""
+        return 0.0 < self.min_name_similarity <= 1.0
+
+    @property
+    def full_scan(self) -> bool:
+        """Whether every position must be compared (no safe blocking)."""
+        return self.min_name_similarity <= 0.0
+
+    def add(self, position: int, name: Optional[str], domain: Optional[str]) -> None:
+        """
+        Index a company at a position.
+
+        Args:
+            position: Position of the company in the caller's match list
+            name: Company name
+            domain: Normalized website domain, or None without a website
+        """
+        self._positions.add(position)
+        if domain is not None:
+            self._by_domain[domain].add(position)
+
+        normalized = name.lower().strip() if name else ""
+        if not self.uses_name_blocking or not normalized or (position, normalized) in self._entries:
+            return
+
+        entry = len(self._entry_positions)
+        self._entries[(position, normalized)] = entry
+        self._entry_positions.append(position)
+        self._entry_lengths.append(len(normalized))
+        self._by_length[len(normalized)].append(entry)
+        for key in self._name_keys(normalized):
+            self._by_gram[key].append(entry)
+
+    def candidates(self, name: Optional[str], domain: Optional[str]) -> List[int]:
+        """
+        Get positions that may be similar to a company, in position order.
+
+        Args:
+            name: Company name
+            domain: Normalized website domain, or None without a website
+
+        Returns:
+            Sorted list of candidate positions
+        """
+        if self.full_scan:
+            found = self._positions
+        else:
+            found = set()
+            if domain is not None:
+                found |= self._by_domain.get(domain, set())
+            normalized = name.lower().strip() if name else ""
+            if self.uses_name_blocking and normalized:
+                found |= self._name_candidates(normalized)
+
+        self.candidate_lookups += 1
+        self.candidates_returned += len(found)
+        return sorted(found)
+
+    def _name_candidates(self, normalized: str) -> Set[int]:
+        """Positions whose names pass the length and q-gram count filters."""
+        length = len(normalized)
+        found: Set[int] = set()
+
+        # Lengths too short for the count filter to exclude anything
+        for other_length, entries in self._by_length.items():
+            if self._length_compatible(length, other_length) and self._min_shared(length, other_length) <= 0:
+                found.update(self._entry_positions[entry] for entry in entries)
+
+        shared: Counter = Counter()
+        for key in self._name_keys(normalized):
+            shared.update(self._by_gram.get(key, ()))
+        for entry, count in shared.items():
+            other_length = self._entry_lengths[entry]
+            if self._length_compatible(length, other_length) and count >= self._min_shared(length, other_length):
+                found.add(self._entry_positions[entry])
+        return found
+
+    def _max_edits(self, length: int, other_length: int) -> int:
+        """Most insertions/deletions between names whose ratio reaches the threshold."""
+        # Tolerance keeps float rounding from dropping an exact boundary
+        return math.floor((1.0 - self.min_name_similarity) * (length + other_length) + 1e-9)
+
+    def _length_compatible(self, length: int, other_length: int) -> bool:
+        return abs(length - other_length) <= self._max_edits(length, other_length)
+
+    def _min_shared(self, length: int, other_length: int) -> int:
+        """Lower bound on shared padded q-grams for names that can reach the threshold."""
+        q = self.shingle_size
+        return max(length, other_length) + q - 1 - q * self._max_edits(length, other_length)
+
+    def _name_keys(self, normalized: str) -> List[Tuple[str, int]]:
+        """
+        Get the padded q-grams of a normalized name (cached).
+
+        Repeated q-grams are numbered, so shared keys count the multiset
+        intersection.
+        """
+        keys = self._gram_keys.get(normalized)
+        if keys is None:
+            size = self.shingle_size
+            padding = " " * (size - 1)
+            padded = f"{padding}{normalized}{padding}"
+            seen: Counter = Counter()
+            keys = []
+            for i in range(len(padded) - size + 1):
+                gram = padded[i:i + size]
+                keys.append((gram, seen[gram]))
+                seen[gram] += 1
+            self._gram_keys[normalized] = keys
+        return keys
+
+    def get_statistics(self) -> Dict[str, float]:
+        """Get candidate blocking statistics."""
+        return {
+            "indexed_positions": len(self._positions),
+            "domain_blocks": len(self._by_domain),
+            "name_grams": len(self._by_gram),
+            "candidate_lookups": self.candidate_lookups,
+            "average_candidates": (
+                self.candidates_returned / self.candidate_lookups if self.candidate_lookups else 0.0
+            )
+        }
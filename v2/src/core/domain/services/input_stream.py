@@ -0,0 +1,342 @@
+"""
+Lazy, row-count-free readers for batch input files.
+
+This module provides a streaming reader that yields input rows one at a
+time from CSV/TSV, Excel (openpyxl read-only mode), JSON Lines and JSON
+array files. Nothing is read ahead beyond the current row (or, for JSON
+arrays, the current buffered chunk), so memory stays flat and processing
+can start on the first row of a multi-hundred-MB file.
+
+Instead of counting rows up front, the reader tracks how far into the
+input it is (byte offset for text files, row position for Excel) and
+extrapolates the total from the rows seen so far.
+
+Input can be sharded across workers: shard i of n yields every n-th row
+of CSV, Excel and JSON array input, and a contiguous byte range of JSON
+Lines input (records never span lines, so a range can start at any newline).
+"""
+
+import asyncio
+import codecs
+import csv
+import json
+import logging
+import os
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+try:
+    import openpyxl
+    HAS_OPENPYXL = True
+except ImportError:
+    HAS_OPENPYXL = False
+
+
+logger = logging.getLogger(__name__)
+
+INPUT_FORMATS = {
+    ".csv": "csv",
+    ".tsv": "csv",
+    ".txt": "csv",
+    ".xlsx": "excel",
+    ".xlsm": "excel",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".json": "json",
+}
+
+# Bytes read per step when decoding a JSON array
+_JSON_CHUNK_BYTES = 64 * 1024
+_JSON_WHITESPACE = " \t\r\n"
+
+
+def detect_input_format(path: str) -> str:
+    """Detect the input format ("csv", "excel", "jsonl" or "json") from a file extension."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in INPUT_FORMATS:
+        raise ValueError(f"Unsupported input file type: {extension or path}")
+    return INPUT_FORMATS[extension]
+
+
+class StreamingInputReader:
+    """
+    Streams rows of a CSV, Excel or JSON Lines file as dictionaries.
+
+    A reader can be iterated once, synchronously (``for row in reader``)
+    or from async code (``async for row in reader.stream()``), which reads
+    rows in small batches on a worker thread so the event loop never
+    blocks on disk.
+
+    Args:
+        path: Input file
+        input_format: "csv", "excel", "jsonl" or "json" (a JSON array of
+            records, or JSON Lines); detected from the extension if omitted
+        shard_index: Shard this reader yields, 0 <= shard_index < shard_count
+        shard_count: Number of workers the input is split across
+        encoding: Text encoding of CSV and JSON Lines input
+        sheet_name: Excel worksheet (defaults to the active sheet)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        input_format: Optional[str] = None,
+        shard_index: int = 0,
+        shard_count: int = 1,
+        encoding: str = "utf-8",
+        sheet_name: Optional[str] = None
+    ):
+        if shard_count < 1 or not 0 <= shard_index < shard_count:
+            raise ValueError(f"Invalid shard {shard_index} of {shard_count}")
+
+        self.path = path
+        self.input_format = input_format or detect_input_format(path)
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+        self.encoding = encoding
+        self.sheet_name = sheet_name
+
+        self.total_bytes = os.path.getsize(path)
+        self.rows_read = 0
+
+        # Position within this reader's part of the input, in the unit
+        # of _span (bytes for text files, rows for Excel)
+        self._position = 0
+        self._span: Optional[int] = None
+        self._rows: Optional[Iterator[Dict[str, Any]]] = None
+
+    @property
+    def progress(self) -> float:
+        """Fraction of this reader's part of the input consumed so far (0.0-1.0)."""
+        if self._span is None:
+            return 0.0
+        if self._span <= 0:
+            return 1.0
+        return min(1.0, self._position / self._span)
+
+    def estimate_total_rows(self) -> Optional[int]:
+        """
+        Estimate how many rows this reader will yield in total.
+
+        Extrapolated from the rows read so far and the share of the input
+        they came from; exact once the input is exhausted. None before the
+        first row has been read.
+        """
+        progress = self.progress
+        if progress >= 1.0:
+            return self.rows_read
+        if self.rows_read == 0 or progress <= 0.0:
+            return None
+        return max(self.rows_read, round(self.rows_read / progress))
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        if self._rows is None:
+            self._rows = self._iter_rows()
+        return self
+
+    def __next__(self) -> Dict[str, Any]:
+        if self._rows is None:
+            self._rows = self._iter_rows()
+        row = next(self._rows)
+        self.rows_read += 1
+        return row
+
+    def read_batch(self, size: int) -> List[Dict[str, Any]]:
+        """Read up to size rows; an empty list means the input is exhausted."""
+        batch = []
+        for row in self:
+            batch.append(row)
+            if len(batch) >= size:
+                break
+        return batch
+
+    def close(self) -> None:
+        """Release the underlying file before the input is exhausted."""
+        if self._rows is not None:
+            self._rows.close()
+
+    async def stream(self, batch_size: int = 256) -> AsyncIterator[Dict[str, Any]]:
+        """Yield rows from async code, reading each batch on a worker thread."""
+        while True:
+            batch = await asyncio.to_thread(self.read_batch, batch_size)
+            if not batch:
+                return
+            for row in batch:
+                yield row
+
+    def _iter_rows(self) -> Iterator[Dict[str, Any]]:
+        if self.input_format == "csv":
+            return self._iter_csv()
+        if self.input_format == "excel":
+            return self._iter_excel()
+        if self.input_format == "jsonl":
+            return self._iter_jsonl()
+        if self.input_format == "json":
+            return self._iter_json_array() if self._is_json_array() else self._iter_jsonl()
+        raise ValueError(f"Unsupported input format: {self.input_format}")
+
+    def _owns(self, row_number: int) -> bool:
+        return row_number % self.shard_count == self.shard_index
+
+    def _iter_csv(self) -> Iterator[Dict[str, Any]]:
+        self._span = self.total_bytes
+        delimiter = "\t" if self.path.lower().endswith(".tsv") else ","
+
+        with open(self.path, "rb") as file:
+            def lines() -> Iterator[str]:
+                # The csv module pulls lines as it needs them, so the offset
+                # after each row includes any quoted multi-line fields
+                for raw_line in file:
+                    self._position += len(raw_line)
+                    yield raw_line.decode(self.encoding)
+
+            text_lines = lines()
+            first_line = next(text_lines, None)
+            if first_line is None:
+                return
+            reader = csv.DictReader(
+                self._prepend(first_line.lstrip("\ufeff"), text_lines),
+                delimiter=delimiter
+            )
+            for row_number, row in enumerate(reader):
+                if self._owns(row_number):
+                    yield row
+
+    def _iter_excel(self) -> Iterator[Dict[str, Any]]:
+        if not HAS_OPENPYXL:
+            raise ImportError("openpyxl is required to read Excel input (pip install openpyxl)")
+
+        workbook = openpyxl.load_workbook(self.path, read_only=True, data_only=True)
+        try:
+            sheet = workbook[self.sheet_name] if self.sheet_name else workbook.active
+            rows = sheet.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                self._span = 0
+                return
+
+            # Read-only sheets report their size from the stored dimension
+            # tag without loading any rows; without one (some writers
+            # leave it out) there is no estimate until the sheet ends
+            max_row = sheet.max_row
+            self._span = max_row - 1 if max_row else None
+            columns = [
+                str(name).strip() if name is not None else f"column_{index + 1}"
+                for index, name in enumerate(header)
+            ]
+
+            for row_number, values in enumerate(rows):
+                self._position = row_number + 1
+                if not any(value not in (None, "") for value in values):
+                    continue
+                if self._owns(row_number):
+                    yield {
+                        column: "" if value is None else str(value)
+                        for column, value in zip(columns, values)
+                    }
+            self._span = self._position
+        finally:
+            workbook.close()
+
+    def _iter_jsonl(self) -> Iterator[Dict[str, Any]]:
+        shard_size = self.total_bytes // self.shard_count
+        start = shard_size * self.shard_index
+        end = self.total_bytes if self.shard_index == self.shard_count - 1 else start + shard_size
+        self._span = end - start
+
+        with open(self.path, "rb") as file:
+            # A shard owns every record that starts inside its byte range
+            if start > 0:
+                file.seek(start - 1)
+                if file.read(1) != b"\n":
+                    self._position += len(file.readline())
+
+            while start + self._position < end:
+                raw_line = file.readline()
+                if not raw_line:
+                    break
+                self._position += len(raw_line)
+
+                line = raw_line.decode(self.encoding).strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning(f"Skipping malformed JSON line near byte {start + self._position} of {self.path}")
+                    continue
+                if isinstance(record, dict):
+                    yield {key: "" if value is None else value for key, value in record.items()}
+
+    def _is_json_array(self) -> bool:
+        """True if the file's first non-whitespace character opens an array."""
+        with open(self.path, "r", encoding=self.encoding) as file:
+            while True:
+                chunk = file.read(256)
+                if not chunk:
+                    return False
+                stripped = chunk.lstrip(_JSON_WHITESPACE + "\ufeff")
+                if stripped:
+                    return stripped[0] == "["
+
+    def _iter_json_array(self) -> Iterator[Dict[str, Any]]:
+        decoder = json.JSONDecoder()
+        text_decoder = codecs.getincrementaldecoder(self.encoding)()
+        self._span = self.total_bytes
+        buffer = ""
+        index = 0
+        consumed = 0  # Characters dropped from the front of the buffer
+        eof = False
+        row_number = 0
+
+        with open(self.path, "rb") as file:
+            def fill() -> bool:
+                """Append the next chunk to the buffer; False at the end of the file."""
+                nonlocal buffer, index, consumed, eof
+                if eof:
+                    return False
+                chunk = file.read(_JSON_CHUNK_BYTES)
+                eof = not chunk
+                consumed += index
+                buffer = buffer[index:] + text_decoder.decode(chunk, final=eof)
+                index = 0
+                return True
+
+            def peek(skipped: str) -> Optional[str]:
+                """Advance past `skipped` characters; the next one, or None at the end."""
+                nonlocal index
+                while True:
+                    while index < len(buffer) and buffer[index] in skipped:
+                        index += 1
+                    if index < len(buffer):
+                        return buffer[index]
+                    if not fill():
+                        return None
+
+            if peek(_JSON_WHITESPACE + "\ufeff") != "[":
+                raise ValueError(f"{self.path} is not a JSON array")
+            index += 1
+
+            while True:
+                char = peek(_JSON_WHITESPACE + ",")
+                if char is None or char == "]":
+                    break
+                try:
+                    record, index = decoder.raw_decode(buffer, index)
+                except ValueError:
+                    # The element runs past the buffered text, or is malformed
+                    if fill():
+                        continue
+                    logger.warning(f"Skipping malformed JSON near character {consumed + index} of {self.path}")
+                    break
+                self._position = consumed + index
+                if isinstance(record, dict) and self._owns(row_number):
+                    yield {key: "" if value is None else value for key, value in record.items()}
+                row_number += 1
+
+        # Progress counts characters, which undercount multi-byte text
+        self._span = self._position
+
+    @staticmethod
+    def _prepend(first: str, rest: Iterator[str]) -> Iterator[str]:
+        yield first
+        yield from rest
@@ -6,17 +6,23 @@ from multiple MCP (Model Context Protocol) search tools.
 """
 
 import logging
-from typing import Dict, List, Optional, Set, Tuple, Any
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Any
 from dataclasses import dataclass
 from enum import Enum
 import difflib
 
 from src.core.ports.mcp_search_tool import MCPSearchResult, MCPToolInfo
 from src.core.domain.entities.company import Company
+from src.core.domain.services.dedup_index import CompanyDedupIndex
 
 
 logger = logging.getLogger(__name__)
 
+# Weights of the company similarity score (a shared domain short-circuits to 1.0)
+NAME_SIMILARITY_WEIGHT = 0.7
+WEBSITE_SIMILARITY_WEIGHT = 0.2
+DESCRIPTION_SIMILARITY_WEIGHT = 0.1
+
 
 class DeduplicationStrategy(str, Enum):
     """Strategies for deduplicating company results."""
@@ -79,13 +85,18 @@ class MCPResultAggregator:
         deduplication_strategy: DeduplicationStrategy = DeduplicationStrategy.SMART,
         ranking_strategy: RankingStrategy = RankingStrategy.HYBRID,
         similarity_threshold: float = 0.85,
-        max_results: int = 50
+        max_results: int = 50,
+        use_dedup_index: bool = True
     ):
         self.deduplication_strategy = deduplication_strategy
         self.ranking_strategy = ranking_strategy
         self.similarity_threshold = similarity_threshold
         self.max_results = max_results
         
+        # Block fuzzy/smart candidates by domain and name q-grams instead
+        # of comparing every company against every kept company
+        self.use_dedup_index = use_dedup_index
+        
         # Tool priority mapping (higher = better)
         self.tool_priorities: Dict[str, int] = {}
         
@@ -236,10 +247,13 @@ class MCPResultAggregator:
     ) -> List[CompanyMatch]:
         """Fuzzy deduplication: similar names and domains."""
         matches = []
+        dedup_index = self._create_dedup_index()
         
         for company, tool_info, confidence, metadata in companies_with_sources:
             # Find existing matches
-            matching_index = self._find_fuzzy_match(company, matches)
+            matching_index = self._find_fuzzy_match(
+                company, matches, self._candidate_indexes(company, matches, dedup_index)
+            )
             
             if matching_index is None:
                 # Create new match
@@ -250,6 +264,7 @@ class MCPResultAggregator:
                     metadata_by_tool={tool_info.tool_name: metadata},
                     match_quality=1.0
                 ))
+                self._index_match(dedup_index, len(matches) - 1, company)
             else:
                 # Merge with existing match
                 existing_match = matches[matching_index]
@@ -261,6 +276,7 @@ class MCPResultAggregator:
                 existing_match.company = self._merge_company_data(
                     existing_match.company, company
                 )
+                self._index_match(dedup_index, matching_index, existing_match.company)
         
         return matches
     
@@ -272,15 +288,16 @@ class MCPResultAggregator:
         # For now, implement as enhanced fuzzy matching
         # Could be extended with ML models for better similarity detection
         matches = []
+        dedup_index = self._create_dedup_index()
         
         for company, tool_info, confidence, metadata in companies_with_sources:
-            # Calculate similarity with all existing matches
+            # Calculate similarity with all candidate matches
             best_match_index = None
             best_similarity = 0.0
             
-            for i, existing_match in enumerate(matches):
+            for i in self._candidate_indexes(company, matches, dedup_index):
                 similarity = self._calculate_company_similarity(
-                    company, existing_match.company
+                    company, matches[i].company
                 )
                 
                 if similarity > best_similarity and similarity >= self.similarity_threshold:
@@ -296,6 +313,7 @@ class MCPResultAggregator:
                     metadata_by_tool={tool_info.tool_name: metadata},
                     match_quality=1.0
                 ))
+                self._index_match(dedup_index, len(matches) - 1, company)
             else:
                 # Merge with best match
                 existing_match = matches[best_match_index]
@@ -308,6 +326,7 @@ class MCPResultAggregator:
                 existing_match.company = self._merge_company_data(
                     existing_match.company, company
                 )
+                self._index_match(dedup_index, best_match_index, existing_match.company)
         
         return matches
     
@@ -343,14 +362,101 @@ class MCPResultAggregator:
         
         return f"{name}|{domain}"
     
+    def _create_dedup_index(self) -> Optional[CompanyDedupIndex]:
+        """
+        Create a candidate index for one deduplication pass.
+        
+        Without a shared domain, similarity is at most
+        name * 0.7 + description * 0.1, so names below
+        (threshold - 0.1) / 0.7 can never match and need no comparison.
+        """
+        if not self.use_dedup_index:
+            return None
+        
+        min_name_similarity = (
+            self.similarity_threshold - DESCRIPTION_SIMILARITY_WEIGHT
+        ) / NAME_SIMILARITY_WEIGHT
+        return CompanyDedupIndex(min_name_similarity)
+    
+    def _candidate_indexes(
+        self,
+        company: Company,
+        existing_matches: List[CompanyMatch],
+        dedup_index: Optional[CompanyDedupIndex]
+    ) -> Iterable[int]:
+        """Get positions of existing matches worth comparing, in order."""
+        if dedup_index is None:
+            return range(len(existing_matches))
+        
+        domain = self._company_domain(company)
+        return [
+            i for i in dedup_index.candidates(company.name, domain)
+            if self._may_reach_threshold(company, domain, existing_matches[i].company)
+        ]
+    
+    def _may_reach_threshold(
+        self,
+        company: Company,
+        domain: Optional[str],
+        other: Company
+    ) -> bool:
+        """
+        Cheap exact bound on _calculate_company_similarity.
+        
+        Unless the domains match, the score is at most
+        name * 0.7 + 0.1, so the (long) description comparison is only
+        worth running when the short name comparison leaves room for it.
+        """
+        if domain is not None and domain == self._company_domain(other):
+            return True
+        if not company.name or not other.name:
+            return DESCRIPTION_SIMILARITY_WEIGHT >= self.similarity_threshold
+        
+        name1 = company.name.lower().strip()
+        name2 = other.name.lower().strip()
+        if name1 == name2:
+            return True
+        
+        def reachable(name_similarity: float) -> bool:
+            return (
+                name_similarity * NAME_SIMILARITY_WEIGHT + DESCRIPTION_SIMILARITY_WEIGHT
+                >= self.similarity_threshold
+            )
+        
+        # real_quick_ratio and quick_ratio are cheap upper bounds of ratio
+        matcher = difflib.SequenceMatcher(None, name1, name2)
+        return (
+            reachable(matcher.real_quick_ratio()) and
+            reachable(matcher.quick_ratio()) and
+            reachable(matcher.ratio())
+        )
+    
+    def _index_match(
+        self,
+        dedup_index: Optional[CompanyDedupIndex],
+        position: int,
+        company: Company
+    ) -> None:
+        """Add a match's (possibly merged) company to the candidate index."""
+        if dedup_index is not None:
+            dedup_index.add(position, company.name, self._company_domain(company))
+    
+    def _company_domain(self, company: Company) -> Optional[str]:
+        """Get the normalized domain of a company, if it has a website."""
+        return self._extract_domain(company.website) if company.website else None
+    
     def _find_fuzzy_match(
         self,
         company: Company,
-        existing_matches: List[CompanyMatch]
+        existing_matches: List[CompanyMatch],
+        candidate_indexes: Optional[Iterable[int]] = None
     ) -> Optional[int]:
         """Find fuzzy match in existing matches."""
-        for i, match in enumerate(existing_matches):
-            similarity = self._calculate_company_similarity(company, match.company)
+        if candidate_indexes is None:
+            candidate_indexes = range(len(existing_matches))
+        
+        for i in candidate_indexes:
+            similarity = self._calculate_company_similarity(company, existing_matches[i].company)
             if similarity >= self.similarity_threshold:
                 return i
         return None
@@ -388,9 +494,9 @@ class MCPResultAggregator:
         
         # Weight name most heavily
         total_similarity = (
-            name_similarity * 0.7 +
-            website_similarity * 0.2 +
-            description_similarity * 0.1
+            name_similarity * NAME_SIMILARITY_WEIGHT +
+            website_similarity * WEBSITE_SIMILARITY_WEIGHT +
+            description_similarity * DESCRIPTION_SIMILARITY_WEIGHT
         )
         
         return total_similarity
@@ -554,5 +660,6 @@ class MCPResultAggregator:
             "deduplication_strategy": self.deduplication_strategy.value,
             "ranking_strategy": self.ranking_strategy.value,
             "similarity_threshold": self.similarity_threshold,
+            "use_dedup_index": self.use_dedup_index,
             "max_results": self.max_results
         }
\ No newline at end of file
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Similarity Kernel
+=================
+
+Blocked NumPy kernels for embedding similarity at collection scale.
+
+Rows are normalised once, and the similarity matrix is produced in row tiles
+sized to a memory budget, so N x M problems never hold more than one tile of
+scores at a time. Top-k per row is selected inside each tile with
+argpartition, so nearest-neighbour lists for 50k embeddings need no
+50k x 50k matrix.
+
+Metrics: "cosine", "dot" (alias "dot_product") and "euclidean", which is
+reported as a similarity 1 / (1 + distance) like the vector storage adapters.
+"""
+
+from typing import Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+DEFAULT_MEMORY_BUDGET_BYTES = 256 * 1024 * 1024
+SUPPORTED_METRICS = ("cosine", "dot", "dot_product", "euclidean")
+
+Embeddings = Union[np.ndarray, Sequence[Sequence[float]]]
+
+
+def as_matrix(embeddings: Embeddings, dtype=np.float32) -> np.ndarray:
+    """Embeddings as a 2-D array (a single vector becomes one row)."""
+    matrix = np.asarray(embeddings, dtype=dtype)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    if matrix.ndim != 2:
+        raise ValueError(f"Expected a list of embeddings, got an array of shape {matrix.shape}")
+    return matrix
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Unit-length copy of every row; all-zero rows stay zero."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def block_rows(n_columns: int, memory_budget_bytes: int = DEFAULT_MEMORY_BUDGET_BYTES, itemsize: int = 4) -> int:
+    """
+    Rows per tile so one tile of scores (plus its argpartition scratch)
+    fits in the memory budget.
+    """
+    per_row = max(1, n_columns) * (itemsize + 8)  # scores + int64 partition indexes
+    return int(max(1, memory_budget_bytes // per_row))
+
+
+class SimilarityKernel:
+    """
+    Tiled similarity between a set of query embeddings and a corpus.
+
+    Args:
+        corpus: Corpus embeddings (N x d)
+        metric: "cosine", "dot"/"dot_product" or "euclidean"
+        memory_budget_bytes: Upper bound for one tile of scores
+    """
+
+    def __init__(
+        self,
+        corpus: Embeddings,
+        metric: str = "cosine",
+        memory_budget_bytes: int = DEFAULT_MEMORY_BUDGET_BYTES
+    ):
+        if metric not in SUPPORTED_METRICS:
+            raise ValueError(f"Unsupported similarity metric '{metric}'; expected one of {', '.join(SUPPORTED_METRICS)}")
+        self.metric = metric
+        self.memory_budget_bytes = memory_budget_bytes
+
+        corpus = as_matrix(corpus)
+        self.dimensions = corpus.shape[1]
+        # Normalise once: every tile afterwards is a plain matrix product
+        self.corpus = normalize_rows(corpus) if metric == "cosine" else corpus
+        self._corpus_sq_norms = np.einsum("ij,ij->i", corpus, corpus) if metric == "euclidean" else None
+
+    def __len__(self) -> int:
+        return len(self.corpus)
+
+    def _prepare(self, queries: Embeddings) -> np.ndarray:
+        queries = as_matrix(queries)
+        if queries.shape[1] != self.dimensions:
+            raise ValueError("Embeddings must have the same dimensions")
+        return normalize_rows(queries) if self.metric == "cosine" else queries
+
+    def _scores(self, queries: np.ndarray) -> np.ndarray:
+        dots = queries @ self.corpus.T
+        if self.metric != "euclidean":
+            return dots
+        squared = np.einsum("ij,ij->i", queries, queries)[:, None] - 2 * dots + self._corpus_sq_norms[None, :]
+        return 1.0 / (1.0 + np.sqrt(np.maximum(squared, 0.0)))
+
+    def iter_blocks(self, queries: Optional[Embeddings] = None) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Yield (first_row, scores) tiles of the query x corpus similarity
+        matrix. Queries default to the corpus itself.
+        """
+        queries = self.corpus if queries is None else self._prepare(queries)
+        step = block_rows(len(self.corpus), self.memory_budget_bytes)
+        for start in range(0, len(queries), step):
+            yield start, self._scores(queries[start:start + step])
+
+    def matrix(self, queries: Optional[Embeddings] = None) -> np.ndarray:
+        """Full similarity matrix (only for sizes where N x M fits in memory)."""
+        n_queries = len(self.corpus) if queries is None else len(as_matrix(queries))
+        result = np.empty((n_queries, len(self.corpus)), dtype=np.float32)
+        for start, block in self.iter_blocks(queries):
+            result[start:start + len(block)] = block
+        return result
+
+    def top_k(
+        self,
+        k: int,
+        queries: Optional[Embeddings] = None,
+        exclude_self: Optional[bool] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The k most similar corpus rows for every query, best first.
+
+        Args:
+            k: Neighbours per query (capped at the corpus size)
+            queries: Query embeddings; defaults to the corpus itself
+            exclude_self: Skip the diagonal (defaults to True for self-similarity)
+
+        Returns:
+            (indices, scores), both n_queries x k
+        """
+        self_join = queries is None
+        if exclude_self is None:
+            exclude_self = self_join
+        available = len(self.corpus) - (1 if exclude_self and self_join else 0)
+        k = max(0, min(k, available))
+
+        n_queries = len(self.corpus) if self_join else len(as_matrix(queries))
+        indices = np.empty((n_queries, k), dtype=np.int64)
+        scores = np.empty((n_queries, k), dtype=np.float32)
+        if k == 0:
+            return indices, scores
+
+        for start, block in self.iter_blocks(queries):
+            if exclude_self and self_join:
+                rows = np.arange(len(block))
+                block[rows, start + rows] = -np.inf
+            top = np.argpartition(block, block.shape[1] - k, axis=1)[:, -k:]
+            top_scores = np.take_along_axis(block, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind="stable")
+            indices[start:start + len(block)] = np.take_along_axis(top, order, axis=1)
+            scores[start:start + len(block)] = np.take_along_axis(top_scores, order, axis=1)
+
+        return indices, scores
+
+
+def pairwise_similarity(
+    embeddings: Embeddings,
+    other: Optional[Embeddings] = None,
+    metric: str = "cosine",
+    memory_budget_bytes: int = DEFAULT_MEMORY_BUDGET_BYTES
+) -> np.ndarray:
+    """Similarity matrix between two sets of embeddings (or a set and itself)."""
+    if other is None:
+        return SimilarityKernel(embeddings, metric, memory_budget_bytes).matrix()
+    return SimilarityKernel(other, metric, memory_budget_bytes).matrix(embeddings)
+
+
+def top_k_similar(
+    embeddings: Embeddings,
+    k: int,
+    metric: str = "cosine",
+    memory_budget_bytes: int = DEFAULT_MEMORY_BUDGET_BYTES
+) -> Tuple[np.ndarray, np.ndarray]:
+    """k nearest neighbours of every embedding among the others, best first."""
+    return SimilarityKernel(embeddings, metric, memory_budget_bytes).top_k(k)
+
+
+def mean_pairwise_cosine(embeddings: Embeddings) -> Optional[float]:
+    """
+    Mean cosine similarity over all unordered pairs, in O(N * d).
+
+    For unit vectors u_i, the sum over i < j of u_i . u_j equals
+    (|sum u_i|^2 - sum |u_i|^2) / 2, so no pair is ever formed.
+    """
+    units = normalize_rows(as_matrix(embeddings, dtype=np.float64))
+    n = len(units)
+    if n < 2:
+        return None
+    total = units.sum(axis=0)
+    pair_sum = (total @ total - np.einsum("ij,ij->", units, units)) / 2
+    return float(pair_sum / (n * (n - 1) / 2))
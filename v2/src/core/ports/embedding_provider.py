@@ -11,9 +11,12 @@ from typing import List, Dict, Any, Optional, Union, AsyncIterator
 import asyncio
 from contextlib import asynccontextmanager
 
-from src.core.domain.value_objects.ai_config import EmbeddingConfig, ModelInfo
+import numpy as np
+
+from src.core.domain.value_objects.ai_config import EmbeddingConfig
 from src.core.domain.value_objects.ai_response import EmbeddingResult, AnalysisError
 from src.core.ports.progress import ProgressTracker
+from src.core.domain.services.similarity_kernel import pairwise_similarity, top_k_similar
 
 
 # Type aliases for cleaner signatures
@@ -456,7 +459,6 @@ class SimilarityEmbeddingProvider(EmbeddingProvider):
         """
         pass
     
-    @abstractmethod
     async def compute_similarity_matrix(
         self,
         texts: List[str],
@@ -466,6 +468,12 @@ class SimilarityEmbeddingProvider(EmbeddingProvider):
         """
         Compute pairwise similarity matrix for all texts.
         
+        The default implementation embeds the texts in one batch and scores
+        them with the blocked NumPy similarity kernel (embeddings are
+        normalised once, tiles stay within the kernel's memory budget).
+        For large collections prefer find_top_k_similar, which never
+        materialises the N x N matrix.
+        
         Args:
             texts: List of texts
             config: Embedding configuration
@@ -474,7 +482,8 @@ class SimilarityEmbeddingProvider(EmbeddingProvider):
         Returns:
             Square matrix where [i][j] is similarity between texts[i] and texts[j]
         """
-        pass
+        results = await self.get_embeddings_batch(texts, config)
+        return calculate_similarity_matrix([result.embedding for result in results], similarity_metric)
 
 
 # Factory interface for creating embedding providers
@@ -679,14 +688,48 @@ def calculate_cosine_similarity(embedding1: EmbeddingVector, embedding2: Embeddi
     if len(embedding1) != len(embedding2):
         raise ValueError("Embeddings must have the same dimensions")
     
-    dot_product = sum(a * b for a, b in zip(embedding1, embedding2))
-    norm1 = sum(a * a for a in embedding1) ** 0.5
-    norm2 = sum(b * b for b in embedding2) ** 0.5
+    vector1 = np.asarray(embedding1, dtype=np.float64)
+    vector2 = np.asarray(embedding2, dtype=np.float64)
+    norm1 = np.linalg.norm(vector1)
+    norm2 = np.linalg.norm(vector2)
     
     if norm1 == 0 or norm2 == 0:
         return 0.0
     
-    return dot_product / (norm1 * norm2)
+    return float(vector1 @ vector2 / (norm1 * norm2))
+
+
+def calculate_similarity_matrix(
+    embeddings: List[EmbeddingVector],
+    similarity_metric: str = "cosine"
+) -> List[List[float]]:
+    """Calculate the pairwise similarity matrix of a list of embeddings"""
+    if not embeddings:
+        return []
+    return pairwise_similarity(embeddings, metric=similarity_metric).tolist()
+
+
+def find_top_k_similar(
+    embeddings: List[EmbeddingVector],
+    top_k: int = 5,
+    similarity_metric: str = "cosine"
+) -> List[List[tuple[int, float]]]:
+    """
+    Find the top_k most similar other embeddings for every embedding.
+    
+    Runs in memory-bounded tiles, so it scales to tens of thousands of
+    embeddings without building the full similarity matrix.
+    
+    Returns:
+        For each embedding, a list of (index, similarity_score) tuples sorted by similarity
+    """
+    if not embeddings:
+        return []
+    indices, scores = top_k_similar(embeddings, top_k, metric=similarity_metric)
+    return [
+        list(zip(row_indices.tolist(), row_scores.tolist()))
+        for row_indices, row_scores in zip(indices, scores)
+    ]
 
 
 def calculate_euclidean_distance(embedding1: EmbeddingVector, embedding2: EmbeddingVector) -> float:
@@ -6,7 +6,7 @@ Port interface for data export functionality with multiple format support.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 from pathlib import Path
 
 from ...domain.models.company import CompanyData
@@ -46,6 +46,30 @@ class ExportEnginePort(ABC):
         """
         pass
     
+    @abstractmethod
+    async def export_stream(
+        self,
+        records: AsyncIterator[Union[CompanyData, Dict[str, Any]]],
+        config: OutputConfig
+    ) -> ExportResult:
+        """
+        Export records pulled from an async iterator
+        
+        Records are consumed and written one chunk at a time, so memory
+        stays bounded by the chunk size instead of the export size.
+        
+        Args:
+            records: Company data or plain record dictionaries to export
+            config: Export configuration including format and chunk size
+            
+        Returns:
+            Export result with file information and metadata
+            
+        Raises:
+            ExportError: If the format cannot be streamed or export fails
+        """
+        pass
+    
     @abstractmethod
     async def validate_export_config(self, config: OutputConfig) -> bool:
         """
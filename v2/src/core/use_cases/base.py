@@ -8,7 +8,7 @@ use cases following Clean Architecture principles.
 """
 
 from abc import ABC, abstractmethod
-from typing import TypeVar, Generic, Any, Dict, Optional
+from typing import TypeVar, Generic, Any, Callable, Dict, Optional
 from pydantic import BaseModel, Field
 from datetime import datetime
 from enum import Enum
@@ -80,6 +80,10 @@ class BaseUseCaseResult(BaseModel):
 class BaseUseCase(ABC, Generic[TRequest, TResult]):
     """Base class for all use cases"""
     
+    # Optional push hook: called as progress_publisher(execution_id, progress_dict)
+    # on every progress event (the API wires this to its progress event bus)
+    progress_publisher: Optional[Callable[[str, Dict[str, Any]], Any]] = None
+    
     def __init__(self, progress_tracker=None):
         self.progress_tracker = progress_tracker
     
@@ -96,6 +100,19 @@ class BaseUseCase(ABC, Generic[TRequest, TResult]):
         message: Optional[str] = None
     ) -> None:
         """Emit progress event"""
+        if self.progress_publisher:
+            try:
+                self.progress_publisher(execution_id, {
+                    "execution_id": execution_id,
+                    "phase": phase,
+                    "percentage": percentage,
+                    "message": message,
+                    "timestamp": datetime.utcnow().isoformat()
+                })
+            except Exception:
+                # Progress delivery must never fail the use case
+                pass
+        
         if self.progress_tracker:
             try:
                 # Use the progress tracking system we built in TICKET-004
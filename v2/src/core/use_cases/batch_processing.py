@@ -9,13 +9,15 @@ import asyncio
 import logging
 import time
 from pathlib import Path
-from typing import List, Dict, Any, Optional, AsyncIterator, Callable
+from typing import List, Dict, Any, Optional, AsyncIterator, Awaitable, Callable
 from datetime import datetime, timezone
 
 from ..domain.entities.batch_job import (
     BatchJob, BatchJobStatus, BatchJobType, BatchProgress, 
     BatchResultSummary, BatchInputSource, BatchOutputDestination
 )
+from ..domain.services.batch_journal import BatchJournal, JournalEntry
+from ..domain.services.input_stream import StreamingInputReader
 from ..use_cases.research_company import ResearchCompanyUseCase
 from ..use_cases.discover_similar import DiscoverSimilarCompaniesUseCase
 from ..use_cases.base import BaseUseCase
@@ -23,32 +25,88 @@ from ..use_cases.base import BaseUseCase
 logger = logging.getLogger(__name__)
 
 
+def estimate_company_total(reader: StreamingInputReader, rows_read: int, companies: int) -> int:
+    """
+    Estimate the companies in a reader's input from those read so far.
+    
+    rows_read and companies count the rows consumed from the reader and
+    the valid companies among them. Exact once the reader is exhausted.
+    """
+    estimated_rows = reader.estimate_total_rows()
+    if not estimated_rows or rows_read == 0:
+        return companies
+    return max(companies, round(estimated_rows * companies / rows_read))
+
+
 class BatchInputProcessor:
     """Processes various input sources for batch operations"""
     
+    # Reader format for each file input source type
+    INPUT_FORMATS = {
+        "csv_file": "csv",
+        "excel_file": "excel",
+        "json_file": "json"
+    }
+    
+    def open_reader(
+        self,
+        input_source: BatchInputSource,
+        shard_index: int = 0,
+        shard_count: int = 1
+    ) -> StreamingInputReader:
+        """Open a lazy reader over one shard of a file input source"""
+        input_format = self.INPUT_FORMATS.get(input_source.type.value)
+        if input_format is None or not input_source.path:
+            raise ValueError(f"Unsupported batch input source: {input_source.type.value}")
+        
+        return StreamingInputReader(
+            input_source.path,
+            input_format=input_format,
+            shard_index=shard_index,
+            shard_count=shard_count,
+            sheet_name=input_source.schema_config.get('sheet_name')
+        )
+    
+    async def read_companies(self, reader: StreamingInputReader) -> AsyncIterator[Dict[str, Any]]:
+        """Stream companies from a reader, skipping rows without a company name"""
+        async for row in reader.stream():
+            company_data = self._normalize_company_row(row)
+            if company_data:
+                yield company_data
+    
     async def read_companies_from_csv(self, file_path: str) -> AsyncIterator[Dict[str, Any]]:
         """Read companies from CSV file with schema detection"""
-        import aiofiles
-        import csv
-        from io import StringIO
-        
         try:
-            async with aiofiles.open(file_path, 'r', encoding='utf-8') as file:
-                content = await file.read()
-                
-            # Parse CSV content
-            csv_reader = csv.DictReader(StringIO(content))
-            
-            for row in csv_reader:
-                # Auto-detect company name and website columns
-                company_data = self._normalize_company_row(row)
-                if company_data:
-                    yield company_data
+            reader = StreamingInputReader(file_path, input_format="csv")
+            async for company_data in self.read_companies(reader):
+                yield company_data
                     
         except Exception as e:
             logger.error(f"Error reading CSV file {file_path}: {e}")
             raise
     
+    async def estimate_company_count(
+        self,
+        input_source: BatchInputSource,
+        sample_size: int = 1000
+    ) -> int:
+        """Estimate the number of companies from the first sample_size of them"""
+        reader = self.open_reader(input_source)
+        rows_read = 0
+        companies = 0
+        
+        try:
+            async for row in reader.stream():
+                rows_read += 1
+                if self._normalize_company_row(row):
+                    companies += 1
+                if companies >= sample_size:
+                    break
+        finally:
+            reader.close()
+        
+        return estimate_company_total(reader, rows_read, companies)
+    
     def _normalize_company_row(self, row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Normalize CSV row to extract company information"""
         # Common column name patterns
@@ -80,8 +138,8 @@ class BatchInputProcessor:
             return None
         
         return {
-            'company_name': company_name.strip(),
-            'website': website.strip() if website else None,
+            'company_name': str(company_name).strip(),
+            'website': str(website).strip() if website else None,
             'original_row': row
         }
 
@@ -119,20 +177,41 @@ class BatchOutputProcessor:
         async with aiofiles.open(file_path, 'w', encoding='utf-8') as file:
             await file.write(output.getvalue())
     
+    async def open_csv_stream(
+        self,
+        file_path: str,
+        include_metadata: bool = True
+    ) -> 'CSVResultStream':
+        """Open a CSV file that batch results are appended to as they complete"""
+        import aiofiles
+        
+        # Results arrive one at a time, so the company columns are always
+        # present rather than inferred from the first result
+        fieldnames = self._csv_fieldnames(include_company_fields=True, include_metadata=include_metadata)
+        file = await aiofiles.open(file_path, 'w', encoding='utf-8', newline='')
+        stream = CSVResultStream(self, file, fieldnames, include_metadata)
+        await stream.write_header()
+        return stream
+    
     def _get_csv_fieldnames(self, results: List[Dict[str, Any]], include_metadata: bool) -> List[str]:
         """Determine CSV column names from results"""
+        include_company_fields = bool(
+            results and 'company_data' in results[0] and results[0]['company_data']
+        )
+        return self._csv_fieldnames(include_company_fields, include_metadata)
+    
+    def _csv_fieldnames(self, include_company_fields: bool, include_metadata: bool) -> List[str]:
+        """Build CSV column names"""
         fieldnames = ['company_name', 'website', 'status']
         
         # Add company data fields
-        if results and 'company_data' in results[0]:
-            sample_data = results[0]['company_data']
-            if sample_data:
-                # Add key company fields
-                company_fields = [
-                    'industry', 'description', 'founding_year', 'employee_count',
-                    'headquarters_location', 'business_model', 'value_proposition'
-                ]
-                fieldnames.extend(company_fields)
+        if include_company_fields:
+            # Add key company fields
+            company_fields = [
+                'industry', 'description', 'founding_year', 'employee_count',
+                'headquarters_location', 'business_model', 'value_proposition'
+            ]
+            fieldnames.extend(company_fields)
         
         if include_metadata:
             metadata_fields = [
@@ -175,6 +254,132 @@ class BatchOutputProcessor:
         return flattened
 
 
+class CSVResultStream:
+    """CSV output that batch results are written to one at a time"""
+    
+    def __init__(
+        self,
+        output_processor: BatchOutputProcessor,
+        file,
+        fieldnames: List[str],
+        include_metadata: bool
+    ):
+        self.output_processor = output_processor
+        self.file = file
+        self.fieldnames = fieldnames
+        self.include_metadata = include_metadata
+        self.record_count = 0
+    
+    async def write_header(self) -> None:
+        """Write the CSV header row"""
+        await self._write_row(None)
+    
+    async def write(self, result: Dict[str, Any]) -> None:
+        """Append one result"""
+        await self.write_row(
+            self.output_processor._flatten_result_for_csv(result, self.include_metadata)
+        )
+    
+    async def write_row(self, row: Dict[str, Any]) -> None:
+        """Append one already flattened row (columns not in the header are dropped)"""
+        await self._write_row(row)
+        self.record_count += 1
+    
+    async def close(self) -> None:
+        """Flush and close the output file"""
+        await self.file.close()
+    
+    async def _write_row(self, row: Optional[Dict[str, Any]]) -> None:
+        import csv
+        from io import StringIO
+        
+        output = StringIO()
+        writer = csv.DictWriter(output, fieldnames=self.fieldnames, extrasaction='ignore')
+        if row is None:
+            writer.writeheader()
+        else:
+            writer.writerow(row)
+        await self.file.write(output.getvalue())
+
+
+class SlidingWindowScheduler:
+    """
+    Keeps up to max_in_flight tasks running over an async stream of items.
+    
+    A slot is refilled from the source as soon as any task finishes
+    (asyncio.wait with FIRST_COMPLETED), so one slow item never holds
+    back the others, and results are yielded in completion order.
+    """
+    
+    def __init__(self, max_in_flight: int):
+        self.max_in_flight = max(1, max_in_flight)
+        self.busy_seconds = 0.0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+    
+    @property
+    def slot_utilization(self) -> float:
+        """Share of slot time spent running tasks (0.0-1.0)"""
+        if self.started_at is None:
+            return 0.0
+        elapsed = (self.finished_at or time.monotonic()) - self.started_at
+        if elapsed <= 0:
+            return 0.0
+        return min(1.0, self.busy_seconds / (self.max_in_flight * elapsed))
+    
+    async def run(
+        self,
+        items: AsyncIterator[Any],
+        worker: Callable[[Any], Awaitable[Any]]
+    ) -> AsyncIterator[Any]:
+        """
+        Run worker over every item, yielding results as they complete.
+        
+        Like gather(return_exceptions=True), an exception raised by a
+        worker is yielded in place of its result. Tasks still in flight
+        when the consumer stops iterating are cancelled.
+        """
+        self.started_at = time.monotonic()
+        self.finished_at = None
+        source = items.__aiter__()
+        source_exhausted = False
+        in_flight: Dict[asyncio.Task, float] = {}
+        
+        try:
+            while True:
+                # Refill free slots
+                while not source_exhausted and len(in_flight) < self.max_in_flight:
+                    try:
+                        item = await source.__anext__()
+                    except StopAsyncIteration:
+                        source_exhausted = True
+                        break
+                    in_flight[asyncio.create_task(worker(item))] = time.monotonic()
+                
+                if not in_flight:
+                    break
+                self.peak_in_flight = max(self.peak_in_flight, len(in_flight))
+                
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                finished_at = time.monotonic()
+                
+                for task in done:
+                    self.busy_seconds += finished_at - in_flight.pop(task)
+                    self.completed += 1
+                    if task.cancelled():
+                        yield asyncio.CancelledError()
+                    elif task.exception() is not None:
+                        yield task.exception()
+                    else:
+                        yield task.result()
+        finally:
+            for task in in_flight:
+                task.cancel()
+            self.finished_at = time.monotonic()
+
+
 class ConcurrencyController:
     """Controls concurrent execution with rate limiting and resource management"""
     
@@ -256,16 +461,14 @@ class BatchProcessingUseCase(BaseUseCase):
     ) -> BatchJob:
         """Start a new batch research job"""
         
-        # Count total companies first
-        total_companies = await self._count_companies_in_source(input_source)
-        
-        # Create batch job
+        # The input is not counted up front; the total is estimated from
+        # the read position while companies stream in
         job = BatchJob(
             job_name=job_name,
             job_type=BatchJobType.RESEARCH,
             input_source=input_source,
             output_destination=output_destination,
-            progress=BatchProgress(total_companies=total_companies)
+            progress=BatchProgress(total_companies=0, total_is_estimate=True)
         )
         
         # Update configuration
@@ -273,8 +476,6 @@ class BatchProcessingUseCase(BaseUseCase):
             if hasattr(job.configuration, key):
                 setattr(job.configuration, key, value)
         
-        # Total companies already set during job creation
-        
         # Store active job
         self.active_jobs[job.job_id] = job
         
@@ -283,16 +484,6 @@ class BatchProcessingUseCase(BaseUseCase):
         
         return job
     
-    async def _count_companies_in_source(self, input_source: BatchInputSource) -> int:
-        """Count total companies in input source"""
-        count = 0
-        
-        if input_source.type.value == "csv_file":
-            async for _ in self.input_processor.read_companies_from_csv(input_source.path):
-                count += 1
-        
-        return count
-    
     async def _execute_batch_research(self, job: BatchJob) -> None:
         """Execute batch research processing"""
         try:
@@ -305,41 +496,71 @@ class BatchProcessingUseCase(BaseUseCase):
                 rate_limit_per_minute=job.configuration.rate_limit_per_minute
             )
             
-            # Process companies
+            # Keep every slot busy: a new company starts as soon as any
+            # in-flight company finishes
+            scheduler = SlidingWindowScheduler(job.configuration.max_concurrent)
+            
+            # Results are kept as flattened rows, not full company data
             results = []
-            company_tasks = []
+            # Journal IO (replay, appends, fsync) runs in a worker thread
+            journal = await asyncio.to_thread(self._open_journal, job)
+            result_stream = None
+            # Journaled successes met while reading this input, waiting to be carried over
+            carried_over: List[JournalEntry] = []
             
-            # Read companies from input source
-            if job.input_source.type.value == "csv_file":
-                async for company_data in self.input_processor.read_companies_from_csv(job.input_source.path):
-                    # Create processing task
-                    task = asyncio.create_task(
-                        self._process_single_company(
-                            job, company_data, concurrency_controller
-                        )
+            try:
+                result_stream = await self._open_result_stream(job)
+                
+                async for result in scheduler.run(
+                    self._read_companies(job, journal, carried_over),
+                    lambda company_data: self._process_single_company(
+                        job, company_data, concurrency_controller
                     )
-                    company_tasks.append(task)
+                ):
+                    await self._carry_over(job, carried_over, results, result_stream)
+                    if isinstance(result, BaseException):
+                        continue
                     
-                    # Process in batches to avoid memory issues
-                    if len(company_tasks) >= job.configuration.max_concurrent * 2:
-                        batch_results = await asyncio.gather(*company_tasks, return_exceptions=True)
-                        results.extend([r for r in batch_results if not isinstance(r, Exception)])
-                        company_tasks = []
-                        
-                        # Create checkpoint if needed
-                        if job.should_checkpoint():
-                            await self._create_checkpoint(job)
-            
-            # Process remaining tasks
-            if company_tasks:
-                batch_results = await asyncio.gather(*company_tasks, return_exceptions=True)
-                results.extend([r for r in batch_results if not isinstance(r, Exception)])
+                    row = self.output_processor._flatten_result_for_csv(result, include_metadata=True)
+                    results.append(row)
+                    job.progress.slot_utilization = scheduler.slot_utilization
+                    
+                    # Journal the outcome before it is reported anywhere else
+                    if journal:
+                        await asyncio.to_thread(
+                            journal.record,
+                            result['company_name'],
+                            result.get('website'),
+                            result['status'],
+                            row=row,
+                            error=result.get('error_message')
+                        )
+                    
+                    # Stream the result to the output as soon as it completes
+                    if result_stream:
+                        await result_stream.write_row(row)
+                    
+                    # Create checkpoint if needed
+                    if job.should_checkpoint():
+                        await self._create_checkpoint(job, journal)
+                
+                await self._carry_over(job, carried_over, results, result_stream)
+            finally:
+                if result_stream:
+                    await result_stream.close()
+                if journal:
+                    await asyncio.to_thread(journal.close)
             
-            # Save results
-            await self._save_batch_results(job, results)
+            job.progress.slot_utilization = scheduler.slot_utilization
+            logger.info(
+                f"Saved {len(results)} results for job {job.job_id} "
+                f"(slot utilization {scheduler.slot_utilization:.0%}, "
+                f"peak {scheduler.peak_in_flight}/{scheduler.max_in_flight} in flight)"
+            )
             
             # Complete job
             result_summary = self._create_result_summary(job, results)
+            result_summary.slot_utilization = scheduler.slot_utilization
             job.complete_job(result_summary)
             
             await self._emit_progress("batch_research", "completed", 100, f"Batch job {job.job_id} completed")
@@ -374,12 +595,21 @@ class BatchProcessingUseCase(BaseUseCase):
                 job.progress.current_company = company_name
                 job.progress.processing_companies += 1
                 
-                # Perform research
-                company_result = await self.research_use_case.execute(
-                    company_name=company_name,
-                    website=company_data.get('website'),
-                    timeout=job.configuration.timeout_per_company
-                )
+                # Perform research within the per-company deadline
+                deadline = job.configuration.timeout_per_company
+                try:
+                    company_result = await asyncio.wait_for(
+                        self.research_use_case.execute(
+                            company_name=company_name,
+                            website=company_data.get('website'),
+                            timeout=deadline
+                        ),
+                        timeout=deadline
+                    )
+                except asyncio.TimeoutError:
+                    raise asyncio.TimeoutError(
+                        f"Research exceeded the {deadline}s per-company deadline"
+                    ) from None
                 
                 processing_time = time.time() - start_time
                 
@@ -443,22 +673,109 @@ class BatchProcessingUseCase(BaseUseCase):
             if elapsed_minutes > 0:
                 job.progress.processing_rate = total_processed / elapsed_minutes
     
-    async def _create_checkpoint(self, job: BatchJob) -> None:
+    async def _create_checkpoint(self, job: BatchJob, journal: Optional[BatchJournal] = None) -> None:
         """Create a checkpoint for job state"""
+        # The journal is the durable state; a checkpoint forces its
+        # pending group to disk and records where it lives
+        if journal:
+            await asyncio.to_thread(journal.sync)
+            job.checkpoint_data['journal_path'] = journal.path
         checkpoint_data = job.create_checkpoint()
-        # Here you would typically save to persistent storage
         logger.info(f"Created checkpoint for job {job.job_id} at {checkpoint_data['timestamp']}")
     
-    async def _save_batch_results(self, job: BatchJob, results: List[Dict[str, Any]]) -> None:
-        """Save batch processing results to output destination"""
+    async def _read_companies(
+        self,
+        job: BatchJob,
+        journal: Optional[BatchJournal] = None,
+        carried_over: Optional[List[JournalEntry]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream companies from the job's shard of its input source.
+        
+        Skips journaled successes, appending each one (once) to
+        `carried_over`, and keeps job.progress.total_companies estimated
+        from the read position until the input is exhausted.
+        """
+        if job.input_source.type.value not in BatchInputProcessor.INPUT_FORMATS:
+            return
+        
+        reader = self.input_processor.open_reader(
+            job.input_source,
+            shard_index=job.configuration.input_shard_index,
+            shard_count=job.configuration.input_shard_count
+        )
+        progress = job.progress
+        rows_read = 0
+        companies = 0
+        carried_keys = set()
+        
+        try:
+            async for row in reader.stream():
+                rows_read += 1
+                company_data = self.input_processor._normalize_company_row(row)
+                if not company_data:
+                    continue
+                
+                companies += 1
+                progress.total_companies = estimate_company_total(reader, rows_read, companies)
+                
+                entry = journal.completed(company_data['company_name'], company_data.get('website')) if journal else None
+                if entry:
+                    if carried_over is not None and entry.key not in carried_keys:
+                        carried_keys.add(entry.key)
+                        carried_over.append(entry)
+                    continue
+                yield company_data
+        finally:
+            reader.close()
+        
+        progress.total_companies = companies
+        progress.total_is_estimate = False
+    
+    async def _carry_over(
+        self,
+        job: BatchJob,
+        carried_over: List[JournalEntry],
+        results: List[Dict[str, Any]],
+        result_stream: Optional[CSVResultStream]
+    ) -> None:
+        """Report journaled successes from a previous run as results of this one"""
+        while carried_over:
+            entry = carried_over.pop(0)
+            results.append(entry.row)
+            job.add_processed_company(entry.company_name, success=True)
+            if result_stream:
+                await result_stream.write_row(entry.row)
+    
+    def _open_journal(self, job: BatchJob) -> Optional[BatchJournal]:
+        """Open and replay the job's outcome journal, if it has one"""
+        journal_path = job.configuration.journal_path
+        if not journal_path and job.output_destination.path:
+            journal_path = f"{job.output_destination.path}.journal.jsonl"
+        if not journal_path:
+            return None
+        
+        journal = BatchJournal(journal_path, group_size=job.configuration.journal_group_size)
+        entries = journal.open(job_id=job.job_id, restart=job.configuration.restart_journal)
+        job.checkpoint_data['journal_path'] = journal_path
+        
+        if entries:
+            stats = journal.get_statistics()
+            logger.info(
+                f"Resuming job {job.job_id} from {journal_path}: "
+                f"{stats['succeeded']} companies already completed, "
+                f"{stats['failed']} failures to retry"
+            )
+        return journal
+    
+    async def _open_result_stream(self, job: BatchJob) -> Optional[CSVResultStream]:
+        """Open the output destination that results are streamed to"""
         if job.output_destination.type.value == "csv_file":
-            await self.output_processor.write_results_to_csv(
-                results,
+            return await self.output_processor.open_csv_stream(
                 job.output_destination.path,
                 include_metadata=job.configuration.include_metadata
             )
-        
-        logger.info(f"Saved {len(results)} results for job {job.job_id}")
+        return None
     
     def _create_result_summary(self, job: BatchJob, results: List[Dict[str, Any]]) -> BatchResultSummary:
         """Create comprehensive result summary"""
@@ -257,6 +257,7 @@ class ExportDataUseCase:
             expected_extensions = {
                 'csv': ['.csv'],
                 'json': ['.json'],
+                'jsonl': ['.jsonl', '.ndjson'],
                 'excel': ['.xlsx', '.xls'],
                 'pdf': ['.pdf'],
                 'parquet': ['.parquet'],
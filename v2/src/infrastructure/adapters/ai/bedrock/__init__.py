@@ -11,6 +11,7 @@ Features:
 - Nova Pro/Lite model support for cost optimization
 - Claude and Titan model support  
 - Batch embedding processing
+- Pooled async HTTP transport with bounded concurrency
 - Comprehensive retry logic with exponential backoff
 - Real-time cost tracking and limits
 - Health monitoring and circuit breakers
@@ -46,16 +47,18 @@ Production Recommendations:
 - Use batch processing for embeddings when possible
 """
 
-from .analyzer import BedrockAnalyzer
 from .embedder import BedrockEmbeddingProvider
 from .client import BedrockClient
 from .config import BedrockConfig, BEDROCK_MODEL_COSTS, calculate_bedrock_cost
+from .transport import BedrockTransport, BedrockTransportError
 
 __all__ = [
     "BedrockAnalyzer",
     "BedrockEmbeddingProvider", 
     "BedrockClient",
     "BedrockConfig",
+    "BedrockTransport",
+    "BedrockTransportError",
     "BEDROCK_MODEL_COSTS",
     "calculate_bedrock_cost",
     "create_bedrock_analyzer",
@@ -64,6 +67,16 @@ __all__ = [
 ]
 
 
+
+def __getattr__(name: str):
+    # The analyzer depends on the AI provider port, which is imported on first
+    # use so the client, transport and embedder can be used without it
+    if name == "BedrockAnalyzer":
+        from .analyzer import BedrockAnalyzer
+        return BedrockAnalyzer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # Production factory functions
 def create_bedrock_analyzer(config: 'BedrockConfig' = None) -> 'BedrockAnalyzer':
     """Create a production-ready Bedrock analyzer with optimal settings."""
@@ -76,6 +89,7 @@ def create_bedrock_analyzer(config: 'BedrockConfig' = None) -> 'BedrockAnalyzer'
     config.timeout_seconds = max(config.timeout_seconds, 60)
     config.enable_cost_tracking = True
     
+    from .analyzer import BedrockAnalyzer
     analyzer = BedrockAnalyzer(config)
     
     return analyzer
@@ -109,6 +123,7 @@ def create_production_bedrock_suite(config: 'BedrockConfig' = None) -> tuple:
     config.enable_cost_tracking = True
     config.enable_caching = True
     
+    from .analyzer import BedrockAnalyzer
     analyzer = BedrockAnalyzer(config)
     embedder = BedrockEmbeddingProvider(config)
     
@@ -123,6 +138,7 @@ async def check_bedrock_health(config: 'BedrockConfig' = None) -> dict:
     if config is None:
         config = BedrockConfig.from_environment()
     
+    from .analyzer import BedrockAnalyzer
     analyzer = BedrockAnalyzer(config)
     embedder = BedrockEmbeddingProvider(config)
     
@@ -200,41 +200,62 @@ class BedrockAnalyzer(AIProvider):
         system_prompt: Optional[str] = None,
         streaming_config: Optional[StreamingConfig] = None
     ) -> AsyncIterator[StreamingChunk]:
-        """Analyze text with streaming response (simulated for Bedrock)."""
+        """Analyze text with a native Bedrock streaming response."""
         
-        # Bedrock doesn't support streaming natively for all models
-        # We'll simulate streaming by chunking the response
-        
-        result = await self.analyze_text(text, config, system_prompt)
+        model = config.model_name or self.config.default_model
         
-        if result.status != ResponseStatus.SUCCESS:
+        # Models without streaming support are answered in one final chunk
+        if not self.model_capabilities.get(model, {}).get('supports_streaming', False):
+            result = await self.analyze_text(text, config, system_prompt)
             yield StreamingChunk(
                 content=result.content,
-                finish_reason=result.finish_reason,
-                token_usage=result.token_usage,
+                chunk_index=0,
                 is_final=True,
-                metadata=result.metadata
+                final_token_usage=result.token_usage,
+                finish_reason=result.finish_reason
             )
             return
         
-        # Simulate streaming by yielding content in chunks
-        content = result.content
-        chunk_size = 50  # Characters per chunk
+        body = self._prepare_request_body(text, config, system_prompt, model)
+        chunk_index = 0
+        finish_reason = FinishReason.STOP
+        invocation_metrics: Dict[str, Any] = {}
         
-        for i in range(0, len(content), chunk_size):
-            chunk = content[i:i + chunk_size]
-            is_final = i + chunk_size >= len(content)
-            
+        try:
+            async for event in self.client.invoke_model_stream(model, body):
+                invocation_metrics = event.get('amazon-bedrock-invocationMetrics', invocation_metrics)
+                finish_reason = self._extract_stream_finish_reason(event, model) or finish_reason
+                
+                content = self._extract_stream_content(event, model)
+                if content:
+                    yield StreamingChunk(content=content, chunk_index=chunk_index)
+                    chunk_index += 1
+                    
+        except Exception as e:
+            self.logger.error(f"Bedrock streaming analysis failed: {e}")
             yield StreamingChunk(
-                content=chunk,
-                finish_reason=result.finish_reason if is_final else None,
-                token_usage=result.token_usage if is_final else None,
-                is_final=is_final,
-                metadata=result.provider_metadata if is_final else {}
+                content=f"Error: {str(e)}",
+                chunk_index=chunk_index,
+                is_final=True,
+                finish_reason=FinishReason.ERROR
             )
-            
-            # Small delay to simulate streaming
-            await asyncio.sleep(0.05)
+            return
+        
+        prompt_tokens = invocation_metrics.get('inputTokenCount', 0)
+        completion_tokens = invocation_metrics.get('outputTokenCount', 0)
+        
+        yield StreamingChunk(
+            content="",
+            chunk_index=chunk_index,
+            is_final=True,
+            cumulative_tokens=completion_tokens,
+            final_token_usage=TokenUsage(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=prompt_tokens + completion_tokens
+            ),
+            finish_reason=finish_reason
+        )
     
     async def analyze_batch(
         self,
@@ -246,28 +267,16 @@ class BedrockAnalyzer(AIProvider):
         """Analyze multiple texts in batch."""
         
         start_time = time.time()
-        results = []
-        total_cost = 0.0
-        total_tokens = TokenUsage(prompt_tokens=0, completion_tokens=0, total_tokens=0)
+        completed = 0
         
-        for i, text in enumerate(texts):
-            if progress_callback:
-                progress = (i + 1) / len(texts)
-                progress_callback(f"Processing text {i + 1} of {len(texts)}", progress, None)
+        async def analyze(text: str) -> AnalysisResult:
+            nonlocal completed
             
             try:
                 result = await self.analyze_text(text, config, system_prompt)
-                results.append(result)
-                
-                # Accumulate metrics
-                total_cost += result.estimated_cost
-                total_tokens.prompt_tokens += result.token_usage.prompt_tokens
-                total_tokens.completion_tokens += result.token_usage.completion_tokens
-                total_tokens.total_tokens += result.token_usage.total_tokens
-                
             except Exception as e:
                 # Create error result for failed analysis
-                error_result = AnalysisResult(
+                result = AnalysisResult(
                     content=f"Error: {str(e)}",
                     status=ResponseStatus.ERROR,
                     finish_reason=FinishReason.ERROR,
@@ -279,7 +288,22 @@ class BedrockAnalyzer(AIProvider):
                     timestamp=datetime.now(),
                     provider_metadata={'error': str(e)}
                 )
-                results.append(error_result)
+            
+            completed += 1
+            if progress_callback:
+                progress_callback(f"Processed text {completed} of {len(texts)}", completed / len(texts), None)
+            return result
+        
+        # Texts fan out concurrently, bounded by the client's transport
+        results = list(await asyncio.gather(*(analyze(text) for text in texts)))
+        
+        # Accumulate metrics
+        total_cost = sum(result.estimated_cost for result in results)
+        total_tokens = TokenUsage(
+            prompt_tokens=sum(result.token_usage.prompt_tokens for result in results),
+            completion_tokens=sum(result.token_usage.completion_tokens for result in results),
+            total_tokens=sum(result.token_usage.total_tokens for result in results)
+        )
         
         processing_time = time.time() - start_time
         
@@ -452,6 +476,40 @@ class BedrockAnalyzer(AIProvider):
         self.logger.warning(f"Could not extract content from response: {response}")
         return str(response)
     
+    def _extract_stream_content(self, event: Dict[str, Any], model: str) -> str:
+        """Extract the text delta from one streaming event."""
+        
+        if model.startswith('amazon.nova'):
+            return event.get('contentBlockDelta', {}).get('delta', {}).get('text', '')
+        
+        if model.startswith('anthropic.claude'):
+            if event.get('type') == 'content_block_delta':
+                return event.get('delta', {}).get('text', '')
+            return ''
+        
+        if model.startswith('amazon.titan'):
+            return event.get('outputText', '')
+        
+        return ''
+    
+    def _extract_stream_finish_reason(self, event: Dict[str, Any], model: str) -> Optional[FinishReason]:
+        """Extract the finish reason if this streaming event carries one."""
+        
+        if model.startswith('amazon.nova'):
+            stop_reason = event.get('messageStop', {}).get('stopReason')
+        elif model.startswith('anthropic.claude'):
+            stop_reason = event.get('delta', {}).get('stop_reason') if event.get('type') == 'message_delta' else None
+        else:
+            stop_reason = event.get('completionReason')
+        
+        if not stop_reason:
+            return None
+        if stop_reason.lower() in ('max_tokens', 'length'):
+            return FinishReason.LENGTH
+        if stop_reason.lower() in ('content_filtered', 'content_filter', 'guardrail_intervened'):
+            return FinishReason.CONTENT_FILTER
+        return FinishReason.STOP
+    
     async def health_check(self) -> Dict[str, Any]:
         """Check analyzer health and return status information."""
         
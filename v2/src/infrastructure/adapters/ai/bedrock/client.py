@@ -5,17 +5,24 @@ Core Bedrock Client
 
 Enterprise-grade AWS Bedrock client with comprehensive authentication, retry logic,
 cost tracking, and production monitoring capabilities.
+
+Model calls go through the async BedrockTransport (pooled connections, SigV4,
+bounded concurrency). boto3 is only needed for the raw `client` property.
 """
 
-import boto3
-import json
 import time
 import asyncio
-from typing import Dict, Any, Optional
-from botocore.exceptions import ClientError, BotoCoreError
-from botocore.config import Config
+from typing import Dict, Any, Optional, AsyncIterator
 import logging
 from .config import BedrockConfig, calculate_bedrock_cost
+from .transport import BedrockTransport, BedrockTransportError
+
+try:
+    import boto3
+    from botocore.config import Config
+    HAS_BOTO3 = True
+except ImportError:
+    HAS_BOTO3 = False
 
 
 class BedrockClient:
@@ -29,14 +36,8 @@ class BedrockClient:
         self._total_cost_today = 0.0
         self._last_cost_reset = time.strftime('%Y-%m-%d')
         
-        # Performance optimizations
-        self._boto_config = Config(
-            region_name=config.region_name,
-            retries={'max_attempts': 0},  # We handle retries ourselves
-            max_pool_connections=config.connection_pool_size,
-            read_timeout=config.timeout_seconds,
-            connect_timeout=30
-        )
+        # Async transport used for every model call
+        self.transport = BedrockTransport(config)
     
     @property
     def client(self):
@@ -66,6 +67,17 @@ class BedrockClient:
     
     def _create_client(self):
         """Create new Bedrock client with proper authentication."""
+        if not HAS_BOTO3:
+            raise ImportError("boto3 is required for the raw Bedrock client (pip install boto3)")
+        
+        boto_config = Config(
+            region_name=self.config.region_name,
+            retries={'max_attempts': 0},  # We handle retries ourselves
+            max_pool_connections=self.config.connection_pool_size,
+            read_timeout=self.config.timeout_seconds,
+            connect_timeout=30
+        )
+        
         try:
             # Create session with explicit credentials if provided
             if (self.config.aws_access_key_id and 
@@ -81,7 +93,7 @@ class BedrockClient:
                 # Use default credential chain (IAM roles, env vars, etc.)
                 session = boto3.Session(region_name=self.config.region_name)
             
-            self._client = session.client('bedrock-runtime', config=self._boto_config)
+            self._client = session.client('bedrock-runtime', config=boto_config)
             self._session_created_at = time.time()
             
             self.logger.info(f"Created Bedrock client for region {self.config.region_name}")
@@ -108,19 +120,8 @@ class BedrockClient:
                 # Check daily cost limit
                 self._check_cost_limits()
                 
-                # Prepare request
-                request_body = json.dumps(body)
-                
-                # Make the API call
-                response = self.client.invoke_model(
-                    modelId=model_id,
-                    body=request_body,
-                    contentType='application/json',
-                    accept='application/json'
-                )
-                
-                # Parse response
-                response_body = json.loads(response['body'].read())
+                # Make the API call without blocking the event loop
+                response_body = await self.transport.invoke_model(model_id, body)
                 processing_time = time.time() - start_time
                 
                 # Track usage and costs
@@ -144,13 +145,12 @@ class BedrockClient:
                 
                 return response_body
                 
-            except ClientError as e:
-                error_code = e.response['Error']['Code']
+            except BedrockTransportError as e:
                 last_exception = e
                 
                 # Don't retry on certain errors
-                if error_code in ['ValidationException', 'AccessDeniedException']:
-                    self.logger.error(f"Non-retryable Bedrock error: {error_code}")
+                if not e.retryable:
+                    self.logger.error(f"Non-retryable Bedrock error: {e.error_code}")
                     raise
                 
                 # Calculate retry delay with exponential backoff and jitter
@@ -158,24 +158,48 @@ class BedrockClient:
                     delay = min(2 ** attempt + (time.time() % 1), 60)  # Jitter + cap at 60s
                     self.logger.warning(
                         f"Bedrock request failed (attempt {attempt + 1}/{max_retries + 1}): "
-                        f"{error_code}. Retrying in {delay:.2f}s"
+                        f"{e.error_code}. Retrying in {delay:.2f}s"
                     )
                     await asyncio.sleep(delay)
                 else:
                     self.logger.error(f"Bedrock request failed after {max_retries + 1} attempts")
-                    
-            except BotoCoreError as e:
-                last_exception = e
-                if attempt < max_retries:
-                    delay = min(2 ** attempt + (time.time() % 1), 60)
-                    self.logger.warning(f"Bedrock connection error: {e}. Retrying in {delay:.2f}s")
-                    await asyncio.sleep(delay)
-                else:
-                    self.logger.error(f"Bedrock connection failed after {max_retries + 1} attempts")
         
         # If we get here, all retries failed
         raise last_exception
     
+    async def invoke_model_stream(
+        self,
+        model_id: str,
+        body: Dict[str, Any]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Invoke Bedrock model with a streaming response and cost tracking.
+        
+        Yields model chunks as they arrive. Streams are not retried, since
+        chunks may already have been consumed.
+        """
+        self._check_cost_limits()
+        start_time = time.time()
+        invocation_metrics: Dict[str, Any] = {}
+        
+        async for chunk in self.transport.invoke_model_stream(model_id, body):
+            # The last chunk of every model carries the invocation metrics
+            invocation_metrics = chunk.get('amazon-bedrock-invocationMetrics', invocation_metrics)
+            yield chunk
+        
+        usage_info = {
+            'input_tokens': invocation_metrics.get('inputTokenCount', 0),
+            'output_tokens': invocation_metrics.get('outputTokenCount', 0)
+        }
+        usage_info['total_tokens'] = usage_info['input_tokens'] + usage_info['output_tokens']
+        cost = self._track_usage(usage_info, model_id)
+        
+        self.logger.info(
+            f"Bedrock stream completed: model={model_id}, "
+            f"tokens={usage_info['total_tokens']}, "
+            f"cost=${cost:.4f}, time={time.time() - start_time:.2f}s"
+        )
+    
     def _check_cost_limits(self):
         """Check if we're within cost limits."""
         current_date = time.strftime('%Y-%m-%d')
@@ -286,6 +310,7 @@ class BedrockClient:
     
     async def close(self) -> None:
         """Clean up client resources."""
+        await self.transport.close()
         if self._client:
             # Boto3 clients don't need explicit closing, but we can clear the reference
             self._client = None
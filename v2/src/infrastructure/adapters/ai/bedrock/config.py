@@ -35,6 +35,8 @@ class BedrockConfig:
     
     # Performance
     connection_pool_size: int = 10
+    max_concurrent_requests: int = 10
+    endpoint_url: Optional[str] = None  # defaults to the regional bedrock-runtime endpoint
     enable_caching: bool = True
     cache_ttl_seconds: int = 3600
     
@@ -51,7 +53,9 @@ class BedrockConfig:
             max_retries=int(os.getenv('BEDROCK_MAX_RETRIES', '3')),
             timeout_seconds=int(os.getenv('BEDROCK_TIMEOUT', '60')),
             max_cost_per_request=float(os.getenv('BEDROCK_MAX_COST_PER_REQUEST', '1.0')),
-            daily_cost_limit=float(os.getenv('BEDROCK_DAILY_COST_LIMIT', '100.0'))
+            daily_cost_limit=float(os.getenv('BEDROCK_DAILY_COST_LIMIT', '100.0')),
+            max_concurrent_requests=int(os.getenv('BEDROCK_MAX_CONCURRENT_REQUESTS', '10')),
+            endpoint_url=os.getenv('BEDROCK_ENDPOINT_URL')
         )
 
 
@@ -89,7 +89,7 @@ class BedrockEmbeddingProvider(EmbeddingProvider):
                 progress_callback("Preparing embedding request", 0.3, None)
             
             # Prepare and execute request
-            model = config.model_name or self.config.embedding_model
+            model = config.model_id or self.config.embedding_model
             body = self._prepare_embedding_request(text, model, config)
             
             if progress_callback:
@@ -149,10 +149,10 @@ class BedrockEmbeddingProvider(EmbeddingProvider):
             elif "quota" in str(e).lower():
                 raise EmbeddingQuotaExceededException("aws_bedrock", "daily_quota")
             elif "model" in str(e).lower() and "not" in str(e).lower():
-                raise EmbeddingModelNotAvailableException("aws_bedrock", config.model_name)
+                raise EmbeddingModelNotAvailableException("aws_bedrock", config.model_id)
             
             # Return error result with zero embedding
-            model = config.model_name or self.config.embedding_model
+            model = config.model_id or self.config.embedding_model
             dimensions = self.model_capabilities.get(model, {}).get('dimensions', 1536)
             
             return EmbeddingResult(
@@ -186,7 +186,7 @@ class BedrockEmbeddingProvider(EmbeddingProvider):
             return []
         
         start_time = time.time()
-        model = config.model_name or self.config.embedding_model
+        model = config.model_id or self.config.embedding_model
         
         try:
             # Validate configuration (but allow batch size adjustment)
@@ -196,21 +196,15 @@ class BedrockEmbeddingProvider(EmbeddingProvider):
             supports_batch = model_caps['supports_batch']
             max_batch_size = min(model_caps['batch_size'], config.batch_size)
             
-            results = []
-            total_batches = (len(texts) + max_batch_size - 1) // max_batch_size
+            batches = [
+                texts[start_idx:start_idx + max_batch_size]
+                for start_idx in range(0, len(texts), max_batch_size)
+            ]
+            total_batches = len(batches)
+            completed_batches = 0
             
-            for batch_idx in range(total_batches):
-                start_idx = batch_idx * max_batch_size
-                end_idx = min(start_idx + max_batch_size, len(texts))
-                batch_texts = texts[start_idx:end_idx]
-                
-                if progress_callback:
-                    progress = (batch_idx + 1) / total_batches
-                    progress_callback(
-                        f"Processing batch {batch_idx + 1} of {total_batches}", 
-                        progress, 
-                        None
-                    )
+            async def process_batch(batch_texts: List[str]) -> List[EmbeddingResult]:
+                nonlocal completed_batches
                 
                 if supports_batch and len(batch_texts) > 1:
                     # Use native batch processing
@@ -219,11 +213,19 @@ class BedrockEmbeddingProvider(EmbeddingProvider):
                     # Process individually
                     batch_results = await self._process_batch_individual(batch_texts, model, config)
                 
-                results.extend(batch_results)
-                
-                # Rate limiting between batches
-                if batch_idx < total_batches - 1:
-                    await asyncio.sleep(0.1)
+                completed_batches += 1
+                if progress_callback:
+                    progress_callback(
+                        f"Processed batch {completed_batches} of {total_batches}",
+                        completed_batches / total_batches,
+                        None
+                    )
+                return batch_results
+            
+            # All batches fan out at once; the transport bounds how many
+            # requests are in flight and the client retries throttled ones
+            batch_results = await asyncio.gather(*(process_batch(batch) for batch in batches))
+            results = [result for batch in batch_results for result in batch]
             
             total_time = time.time() - start_time
             self.logger.info(
@@ -237,7 +239,7 @@ class BedrockEmbeddingProvider(EmbeddingProvider):
             self.logger.error(f"Batch embedding failed: {e}")
             
             # Return error results for all texts
-            model = config.model_name or self.config.embedding_model
+            model = config.model_id or self.config.embedding_model
             dimensions = self.model_capabilities.get(model, {}).get('dimensions', 1536)
             
             error_results = []
@@ -311,7 +313,7 @@ class BedrockEmbeddingProvider(EmbeddingProvider):
     async def validate_embedding_config(self, config: EmbeddingConfig) -> bool:
         """Validate configuration against Bedrock capabilities."""
         
-        model = config.model_name or self.config.embedding_model
+        model = config.model_id or self.config.embedding_model
         
         if model not in self.model_capabilities:
             raise EmbeddingModelNotAvailableException("aws_bedrock", model)
@@ -344,7 +346,7 @@ class BedrockEmbeddingProvider(EmbeddingProvider):
         try:
             # Test with minimal embedding request
             test_config = EmbeddingConfig(
-                model_name=self.config.embedding_model,
+                model_id=self.config.embedding_model,
                 batch_size=1
             )
             
@@ -443,25 +445,13 @@ class BedrockEmbeddingProvider(EmbeddingProvider):
         model: str, 
         config: EmbeddingConfig
     ) -> List[EmbeddingResult]:
-        """Process batch by making individual requests."""
-        
-        results = []
+        """Process batch by making concurrent individual requests."""
         
-        for text in texts:
-            individual_config = EmbeddingConfig(
-                model_name=model,
-                dimensions=config.dimensions,
-                normalize=config.normalize,
-                truncate=config.truncate,
-                batch_size=1,
-                provider_config=config.provider_config,
-                encoding_format=config.encoding_format
-            )
-            
-            result = await self.get_embedding(text, individual_config)
-            results.append(result)
+        individual_config = config.model_copy(update={'model_id': model, 'batch_size': 1})
         
-        return results
+        return list(await asyncio.gather(
+            *(self.get_embedding(text, individual_config) for text in texts)
+        ))
     
     def _prepare_embedding_request(self, text: str, model: str, config: EmbeddingConfig) -> Dict[str, Any]:
         """Prepare embedding request body based on model type."""
@@ -523,7 +513,7 @@ class BedrockEmbeddingProvider(EmbeddingProvider):
     
     async def _validate_model_available(self, config: EmbeddingConfig) -> bool:
         """Validate that the model is available (without strict batch size check)."""
-        model = config.model_name or self.config.embedding_model
+        model = config.model_id or self.config.embedding_model
         
         if model not in self.model_capabilities:
             raise EmbeddingModelNotAvailableException("aws_bedrock", model)
@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+Async Bedrock Runtime Transport
+===============================
+
+Native asyncio transport for the Bedrock Runtime API. Model calls go over a
+pooled aiohttp connection instead of a blocking boto3 client, so they never
+stall the event loop.
+
+- One keep-alive connection pool per transport (connection_pool_size)
+- At most max_concurrent_requests calls in flight; extra callers wait
+- Requests are signed with AWS Signature Version 4
+- Streaming responses (invoke-with-response-stream) are decoded from the
+  AWS event stream framing as chunks arrive
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import struct
+import zlib
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, quote, urlsplit
+
+import aiohttp
+
+from .config import BedrockConfig
+
+
+# Error codes that are not worth retrying
+NON_RETRYABLE_ERRORS = {
+    'ValidationException',
+    'AccessDeniedException',
+    'ResourceNotFoundException',
+    'UnrecognizedClientException',
+    'MissingCredentials'
+}
+
+
+class BedrockTransportError(Exception):
+    """Error returned by the Bedrock Runtime API or raised by the transport."""
+
+    def __init__(self, message: str, status: Optional[int] = None, error_code: Optional[str] = None):
+        super().__init__(message)
+        self.status = status
+        self.error_code = error_code or 'TransportError'
+
+    @property
+    def retryable(self) -> bool:
+        """Whether the same request may succeed if retried."""
+        if self.error_code in NON_RETRYABLE_ERRORS:
+            return False
+        return self.status is None or self.status == 429 or self.status >= 500
+
+
+class SigV4Signer:
+    """AWS Signature Version 4 request signer."""
+
+    ALGORITHM = 'AWS4-HMAC-SHA256'
+
+    def __init__(self, region: str, service: str = 'bedrock'):
+        self.region = region
+        self.service = service
+
+    def sign(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        body: bytes,
+        credentials: Tuple[str, str, Optional[str]],
+        now: Optional[datetime] = None
+    ) -> Dict[str, str]:
+        """
+        Sign a request.
+
+        Args:
+            method: HTTP method
+            url: Request URL with its path already percent-encoded
+            headers: Headers to send (all of them are signed)
+            body: Request payload
+            credentials: (access key, secret key, session token or None)
+            now: Signing time (defaults to the current time)
+
+        Returns:
+            The headers with Host, X-Amz-Date, X-Amz-Security-Token and
+            Authorization added
+        """
+        access_key, secret_key, session_token = credentials
+        now = now or datetime.now(timezone.utc)
+        amz_date = now.strftime('%Y%m%dT%H%M%SZ')
+        date_stamp = now.strftime('%Y%m%d')
+
+        parts = urlsplit(url)
+        signed = dict(headers)
+        signed['Host'] = parts.netloc
+        signed['X-Amz-Date'] = amz_date
+        if session_token:
+            signed['X-Amz-Security-Token'] = session_token
+
+        canonical_headers = {
+            name.lower(): ' '.join(str(value).split()) for name, value in signed.items()
+        }
+        signed_header_names = ';'.join(sorted(canonical_headers))
+
+        # Outside S3 the already-encoded path is encoded once more
+        canonical_request = '\n'.join([
+            method.upper(),
+            quote(parts.path or '/', safe='/~'),
+            self._canonical_query(parts.query),
+            ''.join(f"{name}:{canonical_headers[name]}\n" for name in sorted(canonical_headers)),
+            signed_header_names,
+            hashlib.sha256(body).hexdigest()
+        ])
+
+        scope = f"{date_stamp}/{self.region}/{self.service}/aws4_request"
+        string_to_sign = '\n'.join([
+            self.ALGORITHM,
+            amz_date,
+            scope,
+            hashlib.sha256(canonical_request.encode('utf-8')).hexdigest()
+        ])
+
+        key = self._hmac(f"AWS4{secret_key}".encode('utf-8'), date_stamp)
+        for part in (self.region, self.service, 'aws4_request'):
+            key = self._hmac(key, part)
+        signature = hmac.new(key, string_to_sign.encode('utf-8'), hashlib.sha256).hexdigest()
+
+        signed['Authorization'] = (
+            f"{self.ALGORITHM} Credential={access_key}/{scope}, "
+            f"SignedHeaders={signed_header_names}, Signature={signature}"
+        )
+        return signed
+
+    @staticmethod
+    def _hmac(key: bytes, message: str) -> bytes:
+        return hmac.new(key, message.encode('utf-8'), hashlib.sha256).digest()
+
+    @staticmethod
+    def _canonical_query(query: str) -> str:
+        pairs = sorted(
+            (quote(name, safe='-_.~'), quote(value, safe='-_.~'))
+            for name, value in parse_qsl(query, keep_blank_values=True)
+        )
+        return '&'.join(f"{name}={value}" for name, value in pairs)
+
+
+class EventStreamDecoder:
+    """
+    Incremental decoder for the AWS event stream (vnd.amazon.eventstream) framing.
+
+    Each message is: total length (4 bytes), headers length (4), prelude
+    CRC32 (4), headers, payload, message CRC32 (4). Feed it bytes as they
+    arrive; it returns every message completed so far.
+    """
+
+    _PRELUDE = struct.Struct('>III')
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[Tuple[Dict[str, Any], bytes]]:
+        """Add received bytes and return the completed (headers, payload) messages."""
+        self._buffer.extend(data)
+        messages = []
+
+        while len(self._buffer) >= self._PRELUDE.size:
+            total_length, headers_length, prelude_crc = self._PRELUDE.unpack_from(self._buffer)
+            if zlib.crc32(self._buffer[:8]) != prelude_crc:
+                raise BedrockTransportError("Corrupt event stream prelude", error_code='EventStreamError')
+            if len(self._buffer) < total_length:
+                break
+
+            message = bytes(self._buffer[:total_length])
+            del self._buffer[:total_length]
+
+            (message_crc,) = struct.unpack_from('>I', message, total_length - 4)
+            if zlib.crc32(message[:-4]) != message_crc:
+                raise BedrockTransportError("Corrupt event stream message", error_code='EventStreamError')
+
+            headers_end = self._PRELUDE.size + headers_length
+            headers = self._decode_headers(message[self._PRELUDE.size:headers_end])
+            messages.append((headers, message[headers_end:-4]))
+
+        return messages
+
+    @staticmethod
+    def _decode_headers(data: bytes) -> Dict[str, Any]:
+        headers = {}
+        offset = 0
+
+        while offset < len(data):
+            name_length = data[offset]
+            name = data[offset + 1:offset + 1 + name_length].decode('utf-8')
+            offset += 1 + name_length
+            value_type = data[offset]
+            offset += 1
+
+            if value_type in (0, 1):
+                value = value_type == 0
+            elif value_type == 2:
+                (value,) = struct.unpack_from('>b', data, offset)
+                offset += 1
+            elif value_type == 3:
+                (value,) = struct.unpack_from('>h', data, offset)
+                offset += 2
+            elif value_type == 4:
+                (value,) = struct.unpack_from('>i', data, offset)
+                offset += 4
+            elif value_type in (5, 8):
+                (value,) = struct.unpack_from('>q', data, offset)
+                offset += 8
+            elif value_type in (6, 7):
+                (length,) = struct.unpack_from('>H', data, offset)
+                value = data[offset + 2:offset + 2 + length]
+                if value_type == 7:
+                    value = value.decode('utf-8')
+                offset += 2 + length
+            elif value_type == 9:
+                value = data[offset:offset + 16]
+                offset += 16
+            else:
+                raise BedrockTransportError(
+                    f"Unknown event stream header type {value_type}", error_code='EventStreamError'
+                )
+
+            headers[name] = value
+
+        return headers
+
+
+class BedrockTransport:
+    """
+    Pooled, bounded-concurrency async HTTP transport for Bedrock Runtime.
+
+    Credentials come from the configuration, then the standard AWS
+    environment variables, then (if botocore is installed) the default
+    credential chain, which covers profiles and IAM roles.
+    """
+
+    def __init__(self, config: BedrockConfig, endpoint_url: Optional[str] = None):
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+        self.endpoint_url = (
+            endpoint_url or config.endpoint_url or
+            f"https://bedrock-runtime.{config.region_name}.amazonaws.com"
+        ).rstrip('/')
+        self.signer = SigV4Signer(config.region_name)
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore = asyncio.Semaphore(max(1, config.max_concurrent_requests))
+        self._botocore_credentials = None
+
+        # Monitoring
+        self._request_count = 0
+        self._error_count = 0
+        self._in_flight = 0
+        self._peak_in_flight = 0
+
+    async def invoke_model(self, model_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Invoke a model and return its parsed JSON response."""
+        async with self._semaphore:
+            session = await self._ensure_session()
+            url, payload, headers = await self._signed_request(model_id, 'invoke', body, 'application/json')
+            self._start_request()
+            try:
+                async with session.post(url, data=payload, headers=headers) as response:
+                    await self._raise_for_status(response)
+                    return await response.json(content_type=None)
+            except aiohttp.ClientError as e:
+                self._error_count += 1
+                raise BedrockTransportError(f"Bedrock request failed: {e}") from e
+            except asyncio.TimeoutError:
+                self._error_count += 1
+                raise BedrockTransportError(
+                    f"Bedrock request timed out after {self.config.timeout_seconds}s",
+                    error_code='TimeoutError'
+                )
+            finally:
+                self._in_flight -= 1
+
+    async def invoke_model_stream(self, model_id: str, body: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Invoke a model with a streaming response.
+
+        Yields each decoded model chunk as soon as its event arrives. The
+        concurrency slot is held until the stream ends.
+        """
+        async with self._semaphore:
+            session = await self._ensure_session()
+            url, payload, headers = await self._signed_request(
+                model_id, 'invoke-with-response-stream', body, 'application/vnd.amazon.eventstream'
+            )
+            self._start_request()
+            try:
+                async with session.post(url, data=payload, headers=headers) as response:
+                    await self._raise_for_status(response)
+                    decoder = EventStreamDecoder()
+
+                    async for data in response.content.iter_any():
+                        for headers, payload in decoder.feed(data):
+                            chunk = self._decode_event(headers, payload)
+                            if chunk is not None:
+                                yield chunk
+            except aiohttp.ClientError as e:
+                self._error_count += 1
+                raise BedrockTransportError(f"Bedrock stream failed: {e}") from e
+            except asyncio.TimeoutError:
+                self._error_count += 1
+                raise BedrockTransportError(
+                    f"Bedrock stream timed out after {self.config.timeout_seconds}s",
+                    error_code='TimeoutError'
+                )
+            finally:
+                self._in_flight -= 1
+
+    async def close(self) -> None:
+        """Close the connection pool."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get transport statistics."""
+        return {
+            'endpoint_url': self.endpoint_url,
+            'requests': self._request_count,
+            'errors': self._error_count,
+            'in_flight': self._in_flight,
+            'peak_in_flight': self._peak_in_flight,
+            'max_concurrent_requests': self.config.max_concurrent_requests,
+            'connection_pool_size': self.config.connection_pool_size
+        }
+
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """Create the pooled HTTP session on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.config.connection_pool_size,
+                ttl_dns_cache=300,
+                keepalive_timeout=30,
+                enable_cleanup_closed=True
+            )
+            # Like boto's read_timeout, the timeout applies to each read,
+            # so long streaming responses are not cut off
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(
+                    total=None, connect=30, sock_read=self.config.timeout_seconds
+                )
+            )
+        return self._session
+
+    async def _signed_request(
+        self,
+        model_id: str,
+        action: str,
+        body: Dict[str, Any],
+        accept: str
+    ) -> Tuple[str, bytes, Dict[str, str]]:
+        """Build the URL, payload and signed headers of a model request."""
+        payload = json.dumps(body).encode('utf-8')
+        url = f"{self.endpoint_url}/model/{quote(model_id, safe='')}/{action}"
+        headers = self.signer.sign(
+            'POST',
+            url,
+            {'Content-Type': 'application/json', 'Accept': accept},
+            payload,
+            await self._credentials()
+        )
+        # Host is set by aiohttp from the URL
+        headers.pop('Host')
+        return url, payload, headers
+
+    def _start_request(self) -> None:
+        self._request_count += 1
+        self._in_flight += 1
+        self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+
+    async def _raise_for_status(self, response: aiohttp.ClientResponse) -> None:
+        if response.status == 200:
+            return
+
+        self._error_count += 1
+        text = await response.text()
+        try:
+            message = json.loads(text).get('message', text)
+        except (ValueError, AttributeError):
+            message = text
+
+        error_code = response.headers.get('x-amzn-ErrorType', '').split(':')[0]
+        if not error_code:
+            error_code = 'ThrottlingException' if response.status == 429 else f"HTTP{response.status}"
+
+        raise BedrockTransportError(
+            f"{error_code} ({response.status}): {message}",
+            status=response.status,
+            error_code=error_code
+        )
+
+    def _decode_event(self, headers: Dict[str, Any], payload: bytes) -> Optional[Dict[str, Any]]:
+        """Turn one event stream message into a model chunk (None for non-chunk events)."""
+        message_type = headers.get(':message-type')
+
+        if message_type == 'exception':
+            error_code = headers.get(':exception-type', 'ModelStreamErrorException')
+            try:
+                message = json.loads(payload).get('message', '')
+            except ValueError:
+                message = payload.decode('utf-8', 'replace')
+            raise BedrockTransportError(f"{error_code}: {message}", error_code=error_code)
+
+        if message_type == 'error':
+            error_code = headers.get(':error-code', 'EventStreamError')
+            raise BedrockTransportError(
+                f"{error_code}: {headers.get(':error-message', '')}", error_code=error_code
+            )
+
+        if headers.get(':event-type') != 'chunk':
+            return None
+
+        return json.loads(base64.b64decode(json.loads(payload)['bytes']))
+
+    async def _credentials(self) -> Tuple[str, str, Optional[str]]:
+        """Resolve (access key, secret key, session token) for signing."""
+        if self.config.aws_access_key_id and self.config.aws_secret_access_key:
+            return (
+                self.config.aws_access_key_id,
+                self.config.aws_secret_access_key,
+                self.config.aws_session_token
+            )
+
+        access_key = os.getenv('AWS_ACCESS_KEY_ID')
+        secret_key = os.getenv('AWS_SECRET_ACCESS_KEY')
+        if access_key and secret_key:
+            return access_key, secret_key, os.getenv('AWS_SESSION_TOKEN')
+
+        # Profiles, SSO and IAM roles; refreshed by botocore as they expire.
+        # Resolving and refreshing them may read files or call the instance
+        # metadata / SSO endpoints, so it runs off the event loop
+        if self._botocore_credentials is None:
+            self._botocore_credentials = await asyncio.to_thread(self._load_botocore_credentials)
+
+        if self._botocore_credentials is not None:
+            frozen = await asyncio.to_thread(self._botocore_credentials.get_frozen_credentials)
+            return frozen.access_key, frozen.secret_key, frozen.token
+
+        raise BedrockTransportError("No AWS credentials found for Bedrock", error_code='MissingCredentials')
+
+    @staticmethod
+    def _load_botocore_credentials():
+        """Credentials from botocore's default chain (None without botocore or credentials)."""
+        try:
+            import botocore.session
+        except ImportError:
+            return None
+        return botocore.session.get_session().get_credentials()
@@ -483,11 +483,14 @@ class AnalyticsEngine(AnalyticsEnginePort):
             features = []
             company_names = []
             
+            # Category vocabularies are shared by every company
+            industries = list(set(c.industry for c in companies if c.industry))
+            business_models = list(set(getattr(c, 'business_model', '') for c in companies))
+            
             for company in companies:
                 feature_vector = []
                 
                 # Industry encoding (simple categorical)
-                industries = list(set(c.industry for c in companies if c.industry))
                 industry_encoding = [1 if company.industry == ind else 0 for ind in industries]
                 feature_vector.extend(industry_encoding)
                 
@@ -496,7 +499,6 @@ class AnalyticsEngine(AnalyticsEnginePort):
                 feature_vector.append(size)
                 
                 # Business model encoding
-                business_models = list(set(getattr(c, 'business_model', '') for c in companies))
                 bm_encoding = [1 if getattr(company, 'business_model', '') == bm else 0 for bm in business_models]
                 feature_vector.extend(bm_encoding)
                 
@@ -605,34 +607,36 @@ class AnalyticsEngine(AnalyticsEnginePort):
             return None
         
         try:
-            # This is a simplified similarity calculation
+            # Simple similarity based on shared attributes, averaged over all
+            # pairs in closed form: matching pairs per attribute come from
+            # value counts, so no O(n^2) pair loop is needed.
             # In practice, would use actual embeddings from vector database
-            similarities = []
-            
-            for i, company1 in enumerate(companies):
-                for j, company2 in enumerate(companies[i+1:], i+1):
-                    # Simple similarity based on shared attributes
-                    similarity = 0.0
-                    
-                    if company1.industry == company2.industry:
-                        similarity += 0.4
-                    
-                    if getattr(company1, 'business_model', '') == getattr(company2, 'business_model', ''):
-                        similarity += 0.3
-                    
-                    if company1.location == company2.location:
-                        similarity += 0.2
-                    
-                    # Size similarity
-                    size1 = self._normalize_company_size(company1)
-                    size2 = self._normalize_company_size(company2)
-                    if size1 and size2:
-                        size_diff = abs(size1 - size2) / max(size1, size2)
-                        similarity += 0.1 * (1 - size_diff)
-                    
-                    similarities.append(similarity)
-            
-            return statistics.mean(similarities) if similarities else None
+            pair_count = len(companies) * (len(companies) - 1) / 2
+            
+            def matching_pairs(values) -> int:
+                return sum(count * (count - 1) // 2 for count in Counter(values).values())
+            
+            total = 0.4 * matching_pairs(c.industry for c in companies)
+            total += 0.3 * matching_pairs(getattr(c, 'business_model', '') for c in companies)
+            total += 0.2 * matching_pairs(c.location for c in companies)
+            
+            # Size similarity: 1 - |s1 - s2| / max(s1, s2) is min / max, so with
+            # sizes sorted ascending each size contributes (sum of smaller) / size
+            sizes = [size for size in map(self._normalize_company_size, companies) if size]
+            if all(size > 0 for size in sizes):
+                size_total = 0.0
+                smaller = 0.0
+                for size in sorted(sizes):
+                    size_total += smaller / size
+                    smaller += size
+            else:
+                size_total = sum(
+                    1 - abs(size1 - size2) / max(size1, size2)
+                    for i, size1 in enumerate(sizes) for size2 in sizes[i+1:]
+                )
+            total += 0.1 * size_total
+            
+            return total / pair_count
             
         except Exception as e:
             logger.error(f"Similarity calculation failed: {e}")
@@ -10,7 +10,7 @@ import os
 import json
 import csv
 from datetime import datetime, timezone
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Union, AsyncIterator
 from pathlib import Path
 import time
 
@@ -44,11 +44,14 @@ from ....core.domain.models.export import (
     ExportResult, OutputConfig, Visualization, ExportFormat
 )
 from ...observability.logging import get_logger
-from ...observability.metrics import get_metrics_collector
+from ...observability.metrics import MetricUnit, get_metrics_collector
 
 logger = get_logger(__name__)
 metrics = get_metrics_collector()
 
+# A record to export: domain company data or an already flattened dictionary
+ExportRecord = Union[CompanyData, Dict[str, Any]]
+
 
 class ExportError(Exception):
     """Export operation error"""
@@ -65,8 +68,8 @@ class ExportEngine(ExportEnginePort):
     Comprehensive export engine supporting multiple formats
     
     Supports:
-    - CSV, JSON, Excel, PDF exports
-    - Streaming for large datasets
+    - CSV, JSON, JSON Lines, Excel, PDF exports
+    - Streaming for large datasets, including straight from vector storage
     - Visualization integration
     - Format-specific optimizations
     """
@@ -75,6 +78,7 @@ class ExportEngine(ExportEnginePort):
         self.formatters = {
             ExportFormat.CSV: CSVExporter(),
             ExportFormat.JSON: JSONExporter(),
+            ExportFormat.JSONL: JSONLExporter(),
             ExportFormat.EXCEL: ExcelExporter(),
             ExportFormat.PDF: PDFExporter(),
             ExportFormat.PARQUET: ParquetExporter(),
@@ -93,22 +97,7 @@ class ExportEngine(ExportEnginePort):
         start_time = time.time()
         
         try:
-            # Get appropriate formatter
-            formatter = self.formatters.get(config.format)
-            if not formatter:
-                available_formats = list(self.formatters.keys())
-                raise UnsupportedFormatError(
-                    f"Format '{config.format}' not supported. "
-                    f"Available: {[f.value for f in available_formats]}"
-                )
-            
-            # Check if formatter is available (dependencies installed)
-            if not formatter.is_available():
-                missing_deps = formatter.get_missing_dependencies()
-                raise ExportError(
-                    f"Cannot export to {config.format.value} format. "
-                    f"Missing dependencies: {', '.join(missing_deps)}"
-                )
+            formatter = self._get_formatter(config)
             
             # Apply data transformations
             transformed_data = await self._transform_data(data, config)
@@ -116,6 +105,7 @@ class ExportEngine(ExportEnginePort):
             # Determine if streaming is needed
             should_stream = (
                 config.stream_large_datasets and 
+                formatter.supports_streaming() and
                 len(transformed_data) > config.streaming_threshold
             )
             
@@ -130,40 +120,126 @@ class ExportEngine(ExportEnginePort):
                     formatter, transformed_data, config, visualizations
                 )
             
-            # Calculate processing time
-            processing_time = time.time() - start_time
-            result.processing_time_seconds = processing_time
-            
-            # Record metrics
-            metrics.record_histogram(
-                "export_processing_time_seconds",
-                processing_time,
-                tags={"format": config.format.value}
-            )
+            self._record_export_completion(result, config, start_time)
+            return result
             
-            metrics.record_histogram(
-                "export_file_size_bytes",
-                result.file_size_bytes,
-                tags={"format": config.format.value}
-            )
+        except Exception as e:
+            logger.error(f"Export failed: {e}", exc_info=True)
+            raise ExportError(f"Export operation failed: {e}") from e
+    
+    async def export_stream(
+        self,
+        records: AsyncIterator[ExportRecord],
+        config: OutputConfig
+    ) -> ExportResult:
+        """
+        Export records from an async iterator without materializing them
+        
+        Records are pulled, transformed and written config.chunk_size at a
+        time, so peak memory depends on the chunk size, not the export size.
+        Only formats with incremental writers (CSV, JSON Lines, Parquet)
+        can be streamed.
+        """
+        
+        start_time = time.time()
+        
+        try:
+            formatter = self._get_formatter(config)
+            if not formatter.supports_streaming():
+                raise UnsupportedFormatError(
+                    f"Format '{config.format.value}' does not support streaming export"
+                )
             
-            logger.info(
-                f"Export completed successfully",
-                extra={
-                    "format": config.format.value,
-                    "record_count": result.record_count,
-                    "file_size_mb": result.file_size_mb,
-                    "processing_time": processing_time,
-                    "streaming_used": result.streaming_used
-                }
+            result = await self._write_chunks(
+                formatter, self._chunk_records(records, config), config
             )
             
+            self._record_export_completion(result, config, start_time)
             return result
             
         except Exception as e:
-            logger.error(f"Export failed: {e}", exc_info=True)
+            logger.error(f"Streaming export failed: {e}", exc_info=True)
             raise ExportError(f"Export operation failed: {e}") from e
     
+    async def export_from_vector_storage(
+        self,
+        vector_storage: Any,
+        index_name: str,
+        config: OutputConfig,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        namespace: Optional[str] = None,
+        include_vectors: bool = False
+    ) -> ExportResult:
+        """
+        Export every vector matching a filter straight from vector storage
+        
+        Consumes vector_storage.stream_vectors_by_filter() (any
+        StreamingVectorStorage, e.g. the Pinecone or local adapters); each
+        record is the vector's metadata plus its id, and its values when
+        include_vectors is set.
+        """
+        stream = vector_storage.stream_vectors_by_filter(
+            index_name, metadata_filter or {}, namespace
+        )
+        return await self.export_stream(
+            _vector_records(stream, include_vectors), config
+        )
+    
+    def _get_formatter(self, config: OutputConfig) -> 'ExportFormatter':
+        """Get an available formatter for the configured format"""
+        formatter = self.formatters.get(config.format)
+        if not formatter:
+            available_formats = list(self.formatters.keys())
+            raise UnsupportedFormatError(
+                f"Format '{config.format}' not supported. "
+                f"Available: {[f.value for f in available_formats]}"
+            )
+        
+        # Check if formatter is available (dependencies installed)
+        if not formatter.is_available():
+            missing_deps = formatter.get_missing_dependencies()
+            raise ExportError(
+                f"Cannot export to {config.format.value} format. "
+                f"Missing dependencies: {', '.join(missing_deps)}"
+            )
+        
+        return formatter
+    
+    def _record_export_completion(
+        self,
+        result: ExportResult,
+        config: OutputConfig,
+        start_time: float
+    ) -> None:
+        """Set processing time on the result and record export metrics"""
+        processing_time = time.time() - start_time
+        result.processing_time_seconds = processing_time
+        
+        # Record metrics
+        labels = {"format": config.format.value}
+        metrics.registry.histogram(
+            "export_processing_time_seconds",
+            "Export processing time",
+            MetricUnit.SECONDS
+        ).record(processing_time, labels)
+        
+        metrics.registry.histogram(
+            "export_file_size_bytes",
+            "Export file size",
+            MetricUnit.BYTES
+        ).record(result.file_size_bytes, labels)
+        
+        logger.info(
+            f"Export completed successfully",
+            extra={
+                "format": config.format.value,
+                "record_count": result.record_count,
+                "file_size_mb": result.file_size_mb,
+                "processing_time": processing_time,
+                "streaming_used": result.streaming_used
+            }
+        )
+    
     async def validate_export_config(self, config: OutputConfig) -> bool:
         """Validate export configuration"""
         try:
@@ -218,6 +294,7 @@ class ExportEngine(ExportEnginePort):
         # Estimate based on format
         format_multipliers = {
             ExportFormat.JSON: 1.0,
+            ExportFormat.JSONL: 0.95,
             ExportFormat.CSV: 0.7,
             ExportFormat.EXCEL: 1.2,
             ExportFormat.PDF: 2.0,
@@ -243,7 +320,7 @@ class ExportEngine(ExportEnginePort):
     
     async def _transform_data(
         self, 
-        data: List[CompanyData], 
+        data: List[ExportRecord], 
         config: OutputConfig
     ) -> List[Dict[str, Any]]:
         """Transform company data for export"""
@@ -251,7 +328,7 @@ class ExportEngine(ExportEnginePort):
         
         for company in data:
             # Convert to dictionary
-            company_dict = company.dict()
+            company_dict = company if isinstance(company, dict) else company.dict()
             
             # Apply field selection if specified
             include_fields = getattr(config, 'include_fields', [])
@@ -300,23 +377,57 @@ class ExportEngine(ExportEnginePort):
         chunk_size = config.chunk_size
         total_chunks = (len(data) + chunk_size - 1) // chunk_size
         
+        async def chunks():
+            for i in range(0, len(data), chunk_size):
+                yield data[i:i + chunk_size]
+        
+        return await self._write_chunks(formatter, chunks(), config, total_chunks)
+    
+    async def _chunk_records(
+        self,
+        records: AsyncIterator[ExportRecord],
+        config: OutputConfig
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Group and transform records into chunks of config.chunk_size"""
+        chunk = []
+        async for record in records:
+            chunk.append(record)
+            if len(chunk) >= config.chunk_size:
+                yield await self._transform_data(chunk, config)
+                chunk = []
+        
+        if chunk:
+            yield await self._transform_data(chunk, config)
+    
+    async def _write_chunks(
+        self,
+        formatter: 'ExportFormatter',
+        chunks: AsyncIterator[List[Dict[str, Any]]],
+        config: OutputConfig,
+        total_chunks: Optional[int] = None
+    ) -> ExportResult:
+        """Write chunks through the formatter's streaming export"""
+        
         # Initialize streaming export
         export_context = await formatter.initialize_streaming_export(config)
+        chunk_number = 0
         
         try:
-            for i in range(0, len(data), chunk_size):
-                chunk = data[i:i + chunk_size]
-                chunk_number = (i // chunk_size) + 1
+            async for chunk in chunks:
+                chunk_number += 1
                 
                 # Export chunk
                 await formatter.export_chunk(chunk, export_context)
                 
                 # Report progress
-                progress = (chunk_number / total_chunks) * 100
-                logger.debug(
-                    f"Streaming export progress: {progress:.1f}% "
-                    f"({chunk_number}/{total_chunks} chunks)"
-                )
+                if total_chunks:
+                    progress = (chunk_number / total_chunks) * 100
+                    logger.debug(
+                        f"Streaming export progress: {progress:.1f}% "
+                        f"({chunk_number}/{total_chunks} chunks)"
+                    )
+                else:
+                    logger.debug(f"Streaming export progress: {chunk_number} chunks written")
                 
                 # Allow other tasks to run
                 await asyncio.sleep(0)
@@ -324,7 +435,7 @@ class ExportEngine(ExportEnginePort):
             # Finalize streaming export
             result = await formatter.finalize_streaming_export(export_context)
             result.streaming_used = True
-            result.chunks_processed = total_chunks
+            result.chunks_processed = chunk_number
             
             return result
             
@@ -334,6 +445,20 @@ class ExportEngine(ExportEnginePort):
             raise ExportError(f"Streaming export failed: {e}") from e
 
 
+async def _vector_records(
+    stream: AsyncIterator[tuple],
+    include_vectors: bool
+) -> AsyncIterator[Dict[str, Any]]:
+    """Turn (vector_id, vector, metadata) tuples into flat export records"""
+    async for vector_id, vector, metadata in stream:
+        record = {'id': vector_id}
+        if metadata is not None:
+            record.update(metadata if isinstance(metadata, dict) else metadata.dict())
+        if include_vectors:
+            record['vector'] = list(vector)
+        yield record
+
+
 class ExportFormatter:
     """Base class for format-specific exporters"""
     
@@ -345,6 +470,10 @@ class ExportFormatter:
         """Get list of missing dependencies"""
         return []
     
+    def supports_streaming(self) -> bool:
+        """Check if the formatter can write data chunk by chunk"""
+        return False
+    
     async def export(
         self,
         data: List[Dict[str, Any]],
@@ -417,6 +546,9 @@ class CSVExporter(ExportFormatter):
             columns=columns
         )
     
+    def supports_streaming(self) -> bool:
+        return True
+    
     async def initialize_streaming_export(self, config: OutputConfig) -> Dict[str, Any]:
         """Initialize CSV streaming export"""
         file_handle = open(config.file_path, 'w', newline='', encoding='utf-8')
@@ -424,6 +556,7 @@ class CSVExporter(ExportFormatter):
             'file_handle': file_handle,
             'writer': None,
             'columns_written': False,
+            'columns': config.format_options.get('columns'),
             'record_count': 0
         }
     
@@ -438,10 +571,16 @@ class CSVExporter(ExportFormatter):
         
         file_handle = context['file_handle']
         
-        # Initialize writer on first chunk
+        # Initialize writer on first chunk; the header is fixed from then on,
+        # so later fields missing from a record are left blank and fields
+        # not in the header are dropped
         if context['writer'] is None:
-            columns = list(chunk[0].keys())
-            writer = csv.DictWriter(file_handle, fieldnames=columns)
+            columns = context['columns'] or list(dict.fromkeys(
+                key for record in chunk for key in record
+            ))
+            writer = csv.DictWriter(
+                file_handle, fieldnames=columns, restval='', extrasaction='ignore'
+            )
             context['writer'] = writer
             context['columns'] = columns
             
@@ -465,7 +604,8 @@ class CSVExporter(ExportFormatter):
             format=ExportFormat.CSV,
             record_count=context['record_count'],
             file_size_bytes=os.path.getsize(file_path),
-            columns=context.get('columns', [])
+            processing_time_seconds=0.0,
+            columns=context.get('columns') or []
         )
     
     async def cleanup_failed_export(self, context: Dict[str, Any]) -> None:
@@ -516,6 +656,75 @@ class JSONExporter(ExportFormatter):
         )
 
 
+class JSONLExporter(ExportFormatter):
+    """JSON Lines format exporter (one JSON object per line)"""
+    
+    def supports_streaming(self) -> bool:
+        return True
+    
+    async def export(
+        self,
+        data: List[Dict[str, Any]],
+        config: OutputConfig,
+        visualizations: Optional[List[Visualization]] = None
+    ) -> ExportResult:
+        """Export to JSON Lines format"""
+        context = await self.initialize_streaming_export(config)
+        try:
+            await self.export_chunk(data, context)
+        except Exception:
+            await self.cleanup_failed_export(context)
+            raise
+        return await self.finalize_streaming_export(context)
+    
+    async def initialize_streaming_export(self, config: OutputConfig) -> Dict[str, Any]:
+        """Initialize JSON Lines streaming export"""
+        return {
+            'file_handle': open(config.file_path, 'w', encoding='utf-8'),
+            'columns': {},
+            'record_count': 0
+        }
+    
+    async def export_chunk(
+        self, 
+        chunk: List[Dict[str, Any]], 
+        context: Dict[str, Any]
+    ) -> None:
+        """Export JSON Lines chunk"""
+        file_handle = context['file_handle']
+        columns = context['columns']
+        
+        for record in chunk:
+            file_handle.write(json.dumps(record, ensure_ascii=False, default=str))
+            file_handle.write('\n')
+            columns.update(dict.fromkeys(record))
+        
+        context['record_count'] += len(chunk)
+    
+    async def finalize_streaming_export(self, context: Dict[str, Any]) -> ExportResult:
+        """Finalize JSON Lines streaming export"""
+        file_handle = context['file_handle']
+        file_handle.close()
+        
+        file_path = Path(file_handle.name)
+        return ExportResult(
+            file_path=file_path,
+            format=ExportFormat.JSONL,
+            record_count=context['record_count'],
+            file_size_bytes=os.path.getsize(file_path),
+            processing_time_seconds=0.0,
+            columns=list(context['columns'])
+        )
+    
+    async def cleanup_failed_export(self, context: Dict[str, Any]) -> None:
+        """Cleanup failed JSON Lines export"""
+        if 'file_handle' in context:
+            try:
+                context['file_handle'].close()
+            except:
+                pass
+
+
 class ExcelExporter(ExportFormatter):
     """Excel format exporter with advanced features"""
     
@@ -772,6 +981,182 @@ class ParquetExporter(ExportFormatter):
             file_size_bytes=os.path.getsize(config.file_path),
             columns=list(df.columns)
         )
+    
+    def supports_streaming(self) -> bool:
+        return self.is_available()
+    
+    async def initialize_streaming_export(self, config: OutputConfig) -> Dict[str, Any]:
+        """
+        Initialize Parquet streaming export
+        
+        The schema comes from format_options['schema'] (a pyarrow.Schema) or
+        is inferred from the chunks as they arrive, with nested values stored
+        as JSON strings. An inferred schema is widened when a later chunk does
+        not fit it (null to any type, int to float, anything else to string,
+        new columns appended); the row groups written so far are then copied
+        one at a time into a new file under the widened schema, which
+        replaces the target file when the export is finalized.
+        """
+        schema = config.format_options.get('schema')
+        return {
+            'file_path': config.file_path,
+            'schema': schema,
+            'fixed_schema': schema is not None,
+            'compression': config.format_options.get('compression', 'snappy'),
+            'writer': None,
+            'write_path': str(config.file_path),
+            'rewrites': 0,
+            'record_count': 0
+        }
+    
+    async def export_chunk(
+        self, 
+        chunk: List[Dict[str, Any]], 
+        context: Dict[str, Any]
+    ) -> None:
+        """Export Parquet chunk as one row group"""
+        if not chunk:
+            return
+        
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        if not context['fixed_schema']:
+            schema = self._infer_schema(chunk, context['schema'])
+            if context['writer'] is not None and not schema.equals(context['schema']):
+                await asyncio.to_thread(self._rewrite_with_schema, context, schema)
+            context['schema'] = schema
+        
+        if context['writer'] is None:
+            context['writer'] = pq.ParquetWriter(
+                context['write_path'], context['schema'], compression=context['compression']
+            )
+        
+        try:
+            table = self._to_table(chunk, context['schema'])
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            raise ExportError(f"Chunk does not match the Parquet schema: {e}") from e
+        context['writer'].write_table(table, row_group_size=len(chunk))
+        context['record_count'] += len(chunk)
+    
+    async def finalize_streaming_export(self, context: Dict[str, Any]) -> ExportResult:
+        """Finalize Parquet streaming export"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        if context['writer'] is None:
+            # No records: still write a valid, empty file
+            schema = context['schema'] or pa.schema([])
+            context['schema'] = schema
+            context['writer'] = pq.ParquetWriter(context['write_path'], schema)
+        context['writer'].close()
+        
+        file_path = Path(context['file_path'])
+        if context['write_path'] != str(file_path):
+            os.replace(context['write_path'], file_path)
+        return ExportResult(
+            file_path=file_path,
+            format=ExportFormat.PARQUET,
+            record_count=context['record_count'],
+            file_size_bytes=os.path.getsize(file_path),
+            processing_time_seconds=0.0,
+            columns=list(context['schema'].names)
+        )
+    
+    async def cleanup_failed_export(self, context: Dict[str, Any]) -> None:
+        """Cleanup failed Parquet export"""
+        if context.get('writer') is not None:
+            try:
+                context['writer'].close()
+            except:
+                pass
+        if context.get('write_path') not in (None, str(context['file_path'])):
+            try:
+                os.remove(context['write_path'])
+            except OSError:
+                pass
+    
+    def _infer_schema(self, chunk: List[Dict[str, Any]], schema: Any = None) -> Any:
+        """Infer a flat Parquet schema from a chunk, widening an existing one"""
+        import pyarrow as pa
+        
+        types = {field.name: field.type for field in schema} if schema is not None else {}
+        names = list(types)
+        for name in dict.fromkeys(key for record in chunk for key in record):
+            if name not in types:
+                names.append(name)
+            values = [
+                json.dumps(value, default=str) if isinstance(value, (dict, list, tuple, set)) else value
+                for value in (record.get(name) for record in chunk)
+            ]
+            try:
+                value_type = pa.array(values).type
+            except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+                value_type = pa.string()
+            types[name] = self._widen_type(types.get(name), value_type)
+        
+        return pa.schema([pa.field(name, types[name]) for name in names])
+    
+    def _widen_type(self, current: Any, value_type: Any) -> Any:
+        """Smallest type holding both column types: int to float, else string"""
+        import pyarrow as pa
+        
+        if current is None or pa.types.is_null(current) or current.equals(value_type):
+            return value_type
+        if pa.types.is_null(value_type):
+            return current
+        if pa.types.is_integer(current) and pa.types.is_integer(value_type):
+            return pa.int64()
+        if all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in (current, value_type)):
+            return pa.float64()
+        return pa.string()
+    
+    def _to_table(self, records: List[Dict[str, Any]], schema: Any) -> Any:
+        """Build a table for the schema, coercing values to the column types"""
+        import pyarrow as pa
+        
+        columns = {
+            field.name: [
+                self._to_parquet_value(record.get(field.name), field.type)
+                for record in records
+            ]
+            for field in schema
+        }
+        return pa.Table.from_pydict(columns, schema=schema)
+    
+    def _rewrite_with_schema(self, context: Dict[str, Any], schema: Any) -> None:
+        """Rewrite the row groups written so far under a widened schema"""
+        import pyarrow.parquet as pq
+        
+        context['writer'].close()
+        source_path = context['write_path']
+        context['rewrites'] += 1
+        context['write_path'] = f"{context['file_path']}.{context['rewrites']}.tmp"
+        context['writer'] = pq.ParquetWriter(
+            context['write_path'], schema, compression=context['compression']
+        )
+        source = pq.ParquetFile(source_path)
+        try:
+            for index in range(source.num_row_groups):
+                records = source.read_row_group(index).to_pylist()
+                context['writer'].write_table(self._to_table(records, schema), row_group_size=len(records))
+        finally:
+            source.close()
+        os.remove(source_path)
+    
+    def _to_parquet_value(self, value: Any, value_type: Any) -> Any:
+        """Coerce a record value to the fixed column type"""
+        import pyarrow as pa
+        
+        if value is None:
+            return None
+        if pa.types.is_string(value_type) and not isinstance(value, str):
+            if isinstance(value, (dict, list, tuple, set)):
+                return json.dumps(value, default=str)
+            return str(value)
+        if pa.types.is_floating(value_type) and isinstance(value, int) and not isinstance(value, bool):
+            return float(value)
+        return value
 
 
 class PowerBIExporter(ExportFormatter):
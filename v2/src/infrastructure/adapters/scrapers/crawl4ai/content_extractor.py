@@ -5,6 +5,9 @@ Parallel Content Extractor - Phase 3 of Intelligent Scraping
 
 High-performance parallel content extraction using Crawl4AI with sophisticated
 rate limiting, progress tracking, and error handling for production environments.
+Every page request also takes a slot from the shared host scheduler, which
+enforces crawl-delay, per-host and global concurrency and 429/503 backoff
+across all concurrent jobs.
 """
 
 import asyncio
@@ -15,6 +18,8 @@ from dataclasses import dataclass
 from crawl4ai import AsyncWebCrawler
 import time
 
+from ..host_scheduler import HostScheduler, get_host_scheduler, retry_after_from_headers
+
 
 @dataclass
 class ExtractionResult:
@@ -35,11 +40,12 @@ class ExtractionResult:
 class ParallelContentExtractor:
     """High-performance parallel content extraction service"""
     
-    def __init__(self, max_workers: int = 10):
+    def __init__(self, max_workers: int = 10, host_scheduler: Optional[HostScheduler] = None):
         self.max_workers = max_workers
         self.logger = logging.getLogger(__name__)
         self._semaphore = asyncio.Semaphore(max_workers)
         self._crawlers = []
+        self.host_scheduler = host_scheduler or get_host_scheduler()
     
     async def extract_content_parallel(
         self, 
@@ -138,8 +144,14 @@ class ParallelContentExtractor:
                 "timeout": 25000,  # 25 second timeout
             }
             
-            # Execute extraction
-            result = await crawler.arun(url=url, **crawl_config)
+            # Execute extraction inside a per-host politeness slot
+            if self.host_scheduler:
+                async with self.host_scheduler.slot(url) as slot:
+                    result = await crawler.arun(url=url, **crawl_config)
+                    slot.record(getattr(result, "status_code", None),
+                                retry_after_from_headers(getattr(result, "response_headers", None)))
+            else:
+                result = await crawler.arun(url=url, **crawl_config)
             
             if result.success:
                 # Extract title and clean content
@@ -264,5 +276,6 @@ class ParallelContentExtractor:
             "max_workers": self.max_workers,
             "active_crawlers": len(self._crawlers),
             "semaphore_capacity": self._semaphore._value,
+            "host_scheduler": self.host_scheduler.get_stats() if self.host_scheduler else None,
             "status": "ready" if self._crawlers else "uninitialized"
         }
\ No newline at end of file
@@ -16,6 +16,8 @@ from typing import Set, List, Optional, Callable
 import logging
 import re
 
+from ..host_scheduler import apply_robots_crawl_delay, host_slot
+
 
 class LinkDiscoveryService:
     """Service for comprehensive link discovery using multiple sources"""
@@ -91,9 +93,11 @@ class LinkDiscoveryService:
             async with aiohttp.ClientSession(
                 timeout=aiohttp.ClientTimeout(total=10)
             ) as session:
-                async with session.get(robots_url) as response:
+                async with host_slot(robots_url) as slot, session.get(robots_url) as response:
+                    slot.record(response.status, response.headers.get('Retry-After'))
                     if response.status == 200:
                         robots_content = await response.text()
+                        apply_robots_crawl_delay(base_url, robots_content)
                         
                         # Parse robots.txt for sitemap references
                         for line in robots_content.split('\n'):
@@ -120,7 +124,8 @@ class LinkDiscoveryService:
             async with aiohttp.ClientSession(
                 timeout=aiohttp.ClientTimeout(total=15)
             ) as session:
-                async with session.get(sitemap_url) as response:
+                async with host_slot(sitemap_url) as slot, session.get(sitemap_url) as response:
+                    slot.record(response.status, response.headers.get('Retry-After'))
                     if response.status == 200:
                         sitemap_content = await response.text()
                         
@@ -168,7 +173,8 @@ class LinkDiscoveryService:
                 crawled_urls.add(url)
                 
                 try:
-                    async with session.get(url) as response:
+                    async with host_slot(url) as slot, session.get(url) as response:
+                        slot.record(response.status, response.headers.get('Retry-After'))
                         if response.status == 200 and 'text/html' in response.headers.get('content-type', ''):
                             html_content = await response.text()
                             
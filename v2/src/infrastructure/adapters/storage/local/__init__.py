@@ -0,0 +1,19 @@
+"""
+Local vector storage adapter for Theodore.
+
+This module provides a NumPy-backed, memory-mapped implementation of the
+VectorStorage interface for offline development and small deployments,
+with exact (flat) or approximate (IVF-flat) search.
+"""
+
+from .adapter import LocalVectorStorage
+from .config import LocalVectorConfig
+from .index import LocalVectorIndex
+from .ivf import IVFPartition
+
+__all__ = [
+    "LocalVectorStorage",
+    "LocalVectorConfig",
+    "LocalVectorIndex",
+    "IVFPartition"
+]
@@ -0,0 +1,608 @@
+"""
+Local vector storage adapter implementing the VectorStorage interface.
+
+This module provides an offline alternative to Pinecone for development and
+small deployments: indexes live in memory-mapped float32 matrices on local
+disk (or purely in memory) and are searched with vectorized NumPy kernels.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from datetime import datetime
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
+
+from src.core.ports.vector_storage import (
+    BatchVectorStorage, StreamingVectorStorage,
+    VectorStorageException, VectorIndexException, VectorNotFoundException,
+    VectorDimensionMismatchException,
+    VectorId, Vector, MetadataFilter, ProgressCallback
+)
+from src.core.domain.value_objects.vector_config import SearchConfig, SimilarityMetric
+from src.core.domain.value_objects.vector_result import (
+    VectorSearchResult, VectorOperationResult, IndexInfo, VectorRecord,
+    SearchMatch, OperationStatus, VectorOperationType
+)
+
+from .config import LocalVectorConfig
+from .index import LocalVectorIndex, StoredVector, MANIFEST_FILE, validate_index_name
+
+
+logger = logging.getLogger(__name__)
+
+PROVIDER_NAME = "local"
+DEFAULT_NAMESPACE = "default"
+
+
+class LocalVectorStorage(BatchVectorStorage, StreamingVectorStorage):
+    """
+    NumPy-backed local implementation of the VectorStorage interface.
+
+    Each index is a `LocalVectorIndex`; with `config.data_dir` set, indexes are
+    persisted under `<data_dir>/<index_name>/` and reloaded on start-up.
+    Pass `index_type="ivf_flat"` (with optional `nlist` / `nprobe`) to
+    `create_index` for approximate search; `SearchConfig.nprobe` tunes it
+    per query.
+    Searches, bulk writes and persistence run in a worker thread so large
+    matrices do not stall the event loop; with `config.autoflush` each write
+    appends only the changed rows to the index's records log.
+    """
+
+    def __init__(self, config: Optional[LocalVectorConfig] = None):
+        self.config = config or LocalVectorConfig()
+        self.indexes: Dict[str, LocalVectorIndex] = {}
+        self._closed = False
+
+        if self.config.data_dir:
+            os.makedirs(self.config.data_dir, exist_ok=True)
+            self._load_indexes()
+
+        logger.info(
+            f"Initialized local vector storage ({self.config.data_dir or 'in-memory'}, "
+            f"{len(self.indexes)} indexes)"
+        )
+
+    def _load_indexes(self) -> None:
+        for name in sorted(os.listdir(self.config.data_dir)):
+            path = os.path.join(self.config.data_dir, name)
+            if not os.path.isfile(os.path.join(path, MANIFEST_FILE)):
+                continue
+            try:
+                self.indexes[name] = LocalVectorIndex.open(path, self.config)
+            except Exception as e:
+                logger.error(f"Failed to load local vector index '{name}': {e}")
+
+    def _get_index(self, index_name: str, operation: str) -> LocalVectorIndex:
+        if self._closed:
+            raise VectorStorageException("Vector storage has been closed")
+        index = self.indexes.get(index_name)
+        if index is None:
+            raise VectorIndexException(index_name, operation, "Index does not exist")
+        return index
+
+    async def _after_write(self, index: LocalVectorIndex) -> None:
+        if self.config.autoflush:
+            await asyncio.to_thread(index.persist)
+
+    def _result(
+        self,
+        operation_type: VectorOperationType,
+        index_name: str,
+        affected_ids: List[str],
+        started: float,
+        failed_count: int = 0,
+        errors: Optional[List[Dict[str, Any]]] = None
+    ) -> VectorOperationResult:
+        execution_time = time.time() - started
+        successful_count = len(affected_ids)
+        if failed_count == 0:
+            status = OperationStatus.SUCCESS
+        elif successful_count:
+            status = OperationStatus.PARTIAL_SUCCESS
+        else:
+            status = OperationStatus.FAILED
+
+        return VectorOperationResult(
+            operation_type=operation_type,
+            operation_id=f"local_op_{uuid.uuid4().hex[:8]}",
+            status=status,
+            successful_count=successful_count,
+            failed_count=failed_count,
+            total_count=max(1, successful_count + failed_count),
+            execution_time=execution_time,
+            throughput=successful_count / execution_time if execution_time > 0 else 0.0,
+            provider_name=PROVIDER_NAME,
+            index_name=index_name,
+            affected_ids=affected_ids,
+            errors=errors or []
+        )
+
+    @staticmethod
+    def _to_record(stored: StoredVector) -> VectorRecord:
+        return VectorRecord(
+            id=stored.id,
+            vector=stored.values.tolist(),
+            metadata=stored.metadata,
+            created_at=datetime.utcfromtimestamp(stored.created_at),
+            updated_at=datetime.utcfromtimestamp(stored.updated_at)
+        )
+
+    def _to_search_result(
+        self,
+        index_name: str,
+        hits: List[Tuple[StoredVector, float]],
+        query_vector: Vector,
+        config: SearchConfig,
+        search_time: float
+    ) -> VectorSearchResult:
+        matches = [
+            SearchMatch(
+                record=self._to_record(stored),
+                score=score,
+                rank=rank,
+                confidence=min(1.0, max(0.0, score))
+            )
+            for rank, (stored, score) in enumerate(hits, 1)
+        ]
+        return VectorSearchResult(
+            matches=matches,
+            total_matches=len(matches),
+            query_vector=list(query_vector) if config.include_vectors else None,
+            search_id=f"search_{uuid.uuid4().hex[:8]}",
+            search_time=search_time,
+            index_search_time=search_time,
+            top_k=config.top_k,
+            similarity_threshold=config.similarity_threshold,
+            metadata_filter=config.metadata_filter,
+            provider_name=PROVIDER_NAME,
+            index_name=index_name
+        )
+
+    # Index Management Methods
+
+    async def create_index(
+        self,
+        index_name: str,
+        dimensions: int,
+        metric: str = SimilarityMetric.COSINE,
+        metadata_config: Optional[Dict[str, str]] = None,
+        **kwargs
+    ) -> VectorOperationResult:
+        """
+        Create a new vector index.
+
+        Supported kwargs: index_type ("flat" or "ivf_flat"), nlist, nprobe.
+        """
+        started = time.time()
+        validate_index_name(index_name)
+        if index_name in self.indexes:
+            raise VectorIndexException(index_name, "create", "Index already exists")
+
+        path = os.path.join(self.config.data_dir, index_name) if self.config.data_dir else None
+        try:
+            self.indexes[index_name] = LocalVectorIndex.create(
+                index_name, dimensions, metric, self.config, path,
+                index_type=kwargs.get("index_type", self.config.index_type),
+                nlist=kwargs.get("nlist"),
+                nprobe=kwargs.get("nprobe")
+            )
+        except VectorStorageException:
+            raise
+        except OSError as e:
+            raise VectorIndexException(index_name, "create", str(e))
+
+        return self._result(VectorOperationType.INDEX_CREATE, index_name, [index_name], started)
+
+    async def delete_index(self, index_name: str) -> VectorOperationResult:
+        """Delete a vector index and its files."""
+        started = time.time()
+        index = self._get_index(index_name, "delete")
+        total_vectors = index.size
+        index.destroy()
+        del self.indexes[index_name]
+
+        result = self._result(VectorOperationType.INDEX_DELETE, index_name, [index_name], started)
+        result.successful_count = total_vectors
+        result.total_count = max(1, total_vectors)
+        return result
+
+    async def list_indexes(self) -> List[str]:
+        """List all available vector indexes."""
+        return list(self.indexes.keys())
+
+    async def get_index_stats(self, index_name: str) -> IndexInfo:
+        """Get statistics for a vector index."""
+        index = self._get_index(index_name, "get_stats")
+        stats = index.get_stats()
+        age = max(1.0, (datetime.utcnow() - index.created_at).total_seconds())
+
+        return IndexInfo(
+            name=index_name,
+            provider=PROVIDER_NAME,
+            dimensions=index.dimensions,
+            similarity_metric=index.metric,
+            index_type=index.index_type,
+            total_vectors=stats["vectors"],
+            index_size_bytes=stats["matrix_bytes"],
+            average_query_latency=stats["average_query_ms"],
+            queries_per_second=index.query_count / age,
+            status="healthy",
+            last_updated=index.last_updated,
+            memory_usage_mb=0.0 if stats["persistent"] else stats["matrix_bytes"] / (1024 * 1024),
+            disk_usage_mb=stats["disk_bytes"] / (1024 * 1024)
+        )
+
+    async def index_exists(self, index_name: str) -> bool:
+        """Check if an index exists."""
+        return index_name in self.indexes
+
+    # Vector CRUD Operations
+
+    async def upsert_vector(
+        self,
+        index_name: str,
+        vector_id: VectorId,
+        vector: Vector,
+        metadata: Optional[Dict[str, Any]] = None,
+        namespace: Optional[str] = None
+    ) -> VectorOperationResult:
+        """Insert or update a single vector."""
+        started = time.time()
+        index = self._get_index(index_name, "upsert")
+        if len(vector) != index.dimensions:
+            raise VectorDimensionMismatchException(index.dimensions, len(vector), index_name)
+        written, _ = index.upsert([(vector_id, vector, metadata)], namespace or DEFAULT_NAMESPACE)
+        await self._after_write(index)
+        return self._result(VectorOperationType.INSERT, index_name, written, started)
+
+    async def upsert_vectors_batch(
+        self,
+        index_name: str,
+        vectors: List[tuple[VectorId, Vector, Optional[Dict[str, Any]]]],
+        namespace: Optional[str] = None,
+        batch_size: int = 100,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> VectorOperationResult:
+        """Insert or update multiple vectors, one matrix write per batch."""
+        started = time.time()
+        index = self._get_index(index_name, "upsert_batch")
+        namespace = namespace or DEFAULT_NAMESPACE
+        batch_size = max(1, batch_size)
+
+        affected_ids: List[str] = []
+        errors: List[Dict[str, Any]] = []
+        for offset in range(0, len(vectors), batch_size):
+            batch = vectors[offset:offset + batch_size]
+            written, batch_errors = await asyncio.to_thread(index.upsert, batch, namespace)
+            affected_ids.extend(written)
+            errors.extend(batch_errors)
+
+            if progress_callback:
+                done = offset + len(batch)
+                progress_callback(
+                    f"Processed {done}/{len(vectors)} vectors",
+                    min(1.0, done / len(vectors)),
+                    f"Batch {offset // batch_size + 1}"
+                )
+
+        if affected_ids:
+            await self._after_write(index)
+        return self._result(
+            VectorOperationType.BULK_INSERT, index_name, affected_ids, started, len(errors), errors
+        )
+
+    async def get_vector(
+        self,
+        index_name: str,
+        vector_id: VectorId,
+        namespace: Optional[str] = None,
+        include_values: bool = False,
+        include_metadata: bool = True
+    ) -> tuple[Optional[Vector], Optional[Dict[str, Any]]]:
+        """Retrieve a single vector by ID."""
+        index = self._get_index(index_name, "get")
+        stored = index.get(vector_id, namespace or DEFAULT_NAMESPACE)
+        if stored is None:
+            return None, None
+        return (
+            stored.values.tolist() if include_values else None,
+            dict(stored.metadata) if include_metadata else None
+        )
+
+    async def get_vectors_batch(
+        self,
+        index_name: str,
+        vector_ids: List[VectorId],
+        namespace: Optional[str] = None,
+        include_values: bool = False,
+        include_metadata: bool = True
+    ) -> Dict[VectorId, tuple[Optional[Vector], Optional[Dict[str, Any]]]]:
+        """Retrieve multiple vectors by ID."""
+        return {
+            vector_id: await self.get_vector(index_name, vector_id, namespace, include_values, include_metadata)
+            for vector_id in vector_ids
+        }
+
+    async def delete_vector(
+        self,
+        index_name: str,
+        vector_id: VectorId,
+        namespace: Optional[str] = None
+    ) -> VectorOperationResult:
+        """Delete a single vector by ID."""
+        started = time.time()
+        index = self._get_index(index_name, "delete")
+        deleted = index.delete([vector_id], namespace or DEFAULT_NAMESPACE)
+        if deleted:
+            await self._after_write(index)
+        return self._result(VectorOperationType.DELETE, index_name, deleted, started, 1 - len(deleted))
+
+    async def delete_vectors_batch(
+        self,
+        index_name: str,
+        vector_ids: List[VectorId],
+        namespace: Optional[str] = None,
+        batch_size: int = 100
+    ) -> VectorOperationResult:
+        """Delete multiple vectors."""
+        started = time.time()
+        index = self._get_index(index_name, "delete_batch")
+        deleted = index.delete(vector_ids, namespace or DEFAULT_NAMESPACE)
+        if deleted:
+            await self._after_write(index)
+        return self._result(
+            VectorOperationType.BULK_DELETE, index_name, deleted, started, len(vector_ids) - len(deleted)
+        )
+
+    async def delete_by_filter(
+        self,
+        index_name: str,
+        metadata_filter: MetadataFilter,
+        namespace: Optional[str] = None
+    ) -> VectorOperationResult:
+        """Delete vectors matching metadata filter."""
+        started = time.time()
+        index = self._get_index(index_name, "delete_by_filter")
+        namespace = namespace or DEFAULT_NAMESPACE
+        matching = [stored.id for stored in index.iter_matching(namespace, metadata_filter)]
+        deleted = index.delete(matching, namespace)
+        if deleted:
+            await self._after_write(index)
+        return self._result(VectorOperationType.DELETE, index_name, deleted, started)
+
+    # Vector Search Operations
+
+    async def search_similar(
+        self,
+        index_name: str,
+        query_vector: Vector,
+        config: SearchConfig,
+        namespace: Optional[str] = None
+    ) -> VectorSearchResult:
+        """Search for similar vectors using a query vector."""
+        return (await self.search_multiple_vectors(index_name, [query_vector], config, namespace))[0]
+
+    async def search_by_id(
+        self,
+        index_name: str,
+        vector_id: VectorId,
+        config: SearchConfig,
+        namespace: Optional[str] = None
+    ) -> VectorSearchResult:
+        """Search for vectors similar to a stored vector."""
+        vector, _ = await self.get_vector(index_name, vector_id, namespace, include_values=True)
+        if vector is None:
+            raise VectorNotFoundException(vector_id, index_name)
+        return await self.search_similar(index_name, vector, config, namespace)
+
+    async def search_by_metadata(
+        self,
+        index_name: str,
+        metadata_filter: MetadataFilter,
+        limit: int = 100,
+        offset: int = 0,
+        namespace: Optional[str] = None
+    ) -> List[tuple[VectorId, Dict[str, Any]]]:
+        """Search vectors by metadata only."""
+        index = self._get_index(index_name, "search_metadata")
+        return [
+            (stored.id, dict(stored.metadata))
+            for stored in index.iter_matching(namespace or DEFAULT_NAMESPACE, metadata_filter, offset, limit)
+        ]
+
+    # Advanced Operations
+
+    async def get_similar_entities(
+        self,
+        index_name: str,
+        entity_id: str,
+        entity_type: str,
+        config: SearchConfig,
+        namespace: Optional[str] = None
+    ) -> VectorSearchResult:
+        """Find entities of the same type similar to a given entity."""
+        enhanced_filter = dict(config.metadata_filter)
+        enhanced_filter["entity_type"] = entity_type
+        enhanced_config = config.model_copy(update={"metadata_filter": enhanced_filter})
+        return await self.search_by_id(index_name, entity_id, enhanced_config, namespace)
+
+    async def count_vectors(
+        self,
+        index_name: str,
+        metadata_filter: Optional[MetadataFilter] = None,
+        namespace: Optional[str] = None
+    ) -> int:
+        """Count vectors matching optional filter."""
+        index = self._get_index(index_name, "count")
+        return index.count(namespace or DEFAULT_NAMESPACE, metadata_filter)
+
+    async def update_metadata(
+        self,
+        index_name: str,
+        vector_id: VectorId,
+        metadata: Dict[str, Any],
+        namespace: Optional[str] = None
+    ) -> VectorOperationResult:
+        """Merge metadata into an existing vector."""
+        started = time.time()
+        index = self._get_index(index_name, "update")
+        if not index.update_metadata(vector_id, metadata, namespace or DEFAULT_NAMESPACE):
+            raise VectorNotFoundException(vector_id, index_name)
+        await self._after_write(index)
+        return self._result(VectorOperationType.UPDATE, index_name, [vector_id], started)
+
+    # Batch Operations
+
+    async def upsert_vectors_chunked(
+        self,
+        index_name: str,
+        vectors: List[tuple[VectorId, Vector, Optional[Dict[str, Any]]]],
+        chunk_size: Optional[int] = None,
+        max_parallel: int = 5,
+        namespace: Optional[str] = None,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> VectorOperationResult:
+        """
+        Upsert vectors in chunks.
+
+        Chunks are written sequentially: they all land in the same matrix, so
+        parallel writers would only contend for the index lock.
+        """
+        return await self.upsert_vectors_batch(
+            index_name, vectors, namespace, batch_size=chunk_size or 1000, progress_callback=progress_callback
+        )
+
+    async def search_multiple_vectors(
+        self,
+        index_name: str,
+        query_vectors: List[Vector],
+        config: SearchConfig,
+        namespace: Optional[str] = None
+    ) -> List[VectorSearchResult]:
+        """Search several query vectors with a single matrix product."""
+        index = self._get_index(index_name, "search")
+        started = time.time()
+        hits = await asyncio.to_thread(
+            index.search,
+            query_vectors,
+            config.top_k,
+            namespace or DEFAULT_NAMESPACE,
+            config.metadata_filter,
+            config.similarity_threshold,
+            config.nprobe
+        )
+        search_time = (time.time() - started) / max(1, len(query_vectors))
+        return [
+            self._to_search_result(index_name, query_hits, query_vector, config, search_time)
+            for query_vector, query_hits in zip(query_vectors, hits)
+        ]
+
+    async def bulk_update_metadata(
+        self,
+        index_name: str,
+        updates: List[tuple[VectorId, Dict[str, Any]]],
+        namespace: Optional[str] = None,
+        batch_size: int = 100
+    ) -> VectorOperationResult:
+        """Merge metadata into many vectors, flushing once."""
+        started = time.time()
+        index = self._get_index(index_name, "bulk_update")
+        namespace = namespace or DEFAULT_NAMESPACE
+
+        affected_ids = []
+        errors = []
+        for vector_id, metadata in updates:
+            if index.update_metadata(vector_id, metadata, namespace):
+                affected_ids.append(vector_id)
+            else:
+                errors.append({
+                    "message": str(VectorNotFoundException(vector_id, index_name)),
+                    "vector_id": vector_id,
+                    "timestamp": datetime.utcnow().isoformat()
+                })
+
+        if affected_ids:
+            await self._after_write(index)
+        return self._result(
+            VectorOperationType.BULK_UPDATE, index_name, affected_ids, started, len(errors), errors
+        )
+
+    # Streaming Operations
+
+    async def stream_search_results(
+        self,
+        index_name: str,
+        query_vector: Vector,
+        config: SearchConfig,
+        namespace: Optional[str] = None
+    ) -> AsyncIterator[tuple[VectorId, float, Optional[Dict[str, Any]]]]:
+        """Stream search results best first."""
+        result = await self.search_similar(index_name, query_vector, config, namespace)
+        for match in result.matches:
+            yield (match.record.id, match.score, match.record.metadata)
+
+    async def stream_vectors_by_filter(
+        self,
+        index_name: str,
+        metadata_filter: MetadataFilter,
+        namespace: Optional[str] = None
+    ) -> AsyncIterator[tuple[VectorId, Vector, Dict[str, Any]]]:
+        """Stream vectors matching metadata filter."""
+        index = self._get_index(index_name, "stream")
+        for stored in index.iter_matching(namespace or DEFAULT_NAMESPACE, metadata_filter):
+            yield (stored.id, stored.values.tolist(), dict(stored.metadata))
+            await asyncio.sleep(0)
+
+    async def train_index(self, index_name: str, sample_size: Optional[int] = None) -> bool:
+        """
+        Train (or retrain) an IVF index now instead of on its next search.
+
+        Returns False for flat or empty indexes.
+        """
+        index = self._get_index(index_name, "train")
+        trained = await asyncio.to_thread(index.train, sample_size)
+        if trained:
+            await self._after_write(index)
+        return trained
+
+    # Persistence and Lifecycle
+
+    async def flush(self) -> None:
+        """Persist every index (a no-op for in-memory storage)."""
+        for index in self.indexes.values():
+            await asyncio.to_thread(index.flush)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-index statistics."""
+        return {
+            "provider": PROVIDER_NAME,
+            "data_dir": self.config.data_dir,
+            "indexes": {name: index.get_stats() for name, index in self.indexes.items()}
+        }
+
+    async def health_check(self) -> Dict[str, Any]:
+        """Health information for the storage health checker."""
+        return {
+            "status": "unhealthy" if self._closed else "healthy",
+            "message": f"Local vector storage with {len(self.indexes)} indexes",
+            "indexes": len(self.indexes)
+        }
+
+    async def close(self) -> None:
+        """Flush and release all indexes."""
+        if self._closed:
+            return
+        for index in self.indexes.values():
+            await asyncio.to_thread(index.close)
+        self.indexes.clear()
+        self._closed = True
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit with automatic cleanup."""
+        await self.close()
@@ -0,0 +1,104 @@
+"""
+Local vector storage configuration.
+
+This module holds the settings for the NumPy-backed local vector storage
+adapter: where indexes are persisted, how the memory-mapped matrices grow,
+and when writes are flushed to disk.
+"""
+
+from typing import Optional
+from pydantic import BaseModel, Field
+import os
+
+
+class LocalVectorConfig(BaseModel):
+    """Configuration for local (offline) vector storage."""
+
+    # Persistence
+    data_dir: Optional[str] = Field(
+        default=None,
+        description="Directory holding one sub-directory per index; None keeps indexes in memory"
+    )
+    autoflush: bool = Field(
+        default=True,
+        description="Append the rows changed by every write operation to the records log"
+    )
+    log_compaction_rows: int = Field(
+        default=4096,
+        ge=1,
+        description="Minimum row entries in records.log before it is compacted into records.json"
+    )
+
+    # Matrix sizing
+    initial_capacity: int = Field(
+        default=1024,
+        ge=1,
+        description="Rows allocated when an index is created"
+    )
+    growth_factor: float = Field(
+        default=2.0,
+        ge=1.1,
+        le=10.0,
+        description="Capacity multiplier applied when the matrix is full"
+    )
+    max_vectors_per_index: int = Field(
+        default=1_000_000,
+        ge=1,
+        description="Hard limit on live vectors per index"
+    )
+
+    # Index type and IVF (approximate search) knobs
+    index_type: str = Field(
+        default="flat",
+        description="Default index type for new indexes: flat (exact) or ivf_flat (approximate)"
+    )
+    ivf_nlist: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="IVF cells; about 4 * sqrt(vectors) at training time when unset"
+    )
+    ivf_nprobe: int = Field(
+        default=8,
+        ge=1,
+        description="IVF cells scored per query; higher means better recall and slower queries"
+    )
+    ivf_min_train_size: int = Field(
+        default=1024,
+        ge=1,
+        description="IVF indexes search exactly until they hold this many vectors"
+    )
+    ivf_train_sample: int = Field(
+        default=65536,
+        ge=1,
+        description="Maximum vectors sampled for k-means training"
+    )
+    ivf_train_iterations: int = Field(
+        default=20,
+        ge=1,
+        description="Maximum k-means iterations"
+    )
+    ivf_retrain_growth: float = Field(
+        default=4.0,
+        ge=1.1,
+        description="Retrain once the index has grown by this factor since the last training"
+    )
+
+    # Search
+    gather_threshold: float = Field(
+        default=0.25,
+        ge=0.0,
+        le=1.0,
+        description="When a metadata filter keeps less than this fraction of rows, only those rows are scored"
+    )
+
+    @classmethod
+    def from_env(cls) -> 'LocalVectorConfig':
+        """Create configuration from environment variables."""
+        return cls(
+            data_dir=os.getenv("LOCAL_VECTOR_DATA_DIR") or None,
+            autoflush=os.getenv("LOCAL_VECTOR_AUTOFLUSH", "true").lower() != "false",
+            initial_capacity=int(os.getenv("LOCAL_VECTOR_INITIAL_CAPACITY", "1024")),
+            index_type=os.getenv("LOCAL_VECTOR_INDEX_TYPE", "flat"),
+            ivf_nprobe=int(os.getenv("LOCAL_VECTOR_IVF_NPROBE", "8")),
+            max_vectors_per_index=int(os.getenv("LOCAL_VECTOR_MAX_VECTORS", "1000000"))
+        )
@@ -0,0 +1,879 @@
+"""
+Memory-mapped vector index for local vector storage.
+
+Each index keeps its vectors in one float32 matrix (a NumPy memmap when the
+index is persisted, a plain array otherwise), plus:
+
+- an id map from (namespace, vector id) to matrix row
+- a metadata sidecar (records.json) with ids, namespaces, metadata and timestamps
+- an append-only log (records.log) of the rows written since records.json
+  was last rewritten; it is replayed on open and compacted by `flush`
+- a manifest (manifest.json) with name, dimensions and metric
+
+Searches score all candidate rows with one matrix product and select the
+top k with argpartition. Metadata filters are evaluated before scoring and
+the resulting row masks are cached until the next write. Deleted rows are
+tombstoned and reused by later inserts.
+
+Indexes created with index_type "ivf_flat" additionally keep an IVF
+partition (see ivf.py) and, once trained, score only the rows in the cells
+nearest to each query.
+"""
+
+import json
+import logging
+import operator
+import os
+import re
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple, Iterator
+
+import numpy as np
+
+from src.core.ports.vector_storage import (
+    VectorIndexException, VectorDimensionMismatchException, VectorQuotaExceededException,
+    InvalidVectorFilterException, VectorId, Vector, MetadataFilter
+)
+from src.core.domain.value_objects.vector_config import SimilarityMetric, IndexType
+
+from .config import LocalVectorConfig
+from .ivf import IVFPartition, IVF_FILE
+
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+VECTORS_FILE = "vectors.f32"
+RECORDS_FILE = "records.json"
+RECORDS_LOG_FILE = "records.log"
+FORMAT_VERSION = 1
+
+SUPPORTED_METRICS = (
+    SimilarityMetric.COSINE.value,
+    SimilarityMetric.EUCLIDEAN.value,
+    SimilarityMetric.DOT_PRODUCT.value
+)
+SUPPORTED_INDEX_TYPES = (IndexType.FLAT.value, IndexType.IVF_FLAT.value)
+
+_INDEX_NAME_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+_ORDERING_OPERATORS = {
+    "$gt": operator.gt,
+    "$gte": operator.ge,
+    "$lt": operator.lt,
+    "$lte": operator.le
+}
+FILTER_OPERATORS = {"$eq", "$ne", "$in", "$nin", "$exists", *_ORDERING_OPERATORS}
+
+# Rows normalised per chunk when norms are rebuilt on load
+_NORM_CHUNK_ROWS = 65536
+
+
+def validate_index_name(index_name: str) -> None:
+    """Index names double as directory names, so keep them path-safe."""
+    if not index_name or not _INDEX_NAME_PATTERN.match(index_name):
+        raise VectorIndexException(
+            index_name, "create", "Name must start with a letter or digit and contain only letters, digits, '_', '-' or '.'"
+        )
+
+
+def validate_filter(metadata_filter: MetadataFilter) -> None:
+    """
+    Reject filters the local index cannot evaluate.
+
+    Supported: exact values, lists ("in"), and operator dicts using
+    $eq, $ne, $gt, $gte, $lt, $lte, $in, $nin and $exists.
+    """
+    if not isinstance(metadata_filter, dict):
+        raise InvalidVectorFilterException(str(metadata_filter), "Filter must be a dictionary")
+
+    for key, condition in metadata_filter.items():
+        if not isinstance(condition, dict):
+            continue
+        unknown = set(condition) - FILTER_OPERATORS
+        if unknown:
+            raise InvalidVectorFilterException(
+                json.dumps(metadata_filter, default=str), f"Unsupported operator '{sorted(unknown)[0]}' for '{key}'"
+            )
+        for op in ("$in", "$nin"):
+            if op in condition and not isinstance(condition[op], list):
+                raise InvalidVectorFilterException(
+                    json.dumps(metadata_filter, default=str), f"'{op}' for '{key}' needs a list"
+                )
+
+
+def _match_operator(actual: Any, op: str, operand: Any) -> bool:
+    # List-valued metadata (tags, industries) matches when any element does
+    values = actual if isinstance(actual, list) else [actual]
+
+    if op == "$eq":
+        return operand in values
+    if op == "$ne":
+        return operand not in values
+    if op in ("$in", "$nin"):
+        hit = any(value in operand for value in values)
+        return hit if op == "$in" else not hit
+
+    compare = _ORDERING_OPERATORS[op]
+    try:
+        return any(value is not None and compare(value, operand) for value in values)
+    except TypeError:
+        return False
+
+
+def matches_filter(metadata: Dict[str, Any], metadata_filter: MetadataFilter) -> bool:
+    """Check whether metadata satisfies a (validated) filter."""
+    for key, condition in metadata_filter.items():
+        present = key in metadata
+        actual = metadata.get(key)
+
+        if isinstance(condition, dict):
+            if "$exists" in condition and bool(condition["$exists"]) != present:
+                return False
+            operators = [op for op in condition if op != "$exists"]
+            if operators and not present:
+                return False
+            if not all(_match_operator(actual, op, condition[op]) for op in operators):
+                return False
+        elif not present:
+            return False
+        elif isinstance(condition, list):
+            if not _match_operator(actual, "$in", condition):
+                return False
+        elif not _match_operator(actual, "$eq", condition):
+            return False
+
+    return True
+
+
+def _atomic_write_json(path: str, payload: Any) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, separators=(",", ":"), default=str)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _read_records_log(path: str, generation: int) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Read the log entries written on top of records.json `generation`.
+
+    A torn last line (a crash mid-append) is cut off so later appends start
+    on a clean line. Returns (entries, number of row entries).
+    """
+    entries: List[Dict[str, Any]] = []
+    row_entries = 0
+    if not os.path.exists(path):
+        return entries, row_entries
+    with open(path, "rb+") as f:
+        good = 0
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break
+            if not line.endswith(b"\n"):
+                break
+            good += len(line)
+            if entry.get("generation") == generation:
+                entries.append(entry)
+                row_entries += len(entry["rows"])
+        if good < os.fstat(f.fileno()).st_size:
+            logger.warning(f"Truncating torn tail of {path}")
+            f.truncate(good)
+    return entries, row_entries
+
+
+@dataclass
+class StoredVector:
+    """A vector as held by the local index"""
+    id: str
+    namespace: str
+    values: np.ndarray
+    metadata: Dict[str, Any]
+    created_at: float
+    updated_at: float
+
+
+class LocalVectorIndex:
+    """
+    One local vector index.
+
+    Thread-safe; all public methods take the index lock. Use `create` for a
+    new index and `open` to load a persisted one.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        dimensions: int,
+        metric: str,
+        config: LocalVectorConfig,
+        path: Optional[str] = None,
+        created_at: Optional[datetime] = None,
+        index_type: str = IndexType.FLAT.value,
+        nlist: Optional[int] = None,
+        nprobe: Optional[int] = None
+    ):
+        metric = getattr(metric, "value", metric)
+        if metric not in SUPPORTED_METRICS:
+            raise VectorIndexException(
+                name, "create", f"Unsupported metric '{metric}'; expected one of {', '.join(SUPPORTED_METRICS)}"
+            )
+        index_type = getattr(index_type, "value", index_type)
+        if index_type not in SUPPORTED_INDEX_TYPES:
+            raise VectorIndexException(
+                name, "create",
+                f"Unsupported index type '{index_type}'; expected one of {', '.join(SUPPORTED_INDEX_TYPES)}"
+            )
+        if dimensions <= 0:
+            raise VectorIndexException(name, "create", "Dimensions must be positive")
+
+        self.name = name
+        self.dimensions = dimensions
+        self.metric = metric
+        self.config = config
+        self.path = path
+        self.created_at = created_at or datetime.utcnow()
+        self.index_type = index_type
+        self.ivf: Optional[IVFPartition] = None
+        if index_type == IndexType.IVF_FLAT.value:
+            self.ivf = IVFPartition(metric, nlist or config.ivf_nlist, nprobe or config.ivf_nprobe)
+
+        self._lock = threading.RLock()
+        self._capacity = 0
+        self._count = 0  # High-water mark of used rows (live + tombstoned)
+        self._matrix: np.ndarray = np.zeros((0, dimensions), dtype=np.float32)
+        self._norms = np.zeros(0, dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._ns_codes = np.zeros(0, dtype=np.int32)
+
+        self._namespaces: List[str] = []
+        self._namespace_codes: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._metadata: List[Optional[Dict[str, Any]]] = []
+        self._timestamps: List[Optional[Tuple[float, float]]] = []
+        self._rows: Dict[Tuple[int, str], int] = {}
+        self._free: List[int] = []
+
+        self._mask_cache: Dict[Tuple[int, str], np.ndarray] = {}
+        self.query_count = 0
+        self.total_query_time = 0.0
+        self.write_count = 0
+        self.last_updated = self.created_at
+
+        # Incremental persistence state
+        self._generation = 0
+        self._dirty_rows: set = set()
+        self._persisted_namespaces = 0
+        self._log_rows = 0
+        self._ivf_dirty = False
+
+    # Construction
+
+    @classmethod
+    def create(
+        cls,
+        name: str,
+        dimensions: int,
+        metric: str,
+        config: LocalVectorConfig,
+        path: Optional[str] = None,
+        index_type: str = IndexType.FLAT.value,
+        nlist: Optional[int] = None,
+        nprobe: Optional[int] = None
+    ) -> 'LocalVectorIndex':
+        """Create an empty index, allocating its matrix file when `path` is given."""
+        index = cls(name, dimensions, metric, config, path, index_type=index_type, nlist=nlist, nprobe=nprobe)
+        if path:
+            os.makedirs(path, exist_ok=False)
+        index._allocate(config.initial_capacity)
+        index.flush()
+        return index
+
+    @classmethod
+    def open(cls, path: str, config: LocalVectorConfig) -> 'LocalVectorIndex':
+        """Load a persisted index from its directory."""
+        with open(os.path.join(path, MANIFEST_FILE), encoding="utf-8") as f:
+            manifest = json.load(f)
+        with open(os.path.join(path, RECORDS_FILE), encoding="utf-8") as f:
+            records = json.load(f)
+        generation = records.get("generation", 0)
+        entries, log_rows = _read_records_log(os.path.join(path, RECORDS_LOG_FILE), generation)
+        replayed = set()
+        for entry in entries:
+            records.setdefault("namespaces", []).extend(entry["namespaces"])
+            for row, record in entry["rows"].items():
+                row = int(row)
+                if row >= len(records["rows"]):
+                    records["rows"].extend([None] * (row + 1 - len(records["rows"])))
+                records["rows"][row] = record
+                replayed.add(row)
+
+        index = cls(
+            manifest["name"], manifest["dimensions"], manifest["metric"], config, path,
+            datetime.fromisoformat(manifest["created_at"]),
+            index_type=manifest.get("index_type", IndexType.FLAT.value),
+            nlist=manifest.get("nlist"),
+            nprobe=manifest.get("nprobe")
+        )
+        row_bytes = index.dimensions * np.dtype(np.float32).itemsize
+        # The matrix file may have grown after the manifest was last written
+        capacity = max(os.path.getsize(os.path.join(path, VECTORS_FILE)) // row_bytes, len(records["rows"]), 1)
+        index._allocate(capacity)
+        index._load_records(records)
+        index._generation = generation
+        index._persisted_namespaces = len(index._namespaces)
+        index._log_rows = log_rows
+        if index.ivf is not None and index.ivf.load(path):
+            # Rows written after the last flush of ivf.npz still need a cell
+            if replayed:
+                index.ivf.assignments[np.fromiter(replayed, dtype=np.int64)] = -1
+            live = np.flatnonzero(index._alive[:index._count])
+            unassigned = live[index.ivf.assignments[live] < 0]
+            index.ivf.assign(unassigned, index._matrix[unassigned])
+        return index
+
+    def _vectors_path(self) -> str:
+        return os.path.join(self.path, VECTORS_FILE)
+
+    def _allocate(self, capacity: int) -> None:
+        """(Re)size the matrix and row arrays to `capacity` rows, keeping existing rows."""
+        old_capacity = self._capacity
+        if self.path:
+            if isinstance(self._matrix, np.memmap):
+                self._matrix.flush()
+            self._matrix = None  # Release the old mapping before resizing the file
+            with open(self._vectors_path(), "ab") as f:
+                f.truncate(capacity * self.dimensions * np.dtype(np.float32).itemsize)
+            self._matrix = np.memmap(self._vectors_path(), dtype=np.float32, mode="r+",
+                                     shape=(capacity, self.dimensions))
+        else:
+            matrix = np.zeros((capacity, self.dimensions), dtype=np.float32)
+            matrix[:old_capacity] = self._matrix[:old_capacity]
+            self._matrix = matrix
+
+        def extend(array: np.ndarray) -> np.ndarray:
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[:old_capacity] = array[:old_capacity]
+            return grown
+
+        self._norms = extend(self._norms)
+        self._alive = extend(self._alive)
+        self._ns_codes = extend(self._ns_codes)
+        if self.ivf is not None:
+            self.ivf.resize(capacity)
+        self._capacity = capacity
+
+    def _load_records(self, records: Dict[str, Any]) -> None:
+        self._namespaces = list(records.get("namespaces", []))
+        self._namespace_codes = {ns: code for code, ns in enumerate(self._namespaces)}
+
+        for row, record in enumerate(records["rows"]):
+            if record is None:
+                self._ids.append(None)
+                self._metadata.append(None)
+                self._timestamps.append(None)
+                self._free.append(row)
+                continue
+            vector_id, ns_code, metadata, created, updated = record
+            self._ids.append(vector_id)
+            self._metadata.append(metadata)
+            self._timestamps.append((created, updated))
+            self._rows[(ns_code, vector_id)] = row
+            self._alive[row] = True
+            self._ns_codes[row] = ns_code
+
+        self._count = len(records["rows"])
+        for start in range(0, self._count, _NORM_CHUNK_ROWS):
+            stop = min(start + _NORM_CHUNK_ROWS, self._count)
+            self._norms[start:stop] = np.linalg.norm(self._matrix[start:stop], axis=1)
+        self._free.reverse()  # Reuse the lowest rows first
+
+    # Properties
+
+    @property
+    def size(self) -> int:
+        """Number of live vectors across all namespaces."""
+        return len(self._rows)
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def tombstones(self) -> int:
+        return len(self._free)
+
+    def namespace_size(self, namespace: str) -> int:
+        with self._lock:
+            code = self._namespace_codes.get(namespace)
+            if code is None:
+                return 0
+            return int(np.count_nonzero(self._alive[:self._count] & (self._ns_codes[:self._count] == code)))
+
+    # Writes
+
+    def _namespace_code(self, namespace: str) -> int:
+        code = self._namespace_codes.get(namespace)
+        if code is None:
+            code = len(self._namespaces)
+            self._namespaces.append(namespace)
+            self._namespace_codes[namespace] = code
+        return code
+
+    def _take_row(self) -> int:
+        if self._free:
+            return self._free.pop()
+        if self._count >= self._capacity:
+            self._allocate(max(self._count + 1, int(self._capacity * self.config.growth_factor)))
+        row = self._count
+        self._count += 1
+        self._ids.append(None)
+        self._metadata.append(None)
+        self._timestamps.append(None)
+        return row
+
+    def _touch(self) -> None:
+        self._mask_cache.clear()
+        self.write_count += 1
+        self.last_updated = datetime.utcnow()
+
+    def upsert(
+        self,
+        vectors: List[Tuple[VectorId, Vector, Optional[Dict[str, Any]]]],
+        namespace: str
+    ) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """
+        Insert or replace vectors in one namespace.
+
+        Vectors with the wrong dimensionality are reported as errors and
+        skipped; the rest are written with a single matrix assignment.
+        Later duplicates of an id in the same call win.
+
+        Returns:
+            Tuple of (written ids, error dicts)
+
+        Raises:
+            VectorQuotaExceededException: If the new vectors exceed the index limit
+        """
+        latest: Dict[str, Tuple[Vector, Optional[Dict[str, Any]]]] = {}
+        errors = []
+        for vector_id, vector, metadata in vectors:
+            if len(vector) != self.dimensions:
+                error = VectorDimensionMismatchException(self.dimensions, len(vector), self.name)
+                errors.append({
+                    "message": str(error),
+                    "vector_id": vector_id,
+                    "timestamp": datetime.utcnow().isoformat()
+                })
+                continue
+            latest.pop(vector_id, None)
+            latest[vector_id] = (vector, metadata)
+
+        if not latest:
+            return [], errors
+
+        values = np.asarray([vector for vector, _ in latest.values()], dtype=np.float32)
+        now = time.time()
+
+        with self._lock:
+            code = self._namespace_code(namespace)
+            new_ids = sum(1 for vector_id in latest if (code, vector_id) not in self._rows)
+            if self.size + new_ids > self.config.max_vectors_per_index:
+                raise VectorQuotaExceededException("vectors", self.size + new_ids, self.config.max_vectors_per_index)
+
+            rows = np.empty(len(latest), dtype=np.int64)
+            for position, (vector_id, (_, metadata)) in enumerate(latest.items()):
+                key = (code, vector_id)
+                row = self._rows.get(key)
+                created = now
+                if row is None:
+                    row = self._take_row()
+                    self._rows[key] = row
+                else:
+                    created = self._timestamps[row][0]
+                rows[position] = row
+                self._ids[row] = vector_id
+                self._metadata[row] = dict(metadata or {})
+                self._timestamps[row] = (created, now)
+
+            self._matrix[rows] = values
+            self._norms[rows] = np.linalg.norm(values, axis=1)
+            self._alive[rows] = True
+            self._ns_codes[rows] = code
+            if self.ivf is not None:
+                self.ivf.assign(rows, values)
+            self._dirty_rows.update(rows.tolist())
+            self._touch()
+
+        return list(latest), errors
+
+    def delete(self, vector_ids: List[VectorId], namespace: str) -> List[str]:
+        """Tombstone vectors; returns the ids that existed."""
+        with self._lock:
+            code = self._namespace_codes.get(namespace)
+            if code is None:
+                return []
+            deleted = []
+            for vector_id in vector_ids:
+                row = self._rows.pop((code, vector_id), None)
+                if row is None:
+                    continue
+                self._alive[row] = False
+                self._ids[row] = None
+                self._metadata[row] = None
+                self._timestamps[row] = None
+                self._free.append(row)
+                self._dirty_rows.add(row)
+                deleted.append(vector_id)
+            if deleted:
+                self._touch()
+            return deleted
+
+    def update_metadata(self, vector_id: VectorId, metadata: Dict[str, Any], namespace: str) -> bool:
+        """Merge metadata into an existing vector; False if it does not exist."""
+        with self._lock:
+            row = self._rows.get((self._namespace_codes.get(namespace, -1), vector_id))
+            if row is None:
+                return False
+            self._metadata[row].update(metadata)
+            self._timestamps[row] = (self._timestamps[row][0], time.time())
+            self._dirty_rows.add(row)
+            self._touch()
+            return True
+
+    # Reads
+
+    def get(self, vector_id: VectorId, namespace: str) -> Optional[StoredVector]:
+        with self._lock:
+            row = self._rows.get((self._namespace_codes.get(namespace, -1), vector_id))
+            if row is None:
+                return None
+            return self._stored(row)
+
+    def _stored(self, row: int) -> StoredVector:
+        created, updated = self._timestamps[row]
+        return StoredVector(
+            id=self._ids[row],
+            namespace=self._namespaces[self._ns_codes[row]],
+            values=np.array(self._matrix[row]),
+            metadata=self._metadata[row],
+            created_at=created,
+            updated_at=updated
+        )
+
+    def filter_rows(self, namespace: str, metadata_filter: Optional[MetadataFilter] = None) -> np.ndarray:
+        """
+        Rows of live vectors in a namespace matching a metadata filter, ascending.
+
+        Raises:
+            InvalidVectorFilterException: If the filter is invalid
+        """
+        return np.flatnonzero(self._allowed_mask(namespace, metadata_filter))
+
+    def _allowed_mask(self, namespace: str, metadata_filter: Optional[MetadataFilter] = None) -> np.ndarray:
+        """Boolean mask over used rows: live, in the namespace and matching the filter."""
+        if metadata_filter:
+            validate_filter(metadata_filter)
+
+        with self._lock:
+            code = self._namespace_codes.get(namespace)
+            if code is None:
+                return np.zeros(self._count, dtype=bool)
+
+            mask = self._alive[:self._count] & (self._ns_codes[:self._count] == code)
+            if metadata_filter:
+                cache_key = (code, json.dumps(metadata_filter, sort_keys=True, default=str))
+                filter_mask = self._mask_cache.get(cache_key)
+                if filter_mask is None:
+                    filter_mask = np.fromiter(
+                        (meta is not None and matches_filter(meta, metadata_filter) for meta in self._metadata),
+                        dtype=bool, count=self._count
+                    )
+                    self._mask_cache[cache_key] = filter_mask
+                mask = mask & filter_mask
+            return mask
+
+    def iter_matching(
+        self,
+        namespace: str,
+        metadata_filter: Optional[MetadataFilter] = None,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> Iterator[StoredVector]:
+        """Stored vectors matching a filter, in insertion-row order."""
+        rows = self.filter_rows(namespace, metadata_filter)
+        stop = None if limit is None else offset + limit
+        for row in rows[offset:stop]:
+            with self._lock:
+                if not self._alive[row]:
+                    continue
+                stored = self._stored(int(row))
+            yield stored
+
+    def count(self, namespace: str, metadata_filter: Optional[MetadataFilter] = None) -> int:
+        if not metadata_filter:
+            return self.namespace_size(namespace)
+        return len(self.filter_rows(namespace, metadata_filter))
+
+    # Search
+
+    def _score(self, queries: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Similarity of every query to every candidate row (queries x rows)."""
+        if len(rows) < self.config.gather_threshold * self._count:
+            block = self._matrix[rows]
+            dots = queries @ block.T
+        else:
+            # Score the whole matrix with one product and pick the candidate columns
+            dots = (queries @ self._matrix[:self._count].T)[:, rows]
+
+        if self.metric == SimilarityMetric.DOT_PRODUCT.value:
+            return dots
+
+        row_norms = self._norms[rows]
+        query_norms = np.linalg.norm(queries, axis=1)
+        if self.metric == SimilarityMetric.EUCLIDEAN.value:
+            squared = query_norms[:, None] ** 2 - 2 * dots + row_norms[None, :] ** 2
+            return 1.0 / (1.0 + np.sqrt(np.maximum(squared, 0.0)))
+
+        denominator = query_norms[:, None] * row_norms[None, :]
+        return np.divide(dots, denominator, out=np.zeros_like(dots), where=denominator > 0)
+
+    @staticmethod
+    def _top_k(
+        scores: np.ndarray,
+        rows: np.ndarray,
+        top_k: int,
+        similarity_threshold: Optional[float]
+    ) -> List[Tuple[int, float]]:
+        """Best `top_k` (row, score) pairs, best first."""
+        candidates = np.arange(len(rows))
+        if similarity_threshold is not None:
+            candidates = np.flatnonzero(scores >= similarity_threshold)
+        k = min(top_k, len(candidates))
+        if k == 0:
+            return []
+        candidate_scores = scores[candidates]
+        if k < len(candidates):
+            top = np.argpartition(-candidate_scores, k - 1)[:k]
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.argsort(-candidate_scores[top], kind="stable")]
+        return [(int(rows[candidates[i]]), float(candidate_scores[i])) for i in top]
+
+    def search(
+        self,
+        queries: List[Vector],
+        top_k: int,
+        namespace: str,
+        metadata_filter: Optional[MetadataFilter] = None,
+        similarity_threshold: Optional[float] = None,
+        nprobe: Optional[int] = None
+    ) -> List[List[Tuple[StoredVector, float]]]:
+        """
+        Top-k most similar vectors for each query, best first.
+
+        Scores follow the index metric: cosine similarity, 1 / (1 + euclidean
+        distance), or the raw dot product. Trained IVF indexes only score the
+        `nprobe` nearest cells, unless the filter already narrows the
+        candidates below that.
+
+        Raises:
+            VectorDimensionMismatchException: If a query has the wrong dimensionality
+            InvalidVectorFilterException: If the filter is invalid
+        """
+        for query in queries:
+            if len(query) != self.dimensions:
+                raise VectorDimensionMismatchException(self.dimensions, len(query), self.name)
+
+        started = time.perf_counter()
+        query_matrix = np.asarray(queries, dtype=np.float32).reshape(len(queries), self.dimensions)
+
+        with self._lock:
+            self._maybe_train()
+            mask = self._allowed_mask(namespace, metadata_filter)
+            rows = np.flatnonzero(mask)
+            hits: List[List[Tuple[int, float]]] = [[] for _ in queries]
+
+            use_ivf = (
+                self.ivf is not None and self.ivf.trained
+                and len(rows) > self.ivf.expected_candidates(self._count, nprobe)
+            )
+            if use_ivf:
+                for position, query in enumerate(query_matrix):
+                    candidates = self.ivf.candidates(query, self._count, nprobe)
+                    candidates = candidates[mask[candidates]]
+                    if len(candidates):
+                        scores = self._score(query[None, :], candidates)[0]
+                        hits[position] = self._top_k(scores, candidates, top_k, similarity_threshold)
+            elif len(rows) and len(queries):
+                scores = self._score(query_matrix, rows)
+                hits = [self._top_k(query_scores, rows, top_k, similarity_threshold) for query_scores in scores]
+
+            results = [[(self._stored(row), score) for row, score in query_hits] for query_hits in hits]
+            self.query_count += len(queries)
+            self.total_query_time += time.perf_counter() - started
+
+        return results
+
+    # IVF training
+
+    def train(self, sample_size: Optional[int] = None, iterations: Optional[int] = None, seed: int = 0) -> bool:
+        """
+        (Re)train the IVF partition on a sample of the live vectors and
+        reassign every row. Returns False for flat or empty indexes.
+        """
+        if self.ivf is None:
+            return False
+        with self._lock:
+            live = np.flatnonzero(self._alive[:self._count])
+            if len(live) == 0:
+                return False
+            sample_size = min(len(live), sample_size or self.config.ivf_train_sample)
+            sample = np.sort(np.random.default_rng(seed).choice(live, sample_size, replace=False))
+
+            started = time.perf_counter()
+            self.ivf.train(self._matrix[sample], iterations or self.config.ivf_train_iterations, seed)
+            for start in range(0, len(live), _NORM_CHUNK_ROWS):
+                chunk = live[start:start + _NORM_CHUNK_ROWS]
+                self.ivf.assign(chunk, self._matrix[chunk])
+            self.ivf.trained_size = len(live)
+            self._ivf_dirty = True
+            logger.info(
+                f"Trained IVF index '{self.name}': {self.ivf.cells} cells over {len(live)} vectors "
+                f"in {time.perf_counter() - started:.2f}s"
+            )
+            return True
+
+    def _maybe_train(self) -> None:
+        """Train once the index is big enough, and retrain after it has grown."""
+        if self.ivf is None or self.size < self.config.ivf_min_train_size:
+            return
+        if not self.ivf.trained or self.size >= self.ivf.trained_size * self.config.ivf_retrain_growth:
+            self.train()
+
+    # Persistence and lifecycle
+
+    def _record(self, row: int) -> Optional[List[Any]]:
+        if self._ids[row] is None:
+            return None
+        return [self._ids[row], int(self._ns_codes[row]), self._metadata[row], *self._timestamps[row]]
+
+    def persist(self) -> None:
+        """
+        Persist the writes made since the last call.
+
+        Only the changed rows are appended to records.log; once the log holds
+        more row entries than the index has rows (or than
+        `config.log_compaction_rows`), or after IVF training, this falls back
+        to a full `flush`, which compacts the log into records.json.
+        """
+        if not self.path:
+            return
+        with self._lock:
+            if self._ivf_dirty or self._log_rows + len(self._dirty_rows) > max(
+                self._count, self.config.log_compaction_rows
+            ):
+                self.flush()
+                return
+            if not self._dirty_rows and len(self._namespaces) == self._persisted_namespaces:
+                return
+            if isinstance(self._matrix, np.memmap):
+                self._matrix.flush()
+            entry = {
+                "generation": self._generation,
+                "namespaces": self._namespaces[self._persisted_namespaces:],
+                "rows": {str(row): self._record(row) for row in sorted(self._dirty_rows)}
+            }
+            with open(os.path.join(self.path, RECORDS_LOG_FILE), "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, separators=(",", ":"), default=str) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._log_rows += len(self._dirty_rows)
+            self._dirty_rows.clear()
+            self._persisted_namespaces = len(self._namespaces)
+
+    def flush(self) -> None:
+        """Write the matrix, id map, metadata sidecar and manifest to disk."""
+        if not self.path:
+            return
+        with self._lock:
+            if isinstance(self._matrix, np.memmap):
+                self._matrix.flush()
+            if self.ivf is not None:
+                self.ivf.save(self.path, self._count)
+            # A new generation makes log entries from before this rewrite stale,
+            # even if removing the log below is interrupted
+            self._generation += 1
+            _atomic_write_json(os.path.join(self.path, RECORDS_FILE), {
+                "generation": self._generation,
+                "namespaces": self._namespaces,
+                "rows": [self._record(row) for row in range(self._count)]
+            })
+            log_path = os.path.join(self.path, RECORDS_LOG_FILE)
+            if os.path.exists(log_path):
+                os.remove(log_path)
+            self._dirty_rows.clear()
+            self._persisted_namespaces = len(self._namespaces)
+            self._log_rows = 0
+            self._ivf_dirty = False
+            _atomic_write_json(os.path.join(self.path, MANIFEST_FILE), {
+                "format_version": FORMAT_VERSION,
+                "name": self.name,
+                "dimensions": self.dimensions,
+                "metric": self.metric,
+                "index_type": self.index_type,
+                "nlist": self.ivf.nlist if self.ivf else None,
+                "nprobe": self.ivf.nprobe if self.ivf else None,
+                "capacity": self._capacity,
+                "count": self._count,
+                "created_at": self.created_at.isoformat()
+            })
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            self._matrix = np.zeros((0, self.dimensions), dtype=np.float32)
+
+    def destroy(self) -> None:
+        """Drop the index and delete its files."""
+        with self._lock:
+            self._matrix = np.zeros((0, self.dimensions), dtype=np.float32)
+            self._rows.clear()
+            if self.path and os.path.isdir(self.path):
+                shutil.rmtree(self.path)
+
+    def disk_usage_bytes(self) -> int:
+        if not self.path or not os.path.isdir(self.path):
+            return 0
+        return sum(
+            os.path.getsize(os.path.join(self.path, name))
+            for name in (MANIFEST_FILE, VECTORS_FILE, RECORDS_FILE, RECORDS_LOG_FILE, IVF_FILE)
+            if os.path.exists(os.path.join(self.path, name))
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "dimensions": self.dimensions,
+                "metric": self.metric,
+                "index_type": self.index_type,
+                "ivf_cells": self.ivf.cells if self.ivf else None,
+                "ivf_nprobe": self.ivf.nprobe if self.ivf else None,
+                "ivf_trained_size": self.ivf.trained_size if self.ivf else None,
+                "vectors": self.size,
+                "capacity": self._capacity,
+                "tombstones": len(self._free),
+                "namespaces": len(self._namespaces),
+                "queries": self.query_count,
+                "average_query_ms": (self.total_query_time / self.query_count * 1000) if self.query_count else None,
+                "matrix_bytes": self._capacity * self.dimensions * np.dtype(np.float32).itemsize,
+                "disk_bytes": self.disk_usage_bytes(),
+                "persistent": bool(self.path)
+            }
@@ -0,0 +1,186 @@
+"""
+Inverted-file (IVF-flat) partitioning for the local vector index.
+
+k-means splits the vectors into `nlist` cells, and every matrix row records
+its cell. A query scores only the rows in the `nprobe` cells whose centroids
+are closest to it, which trades recall for latency:
+
+- nprobe = nlist is an exact search; a few percent of nlist usually keeps
+  recall@10 above 0.9 at a fraction of the cost
+- Vectors inserted after training go to their nearest centroid (incremental
+  inserts); the owning index retrains once the collection has grown enough
+- Tombstoned rows keep their cell and are masked out at query time
+- Centroids and row assignments persist in ivf.npz next to the matrix
+"""
+
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.core.domain.value_objects.vector_config import SimilarityMetric
+
+
+IVF_FILE = "ivf.npz"
+
+# Rows assigned per chunk, bounding the (rows x nlist) score matrix
+_ASSIGN_CHUNK_ROWS = 16384
+
+
+def default_nlist(size: int) -> int:
+    """Common IVF sizing rule: about 4 * sqrt(n) cells."""
+    return int(max(1, min(65536, round(4 * np.sqrt(max(size, 1))))))
+
+
+class IVFPartition:
+    """
+    Coarse quantizer and inverted lists over a row-addressed matrix.
+
+    Args:
+        metric: Index metric (cosine, euclidean or dot_product)
+        nlist: Number of cells (derived from the collection size when None)
+        nprobe: Default number of cells scored per query
+    """
+
+    def __init__(self, metric: str, nlist: Optional[int] = None, nprobe: int = 8):
+        self.metric = metric
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.centroids: Optional[np.ndarray] = None
+        self.assignments = np.full(0, -1, dtype=np.int32)
+        self.trained_size = 0
+        self._lists: Optional[Tuple[np.ndarray, np.ndarray, int]] = None
+
+    @property
+    def trained(self) -> bool:
+        return self.centroids is not None
+
+    @property
+    def cells(self) -> int:
+        return 0 if self.centroids is None else len(self.centroids)
+
+    def resize(self, capacity: int) -> None:
+        grown = np.full(capacity, -1, dtype=np.int32)
+        keep = min(capacity, len(self.assignments))
+        grown[:keep] = self.assignments[:keep]
+        self.assignments = grown
+
+    def _prepare(self, vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.metric == SimilarityMetric.COSINE.value:
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+        return vectors
+
+    def _closeness(self, vectors: np.ndarray, centroids: np.ndarray, inner_product: bool) -> np.ndarray:
+        """Higher is closer. Euclidean closeness drops the constant |v|^2 term."""
+        dots = vectors @ centroids.T
+        if inner_product:
+            return dots
+        return 2 * dots - np.einsum("ij,ij->i", centroids, centroids)[None, :]
+
+    def _nearest(self, vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        # Cosine works on unit vectors, where inner product and euclidean agree;
+        # dot-product indexes are clustered geometrically (IP k-means is unstable)
+        inner_product = self.metric == SimilarityMetric.COSINE.value
+        labels = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), _ASSIGN_CHUNK_ROWS):
+            stop = start + _ASSIGN_CHUNK_ROWS
+            labels[start:stop] = np.argmax(self._closeness(vectors[start:stop], centroids, inner_product), axis=1)
+        return labels
+
+    def train(self, sample: np.ndarray, iterations: int = 20, seed: int = 0) -> None:
+        """
+        Fit centroids with Lloyd's k-means on a sample of the collection.
+
+        Empty cells are re-seeded with random sample points; cosine indexes
+        use spherical k-means (centroids renormalised every iteration).
+        """
+        rng = np.random.default_rng(seed)
+        points = self._prepare(sample)
+        nlist = max(1, min(self.nlist or default_nlist(len(points)), len(points)))
+        centroids = points[rng.choice(len(points), nlist, replace=False)].copy()
+        labels = None
+
+        for _ in range(max(1, iterations)):
+            new_labels = self._nearest(points, centroids)
+            if labels is not None and np.array_equal(new_labels, labels):
+                break
+            labels = new_labels
+
+            order = np.argsort(labels, kind="stable")
+            sorted_labels = labels[order]
+            starts = np.flatnonzero(np.r_[True, sorted_labels[1:] != sorted_labels[:-1]])
+            sums = np.add.reduceat(points[order], starts, axis=0)
+            counts = np.diff(np.r_[starts, len(order)])
+            occupied = sorted_labels[starts]
+
+            centroids[occupied] = sums / counts[:, None]
+            empty = np.setdiff1d(np.arange(nlist), occupied)
+            if len(empty):
+                centroids[empty] = points[rng.choice(len(points), len(empty), replace=False)]
+            if self.metric == SimilarityMetric.COSINE.value:
+                centroids = self._prepare(centroids)
+
+        self.centroids = centroids.astype(np.float32)
+        self._lists = None
+
+    def assign(self, rows: np.ndarray, vectors: np.ndarray) -> None:
+        """Put rows into their nearest cell (no-op before training)."""
+        if not self.trained or len(rows) == 0:
+            return
+        self.assignments[rows] = self._nearest(self._prepare(vectors), self.centroids)
+        self._lists = None
+
+    def _inverted_lists(self, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        if self._lists is None or self._lists[2] != count:
+            codes = self.assignments[:count]
+            order = np.argsort(codes, kind="stable")
+            # Unassigned rows (-1) sort first and fall outside every cell
+            offsets = np.searchsorted(codes[order], np.arange(self.cells + 1))
+            self._lists = (order, offsets, count)
+        return self._lists[0], self._lists[1]
+
+    def candidates(self, query: np.ndarray, count: int, nprobe: Optional[int] = None) -> np.ndarray:
+        """Rows in the `nprobe` cells closest to the query."""
+        nprobe = max(1, min(nprobe or self.nprobe, self.cells))
+        query = self._prepare(query.reshape(1, -1))
+        closeness = self._closeness(query, self.centroids, self.metric != SimilarityMetric.EUCLIDEAN.value)[0]
+        if nprobe < self.cells:
+            cells = np.argpartition(-closeness, nprobe - 1)[:nprobe]
+        else:
+            cells = np.arange(self.cells)
+
+        order, offsets = self._inverted_lists(count)
+        return np.concatenate([order[offsets[cell]:offsets[cell + 1]] for cell in cells])
+
+    def expected_candidates(self, count: int, nprobe: Optional[int] = None) -> float:
+        """Rows a query is expected to score, assuming balanced cells."""
+        if not self.trained:
+            return float(count)
+        return count * min(nprobe or self.nprobe, self.cells) / self.cells
+
+    def save(self, directory: str, count: int) -> None:
+        if not self.trained:
+            return
+        tmp_path = os.path.join(directory, f"{IVF_FILE}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, centroids=self.centroids, assignments=self.assignments[:count],
+                     trained_size=np.int64(self.trained_size))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, os.path.join(directory, IVF_FILE))
+
+    def load(self, directory: str) -> bool:
+        """Restore centroids and assignments; False when nothing was saved."""
+        path = os.path.join(directory, IVF_FILE)
+        if not os.path.exists(path):
+            return False
+        with np.load(path) as data:
+            self.centroids = data["centroids"].astype(np.float32)
+            assignments = data["assignments"]
+            self.trained_size = int(data["trained_size"])
+        keep = min(len(assignments), len(self.assignments))
+        self.assignments[:keep] = assignments[:keep]
+        self._lists = None
+        return True
@@ -15,7 +15,7 @@ from src.core.ports.vector_storage import VectorStorage
 
 # Import storage adapters
 from src.infrastructure.adapters.storage.pinecone.adapter import PineconeVectorStorage
-# from src.infrastructure.adapters.storage.memory_vector_storage import MemoryVectorStorage
+from src.infrastructure.adapters.storage.local import LocalVectorStorage, LocalVectorConfig
 # from src.infrastructure.adapters.storage.company_repository import CompanyRepository
 
 
@@ -45,6 +45,8 @@ def _create_vector_storage(
         return _create_pinecone_adapter(config, external_services)
     elif provider == "memory":
         return _create_memory_vector_storage(config)
+    elif provider == "local":
+        return _create_local_vector_storage(config)
     else:
         raise ValueError(f"Unsupported vector storage provider: {provider}")
 
@@ -54,7 +56,7 @@ class StorageProvider(containers.DeclarativeContainer):
     Storage provider container for all data persistence components.
     
     Provides:
-    - Vector storage adapters (Pinecone, Memory)
+    - Vector storage adapters (Pinecone, Local, Memory)
     - Company repository implementation
     - Cache management
     - Connection pooling and lifecycle management
@@ -125,28 +127,47 @@ def _create_pinecone_adapter(
         raise
 
 
-def _create_memory_vector_storage(config: Dict[str, Any]):
-    """Create and configure in-memory vector storage."""
+def _create_memory_vector_storage(config: Dict[str, Any]) -> LocalVectorStorage:
+    """Create in-memory vector storage (the local adapter, persisted only if enabled)."""
     logger = logging.getLogger(__name__)
     
-    # Extract memory storage configuration
-    memory_config = {
-        "dimension": config.get("dimension", 1536),
-        "metric": config.get("metric", "cosine"),
-        "max_capacity": config.get("max_capacity", 10000),
-        "enable_persistence": config.get("enable_persistence", False),
-        "persistence_path": config.get("persistence_path", "data/memory_storage.pkl")
-    }
+    data_dir = config.get("persistence_path", "data/vector_storage") if config.get("enable_persistence", False) else None
+    local_config = LocalVectorConfig(
+        data_dir=data_dir,
+        max_vectors_per_index=config.get("max_capacity", 10000)
+    )
     
     try:
-        # Memory vector storage not implemented yet
-        logger.warning("Memory vector storage not implemented, returning None")
-        return None
+        adapter = LocalVectorStorage(local_config)
+        logger.info(f"Memory vector storage created (persistence: {data_dir or 'disabled'})")
+        return adapter
     except Exception as e:
         logger.error(f"Failed to create memory vector storage: {e}")
         raise
 
 
+def _create_local_vector_storage(config: Dict[str, Any]) -> LocalVectorStorage:
+    """Create and configure memory-mapped local vector storage."""
+    logger = logging.getLogger(__name__)
+    
+    local_config = LocalVectorConfig(
+        data_dir=config.get("data_dir", "data/vector_storage"),
+        autoflush=config.get("autoflush", True),
+        initial_capacity=config.get("initial_capacity", 1024),
+        max_vectors_per_index=config.get("max_capacity", 1_000_000),
+        index_type=config.get("index_type", "flat"),
+        ivf_nprobe=config.get("nprobe", 8)
+    )
+    
+    try:
+        adapter = LocalVectorStorage(local_config)
+        logger.info(f"Local vector storage created at: {local_config.data_dir}")
+        return adapter
+    except Exception as e:
+        logger.error(f"Failed to create local vector storage: {e}")
+        raise
+
+
 def _create_storage_health_checker(
     vector_storage: VectorStorage,
     company_repository,
@@ -274,7 +295,7 @@ class StorageProviderValidator:
         
         if provider == "pinecone":
             return StorageProviderValidator._validate_pinecone_config(config)
-        elif provider == "memory":
+        elif provider in ("memory", "local"):
             return StorageProviderValidator._validate_memory_config(config)
         else:
             validation_result["valid"] = False
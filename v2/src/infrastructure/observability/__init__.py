@@ -55,6 +55,12 @@ from .alerting import (
     AlertChannel
 )
 
+from .progress_bus import (
+    ProgressEvent,
+    ProgressEventBus,
+    get_progress_bus
+)
+
 __all__ = [
     # Logging
     "TheodoreLogger",
@@ -84,7 +90,12 @@ __all__ = [
     # Alerting
     "AlertManager",
     "AlertLevel",
-    "AlertChannel"
+    "AlertChannel",
+    
+    # Progress streaming
+    "ProgressEvent",
+    "ProgressEventBus",
+    "get_progress_bus"
 ]
 
 # Version information
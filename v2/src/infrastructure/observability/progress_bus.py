@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Theodore v2 Progress Event Bus
+==============================
+
+In-process publish/subscribe bus for job progress. Use cases publish through
+their `progress_publisher` hook; SSE and WebSocket endpoints subscribe per job
+instead of polling, so updates reach clients as soon as they happen.
+
+- Events carry increasing ids for SSE `id:` / Last-Event-ID resume from a
+  bounded per-job history; a gap older than the history is reported so the
+  endpoint can send a fresh snapshot
+- Events with a coalesce key (progress snapshots) collapse to the latest one
+  per key for subscribers that fall behind; terminal events are always kept
+- Publishing never blocks on subscribers and is safe from any thread
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+
+@dataclass
+class ProgressEvent:
+    """One published progress event"""
+    id: int
+    job_id: str
+    event: str
+    data: Dict[str, Any]
+    coalesce_key: Optional[str] = None
+    timestamp: float = field(default_factory=time.time)
+
+    def to_sse(self) -> str:
+        """Format as a named Server-Sent Events message"""
+        return f"id: {self.id}\nevent: {self.event}\ndata: {json.dumps(self.data, default=str)}\n\n"
+
+
+def coalesce_events(events: List[ProgressEvent]) -> List[ProgressEvent]:
+    """Keep only the last event per coalesce key, preserving order"""
+    last_by_key = {event.coalesce_key: event.id for event in events if event.coalesce_key}
+    return [e for e in events if not e.coalesce_key or last_by_key[e.coalesce_key] == e.id]
+
+
+class ProgressEventBus:
+    """
+    Per-job progress bus with bounded history.
+
+    Args:
+        history_size: Events kept per job for resume
+        max_jobs: Jobs kept; least recently updated are dropped first
+        coalesce_interval: Seconds to let a burst accumulate before delivery
+    """
+
+    TERMINAL_EVENTS = ("complete", "error")
+
+    def __init__(self, history_size: int = 256, max_jobs: int = 1000, coalesce_interval: float = 0.25):
+        self.history_size = history_size
+        self.max_jobs = max_jobs
+        self.coalesce_interval = coalesce_interval
+        self._lock = threading.Lock()
+        self._history: "OrderedDict[str, deque]" = OrderedDict()
+        self._evicted_through: Dict[str, int] = {}
+        self._waiters: Dict[str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]]] = {}
+        self._last_id = 0
+
+    @property
+    def last_event_id(self) -> int:
+        with self._lock:
+            return self._last_id
+
+    def publish(
+        self,
+        job_id: str,
+        event: str,
+        data: Dict[str, Any],
+        coalesce_key: Optional[str] = None
+    ) -> ProgressEvent:
+        """Record an event for `job_id` and wake its subscribers"""
+        with self._lock:
+            self._last_id += 1
+            progress_event = ProgressEvent(self._last_id, job_id, event, data, coalesce_key)
+            history = self._history.get(job_id)
+            if history is None:
+                history = self._history[job_id] = deque(maxlen=self.history_size)
+                while len(self._history) > self.max_jobs:
+                    dropped, _ = self._history.popitem(last=False)
+                    self._evicted_through.pop(dropped, None)
+            self._history.move_to_end(job_id)
+            if len(history) == history.maxlen:
+                self._evicted_through[job_id] = history[0].id
+            history.append(progress_event)
+            waiters = self._waiters.pop(job_id, [])
+
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_resolve, future)
+        return progress_event
+
+    def publish_progress(self, job_id: str, progress: Dict[str, Any]) -> ProgressEvent:
+        """Publish a progress snapshot; terminal statuses also publish a complete event"""
+        event = self.publish(job_id, "progress", progress, coalesce_key="progress")
+        if progress.get("phase") in ("completed", "failed", "cancelled"):
+            event = self.publish(job_id, "complete", {"status": progress["phase"]})
+        return event
+
+    def events_since(self, job_id: str, last_event_id: Optional[int]) -> Tuple[List[ProgressEvent], bool]:
+        """
+        Buffered events after `last_event_id`.
+
+        Returns:
+            (events, complete) - complete is False when part of the gap was evicted
+        """
+        with self._lock:
+            return self._events_since(job_id, last_event_id)
+
+    def _events_since(self, job_id: str, last_event_id: Optional[int]) -> Tuple[List[ProgressEvent], bool]:
+        after = last_event_id or 0
+        events = [e for e in self._history.get(job_id, ()) if e.id > after]
+        complete = after >= self._evicted_through.get(job_id, 0) and after <= self._last_id
+        return events, complete
+
+    async def wait(self, job_id: str, last_event_id: Optional[int], timeout: float) -> List[ProgressEvent]:
+        """Wait for events newer than `last_event_id`; returns [] on timeout"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            with self._lock:
+                events, _ = self._events_since(job_id, last_event_id)
+                if events:
+                    break
+                future = loop.create_future()
+                self._waiters.setdefault(job_id, []).append((loop, future))
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return []
+            try:
+                await asyncio.wait_for(future, remaining)
+            except asyncio.TimeoutError:
+                return []
+
+        if self.coalesce_interval:
+            await asyncio.sleep(self.coalesce_interval)
+            events, _ = self.events_since(job_id, last_event_id)
+        return coalesce_events(events)
+
+    async def subscribe(
+        self,
+        job_id: str,
+        last_event_id: Optional[int] = None,
+        heartbeat: float = 15.0
+    ) -> AsyncIterator[Optional[List[ProgressEvent]]]:
+        """
+        Yield batches of new events for `job_id`; None after `heartbeat` idle seconds.
+        Stops after a terminal event.
+        """
+        cursor = last_event_id
+        while True:
+            events = await self.wait(job_id, cursor, heartbeat)
+            if not events:
+                yield None
+                continue
+            cursor = events[-1].id
+            yield events
+            if any(event.event in self.TERMINAL_EVENTS for event in events):
+                return
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+_progress_bus: Optional[ProgressEventBus] = None
+_progress_bus_lock = threading.Lock()
+
+
+def get_progress_bus() -> ProgressEventBus:
+    """Get the process-wide progress event bus"""
+    global _progress_bus
+    with _progress_bus_lock:
+        if _progress_bus is None:
+            _progress_bus = ProgressEventBus()
+        return _progress_bus
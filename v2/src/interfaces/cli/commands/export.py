@@ -42,7 +42,7 @@ def export_group():
 
 @export_group.command()
 @click.option('--format', '-f', 
-              type=click.Choice(['csv', 'json', 'excel', 'pdf', 'parquet', 'powerbi', 'tableau']),
+              type=click.Choice(['csv', 'json', 'jsonl', 'excel', 'pdf', 'parquet', 'powerbi', 'tableau']),
               default='csv',
               help='Export format')
 @click.option('--output', '-o', 
@@ -651,7 +651,7 @@ def _display_report_summary(generated_report, exported_path: str):
 
 @export_group.command()
 @click.option('--format', '-f',
-              type=click.Choice(['csv', 'json', 'excel', 'pdf', 'parquet', 'powerbi', 'tableau']),
+              type=click.Choice(['csv', 'json', 'jsonl', 'excel', 'pdf', 'parquet', 'powerbi', 'tableau']),
               help='Show formats (all if not specified)')
 def formats(format: Optional[str]):
     """Show available export formats and their capabilities"""
@@ -674,6 +674,14 @@ def formats(format: Optional[str]):
             'analytics': True,
             'use_cases': ['API integration', 'Web applications', 'Data interchange']
         },
+        'jsonl': {
+            'name': 'JSON Lines (one record per line)',
+            'streaming': True,
+            'compression': False,
+            'visualizations': False,
+            'analytics': False,
+            'use_cases': ['Full database dumps', 'Log pipelines', 'Incremental loading']
+        },
         'excel': {
             'name': 'Excel Workbook (.xlsx)',
             'streaming': False,
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Tests for the NumPy memory-mapped local vector storage adapter
+"""
+
+import numpy as np
+import pytest
+
+from src.core.ports.vector_storage import (
+    VectorDimensionMismatchException, VectorIndexException, VectorNotFoundException,
+    InvalidVectorFilterException
+)
+from src.core.domain.value_objects.vector_config import SearchConfig
+from src.core.domain.value_objects.vector_result import OperationStatus
+from src.infrastructure.adapters.storage.local import LocalVectorConfig, LocalVectorStorage
+from src.infrastructure.adapters.storage.local.index import matches_filter
+
+
+def random_vectors(count, dimensions=16, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.normal(size=(count, dimensions)).astype(np.float32)
+
+
+def brute_force_top_k(matrix, query, k):
+    scores = matrix @ query / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(query))
+    return list(np.argsort(-scores)[:k])
+
+
+class TestLocalVectorStorage:
+    """Test cases for LocalVectorStorage"""
+
+    @pytest.mark.asyncio
+    async def test_top_k_matches_brute_force_and_respects_filters(self):
+        storage = LocalVectorStorage(LocalVectorConfig(initial_capacity=8))
+        await storage.create_index("companies", 16)
+        matrix = random_vectors(300)
+        vectors = [
+            (f"c{i}", row.tolist(), {"industry": "saas" if i % 3 == 0 else "retail", "employees": i})
+            for i, row in enumerate(matrix)
+        ]
+        result = await storage.upsert_vectors_batch("companies", vectors, batch_size=64)
+        assert result.successful_count == 300
+        assert storage.indexes["companies"].capacity >= 300
+
+        query = matrix[7] + 0.1
+        found = await storage.search_similar("companies", query.tolist(), SearchConfig(top_k=5))
+        assert [m.record.id for m in found.matches] == [f"c{i}" for i in brute_force_top_k(matrix, query, 5)]
+        assert found.matches[0].score >= found.matches[-1].score
+
+        config = SearchConfig(top_k=10, metadata_filter={"industry": "saas", "employees": {"$gte": 150}})
+        filtered = await storage.search_similar("companies", query.tolist(), config)
+        ids = [int(m.record.id[1:]) for m in filtered.matches]
+        assert len(ids) == 10
+        assert all(i % 3 == 0 and i >= 150 for i in ids)
+
+        assert await storage.count_vectors("companies", {"industry": ["saas"]}) == 100
+        with pytest.raises(InvalidVectorFilterException):
+            await storage.count_vectors("companies", {"industry": {"$regex": "sa.*"}})
+
+    @pytest.mark.asyncio
+    async def test_deletes_tombstone_rows_that_are_reused(self):
+        storage = LocalVectorStorage()
+        await storage.create_index("idx", 16, metric="dot_product")
+        matrix = random_vectors(10)
+        await storage.upsert_vectors_batch("idx", [(f"v{i}", row.tolist(), {}) for i, row in enumerate(matrix)])
+
+        deleted = await storage.delete_vectors_batch("idx", ["v1", "v2", "missing"])
+        assert deleted.status == OperationStatus.PARTIAL_SUCCESS
+        assert await storage.count_vectors("idx") == 8
+        assert storage.indexes["idx"].tombstones == 2
+
+        await storage.upsert_vector("idx", "new", matrix[0].tolist())
+        assert storage.indexes["idx"].tombstones == 1
+        found = await storage.search_similar("idx", matrix[1].tolist(), SearchConfig(top_k=10))
+        assert "v1" not in [m.record.id for m in found.matches]
+
+        with pytest.raises(VectorDimensionMismatchException):
+            await storage.upsert_vector("idx", "short", [1.0, 2.0])
+        with pytest.raises(VectorNotFoundException):
+            await storage.search_by_id("idx", "v2", SearchConfig())
+
+    @pytest.mark.asyncio
+    async def test_indexes_persist_to_disk(self, tmp_path):
+        config = LocalVectorConfig(data_dir=str(tmp_path), initial_capacity=4)
+        storage = LocalVectorStorage(config)
+        await storage.create_index("persisted", 16, metric="euclidean")
+        matrix = random_vectors(20, seed=1)
+        await storage.upsert_vectors_batch("persisted", [(f"v{i}", row.tolist(), {"n": i}) for i, row in enumerate(matrix)])
+        await storage.upsert_vector("persisted", "other", matrix[0].tolist(), {"n": -1}, namespace="archive")
+        await storage.delete_vector("persisted", "v3")
+        await storage.update_metadata("persisted", "v4", {"reviewed": True})
+        await storage.close()
+
+        reopened = LocalVectorStorage(config)
+        assert await reopened.list_indexes() == ["persisted"]
+        assert await reopened.count_vectors("persisted") == 19
+        assert await reopened.count_vectors("persisted", namespace="archive") == 1
+
+        values, metadata = await reopened.get_vector("persisted", "v4", include_values=True)
+        assert np.allclose(values, matrix[4])
+        assert metadata == {"n": 4, "reviewed": True}
+
+        found = await reopened.search_similar("persisted", matrix[5].tolist(), SearchConfig(top_k=1))
+        assert found.matches[0].record.id == "v5"
+        assert found.matches[0].score == pytest.approx(1.0)
+
+        stats = await reopened.get_index_stats("persisted")
+        assert stats.provider == "local"
+        assert stats.disk_usage_mb > 0
+
+        await reopened.delete_index("persisted")
+        assert not (tmp_path / "persisted").exists()
+        with pytest.raises(VectorIndexException):
+            await reopened.get_index_stats("persisted")
+
+    @pytest.mark.asyncio
+    async def test_writes_append_to_records_log_and_replay(self, tmp_path):
+        config = LocalVectorConfig(data_dir=str(tmp_path), initial_capacity=4)
+        storage = LocalVectorStorage(config)
+        await storage.create_index("logged", 16)
+        matrix = random_vectors(10, seed=2)
+        records_path = tmp_path / "logged" / "records.json"
+        log_path = tmp_path / "logged" / "records.log"
+        snapshot = records_path.read_bytes()
+
+        await storage.upsert_vectors_batch("logged", [(f"v{i}", row.tolist(), {"n": i}) for i, row in enumerate(matrix)])
+        await storage.upsert_vector("logged", "other", matrix[0].tolist(), namespace="archive")
+        await storage.delete_vector("logged", "v3")
+        await storage.update_metadata("logged", "v4", {"reviewed": True})
+
+        # Writes only append; records.json is not rewritten
+        assert records_path.read_bytes() == snapshot
+        assert len(log_path.read_text().splitlines()) == 4
+
+        # Simulate a crash mid-append, then reopen without closing
+        with open(log_path, "a") as f:
+            f.write('{"generation":1,"rows":{"0":')
+        reopened = LocalVectorStorage(config)
+        assert await reopened.count_vectors("logged") == 9
+        assert await reopened.count_vectors("logged", namespace="archive") == 1
+        _, metadata = await reopened.get_vector("logged", "v4")
+        assert metadata == {"n": 4, "reviewed": True}
+        assert len(log_path.read_text().splitlines()) == 4
+
+        await reopened.upsert_vector("logged", "v3", matrix[3].tolist())
+        await reopened.close()
+        assert not log_path.exists()
+        assert await LocalVectorStorage(config).count_vectors("logged") == 10
+
+    @pytest.mark.asyncio
+    async def test_records_log_is_compacted(self, tmp_path):
+        config = LocalVectorConfig(data_dir=str(tmp_path), initial_capacity=4, log_compaction_rows=5)
+        storage = LocalVectorStorage(config)
+        await storage.create_index("compacted", 16)
+        log_path = tmp_path / "compacted" / "records.log"
+
+        for i, row in enumerate(random_vectors(5, seed=3)):
+            await storage.upsert_vector("compacted", f"v{i}", row.tolist())
+        assert len(log_path.read_text().splitlines()) == 5
+
+        await storage.update_metadata("compacted", "v0", {"n": 0})
+        assert not log_path.exists()
+        reopened = LocalVectorStorage(config)
+        assert await reopened.count_vectors("compacted") == 5
+        _, metadata = await reopened.get_vector("compacted", "v0")
+        assert metadata == {"n": 0}
+
+    def test_filter_semantics(self):
+        metadata = {"tags": ["b2b", "ai"], "employees": 40}
+        assert matches_filter(metadata, {"tags": "ai"})
+        assert matches_filter(metadata, {"tags": {"$nin": ["crypto"]}, "employees": {"$lt": 50}})
+        assert matches_filter(metadata, {"funding": {"$exists": False}})
+        assert not matches_filter(metadata, {"employees": {"$gt": "many"}})
+        assert not matches_filter(metadata, {"funding": {"$ne": 0}})
+
+
+def clustered_vectors(count, dimensions=32, clusters=40, seed=3):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dimensions))
+    labels = rng.integers(0, clusters, size=count)
+    return (centers[labels] + 0.3 * rng.normal(size=(count, dimensions))).astype(np.float32)
+
+
+class TestIVFIndex:
+    """Test cases for approximate (IVF-flat) local indexes"""
+
+    async def build(self, tmp_path=None, count=3000):
+        config = LocalVectorConfig(
+            data_dir=str(tmp_path) if tmp_path else None, ivf_min_train_size=500, ivf_nlist=32, ivf_nprobe=4
+        )
+        storage = LocalVectorStorage(config)
+        await storage.create_index("ann", 32, index_type="ivf_flat")
+        matrix = clustered_vectors(count)
+        await storage.upsert_vectors_batch("ann", [(f"v{i}", row.tolist(), {"i": i}) for i, row in enumerate(matrix)],
+                                           batch_size=1000)
+        return storage, matrix
+
+    @pytest.mark.asyncio
+    async def test_recall_tracks_nprobe(self):
+        storage, matrix = await self.build()
+        queries = clustered_vectors(50, seed=9)
+
+        def recall(results):
+            hits = 0
+            for query, result in zip(queries, results):
+                truth = {f"v{i}" for i in brute_force_top_k(matrix, query, 10)}
+                hits += len(truth & {m.record.id for m in result.matches})
+            return hits / (10 * len(queries))
+
+        approximate = await storage.search_multiple_vectors("ann", queries.tolist(), SearchConfig(top_k=10))
+        exhaustive = await storage.search_multiple_vectors("ann", queries.tolist(), SearchConfig(top_k=10, nprobe=32))
+
+        assert storage.indexes["ann"].ivf.trained
+        assert recall(approximate) >= 0.8
+        assert recall(exhaustive) == 1.0
+        assert (await storage.get_index_stats("ann")).index_type == "ivf_flat"
+
+    @pytest.mark.asyncio
+    async def test_inserts_and_deletes_after_training(self):
+        storage, matrix = await self.build()
+        await storage.train_index("ann")
+
+        probe = (matrix[0] * 1.01).tolist()
+        await storage.upsert_vector("ann", "late", probe)
+        found = await storage.search_similar("ann", probe, SearchConfig(top_k=1))
+        assert found.matches[0].record.id == "late"
+
+        await storage.delete_vector("ann", "late")
+        found = await storage.search_similar("ann", probe, SearchConfig(top_k=3))
+        assert "late" not in [m.record.id for m in found.matches]
+
+        # Selective filters fall back to exact search over the matching rows
+        found = await storage.search_similar("ann", probe, SearchConfig(top_k=5, metadata_filter={"i": {"$lt": 3}}))
+        assert sorted(m.record.id for m in found.matches) == ["v0", "v1", "v2"]
+
+    @pytest.mark.asyncio
+    async def test_trained_partition_persists(self, tmp_path):
+        storage, matrix = await self.build(tmp_path, count=1200)
+        query = matrix[11].tolist()
+        before = await storage.search_similar("ann", query, SearchConfig(top_k=5))
+        centroids = storage.indexes["ann"].ivf.centroids.copy()
+        await storage.close()
+
+        reopened = LocalVectorStorage(LocalVectorConfig(data_dir=str(tmp_path), ivf_min_train_size=500))
+        index = reopened.indexes["ann"]
+        assert index.index_type == "ivf_flat"
+        assert np.array_equal(index.ivf.centroids, centroids)
+        assert (index.ivf.assignments[:1200] >= 0).all()
+
+        after = await reopened.search_similar("ann", query, SearchConfig(top_k=5))
+        assert [m.record.id for m in after.matches] == [m.record.id for m in before.matches]
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for the batch outcome journal
+"""
+
+from src.core.domain.services.batch_journal import BatchJournal
+
+
+class TestBatchJournal:
+    """Test cases for BatchJournal"""
+
+    def test_replay_keeps_latest_outcome_per_company(self, tmp_path):
+        path = str(tmp_path / "job.journal.jsonl")
+        journal = BatchJournal(path, group_size=2)
+        assert journal.open(job_id="batch_1") == {}
+        journal.record("Acme", "https://www.acme.com/", "failed", error="timeout")
+        journal.record("Globex", None, "success", row={"company_name": "Globex"})
+        journal.record("Acme", "acme.com", "success", row={"company_name": "Acme"})
+        journal.close()
+
+        resumed = BatchJournal(path)
+        entries = resumed.open()
+
+        assert resumed.header["job_id"] == "batch_1"
+        assert len(entries) == 2
+        assert resumed.completed("ACME", "http://acme.com").attempts == 2
+        assert resumed.completed("Globex").row == {"company_name": "Globex"}
+        resumed.close()
+
+    def test_failures_are_not_completed(self, tmp_path):
+        journal = BatchJournal(str(tmp_path / "job.journal.jsonl"))
+        journal.open()
+        journal.record("Initech", None, "failed", error="boom")
+
+        assert journal.completed("Initech") is None
+        assert journal.get_statistics()["failed"] == 1
+        journal.close()
+
+    def test_torn_tail_is_dropped(self, tmp_path):
+        path = tmp_path / "job.journal.jsonl"
+        journal = BatchJournal(str(path))
+        journal.open()
+        journal.record("Acme", None, "success")
+        journal.close()
+
+        # Simulate a crash in the middle of writing the next record
+        with open(path, "a", encoding="utf-8") as file:
+            file.write('{"type": "outcome", "key": "glob')
+
+        resumed = BatchJournal(str(path))
+        assert list(resumed.open()) == ["acme|"]
+        resumed.record("Globex", None, "success")
+        resumed.close()
+
+        assert len(BatchJournal(str(path)).open()) == 2
+
+    def test_group_commit(self, tmp_path):
+        journal = BatchJournal(str(tmp_path / "job.journal.jsonl"), group_size=3, group_interval=3600)
+        journal.open()
+        syncs_after_header = journal.syncs
+        for index in range(7):
+            journal.record(f"Company {index}", None, "success")
+
+        assert journal.syncs - syncs_after_header == 2
+        journal.close()
+
+    def test_restart_discards_entries(self, tmp_path):
+        path = str(tmp_path / "job.journal.jsonl")
+        journal = BatchJournal(path)
+        journal.open()
+        journal.record("Acme", None, "success")
+        journal.close()
+
+        restarted = BatchJournal(path)
+        assert restarted.open(restart=True) == {}
+        restarted.close()
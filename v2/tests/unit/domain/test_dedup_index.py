@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for the company deduplication candidate index
+"""
+
+import difflib
+import random
+
+from src.core.domain.services.dedup_index import CompanyDedupIndex
+
+
+class TestCompanyDedupIndex:
+    """Test cases for CompanyDedupIndex"""
+
+    def test_shared_domain_is_always_a_candidate(self):
+        index = CompanyDedupIndex(min_name_similarity=0.9)
+        index.add(0, "Acme Robotics", "acme.com")
+        index.add(1, "Zylophon", "zylophon.io")
+
+        assert index.candidates("Totally Different", "acme.com") == [0]
+
+    def test_near_duplicate_names_collide(self):
+        index = CompanyDedupIndex(min_name_similarity=0.75)
+        index.add(0, "Quantflow Technologies", None)
+        index.add(1, "Rakovelin", None)
+
+        assert 0 in index.candidates("quantflow technologies inc", None)
+        assert 1 in index.candidates("Rakovelim", None)
+        assert index.candidates("Mitorzen Dat", None) == []
+
+    def test_names_ignored_when_they_cannot_reach_threshold(self):
+        index = CompanyDedupIndex(min_name_similarity=1.07)
+        index.add(0, "Acme", None)
+
+        assert not index.uses_name_blocking
+        assert index.candidates("Acme", None) == []
+
+    def test_non_positive_threshold_scans_everything(self):
+        index = CompanyDedupIndex(min_name_similarity=0.0)
+        for position, name in enumerate(["Alpha", "Beta", "Gamma"]):
+            index.add(position, name, None)
+
+        assert index.candidates("Unrelated", None) == [0, 1, 2]
+
+    def test_merged_positions_keep_old_and_new_keys(self):
+        index = CompanyDedupIndex(min_name_similarity=0.75)
+        index.add(0, "Acme", "acme.com")
+        index.add(0, "Acme Holdings", "acme-holdings.com")
+
+        assert index.candidates(None, "acme.com") == [0]
+        assert index.candidates(None, "acme-holdings.com") == [0]
+        assert index.get_statistics()["indexed_positions"] == 1
+
+    def test_short_near_duplicates_are_candidates(self):
+        index = CompanyDedupIndex(min_name_similarity=0.7)
+        index.add(0, "corp", None)
+
+        assert index.candidates("corop", None) == [0]
+
+    def test_name_candidates_cover_brute_force_matches(self):
+        rng = random.Random(7)
+        alphabet = "abcdefghijklmnopqrstuvwxyz  "
+        bases = ["".join(rng.choice(alphabet) for _ in range(rng.randint(2, 24))).strip() or "x"
+                 for _ in range(60)]
+
+        def mutate(name):
+            chars = list(name)
+            for _ in range(rng.randint(1, 3)):
+                i = rng.randrange(len(chars) + 1)
+                op = rng.choice(("insert", "delete", "replace"))
+                if op == "insert" or not chars:
+                    chars.insert(i, rng.choice(alphabet))
+                elif op == "delete":
+                    del chars[min(i, len(chars) - 1)]
+                else:
+                    chars[min(i, len(chars) - 1)] = rng.choice(alphabet)
+            return "".join(chars)
+
+        names = bases + [mutate(rng.choice(bases)) for _ in range(240)] + ["corp", "corop", "co", "cox"]
+        index = CompanyDedupIndex(min_name_similarity=0.7)
+        for position, name in enumerate(names):
+            index.add(position, name, None)
+
+        total_candidates = 0
+        for query in names:
+            expected = {
+                position for position, name in enumerate(names)
+                if name.lower().strip() and query.lower().strip() and difflib.SequenceMatcher(
+                    None, query.lower().strip(), name.lower().strip()
+                ).ratio() >= 0.7
+            }
+            found = set(index.candidates(query, None))
+            assert expected <= found, (query, expected - found)
+            total_candidates += len(found)
+
+        # Still a blocking index, not a full scan
+        assert total_candidates < len(names) ** 2 / 4
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming batch input reader
+"""
+
+import json
+
+import pytest
+
+from src.core.domain.services import input_stream
+from src.core.domain.services.input_stream import StreamingInputReader, detect_input_format
+
+
+def write_csv(path, rows):
+    lines = ["Company Name,Website"] + [f"Company {i},https://company-{i}.com" for i in range(rows)]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+class TestStreamingInputReader:
+    """Test cases for StreamingInputReader"""
+
+    def test_csv_estimates_total_from_byte_offset(self, tmp_path):
+        reader = StreamingInputReader(write_csv(tmp_path / "companies.csv", 1000))
+        assert reader.estimate_total_rows() is None
+
+        first = next(iter(reader))
+        rows = reader.read_batch(249)
+
+        assert first["Company Name"] == "Company 0"
+        assert rows[-1]["Website"] == "https://company-249.com"
+        assert 0.2 < reader.progress < 0.3
+        assert 950 <= reader.estimate_total_rows() <= 1050
+
+        assert len(reader.read_batch(10_000)) == 750
+        assert reader.progress == 1.0
+        assert reader.estimate_total_rows() == 1000
+
+    def test_csv_quoted_newlines_and_bom(self, tmp_path):
+        path = tmp_path / "companies.csv"
+        path.write_text('\ufeffname,notes\nAcme,"line one\nline two"\nGlobex,\n', encoding="utf-8")
+
+        rows = list(StreamingInputReader(str(path)))
+
+        assert [row["name"] for row in rows] == ["Acme", "Globex"]
+        assert rows[0]["notes"] == "line one\nline two"
+
+    def test_csv_shards_cover_input_once(self, tmp_path):
+        path = write_csv(tmp_path / "companies.csv", 101)
+
+        shards = [list(StreamingInputReader(path, shard_index=i, shard_count=3)) for i in range(3)]
+
+        names = sorted(row["Company Name"] for shard in shards for row in shard)
+        assert names == sorted(f"Company {i}" for i in range(101))
+        assert [len(shard) for shard in shards] == [34, 34, 33]
+
+    def test_jsonl_byte_range_shards_cover_input_once(self, tmp_path):
+        path = tmp_path / "companies.jsonl"
+        with open(path, "w", encoding="utf-8") as f:
+            for i in range(500):
+                f.write(json.dumps({"company_name": f"Company {i}", "employees": i}) + "\n")
+            f.write("\n{not json\n")
+
+        readers = [StreamingInputReader(str(path), shard_index=i, shard_count=4) for i in range(4)]
+        shards = [list(reader) for reader in readers]
+
+        employees = sorted(row["employees"] for shard in shards for row in shard)
+        assert employees == list(range(500))
+        assert all(100 <= len(shard) <= 150 for shard in shards)
+        assert all(reader.estimate_total_rows() == len(shard) for reader, shard in zip(readers, shards))
+
+    def test_json_array_streams_across_chunks_and_shards(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(input_stream, "_JSON_CHUNK_BYTES", 64)
+        path = tmp_path / "companies.json"
+        records = [{"company_name": f"Company {i}", "notes": "caf\u00e9 " * (i % 7), "website": None}
+                   for i in range(120)]
+        path.write_text("\ufeff[\n" + ",\n".join(json.dumps(r) for r in records) + "\n]\n", encoding="utf-8")
+
+        reader = StreamingInputReader(str(path))
+        rows = list(reader)
+        shards = [list(StreamingInputReader(str(path), shard_index=i, shard_count=3)) for i in range(3)]
+
+        assert detect_input_format(str(path)) == "json"
+        assert [row["company_name"] for row in rows] == [r["company_name"] for r in records]
+        assert rows[3]["notes"] == records[3]["notes"]
+        assert rows[0]["website"] == ""
+        assert reader.estimate_total_rows() == 120
+        assert sorted(row["company_name"] for shard in shards for row in shard) == sorted(
+            r["company_name"] for r in records
+        )
+
+    def test_json_file_holding_json_lines(self, tmp_path):
+        path = tmp_path / "companies.json"
+        path.write_text('{"company": "Acme"}\n{"company": "Globex"}\n', encoding="utf-8")
+
+        assert [row["company"] for row in StreamingInputReader(str(path))] == ["Acme", "Globex"]
+
+    def test_excel_read_only(self, tmp_path):
+        openpyxl = pytest.importorskip("openpyxl")
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append(["Company", "Website"])
+        for i in range(20):
+            sheet.append([f"Company {i}", f"https://company-{i}.com" if i % 2 else None])
+        sheet.append([None, None])
+        path = str(tmp_path / "companies.xlsx")
+        workbook.save(path)
+
+        reader = StreamingInputReader(path)
+        rows = reader.read_batch(5)
+
+        assert detect_input_format(path) == "excel"
+        assert rows[1] == {"Company": "Company 1", "Website": "https://company-1.com"}
+        assert rows[0]["Website"] == ""
+        assert reader.estimate_total_rows() == 21
+        assert len(reader.read_batch(100)) == 15
+        assert reader.estimate_total_rows() == 20
+
+    @pytest.mark.asyncio
+    async def test_stream_reads_in_batches(self, tmp_path):
+        reader = StreamingInputReader(write_csv(tmp_path / "companies.csv", 30))
+
+        rows = [row async for row in reader.stream(batch_size=7)]
+
+        assert len(rows) == 30
+        assert reader.rows_read == 30
+
+    def test_unsupported_input(self, tmp_path):
+        with pytest.raises(ValueError):
+            detect_input_format(str(tmp_path / "companies.pdf"))
+        with pytest.raises(ValueError):
+            StreamingInputReader(write_csv(tmp_path / "companies.csv", 1), shard_index=2, shard_count=2)
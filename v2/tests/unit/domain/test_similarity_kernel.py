@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for the blocked NumPy similarity kernel
+"""
+
+import numpy as np
+import pytest
+
+from src.core.domain.services.similarity_kernel import (
+    SimilarityKernel, block_rows, mean_pairwise_cosine, pairwise_similarity, top_k_similar
+)
+
+
+def random_embeddings(count, dimensions=24, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.normal(size=(count, dimensions)).astype(np.float32)
+
+
+def brute_force_cosine(a, b):
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return a @ b.T
+
+
+class TestSimilarityKernel:
+    """Test cases for SimilarityKernel"""
+
+    def test_tiled_top_k_matches_brute_force(self):
+        embeddings = random_embeddings(257)
+        # A tiny budget forces one- or two-row tiles
+        assert block_rows(257, memory_budget_bytes=4096) == 1
+        indices, scores = top_k_similar(embeddings, 5, memory_budget_bytes=4096)
+
+        expected = brute_force_cosine(embeddings, embeddings)
+        np.fill_diagonal(expected, -np.inf)
+        expected_indices = np.argsort(-expected, axis=1)[:, :5]
+
+        assert indices.shape == (257, 5)
+        assert np.array_equal(indices, expected_indices)
+        assert np.allclose(scores, np.take_along_axis(expected, expected_indices, axis=1), atol=1e-5)
+        assert (np.diff(scores, axis=1) <= 0).all()
+
+    def test_matrix_metrics_and_queries(self):
+        corpus = random_embeddings(40, seed=1)
+        queries = random_embeddings(7, seed=2)
+
+        cosine = pairwise_similarity(queries, corpus, memory_budget_bytes=1024)
+        assert np.allclose(cosine, brute_force_cosine(queries, corpus), atol=1e-5)
+        assert np.allclose(pairwise_similarity(corpus, metric="dot"), corpus @ corpus.T, atol=1e-4)
+
+        distances = np.linalg.norm(queries[:, None, :] - corpus[None, :, :], axis=2)
+        euclidean = pairwise_similarity(queries, corpus, metric="euclidean")
+        assert np.allclose(euclidean, 1 / (1 + distances), atol=1e-5)
+
+        kernel = SimilarityKernel(corpus, memory_budget_bytes=1024)
+        indices, _ = kernel.top_k(3, queries)
+        assert np.array_equal(indices, np.argsort(-brute_force_cosine(queries, corpus), axis=1)[:, :3])
+        assert kernel.top_k(100)[0].shape == (40, 39)
+
+        with pytest.raises(ValueError, match="same dimensions"):
+            kernel.matrix(random_embeddings(2, dimensions=3))
+        with pytest.raises(ValueError):
+            SimilarityKernel(corpus, metric="jaccard")
+
+    def test_mean_pairwise_cosine_closed_form(self):
+        embeddings = random_embeddings(60, seed=4) + 0.5
+        matrix = brute_force_cosine(embeddings, embeddings)
+        expected = matrix[np.triu_indices(60, k=1)].mean()
+
+        assert mean_pairwise_cosine(embeddings) == pytest.approx(expected, abs=1e-6)
+        assert mean_pairwise_cosine(embeddings[:1]) is None
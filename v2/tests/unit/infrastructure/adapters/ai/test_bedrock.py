@@ -4,7 +4,8 @@ Unit Tests for Bedrock AI Adapters
 ==================================
 
 Comprehensive unit tests for the AWS Bedrock AI adapters with mocked dependencies
-to ensure isolated component testing and cost-safe validation.
+to ensure isolated component testing and cost-safe validation. Analyzer tests
+live in test_bedrock_analyzer.py.
 """
 
 import pytest
@@ -14,13 +15,12 @@ from datetime import datetime
 import json
 import os
 
-from src.infrastructure.adapters.ai.bedrock.analyzer import BedrockAnalyzer
 from src.infrastructure.adapters.ai.bedrock.embedder import BedrockEmbeddingProvider
 from src.infrastructure.adapters.ai.bedrock.client import BedrockClient
 from src.infrastructure.adapters.ai.bedrock.config import BedrockConfig, calculate_bedrock_cost
+from src.infrastructure.adapters.ai.bedrock.transport import BedrockTransportError
 
-from src.core.domain.value_objects.ai_config import AnalysisConfig, EmbeddingConfig
-from src.core.domain.value_objects.ai_response import ResponseStatus, FinishReason
+from src.core.domain.value_objects.ai_config import EmbeddingConfig
 
 
 class TestBedrockConfig:
@@ -158,10 +158,8 @@ class TestBedrockClient:
             }
         }
         
-        with patch.object(client, 'client') as mock_bedrock:
-            mock_bedrock.invoke_model.return_value = {
-                'body': Mock(read=lambda: json.dumps(mock_response_body))
-            }
+        with patch.object(client.transport, 'invoke_model', new_callable=AsyncMock) as mock_invoke:
+            mock_invoke.return_value = mock_response_body
             
             body = {
                 'messages': [{'role': 'user', 'content': 'Test prompt'}],
@@ -183,18 +181,12 @@ class TestBedrockClient:
     async def test_invoke_model_with_retry(self, client):
         """Test model invocation with retry logic."""
         
-        from botocore.exceptions import ClientError
-        
         # Mock first attempt to fail, second to succeed
-        error_response = {'Error': {'Code': 'ThrottlingException'}}
-        success_response = {
-            'body': Mock(read=lambda: json.dumps({'content': 'Success after retry'}))
-        }
-        
-        with patch.object(client, 'client') as mock_bedrock:
-            mock_bedrock.invoke_model.side_effect = [
-                ClientError(error_response, 'InvokeModel'),
-                success_response
+        with patch.object(client.transport, 'invoke_model', new_callable=AsyncMock) as mock_invoke, \
+                patch('asyncio.sleep', new_callable=AsyncMock):
+            mock_invoke.side_effect = [
+                BedrockTransportError('Rate exceeded', status=429, error_code='ThrottlingException'),
+                {'content': 'Success after retry'}
             ]
             
             body = {'messages': [{'role': 'user', 'content': 'Test'}]}
@@ -204,6 +196,20 @@ class TestBedrockClient:
             assert 'content' in response
             assert response['_metadata']['attempt'] == 2
     
+    @pytest.mark.asyncio
+    async def test_invoke_model_non_retryable_error(self, client):
+        """Test that validation errors are raised without retrying."""
+        
+        with patch.object(client.transport, 'invoke_model', new_callable=AsyncMock) as mock_invoke:
+            mock_invoke.side_effect = BedrockTransportError(
+                'Malformed input', status=400, error_code='ValidationException'
+            )
+            
+            with pytest.raises(BedrockTransportError):
+                await client.invoke_model('amazon.nova-lite-v1:0', {})
+            
+            assert mock_invoke.call_count == 1
+    
     @pytest.mark.asyncio
     async def test_cost_limit_enforcement(self, client):
         """Test daily cost limit enforcement."""
@@ -211,10 +217,8 @@ class TestBedrockClient:
         # Set cost close to limit
         client._total_cost_today = 9.99
         
-        with patch.object(client, 'client') as mock_bedrock:
-            mock_bedrock.invoke_model.return_value = {
-                'body': Mock(read=lambda: json.dumps({'content': 'test'}))
-            }
+        with patch.object(client.transport, 'invoke_model', new_callable=AsyncMock) as mock_invoke:
+            mock_invoke.return_value = {'content': 'test'}
             
             # Should allow request under limit
             response = await client.invoke_model('amazon.nova-lite-v1:0', {})
@@ -265,285 +269,6 @@ class TestBedrockClient:
         assert client.get_daily_cost() == 0.0
 
 
-class TestBedrockAnalyzer:
-    """Test Bedrock AI analysis functionality."""
-    
-    @pytest.fixture
-    def config(self):
-        """Test configuration."""
-        return BedrockConfig(
-            aws_access_key_id='test-key',
-            aws_secret_access_key='test-secret',
-            region_name='us-east-1',
-            default_model='amazon.nova-pro-v1:0'
-        )
-    
-    @pytest.fixture
-    def analyzer(self, config):
-        """Create analyzer with mocked client."""
-        return BedrockAnalyzer(config)
-    
-    @pytest.mark.asyncio
-    async def test_analyze_text_nova_pro(self, analyzer):
-        """Test text analysis with Nova Pro model."""
-        
-        mock_response = {
-            'output': {
-                'message': {
-                    'content': 'This is a comprehensive analysis of Acme Corp, a leading B2B SaaS company...'
-                }
-            },
-            '_metadata': {
-                'model_id': 'amazon.nova-pro-v1:0',
-                'processing_time': 2.1,
-                'cost': 0.008,
-                'attempt': 1,
-                'usage': {
-                    'input_tokens': 50,
-                    'output_tokens': 200,
-                    'total_tokens': 250
-                }
-            }
-        }
-        
-        with patch.object(analyzer.client, 'invoke_model', new_callable=AsyncMock) as mock_invoke:
-            mock_invoke.return_value = mock_response
-            
-            config = AnalysisConfig(
-                model_name='amazon.nova-pro-v1:0',
-                temperature=0.1,
-                max_tokens=1000
-            )
-            
-            result = await analyzer.analyze_text(
-                "Analyze this company: Acme Corp provides B2B SaaS solutions...", 
-                config
-            )
-            
-            # Verify request was made correctly
-            mock_invoke.assert_called_once()
-            call_args = mock_invoke.call_args[0]
-            model_id, body = call_args
-            
-            assert model_id == 'amazon.nova-pro-v1:0'
-            assert 'messages' in body
-            assert body['messages'][0]['content'].startswith('Analyze this company')
-            assert body['max_tokens'] == 1000
-            assert body['temperature'] == 0.1
-            
-            # Verify response
-            assert result.status == ResponseStatus.SUCCESS
-            assert result.finish_reason == FinishReason.STOP
-            assert 'comprehensive analysis' in result.content
-            assert result.model_used == 'amazon.nova-pro-v1:0'
-            assert result.token_usage.total_tokens == 250
-            assert result.token_usage.prompt_tokens == 50
-            assert result.token_usage.completion_tokens == 200
-            assert result.estimated_cost == 0.008
-            assert result.provider_metadata['provider'] == 'aws_bedrock'
-    
-    @pytest.mark.asyncio
-    async def test_analyze_text_claude(self, analyzer):
-        """Test text analysis with Claude model."""
-        
-        mock_response = {
-            'content': [
-                {
-                    'text': 'Based on my analysis, this company operates in the B2B SaaS space...'
-                }
-            ],
-            '_metadata': {
-                'model_id': 'anthropic.claude-3-5-sonnet-20241022-v2:0',
-                'cost': 0.025,
-                'usage': {
-                    'input_tokens': 30,
-                    'output_tokens': 180,
-                    'total_tokens': 210
-                }
-            }
-        }
-        
-        with patch.object(analyzer.client, 'invoke_model', new_callable=AsyncMock) as mock_invoke:
-            mock_invoke.return_value = mock_response
-            
-            config = AnalysisConfig(
-                model_name='anthropic.claude-3-5-sonnet-20241022-v2:0',
-                temperature=0.2,
-                max_tokens=2000,
-                system_prompt="You are an expert business analyst."
-            )
-            
-            result = await analyzer.analyze_text("What is this company's business model?", config)
-            
-            # Verify Claude-specific request format
-            call_args = mock_invoke.call_args[0]
-            model_id, body = call_args
-            
-            assert model_id == 'anthropic.claude-3-5-sonnet-20241022-v2:0'
-            assert 'anthropic_version' in body
-            assert len(body['messages']) == 2  # System + user message
-            assert body['messages'][0]['role'] == 'system'
-            assert body['messages'][1]['role'] == 'user'
-            
-            # Verify response parsing
-            assert result.content == 'Based on my analysis, this company operates in the B2B SaaS space...'
-            assert result.token_usage.total_tokens == 210
-    
-    @pytest.mark.asyncio
-    async def test_analyze_text_with_system_prompt(self, analyzer):
-        """Test text analysis with system prompt."""
-        
-        mock_response = {
-            'output': {'message': {'content': 'Expert analysis response'}},
-            'usage': {'inputTokens': 20, 'outputTokens': 30, 'totalTokens': 50},
-            '_metadata': {'cost': 0.002}
-        }
-        
-        with patch.object(analyzer.client, 'invoke_model', new_callable=AsyncMock) as mock_invoke:
-            mock_invoke.return_value = mock_response
-            
-            config = AnalysisConfig(model_name='amazon.nova-pro-v1:0')
-            
-            result = await analyzer.analyze_text(
-                "Analyze this company", 
-                config,
-                system_prompt="You are an expert financial analyst with 20 years of experience."
-            )
-            
-            # Verify system prompt was included
-            call_args = mock_invoke.call_args[0]
-            _, body = call_args
-            
-            assert len(body['messages']) == 2
-            assert body['messages'][0]['role'] == 'system'
-            assert 'expert financial analyst' in body['messages'][0]['content']
-            assert body['messages'][1]['role'] == 'user'
-            assert body['messages'][1]['content'] == 'Analyze this company'
-    
-    @pytest.mark.asyncio
-    async def test_analyze_batch(self, analyzer):
-        """Test batch analysis functionality."""
-        
-        # Mock responses for each text in batch
-        mock_responses = [
-            {
-                'output': {'message': {'content': 'Analysis of Company A'}},
-                'usage': {'inputTokens': 10, 'outputTokens': 20, 'totalTokens': 30},
-                '_metadata': {'cost': 0.001}
-            },
-            {
-                'output': {'message': {'content': 'Analysis of Company B'}},
-                'usage': {'inputTokens': 15, 'outputTokens': 25, 'totalTokens': 40},
-                '_metadata': {'cost': 0.0015}
-            }
-        ]
-        
-        with patch.object(analyzer.client, 'invoke_model', new_callable=AsyncMock) as mock_invoke:
-            mock_invoke.side_effect = mock_responses
-            
-            config = AnalysisConfig(model_name='amazon.nova-pro-v1:0')
-            texts = ["Company A description", "Company B description"]
-            
-            batch_result = await analyzer.analyze_batch(texts, config)
-            
-            # Verify batch processing
-            assert len(batch_result.results) == 2
-            assert batch_result.success_count == 2
-            assert batch_result.error_count == 0
-            assert batch_result.total_cost == 0.0025
-            assert batch_result.total_tokens.total_tokens == 70
-            
-            # Verify individual results
-            assert 'Company A' in batch_result.results[0].content
-            assert 'Company B' in batch_result.results[1].content
-    
-    @pytest.mark.asyncio
-    async def test_analyze_text_streaming(self, analyzer):
-        """Test streaming analysis functionality."""
-        
-        mock_response = {
-            'output': {'message': {'content': 'This is a streaming response that will be chunked'}},
-            'usage': {'inputTokens': 10, 'outputTokens': 15, 'totalTokens': 25},
-            '_metadata': {'cost': 0.001}
-        }
-        
-        with patch.object(analyzer.client, 'invoke_model', new_callable=AsyncMock) as mock_invoke:
-            mock_invoke.return_value = mock_response
-            
-            config = AnalysisConfig(model_name='amazon.nova-pro-v1:0')
-            
-            chunks = []
-            async for chunk in analyzer.analyze_text_streaming("Test prompt", config):
-                chunks.append(chunk)
-            
-            # Verify streaming behavior
-            assert len(chunks) > 1  # Should have multiple chunks
-            
-            # Verify final chunk
-            final_chunk = chunks[-1]
-            assert final_chunk.is_final is True
-            assert final_chunk.token_usage is not None
-            assert final_chunk.finish_reason == FinishReason.STOP
-    
-    @pytest.mark.asyncio
-    async def test_error_handling(self, analyzer):
-        """Test comprehensive error handling."""
-        
-        with patch.object(analyzer.client, 'invoke_model', new_callable=AsyncMock) as mock_invoke:
-            mock_invoke.side_effect = Exception("Model temporarily unavailable")
-            
-            config = AnalysisConfig(model_name='amazon.nova-pro-v1:0')
-            result = await analyzer.analyze_text("Test prompt", config)
-            
-            # Should return error result instead of raising
-            assert result.status == ResponseStatus.ERROR
-            assert result.finish_reason == FinishReason.ERROR
-            assert "Error:" in result.content
-            assert result.token_usage.total_tokens == 0
-            assert result.estimated_cost == 0.0
-            assert 'error' in result.provider_metadata
-    
-    @pytest.mark.asyncio
-    async def test_token_counting(self, analyzer):
-        """Test token counting functionality."""
-        
-        text = "This is a test text for token counting estimation."
-        model = "amazon.nova-pro-v1:0"
-        
-        token_count = await analyzer.count_tokens(text, model)
-        
-        # Should return reasonable estimate
-        assert token_count > 0
-        assert token_count < len(text)  # Should be less than character count
-    
-    @pytest.mark.asyncio
-    async def test_get_provider_info(self, analyzer):
-        """Test provider information retrieval."""
-        
-        provider_info = await analyzer.get_provider_info()
-        
-        assert provider_info.provider_name == "AWS Bedrock"
-        assert provider_info.default_model == analyzer.config.default_model
-        assert len(provider_info.available_models) > 0
-        assert provider_info.supports_streaming is True
-        assert provider_info.supports_function_calling is True
-        assert provider_info.cost_per_1k_tokens > 0
-    
-    @pytest.mark.asyncio
-    async def test_health_check(self, analyzer):
-        """Test analyzer health check."""
-        
-        with patch.object(analyzer.client, 'health_check', new_callable=AsyncMock) as mock_health:
-            mock_health.return_value = True
-            
-            is_healthy = await analyzer.health_check()
-            assert is_healthy is True
-            
-            mock_health.return_value = False
-            is_healthy = await analyzer.health_check()
-            assert is_healthy is False
-
-
 class TestBedrockEmbedder:
     """Test Bedrock embedding functionality."""
     
@@ -577,7 +302,7 @@ class TestBedrockEmbedder:
             mock_invoke.return_value = mock_response
             
             config = EmbeddingConfig(
-                model_name="amazon.titan-embed-text-v2:0",
+                model_id="amazon.titan-embed-text-v2:0",
                 batch_size=1
             )
             
@@ -621,7 +346,7 @@ class TestBedrockEmbedder:
             mock_invoke.side_effect = mock_responses
             
             config = EmbeddingConfig(
-                model_name="amazon.titan-embed-text-v2:0",
+                model_id="amazon.titan-embed-text-v2:0",
                 batch_size=5
             )
             
@@ -664,7 +389,7 @@ class TestBedrockEmbedder:
             mock_invoke.return_value = mock_response
             
             config = EmbeddingConfig(
-                model_name="cohere.embed-english-v3:0",
+                model_id="cohere.embed-english-v3:0",
                 batch_size=10
             )
             
@@ -694,7 +419,7 @@ class TestBedrockEmbedder:
         
         # Valid configuration
         valid_config = EmbeddingConfig(
-            model_name="amazon.titan-embed-text-v2:0",
+            model_id="amazon.titan-embed-text-v2:0",
             dimensions=1536,
             batch_size=1
         )
@@ -704,13 +429,13 @@ class TestBedrockEmbedder:
         
         # Invalid model
         with pytest.raises(Exception):  # Should raise EmbeddingModelNotAvailableException
-            invalid_config = EmbeddingConfig(model_name="unknown-model")
+            invalid_config = EmbeddingConfig(model_id="unknown-model")
             await embedder.validate_embedding_config(invalid_config)
         
         # Invalid dimensions
         with pytest.raises(Exception):  # Should raise InvalidEmbeddingConfigException
             invalid_config = EmbeddingConfig(
-                model_name="amazon.titan-embed-text-v2:0",
+                model_id="amazon.titan-embed-text-v2:0",
                 dimensions=512  # Wrong dimensions
             )
             await embedder.validate_embedding_config(invalid_config)
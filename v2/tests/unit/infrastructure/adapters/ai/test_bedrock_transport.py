@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Tests for the async Bedrock Runtime transport.
+
+The transport is exercised against a local fake Bedrock endpoint, so the
+signing, connection pooling, concurrency limit and event stream decoding
+all run over real HTTP.
+"""
+
+import asyncio
+import base64
+import json
+import struct
+import threading
+import zlib
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.core.domain.value_objects.ai_config import EmbeddingConfig
+from src.infrastructure.adapters.ai.bedrock.config import BedrockConfig
+from src.infrastructure.adapters.ai.bedrock.embedder import BedrockEmbeddingProvider
+from src.infrastructure.adapters.ai.bedrock.transport import (
+    BedrockTransport,
+    BedrockTransportError,
+    EventStreamDecoder,
+    SigV4Signer
+)
+
+
+def encode_event(headers, payload):
+    """Encode one AWS event stream message with string-valued headers."""
+    encoded_headers = b''.join(
+        bytes([len(name)]) + name.encode() + b'\x07' + struct.pack('>H', len(value)) + value.encode()
+        for name, value in headers.items()
+    )
+    prelude = struct.pack('>II', 12 + len(encoded_headers) + len(payload) + 4, len(encoded_headers))
+    message = prelude + struct.pack('>I', zlib.crc32(prelude)) + encoded_headers + payload
+    return message + struct.pack('>I', zlib.crc32(message))
+
+
+def chunk_event(chunk):
+    """Encode a model chunk the way invoke-with-response-stream sends it."""
+    payload = json.dumps({'bytes': base64.b64encode(json.dumps(chunk).encode()).decode()})
+    return encode_event(
+        {':event-type': 'chunk', ':content-type': 'application/json', ':message-type': 'event'},
+        payload.encode()
+    )
+
+
+class FakeBedrock:
+    """Minimal Bedrock Runtime endpoint that records what it receives."""
+
+    def __init__(self):
+        self.requests = []
+        self.errors = []
+        self.stream_chunks = []
+        self.delay = 0.0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.peers = set()
+
+        self.app = web.Application()
+        self.app.router.add_post('/model/{model_id}/invoke', self.invoke)
+        self.app.router.add_post('/model/{model_id}/invoke-with-response-stream', self.invoke_stream)
+
+    async def invoke(self, request):
+        body = await request.json()
+        self.requests.append((request.match_info['model_id'], request.headers, body))
+        self.peers.add(request.transport.get_extra_info('peername'))
+
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+        if self.errors:
+            status, error_code = self.errors.pop(0)
+            return web.json_response(
+                {'message': 'Request rejected'},
+                status=status,
+                headers={'x-amzn-ErrorType': f"{error_code}:http://internal.amazon.com/coral/com.amazon.bedrock/"}
+            )
+
+        if request.match_info['model_id'].startswith('amazon.titan-embed'):
+            return web.json_response({
+                'embedding': [float(len(body['inputText']))] * 1536,
+                'inputTextTokenCount': len(body['inputText'].split())
+            })
+        return web.json_response({'echo': body, 'model_id': request.match_info['model_id']})
+
+    async def invoke_stream(self, request):
+        self.requests.append((request.match_info['model_id'], request.headers, await request.json()))
+
+        response = web.StreamResponse(headers={'Content-Type': 'application/vnd.amazon.eventstream'})
+        await response.prepare(request)
+        for chunk in self.stream_chunks:
+            data = chunk_event(chunk)
+            # Split every message so frames cross network reads
+            await response.write(data[:7])
+            await asyncio.sleep(0)
+            await response.write(data[7:])
+        await response.write_eof()
+        return response
+
+
+@pytest_asyncio.fixture
+async def fake_bedrock():
+    fake = FakeBedrock()
+    server = TestServer(fake.app)
+    await server.start_server()
+    fake.url = str(server.make_url('')).rstrip('/')
+    yield fake
+    await server.close()
+
+
+def make_config(fake, **overrides):
+    return BedrockConfig(
+        aws_access_key_id='AKIDEXAMPLE',
+        aws_secret_access_key='wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY',
+        region_name='us-east-1',
+        endpoint_url=fake.url,
+        **overrides
+    )
+
+
+def make_transport(fake, **overrides):
+    return BedrockTransport(make_config(fake, **overrides))
+
+
+class TestSigV4Signer:
+    """Test request signing."""
+
+    def test_sign_known_vector(self):
+        signer = SigV4Signer('us-east-1')
+        headers = signer.sign(
+            'POST',
+            'https://bedrock-runtime.us-east-1.amazonaws.com/model/amazon.nova-pro-v1%3A0/invoke',
+            {'Content-Type': 'application/json'},
+            b'{}',
+            ('AKIDEXAMPLE', 'wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY', None),
+            now=datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        )
+
+        assert headers['X-Amz-Date'] == '20240102T030405Z'
+        assert headers['Host'] == 'bedrock-runtime.us-east-1.amazonaws.com'
+        assert headers['Authorization'] == (
+            'AWS4-HMAC-SHA256 Credential=AKIDEXAMPLE/20240102/us-east-1/bedrock/aws4_request, '
+            'SignedHeaders=content-type;host;x-amz-date, '
+            'Signature=47f8e7608100cafdb932fae69dcb6360b1f7d04f15846ee290a2670cbccafe13'
+        )
+
+    def test_session_token_is_signed(self):
+        headers = SigV4Signer('us-west-2').sign(
+            'POST', 'https://example.com/model/m/invoke', {}, b'',
+            ('AKID', 'secret', 'token')
+        )
+
+        assert headers['X-Amz-Security-Token'] == 'token'
+        assert 'x-amz-security-token' in headers['Authorization']
+
+
+class TestEventStreamDecoder:
+    """Test AWS event stream decoding."""
+
+    def test_decodes_messages_split_across_reads(self):
+        data = chunk_event({'outputText': 'Hello'}) + chunk_event({'outputText': ' world'})
+        decoder = EventStreamDecoder()
+
+        messages = []
+        for offset in range(0, len(data), 5):
+            messages.extend(decoder.feed(data[offset:offset + 5]))
+
+        assert len(messages) == 2
+        headers, payload = messages[1]
+        assert headers[':event-type'] == 'chunk'
+        assert json.loads(base64.b64decode(json.loads(payload)['bytes'])) == {'outputText': ' world'}
+
+    def test_rejects_corrupt_message(self):
+        data = bytearray(chunk_event({'outputText': 'Hello'}))
+        data[-6] ^= 0xFF
+
+        with pytest.raises(BedrockTransportError):
+            EventStreamDecoder().feed(bytes(data))
+
+
+class TestBedrockTransport:
+    """Test the transport against a fake Bedrock endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_invoke_model_signs_request(self, fake_bedrock):
+        transport = make_transport(fake_bedrock)
+        try:
+            response = await transport.invoke_model('amazon.nova-pro-v1:0', {'inputText': 'hi'})
+        finally:
+            await transport.close()
+
+        model_id, headers, body = fake_bedrock.requests[0]
+        assert response == {'echo': {'inputText': 'hi'}, 'model_id': 'amazon.nova-pro-v1:0'}
+        assert model_id == 'amazon.nova-pro-v1:0'
+        assert body == {'inputText': 'hi'}
+        assert headers['Authorization'].startswith('AWS4-HMAC-SHA256 Credential=AKIDEXAMPLE/')
+        assert 'X-Amz-Date' in headers
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded_and_connections_reused(self, fake_bedrock):
+        fake_bedrock.delay = 0.02
+        transport = make_transport(fake_bedrock, max_concurrent_requests=3, connection_pool_size=3)
+        try:
+            responses = await asyncio.gather(*(
+                transport.invoke_model('amazon.nova-lite-v1:0', {'inputText': str(i)})
+                for i in range(12)
+            ))
+        finally:
+            await transport.close()
+
+        assert [response['echo']['inputText'] for response in responses] == [str(i) for i in range(12)]
+        assert fake_bedrock.peak_in_flight == 3
+        assert len(fake_bedrock.peers) <= 3
+        assert transport.get_statistics()['requests'] == 12
+
+    @pytest.mark.asyncio
+    async def test_error_mapping(self, fake_bedrock):
+        fake_bedrock.errors = [(429, 'ThrottlingException'), (400, 'ValidationException')]
+        transport = make_transport(fake_bedrock)
+        try:
+            with pytest.raises(BedrockTransportError) as throttled:
+                await transport.invoke_model('amazon.nova-lite-v1:0', {})
+            with pytest.raises(BedrockTransportError) as invalid:
+                await transport.invoke_model('amazon.nova-lite-v1:0', {})
+        finally:
+            await transport.close()
+
+        assert throttled.value.error_code == 'ThrottlingException'
+        assert throttled.value.retryable is True
+        assert invalid.value.status == 400
+        assert invalid.value.retryable is False
+
+    @pytest.mark.asyncio
+    async def test_invoke_model_stream(self, fake_bedrock):
+        fake_bedrock.stream_chunks = [
+            {'contentBlockDelta': {'delta': {'text': 'Hello'}}},
+            {'contentBlockDelta': {'delta': {'text': ' world'}}},
+            {'messageStop': {'stopReason': 'end_turn'}}
+        ]
+        transport = make_transport(fake_bedrock)
+        try:
+            chunks = [
+                chunk async for chunk in transport.invoke_model_stream('amazon.nova-pro-v1:0', {})
+            ]
+        finally:
+            await transport.close()
+
+        assert chunks == fake_bedrock.stream_chunks
+        assert transport.get_statistics()['in_flight'] == 0
+
+    @pytest.mark.asyncio
+    async def test_default_credential_chain_resolved_off_event_loop(self, monkeypatch):
+        monkeypatch.delenv('AWS_ACCESS_KEY_ID', raising=False)
+        monkeypatch.delenv('AWS_SECRET_ACCESS_KEY', raising=False)
+        loader_threads = []
+
+        def load_credentials():
+            loader_threads.append(threading.get_ident())
+            frozen = Mock(access_key='AKIDCHAIN', secret_key='secret', token='token')
+            return Mock(get_frozen_credentials=Mock(return_value=frozen))
+
+        monkeypatch.setattr(BedrockTransport, '_load_botocore_credentials', staticmethod(load_credentials))
+        transport = BedrockTransport(BedrockConfig(region_name='us-east-1'))
+
+        assert await transport._credentials() == ('AKIDCHAIN', 'secret', 'token')
+        assert await transport._credentials() == ('AKIDCHAIN', 'secret', 'token')
+        assert len(loader_threads) == 1
+        assert loader_threads[0] != threading.get_ident()
+
+
+class TestBedrockEmbedderFanOut:
+    """Test embedding batches against the fake Bedrock endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_get_embeddings_batch_fans_out(self, fake_bedrock):
+        fake_bedrock.delay = 0.02
+        embedder = BedrockEmbeddingProvider(make_config(
+            fake_bedrock,
+            embedding_model='amazon.titan-embed-text-v2:0',
+            max_concurrent_requests=4
+        ))
+        texts = [f"Company {'x' * i} description" for i in range(12)]
+
+        try:
+            results = await embedder.get_embeddings_batch(
+                texts, EmbeddingConfig(model_id='amazon.titan-embed-text-v2:0', batch_size=5)
+            )
+        finally:
+            await embedder.client.close()
+
+        assert [result.embedding[0] for result in results] == [float(len(text)) for text in texts]
+        assert fake_bedrock.peak_in_flight == 4
+        assert len(fake_bedrock.requests) == 12
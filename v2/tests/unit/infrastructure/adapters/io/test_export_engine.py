@@ -3,6 +3,7 @@
 Tests for Export Engine
 """
 
+import os
 import pytest
 import tempfile
 import json
@@ -211,6 +212,74 @@ class TestExportEngine:
             assert result.streaming_used is True
             assert result.chunks_processed > 0
     
+    @pytest.mark.asyncio
+    async def test_export_stream_from_async_iterator(self, export_engine):
+        """Test streaming export consumes an async iterator chunk by chunk"""
+        
+        async def records():
+            for i in range(105):
+                yield {'name': f'Company {i}', 'industry': 'Tech'}
+        
+        with tempfile.NamedTemporaryFile(suffix='.jsonl', delete=False) as tmp:
+            config = OutputConfig(
+                format=ExportFormat.JSONL,
+                file_path=Path(tmp.name),
+                chunk_size=25
+            )
+            
+            result = await export_engine.export_stream(records(), config)
+            
+            assert result.record_count == 105
+            assert result.streaming_used is True
+            assert result.chunks_processed == 5
+            
+            with open(tmp.name, 'r') as f:
+                lines = [json.loads(line) for line in f]
+                assert len(lines) == 105
+                assert lines[-1]['name'] == 'Company 104'
+    
+    @pytest.mark.asyncio
+    async def test_export_from_vector_storage(self, export_engine):
+        """Test exporting straight from a vector storage stream"""
+        
+        class StreamingStorage:
+            async def stream_vectors_by_filter(self, index_name, metadata_filter, namespace=None):
+                for i in range(3):
+                    yield f"vec-{i}", [0.1, 0.2], {'name': f'Company {i}'}
+        
+        with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as tmp:
+            config = OutputConfig(
+                format=ExportFormat.CSV,
+                file_path=Path(tmp.name),
+                chunk_size=2
+            )
+            
+            result = await export_engine.export_from_vector_storage(
+                StreamingStorage(), "companies", config
+            )
+            
+            assert result.record_count == 3
+            assert result.columns == ['id', 'name']
+            
+            with open(tmp.name, 'r') as f:
+                rows = list(csv.DictReader(f))
+                assert rows[0] == {'id': 'vec-0', 'name': 'Company 0'}
+    
+    @pytest.mark.asyncio
+    async def test_export_stream_unsupported_format(self, export_engine):
+        """Test streaming export rejects formats without incremental writers"""
+        
+        async def records():
+            yield {'name': 'Company A'}
+        
+        config = OutputConfig(
+            format=ExportFormat.JSON,
+            file_path=Path("/tmp/test.json")
+        )
+        
+        with pytest.raises(ExportError):
+            await export_engine.export_stream(records(), config)
+    
     @pytest.mark.asyncio
     async def test_data_transformation_include_fields(self, export_engine, sample_companies):
         """Test data transformation with field inclusion"""
@@ -543,6 +612,77 @@ class TestParquetExporter:
             assert result.format == ExportFormat.PARQUET
             assert result.record_count == 2
             assert result.file_size_bytes > 0
+    
+    @pytest.mark.asyncio
+    async def test_parquet_streaming_row_groups(self, parquet_exporter):
+        """Test Parquet streaming writes one row group per chunk with a fixed schema"""
+        
+        if not parquet_exporter.is_available():
+            pytest.skip("Parquet dependencies not available")
+        
+        import pyarrow.parquet as pq
+        
+        with tempfile.NamedTemporaryFile(suffix='.parquet', delete=False) as tmp:
+            config = OutputConfig(
+                format=ExportFormat.PARQUET,
+                file_path=Path(tmp.name)
+            )
+            
+            context = await parquet_exporter.initialize_streaming_export(config)
+            await parquet_exporter.export_chunk(
+                [{'name': 'Company A', 'tags': ['ai'], 'website': None}], context
+            )
+            await parquet_exporter.export_chunk(
+                [{'name': 'Company B', 'website': 'https://b.com', 'extra': 1}], context
+            )
+            result = await parquet_exporter.finalize_streaming_export(context)
+            
+            assert result.record_count == 2
+            assert result.columns == ['name', 'tags', 'website', 'extra']
+            
+            parquet_file = pq.ParquetFile(tmp.name)
+            assert parquet_file.metadata.num_row_groups == 2
+            rows = parquet_file.read().to_pylist()
+            assert rows[0]['tags'] == '["ai"]'
+            assert rows[0]['extra'] is None
+            assert rows[1]['website'] == 'https://b.com'
+            assert rows[1]['extra'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_parquet_streaming_widens_schema_across_chunks(self, parquet_exporter):
+        """Test later chunks widen the inferred column types instead of failing"""
+        
+        if not parquet_exporter.is_available():
+            pytest.skip("Parquet dependencies not available")
+        
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = Path(tmp_dir) / 'widen.parquet'
+            config = OutputConfig(format=ExportFormat.PARQUET, file_path=file_path)
+            
+            context = await parquet_exporter.initialize_streaming_export(config)
+            chunks = [
+                [{'score': 1, 'flag': True, 'employees': None}],
+                [{'score': 1.5, 'flag': True, 'employees': 30}],
+                [{'score': 2, 'flag': 'yes', 'employees': 40}],
+            ]
+            for chunk in chunks:
+                await parquet_exporter.export_chunk(chunk, context)
+            result = await parquet_exporter.finalize_streaming_export(context)
+            
+            assert result.record_count == 3
+            assert os.listdir(tmp_dir) == ['widen.parquet']
+            parquet_file = pq.ParquetFile(file_path)
+            assert parquet_file.metadata.num_row_groups == 3
+            table = parquet_file.read()
+            assert table.schema.field('score').type == pa.float64()
+            assert table.schema.field('flag').type == pa.string()
+            assert table.schema.field('employees').type == pa.int64()
+            assert table.column('score').to_pylist() == [1.0, 1.5, 2.0]
+            assert table.column('flag').to_pylist() == ['True', 'True', 'yes']
+            assert table.column('employees').to_pylist() == [None, 30, 40]
 
 
 class TestPowerBIExporter:
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared crawl host scheduler
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.infrastructure.adapters.scrapers.host_scheduler import (
+    HostScheduler, HostThrottledError, parse_crawl_delay
+)
+
+
+class TestHostScheduler:
+    """Test cases for HostScheduler"""
+
+    @pytest.mark.asyncio
+    async def test_per_host_cap_does_not_block_other_hosts(self):
+        scheduler = HostScheduler(max_concurrency=10, max_per_host=1)
+        order = []
+
+        async def request(url):
+            async with scheduler.slot(url):
+                order.append(url)
+                await asyncio.sleep(0.05)
+
+        await asyncio.gather(request("https://a.com/1"), request("https://a.com/2"), request("https://b.com/1"))
+
+        assert order[:2] == ["https://a.com/1", "https://b.com/1"]
+        assert scheduler.get_stats()["peak_active"] == 2
+
+    @pytest.mark.asyncio
+    async def test_retry_after_delays_the_host(self):
+        scheduler = HostScheduler(max_per_host=4)
+        async with scheduler.slot("https://cdn.com/a") as slot:
+            slot.record(503, "0.1")
+
+        started = time.monotonic()
+        async with scheduler.slot("https://cdn.com/b"):
+            pass
+
+        assert time.monotonic() - started >= 0.08
+        assert scheduler.get_host_stats("cdn.com")["limit"] == 2
+
+    @pytest.mark.asyncio
+    async def test_waits_beyond_max_wait_fail_fast(self):
+        scheduler = HostScheduler(max_wait=0.5)
+        scheduler.record_response("https://blocked.com", 429, "30")
+
+        with pytest.raises(HostThrottledError):
+            await scheduler.acquire("https://blocked.com/page")
+
+    def test_crawl_delay_from_robots(self):
+        assert parse_crawl_delay("User-agent: *\nCrawl-delay: 2\n") == 2.0
+        assert parse_crawl_delay("User-agent: *\nDisallow: /private\n") is None
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Theodore v2 progress event bus.
+
+Tests push delivery, Last-Event-ID resume, coalescing and the use case
+progress_publisher hook.
+"""
+
+import asyncio
+
+import pytest
+
+from src.core.use_cases.base import BaseUseCase
+from src.infrastructure.observability.progress_bus import ProgressEventBus
+
+
+class TestProgressEventBus:
+    """Test publish/subscribe behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_subscriber_is_woken_by_publish(self):
+        bus = ProgressEventBus(coalesce_interval=0)
+        waiter = asyncio.create_task(bus.wait("job-1", None, timeout=5))
+        await asyncio.sleep(0.01)
+
+        bus.publish("job-1", "progress", {"percentage": 10})
+        events = await asyncio.wait_for(waiter, 1)
+
+        assert [event.data for event in events] == [{"percentage": 10}]
+
+    @pytest.mark.asyncio
+    async def test_burst_is_coalesced_but_terminal_events_kept(self):
+        bus = ProgressEventBus(coalesce_interval=0.05)
+        waiter = asyncio.create_task(bus.wait("job-1", None, timeout=5))
+        await asyncio.sleep(0.01)
+
+        for percentage in range(0, 100, 10):
+            bus.publish_progress("job-1", {"phase": "scraping", "percentage": percentage})
+        bus.publish_progress("job-1", {"phase": "completed", "percentage": 100})
+        events = await waiter
+
+        assert [event.event for event in events] == ["progress", "complete"]
+        assert events[0].data["percentage"] == 100
+
+    def test_resume_from_last_event_id(self):
+        bus = ProgressEventBus(history_size=3)
+        first = bus.publish("job-1", "progress", {"step": 1})
+        bus.publish("job-2", "progress", {"step": 1})
+        second = bus.publish("job-1", "progress", {"step": 2})
+
+        events, complete = bus.events_since("job-1", first.id)
+        assert complete and [event.id for event in events] == [second.id]
+
+        for step in range(3, 6):
+            bus.publish("job-1", "progress", {"step": step})
+        events, complete = bus.events_since("job-1", first.id)
+        assert not complete  # The gap was evicted; caller should send a snapshot
+
+        _, complete = bus.events_since("job-1", 10_000)
+        assert not complete  # Id from an earlier process
+
+    @pytest.mark.asyncio
+    async def test_use_case_publishes_progress(self):
+        bus = ProgressEventBus(coalesce_interval=0)
+
+        class EchoUseCase(BaseUseCase):
+            async def execute(self, request):
+                await self._emit_progress("exec-1", "scraping", 40, "Crawling pages")
+
+        use_case = EchoUseCase()
+        use_case.progress_publisher = bus.publish_progress
+        await use_case.execute(None)
+
+        events, _ = bus.events_since("exec-1", None)
+        assert events[0].data["phase"] == "scraping"
+        assert events[0].to_sse().startswith(f"id: {events[0].id}\nevent: progress\n")
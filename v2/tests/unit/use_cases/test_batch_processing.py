@@ -9,6 +9,7 @@ import pytest
 import asyncio
 import tempfile
 import csv
+import json
 from pathlib import Path
 from unittest.mock import Mock, AsyncMock, patch
 from datetime import datetime, timezone
@@ -20,8 +21,9 @@ from src.core.domain.entities.batch_job import (
 )
 from src.core.use_cases.batch_processing import (
     BatchProcessingUseCase, BatchInputProcessor, BatchOutputProcessor,
-    ConcurrencyController
+    ConcurrencyController, SlidingWindowScheduler
 )
+from src.core.domain.services.batch_journal import BatchJournal
 
 
 class TestBatchInputProcessor:
@@ -252,6 +254,57 @@ class TestConcurrencyController:
         assert end_time >= start_time
 
 
+class TestSlidingWindowScheduler:
+    """Test sliding-window task scheduling"""
+    
+    @staticmethod
+    async def _items(values):
+        for value in values:
+            yield value
+    
+    @pytest.mark.asyncio
+    async def test_refills_slots_as_tasks_complete(self):
+        """A slow task does not hold back the rest of its window"""
+        scheduler = SlidingWindowScheduler(max_in_flight=2)
+        running = 0
+        max_running = 0
+        
+        async def worker(delay):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(delay)
+            running -= 1
+            return delay
+        
+        results = [
+            result async for result in
+            scheduler.run(self._items([0.2, 0.01, 0.01, 0.01, 0.01]), worker)
+        ]
+        
+        # The four short tasks finish while the long one is still running
+        assert results == [0.01, 0.01, 0.01, 0.01, 0.2]
+        assert max_running == 2
+        assert scheduler.peak_in_flight == 2
+        assert scheduler.completed == 5
+        assert 0.0 < scheduler.slot_utilization <= 1.0
+    
+    @pytest.mark.asyncio
+    async def test_yields_worker_exceptions(self):
+        """Worker exceptions are yielded in place of results"""
+        scheduler = SlidingWindowScheduler(max_in_flight=3)
+        
+        async def worker(value):
+            if value == 2:
+                raise ValueError("bad item")
+            return value
+        
+        results = [result async for result in scheduler.run(self._items([1, 2, 3]), worker)]
+        
+        assert sorted(r for r in results if not isinstance(r, Exception)) == [1, 3]
+        assert sum(isinstance(r, ValueError) for r in results) == 1
+
+
 class TestBatchJob:
     """Test batch job entity functionality"""
     
@@ -511,20 +564,184 @@ class TestBatchProcessingUseCase:
         assert job is not None
         assert job.job_name == "Test Batch"
         assert job.job_type == BatchJobType.RESEARCH
-        assert job.progress.total_companies == 3  # From sample CSV
+        # The input is not counted up front
+        assert job.progress.total_companies == 0
+        assert job.progress.total_is_estimate
         assert job.configuration.max_concurrent == 2
         assert job.configuration.timeout_per_company == 60
     
     @pytest.mark.asyncio
-    async def test_count_companies_in_source(self, batch_use_case, csv_file):
-        """Test counting companies in input source"""
-        input_source = BatchInputSource(
-            type=InputSourceType.CSV_FILE,
-            path=csv_file
+    async def test_execute_batch_research_streams_results(
+        self, batch_use_case, mock_research_use_case, csv_file, tmp_path
+    ):
+        """Test results are streamed to the output and slow companies hit their deadline"""
+        research_result = mock_research_use_case.execute.return_value
+        
+        async def research(company_name, website=None, timeout=None):
+            if company_name == 'TestCorp B':
+                await asyncio.sleep(5)
+            return research_result
+        
+        mock_research_use_case.execute.side_effect = research
+        output_path = tmp_path / "results.csv"
+        
+        job = BatchJob(
+            job_name="Streaming Job",
+            job_type=BatchJobType.RESEARCH,
+            input_source=BatchInputSource(type=InputSourceType.CSV_FILE, path=csv_file),
+            output_destination=BatchOutputDestination(
+                type=OutputDestinationType.CSV_FILE, path=str(output_path)
+            ),
+            progress=BatchProgress(total_companies=3),
+            configuration=BatchConfiguration(max_concurrent=2, timeout_per_company=0.2)
+        )
+        
+        await batch_use_case._execute_batch_research(job)
+        
+        assert job.status == BatchJobStatus.COMPLETED
+        assert job.progress.completed_companies == 2
+        assert job.progress.failed_companies == 1
+        assert job.progress.errors_by_type == {'TimeoutError': 1}
+        assert job.result_summary.slot_utilization is not None
+        
+        with open(output_path, 'r', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        
+        # Rows are written in completion order, the timed-out company last
+        assert [row['company_name'] for row in rows] == ['TestCorp A', 'TestCorp C', 'TestCorp B']
+        assert rows[-1]['status'] == 'failed'
+        assert 'deadline' in rows[-1]['error_message']
+    
+    @pytest.mark.asyncio
+    async def test_rerun_resumes_from_journal(
+        self, batch_use_case, mock_research_use_case, csv_file, tmp_path
+    ):
+        """Test a rerun skips journaled successes and retries only failures"""
+        research_result = mock_research_use_case.execute.return_value
+        researched = []
+        
+        async def flaky_research(company_name, website=None, timeout=None):
+            researched.append(company_name)
+            if company_name == 'TestCorp B':
+                raise ConnectionError("site unreachable")
+            return research_result
+        
+        def make_job():
+            return BatchJob(
+                job_type=BatchJobType.RESEARCH,
+                input_source=BatchInputSource(type=InputSourceType.CSV_FILE, path=csv_file),
+                output_destination=BatchOutputDestination(
+                    type=OutputDestinationType.CSV_FILE, path=str(tmp_path / "results.csv")
+                ),
+                progress=BatchProgress(total_companies=3),
+                configuration=BatchConfiguration(
+                    max_concurrent=2, journal_path=str(tmp_path / "other-machine.jsonl")
+                )
+            )
+        
+        mock_research_use_case.execute.side_effect = flaky_research
+        await batch_use_case._execute_batch_research(make_job())
+        assert sorted(researched) == ['TestCorp A', 'TestCorp B', 'TestCorp C']
+        
+        researched.clear()
+        mock_research_use_case.execute.side_effect = None
+        mock_research_use_case.execute.return_value = research_result
+        job = make_job()
+        await batch_use_case._execute_batch_research(job)
+        
+        # Only the failed company is researched again
+        assert mock_research_use_case.execute.call_args.kwargs['company_name'] == 'TestCorp B'
+        assert mock_research_use_case.execute.await_count == 4
+        assert job.progress.completed_companies == 3
+        assert job.result_summary.successful_results == 3
+        assert job.checkpoint_data['journal_path'] == str(tmp_path / "other-machine.jsonl")
+        
+        with open(tmp_path / "results.csv", 'r', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        assert sorted(row['company_name'] for row in rows) == ['TestCorp A', 'TestCorp B', 'TestCorp C']
+        assert all(row['status'] == 'success' for row in rows)
+    
+    @pytest.mark.asyncio
+    async def test_journal_carry_over_is_limited_to_this_input(
+        self, batch_use_case, mock_research_use_case, csv_file, tmp_path
+    ):
+        """Test journaled successes for companies outside this input are not reported"""
+        journal_path = tmp_path / "shared.jsonl"
+        journal = BatchJournal(str(journal_path))
+        journal.open()
+        journal.record('TestCorp A', 'https://testcorp-a.com', 'success',
+                       row={'company_name': 'TestCorp A', 'status': 'success'})
+        journal.record('Other Shard Inc', 'https://other.com', 'success',
+                       row={'company_name': 'Other Shard Inc', 'status': 'success'})
+        journal.close()
+        
+        job = BatchJob(
+            job_type=BatchJobType.RESEARCH,
+            input_source=BatchInputSource(type=InputSourceType.CSV_FILE, path=csv_file),
+            output_destination=BatchOutputDestination(
+                type=OutputDestinationType.CSV_FILE, path=str(tmp_path / "results.csv")
+            ),
+            progress=BatchProgress(total_companies=3),
+            configuration=BatchConfiguration(max_concurrent=2, journal_path=str(journal_path))
+        )
+        await batch_use_case._execute_batch_research(job)
+        
+        assert mock_research_use_case.execute.await_count == 2
+        assert job.result_summary.total_processed == 3
+        with open(tmp_path / "results.csv", 'r', encoding='utf-8') as f:
+            names = sorted(row['company_name'] for row in csv.DictReader(f))
+        assert names == ['TestCorp A', 'TestCorp B', 'TestCorp C']
+    
+    @pytest.mark.asyncio
+    async def test_read_companies_estimates_total_for_shard(self, batch_use_case, tmp_path):
+        """Test companies stream from one shard while the total is estimated"""
+        input_path = tmp_path / "companies.jsonl"
+        with open(input_path, 'w', encoding='utf-8') as f:
+            for i in range(400):
+                f.write(json.dumps({'company': f'Company {i}', 'url': f'https://company-{i}.com'}) + '\n')
+        
+        job = BatchJob(
+            job_name="Sharded Job",
+            job_type=BatchJobType.RESEARCH,
+            input_source=BatchInputSource(type=InputSourceType.JSON_FILE, path=str(input_path)),
+            output_destination=BatchOutputDestination(type=OutputDestinationType.CSV_FILE),
+            progress=BatchProgress(total_companies=0, total_is_estimate=True),
+            configuration=BatchConfiguration(input_shard_index=1, input_shard_count=2)
         )
         
-        count = await batch_use_case._count_companies_in_source(input_source)
-        assert count == 3  # Valid companies in sample CSV
+        estimates = []
+        companies = []
+        async for company_data in batch_use_case._read_companies(job):
+            companies.append(company_data)
+            estimates.append(job.progress.total_companies)
+        
+        # The second shard is the contiguous tail of the file
+        numbers = [int(company['company_name'].split()[1]) for company in companies]
+        assert numbers == list(range(400 - len(companies), 400))
+        assert 180 <= estimates[0] <= 220
+        assert job.progress.total_companies == len(companies)
+        assert not job.progress.total_is_estimate
+    
+    @pytest.mark.asyncio
+    async def test_read_companies_from_json_array(self, batch_use_case, tmp_path):
+        """Test a .json file holding an array of records is read as JSON, not as CSV or JSON Lines"""
+        input_path = tmp_path / "companies.json"
+        input_path.write_text(json.dumps([
+            {'company': 'Acme', 'url': 'https://acme.com'},
+            {'company': 'Globex', 'url': 'https://globex.com'}
+        ], indent=2), encoding='utf-8')
+        
+        job = BatchJob(
+            job_type=BatchJobType.RESEARCH,
+            input_source=BatchInputSource(type=InputSourceType.JSON_FILE, path=str(input_path)),
+            output_destination=BatchOutputDestination(type=OutputDestinationType.CSV_FILE),
+            progress=BatchProgress(total_companies=0, total_is_estimate=True)
+        )
+        
+        companies = [company async for company in batch_use_case._read_companies(job)]
+        
+        assert [company['company_name'] for company in companies] == ['Acme', 'Globex']
+        assert job.progress.total_companies == 2
     
     @pytest.mark.asyncio
     async def test_job_management_operations(self, batch_use_case):
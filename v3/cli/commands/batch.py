@@ -5,6 +5,10 @@ Theodore v3 Batch Command
 
 Process multiple companies from a file using the proven antoine pipeline.
 Supports parallel processing and various input formats.
+
+Every company outcome is appended to a journal (FILE.journal.jsonl by
+default). Rerunning the same command after a crash skips companies that
+already succeeded and retries only the failures.
 """
 
 import click
@@ -52,9 +56,20 @@ console = Console()
     is_flag=True,
     help='Continue processing even if some companies fail'
 )
+@click.option(
+    '--journal',
+    type=click.Path(dir_okay=False),
+    help='Outcome journal to resume from and append to (default: FILE.journal.jsonl)'
+)
+@click.option(
+    '--restart',
+    is_flag=True,
+    help='Ignore outcomes already in the journal and process every company again'
+)
 @click.pass_context
 def batch(ctx, file: str, parallel: int, format: str, output_dir: Optional[str], 
-          summary_file: Optional[str], skip_errors: bool):
+          summary_file: Optional[str], skip_errors: bool, journal: Optional[str],
+          restart: bool):
     """
     Process multiple companies from a file.
     
@@ -68,9 +83,11 @@ def batch(ctx, file: str, parallel: int, format: str, output_dir: Optional[str],
         theodore batch companies.txt
         theodore batch companies.csv --parallel 5 --output-dir results/
         theodore batch domains.txt --format json --summary-file summary.json
+        theodore batch companies.txt --journal copied/companies.txt.journal.jsonl
     """
     
     verbose = ctx.obj.get('verbose', False)
+    journal_path = journal or f"{file}.journal.jsonl"
     
     console.print(f"📋 Processing companies from: [bold blue]{file}[/bold blue]")
     
@@ -79,6 +96,7 @@ def batch(ctx, file: str, parallel: int, format: str, output_dir: Optional[str],
         console.print(f"📋 Output format: {format}")
         console.print(f"📁 Output directory: {output_dir or 'None'}")
         console.print(f"📄 Summary file: {summary_file or 'None'}")
+        console.print(f"📓 Journal: {journal_path}")
         console.print()
     
     # Load companies from file
@@ -105,7 +123,9 @@ def batch(ctx, file: str, parallel: int, format: str, output_dir: Optional[str],
             companies=companies,
             parallel_count=parallel,
             skip_errors=skip_errors,
-            verbose=verbose
+            verbose=verbose,
+            journal_path=journal_path,
+            restart=restart
         )
         
         # Display results
@@ -166,100 +186,133 @@ def load_companies_from_file(file_path: str) -> List[str]:
     
     return companies
 
-def execute_batch_processing(companies: List[str], parallel_count: int, skip_errors: bool, verbose: bool) -> Dict:
+def execute_batch_processing(companies: List[str], parallel_count: int, skip_errors: bool, verbose: bool,
+                             journal_path: Optional[str] = None, restart: bool = False) -> Dict:
     """Execute batch processing of companies"""
     
     # Add core modules to path
     sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'core'))
     
     from cli.commands.research import execute_research_pipeline, extract_company_name_from_url, find_company_website
+    from batch_journal import BatchJournal
     
     results = {
         'successful': [],
         'failed': [],
         'successful_count': 0,
         'failed_count': 0,
+        'resumed_count': 0,
         'total_companies': len(companies),
         'start_time': time.time(),
         'total_cost': 0.0
     }
     
-    with Progress(
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(),
-        TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-        TextColumn("({task.completed}/{task.total})"),
-        TimeElapsedColumn(),
-        console=console
-    ) as progress:
+    journal = None
+    if journal_path:
+        journal = BatchJournal(journal_path)
+        if journal.open(restart=restart):
+            done = sum(1 for company in companies if journal.completed(company))
+            console.print(f"📓 Resuming from {journal_path}: {done} companies already completed")
+    
+    try:
+        with Progress(
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+            TextColumn("({task.completed}/{task.total})"),
+            TimeElapsedColumn(),
+            console=console
+        ) as progress:
         
-        task = progress.add_task("🏭 Processing companies...", total=len(companies))
+            task = progress.add_task("🏭 Processing companies...", total=len(companies))
         
-        for idx, company in enumerate(companies, 1):
-            progress.update(task, description=f"🏭 Processing: {company[:30]}...")
-            
-            try:
-                # Determine URL and company name
-                if company.startswith(('http://', 'https://')):
-                    base_url = company
-                    company_name = extract_company_name_from_url(company)
-                elif '.' in company and not ' ' in company:
-                    base_url = f"https://www.{company}" if not company.startswith('www.') else f"https://{company}"
-                    company_name = extract_company_name_from_url(company)
-                else:
-                    # Company name - find website
-                    base_url = find_company_website(company)
-                    company_name = company
-                    
-                    if not base_url:
-                        raise Exception(f"Could not find website for: {company}")
-                
-                # Execute research pipeline
-                result = execute_research_pipeline(
-                    base_url=base_url,
-                    company_name=company_name,
-                    show_progress=False,
-                    verbose=verbose
-                )
-                
-                if result['success']:
+            for idx, company in enumerate(companies, 1):
+                # Reuse the result of a company a previous run already completed
+                previous = journal.completed(company) if journal else None
+                if previous:
                     results['successful'].append({
                         'company': company,
-                        'result': result
+                        'result': previous['result']
                     })
                     results['successful_count'] += 1
-                    results['total_cost'] += result.get('total_cost', 0)
+                    results['resumed_count'] += 1
+                    results['total_cost'] += (previous['result'] or {}).get('total_cost', 0)
+                    progress.update(task, advance=1)
+                    continue
+            
+                progress.update(task, description=f"🏭 Processing: {company[:30]}...")
+            
+                try:
+                    # Determine URL and company name
+                    if company.startswith(('http://', 'https://')):
+                        base_url = company
+                        company_name = extract_company_name_from_url(company)
+                    elif '.' in company and not ' ' in company:
+                        base_url = f"https://www.{company}" if not company.startswith('www.') else f"https://{company}"
+                        company_name = extract_company_name_from_url(company)
+                    else:
+                        # Company name - find website
+                        base_url = find_company_website(company)
+                        company_name = company
+                    
+                        if not base_url:
+                            raise Exception(f"Could not find website for: {company}")
+                
+                    # Execute research pipeline
+                    result = execute_research_pipeline(
+                        base_url=base_url,
+                        company_name=company_name,
+                        show_progress=False,
+                        verbose=verbose
+                    )
+                
+                    if result['success']:
+                        results['successful'].append({
+                            'company': company,
+                            'result': result
+                        })
+                        results['successful_count'] += 1
+                        results['total_cost'] += result.get('total_cost', 0)
+                        if journal:
+                            journal.record(company, 'success', result=result)
                     
-                    if verbose:
-                        console.print(f"✅ {company} completed successfully")
+                        if verbose:
+                            console.print(f"✅ {company} completed successfully")
                         
-                else:
+                    else:
+                        error_info = {
+                            'company': company,
+                            'error': result.get('error', 'Unknown error')
+                        }
+                        results['failed'].append(error_info)
+                        results['failed_count'] += 1
+                        if journal:
+                            journal.record(company, 'failed', error=str(error_info['error']))
+                    
+                        if not skip_errors:
+                            console.print(f"❌ {company} failed: {error_info['error']}", style="red")
+                        elif verbose:
+                            console.print(f"⚠️ {company} failed: {error_info['error']}", style="yellow")
+                
+                except Exception as e:
                     error_info = {
                         'company': company,
-                        'error': result.get('error', 'Unknown error')
+                        'error': str(e)
                     }
                     results['failed'].append(error_info)
                     results['failed_count'] += 1
-                    
+                    if journal:
+                        journal.record(company, 'failed', error=str(e))
+                
                     if not skip_errors:
-                        console.print(f"❌ {company} failed: {error_info['error']}", style="red")
+                        console.print(f"❌ {company} failed: {str(e)}", style="red")
                     elif verbose:
-                        console.print(f"⚠️ {company} failed: {error_info['error']}", style="yellow")
-                
-            except Exception as e:
-                error_info = {
-                    'company': company,
-                    'error': str(e)
-                }
-                results['failed'].append(error_info)
-                results['failed_count'] += 1
-                
-                if not skip_errors:
-                    console.print(f"❌ {company} failed: {str(e)}", style="red")
-                elif verbose:
-                    console.print(f"⚠️ {company} failed: {str(e)}", style="yellow")
+                        console.print(f"⚠️ {company} failed: {str(e)}", style="yellow")
             
-            progress.update(task, advance=1)
+                progress.update(task, advance=1)
+    finally:
+        if journal:
+            journal.close()
     
     results['total_time'] = time.time() - results['start_time']
     results['end_time'] = time.time()
@@ -273,6 +326,7 @@ def display_batch_summary(results: Dict, companies: List[str]):
     summary_panel = Panel(
         f"[bold green]Successful:[/bold green] {results['successful_count']}/{results['total_companies']}\n"
         f"[bold red]Failed:[/bold red] {results['failed_count']}/{results['total_companies']}\n"
+        f"[bold cyan]Resumed from journal:[/bold cyan] {results.get('resumed_count', 0)}\n"
         f"[bold blue]Total Time:[/bold blue] {results['total_time']:.2f} seconds\n"
         f"[bold yellow]Total Cost:[/bold yellow] ${results['total_cost']:.4f}",
         title="📊 Batch Processing Summary",
@@ -0,0 +1,150 @@
+"""
+Batch Journal
+=============
+
+Append-only outcome journal for `theodore batch`. Without it a batch that
+crashed at company 4,900 of 5,000 had to research all 5,000 again.
+
+- One JSON line per company outcome (success with its research result,
+  or failure with its error), after a header line
+- Lines are flushed and fsynced in groups (every GROUP_SIZE outcomes or
+  GROUP_INTERVAL_SECONDS), so a crash loses at most one group
+- Rerunning the same batch replays the journal: companies that already
+  succeeded are skipped and their stored results reused, failures are
+  retried. The last outcome for a company wins
+- Entries are keyed by the normalized company entry (name, domain or
+  URL), not by file path or line number, so a journal copied from another
+  machine resumes there too (`--journal path/to/copied.journal.jsonl`)
+- A torn final line from a crash is dropped on replay
+
+Usage:
+    journal = BatchJournal(path)
+    done = journal.open()
+    if journal.completed(company): ...
+    journal.record(company, "success", result=result)
+    journal.close()
+"""
+
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_VERSION = 1
+GROUP_SIZE = 20
+GROUP_INTERVAL_SECONDS = 1.0
+
+
+def company_key(company: str) -> str:
+    """Journal key for a batch entry: lower-cased, without scheme, www. or trailing slash."""
+    key = ' '.join(str(company).strip().lower().split())
+    for prefix in ('https://', 'http://'):
+        if key.startswith(prefix):
+            key = key[len(prefix):]
+    if key.startswith('www.'):
+        key = key[4:]
+    return key.rstrip('/')
+
+
+class BatchJournal:
+    """Append-only, group-committed journal of per-company batch outcomes."""
+
+    def __init__(self, path: str, group_size: int = GROUP_SIZE,
+                 group_interval: float = GROUP_INTERVAL_SECONDS):
+        self.path = path
+        self.group_size = max(1, group_size)
+        self.group_interval = group_interval
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def open(self, restart: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Replay the journal (unless restarting) and open it for appending."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        if restart or not os.path.exists(self.path):
+            self.entries = {}
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self._append({
+                'type': 'header',
+                'version': JOURNAL_VERSION,
+                'created_at': datetime.now().isoformat()
+            })
+            self.sync()
+        else:
+            self._replay()
+            self._file = open(self.path, 'a', encoding='utf-8')
+
+        return self.entries
+
+    def completed(self, company: str) -> Optional[Dict[str, Any]]:
+        """The journaled success for a company, or None if it still needs research."""
+        entry = self.entries.get(company_key(company))
+        return entry if entry and entry['status'] == 'success' else None
+
+    def record(self, company: str, status: str, result: Optional[Dict] = None,
+               error: Optional[str] = None) -> None:
+        """Append one company's outcome."""
+        key = company_key(company)
+        previous = self.entries.get(key)
+        entry = {
+            'type': 'outcome',
+            'key': key,
+            'company': company,
+            'status': status,
+            'result': result,
+            'error': error,
+            'attempts': (previous['attempts'] + 1) if previous else 1,
+            'recorded_at': datetime.now().isoformat()
+        }
+        self.entries[key] = entry
+        self._append(entry)
+        self._unsynced += 1
+
+        if self._unsynced >= self.group_size or time.monotonic() - self._last_sync >= self.group_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        """Flush and fsync everything appended so far."""
+        if self._file is None:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, default=str, ensure_ascii=False) + '\n')
+
+    def _replay(self) -> None:
+        self.entries = {}
+        valid_length = 0
+
+        with open(self.path, 'rb') as f:
+            for raw_line in f:
+                if not raw_line.endswith(b'\n'):
+                    break
+                try:
+                    record = json.loads(raw_line)
+                except ValueError:
+                    break
+                valid_length += len(raw_line)
+                if record.get('type') == 'outcome':
+                    self.entries[record['key']] = record
+
+        # Drop a record torn by a crash so the next append starts on a clean line
+        if valid_length < os.path.getsize(self.path):
+            logger.warning(f"Dropping incomplete last record of {self.path}")
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid_length)
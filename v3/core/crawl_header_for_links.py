@@ -47,6 +47,7 @@ try:
     from crawl4ai import AsyncWebCrawler, CrawlerRunConfig
     from crawl4ai.async_configs import CacheMode
     from src.ssl_config import get_browser_args, should_verify_ssl
+    from discovery_cache import get_discovery_cache, revalidate, validator_from_headers
     CRAWL4AI_AVAILABLE = True
     print("✅ Crawl4AI and Theodore SSL config imported successfully")
 except ImportError as e:
@@ -97,6 +98,17 @@ async def extract_header_footer_links(url: str) -> Dict[str, List[Dict[str, str]
         "all_links": []
     }
     
+    # Rendering the homepage is the slowest discovery step: reuse links from an earlier
+    # run within the TTL, or after the page answers "not modified"
+    cache = get_discovery_cache()
+    cache_variant = parsed_url.path or "/"
+    cached = cache.lookup(url, "header_links", cache_variant) if cache else None
+    if cached and (cached.fresh or await revalidate(cached.validators)):
+        if not cached.fresh:
+            cache.mark_revalidated(cached)
+        print(f"✅ Using {len(cached.payload['all_links'])} cached navigation links ({cached.age:.0f}s old)")
+        return cached.payload
+    
     try:
         # Theodore's proven Crawl4AI configuration
         browser_args = get_browser_args(ignore_ssl=not should_verify_ssl())
@@ -151,6 +163,11 @@ async def extract_header_footer_links(url: str) -> Dict[str, List[Dict[str, str]
                 print(f"   Menu links: {len(result['menu_links'])}")
                 print(f"   Total unique links: {len(result['all_links'])}")
                 
+                if cache and result['all_links']:
+                    cache.store(url, "header_links", result,
+                                {url: validator_from_headers(getattr(crawl_result, 'response_headers', None))},
+                                variant=cache_variant)
+                
             else:
                 print(f"❌ Failed to crawl page: success={getattr(crawl_result, 'success', False)}")
                 
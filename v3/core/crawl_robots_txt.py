@@ -30,6 +30,8 @@ from urllib.parse import urljoin, urlparse
 import aiohttp
 import re
 
+from discovery_cache import conditional_headers, get_discovery_cache, validator_from_headers
+
 # Load environment variables
 try:
     from dotenv import load_dotenv
@@ -63,6 +65,16 @@ class RobotsInfo:
     
     def __repr__(self):
         return f"RobotsInfo(url='{self.url}', found={self.found}, user_agents={len(self.user_agents)}, sitemaps={len(self.sitemaps)})"
+    
+    def to_dict(self) -> Dict:
+        """JSON-serializable form for the discovery cache."""
+        return dict(self.__dict__)
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "RobotsInfo":
+        robots_info = cls(data['url'])
+        robots_info.__dict__.update(data)
+        return robots_info
 
 
 async def extract_robots_info(base_url: str, user_agent_filter: str = "*") -> RobotsInfo:
@@ -87,13 +99,25 @@ async def extract_robots_info(base_url: str, user_agent_filter: str = "*") -> Ro
     
     robots_info = RobotsInfo(robots_url)
     
+    # Parsed rules from an earlier run: served as-is within the TTL, revalidated after it
+    cache = get_discovery_cache()
+    cached = cache.lookup(base_url, "robots", user_agent_filter) if cache else None
+    if cached and cached.fresh:
+        print(f"Using cached robots.txt for {domain} ({cached.age:.0f}s old)")
+        return RobotsInfo.from_dict(cached.payload)
+    
     try:
         async with aiohttp.ClientSession(
             timeout=aiohttp.ClientTimeout(total=10),
             headers={"User-Agent": USER_AGENT}
         ) as session:
             
-            async with session.get(robots_url) as response:
+            request_headers = conditional_headers(cached.validators.get(robots_url)) if cached else {}
+            async with session.get(robots_url, headers=request_headers) as response:
+                if response.status == 304 and cached:
+                    print(f"robots.txt unchanged, using cached rules for {domain}")
+                    cache.mark_revalidated(cached)
+                    return RobotsInfo.from_dict(cached.payload)
                 if response.status == 200:
                     robots_info.found = True
                     robots_info.raw_content = await response.text()
@@ -109,6 +133,11 @@ async def extract_robots_info(base_url: str, user_agent_filter: str = "*") -> Ro
                 else:
                     print(f"No robots.txt found (HTTP {response.status})")
                     robots_info.found = False
+                
+                # A missing robots.txt is cached too; throttling and server errors are not
+                if cache and (response.status == 200 or (400 <= response.status < 500 and response.status != 429)):
+                    cache.store(base_url, "robots", robots_info.to_dict(),
+                                {robots_url: validator_from_headers(response.headers)}, variant=user_agent_filter)
     
     except Exception as e:
         logger.error(f"Error fetching robots.txt from {base_url}: {e}")
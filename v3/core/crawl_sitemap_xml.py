@@ -23,10 +23,12 @@ import logging
 import os
 import time
 import xml.etree.ElementTree as ET
-from typing import Dict, List
+from typing import Dict, List, Optional
 from urllib.parse import urljoin, urlparse
 import aiohttp
 
+from discovery_cache import NEGATIVE_TTL_SECONDS, get_discovery_cache, revalidate, validator_from_headers
+
 # Load environment variables
 try:
     from dotenv import load_dotenv
@@ -108,6 +110,9 @@ class SitemapEntry:
     
     def __repr__(self):
         return f"SitemapEntry(url='{self.url}', lastmod='{self.lastmod}')"
+    
+    def to_dict(self) -> Dict[str, Optional[str]]:
+        return {'url': self.url, 'lastmod': self.lastmod, 'changefreq': self.changefreq, 'priority': self.priority}
 
 
 async def extract_sitemap_urls(base_url: str, locale_filter: str = None) -> List[SitemapEntry]:
@@ -132,12 +137,30 @@ async def extract_sitemap_urls(base_url: str, locale_filter: str = None) -> List
     discovered_entries = []
     processed_sitemaps = set()  # Avoid processing same sitemap twice
     
+    # Entries from an earlier run: served within the TTL, or after robots.txt and every
+    # top-level sitemap file answer "not modified"
+    cache = get_discovery_cache()
+    cache_variant = locale_filter or ""
+    cached = cache.lookup(base_url, "sitemap", cache_variant) if cache else None
+    if cached and (cached.fresh or await revalidate(cached.validators)):
+        if not cached.fresh:
+            cache.mark_revalidated(cached)
+        print(f"Using {len(cached.payload)} cached sitemap URLs for {domain} ({cached.age:.0f}s old)")
+        return [SitemapEntry(**entry) for entry in cached.payload]
+    validators: Dict[str, Dict[str, str]] = {}
+    probe_errors: List[str] = []
+    
     try:
         # Step 1: Try to find sitemap.xml
-        sitemap_urls = await _discover_sitemap_urls(base_url)
+        sitemap_urls = await _discover_sitemap_urls(base_url, validators, probe_errors)
         
         if not sitemap_urls:
             print("Warning: No sitemap.xml found")
+            # Only a definite "no sitemap" is cached, and briefly; a timeout or
+            # server error must not hide the sitemap until the TTL runs out
+            if cache and not probe_errors:
+                cache.store(base_url, "sitemap", [], validators, variant=cache_variant,
+                            ttl=NEGATIVE_TTL_SECONDS)
             return []
         
         print(f"Found {len(sitemap_urls)} sitemap file(s)")
@@ -151,12 +174,16 @@ async def extract_sitemap_urls(base_url: str, locale_filter: str = None) -> List
                     continue
                 
                 processed_sitemaps.add(sitemap_url)
-                entries = await _parse_sitemap_file(sitemap_url, domain, locale_filter)
+                entries = await _parse_sitemap_file(sitemap_url, domain, locale_filter, validators)
                 discovered_entries.extend(entries)
                 print(f"Processed {sitemap_url}: {len(entries)} URLs")
         
         print(f"Total sitemap URLs extracted: {len(discovered_entries)}")
         
+        if cache and discovered_entries:
+            cache.store(base_url, "sitemap", [entry.to_dict() for entry in discovered_entries],
+                        validators, variant=cache_variant)
+        
     except Exception as e:
         logger.error(f"Error extracting sitemap from {base_url}: {e}")
         print(f"Error: {e}")
@@ -164,9 +191,19 @@ async def extract_sitemap_urls(base_url: str, locale_filter: str = None) -> List
     return discovered_entries
 
 
-async def _discover_sitemap_urls(base_url: str) -> List[str]:
-    """Discover sitemap URLs from robots.txt and common locations."""
+async def _discover_sitemap_urls(
+    base_url: str,
+    validators: Optional[Dict[str, Dict[str, str]]] = None,
+    errors: Optional[List[str]] = None
+) -> List[str]:
+    """
+    Discover sitemap URLs from robots.txt and common locations.
     
+    robots.txt validators go to `validators`; probes that failed without a
+    definite answer (network errors, 429, 5xx) are appended to `errors`.
+    """
+    if errors is None:
+        errors = []
     sitemap_urls = []
     
     try:
@@ -179,8 +216,12 @@ async def _discover_sitemap_urls(base_url: str) -> List[str]:
             robots_url = urljoin(base_url, '/robots.txt')
             try:
                 async with session.get(robots_url) as response:
+                    if response.status == 429 or response.status >= 500:
+                        errors.append(f"{robots_url}: HTTP {response.status}")
                     if response.status == 200:
                         robots_content = await response.text()
+                        if validators is not None:
+                            validators[robots_url] = validator_from_headers(response.headers)
                         for line in robots_content.split('\n'):
                             line = line.strip()
                             if line.lower().startswith('sitemap:'):
@@ -190,6 +231,7 @@ async def _discover_sitemap_urls(base_url: str) -> List[str]:
                         if sitemap_urls:
                             print(f"Found {len(sitemap_urls)} sitemap(s) in robots.txt")
             except Exception as e:
+                errors.append(f"{robots_url}: {e}")
                 logger.debug(f"Failed to check robots.txt: {e}")
             
             # Method 2: Try common sitemap locations if none found in robots.txt
@@ -205,23 +247,32 @@ async def _discover_sitemap_urls(base_url: str) -> List[str]:
                     sitemap_url = urljoin(base_url, location)
                     try:
                         async with session.get(sitemap_url) as response:
+                            if response.status == 429 or response.status >= 500:
+                                errors.append(f"{sitemap_url}: HTTP {response.status}")
                             if response.status == 200:
                                 content_type = response.headers.get('content-type', '')
                                 if 'xml' in content_type.lower():
                                     sitemap_urls.append(sitemap_url)
                                     print(f"Found sitemap at: {location}")
                                     break
-                    except Exception:
+                    except Exception as e:
+                        errors.append(f"{sitemap_url}: {e}")
                         continue
     
     except Exception as e:
+        errors.append(str(e))
         logger.error(f"Failed to discover sitemaps: {e}")
     
     return sitemap_urls
 
 
-async def _parse_sitemap_file(sitemap_url: str, domain: str, locale_filter: str = None) -> List[SitemapEntry]:
-    """Parse a single sitemap XML file and extract URLs."""
+async def _parse_sitemap_file(
+    sitemap_url: str,
+    domain: str,
+    locale_filter: str = None,
+    validators: Optional[Dict[str, Dict[str, str]]] = None
+) -> List[SitemapEntry]:
+    """Parse a single sitemap XML file and extract URLs (its HTTP validators go to `validators`)."""
     
     entries = []
     
@@ -235,6 +286,8 @@ async def _parse_sitemap_file(sitemap_url: str, domain: str, locale_filter: str
                 if response.status != 200:
                     print(f"Warning: Failed to fetch {sitemap_url}: HTTP {response.status}")
                     return []
+                if validators is not None:
+                    validators[sitemap_url] = validator_from_headers(response.headers)
                 
                 content = await response.text()
                 
@@ -56,6 +56,15 @@ except ImportError:
     TRAFILATURA_AVAILABLE = True
     print("✅ Trafilatura installed and imported successfully")
 
+# Shared on-disk page cache from the main Theodore package
+try:
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+    from src.page_cache import get_page_cache
+    PAGE_CACHE_AVAILABLE = True
+except ImportError as e:
+    print(f"⚠️ Page cache not available: {e}")
+    PAGE_CACHE_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -103,6 +112,7 @@ async def crawl_single_page(
     
     Uses Trafilatura's superior boilerplate removal and content extraction
     to get clean, unique content from each page without navigation/header/footer.
+    Downloaded HTML and extracted text are shared with Theodore's page cache.
     
     Args:
         url: Full URL to crawl
@@ -124,9 +134,33 @@ async def crawl_single_page(
     print(f"🔍 [{url}] Starting Trafilatura extraction...")
     start_time = time.time()
     
+    page_cache = get_page_cache() if PAGE_CACHE_AVAILABLE else None
+    if page_cache:
+        cached_text = await page_cache.get_async(url, "text")
+        if cached_text:
+            content = cached_text.content
+            if len(content) > max_content_length:
+                content = content[:max_content_length] + "... [TRUNCATED]"
+            print(f"💾 [{url}] Served from page cache ({len(content)} chars)")
+            return PageCrawlResult(
+                url=url,
+                success=True,
+                content=content,
+                title=cached_text.meta.get('title', ''),
+                content_length=len(content),
+                crawl_time=time.time() - start_time,
+                extraction_method=cached_text.meta.get('extraction_method', 'trafilatura')
+            )
+    
     try:
-        # Download the page content
-        downloaded = trafilatura.fetch_url(url)
+        # Download the page content (or reuse HTML cached by an earlier crawl)
+        cached_html = await page_cache.get_async(url, "html") if page_cache else None
+        if cached_html:
+            downloaded = cached_html.content
+        else:
+            downloaded = trafilatura.fetch_url(url)
+            if downloaded and page_cache:
+                await page_cache.put_async(url, downloaded, "html")
         
         if not downloaded:
             crawl_time = time.time() - start_time
@@ -228,7 +262,8 @@ async def crawl_single_page(
                 extraction_method="no_content"
             )
         
-        # Clean and limit content
+        # Clean and limit content (the cache keeps the full text)
+        full_content = final_content
         if len(final_content) > max_content_length:
             final_content = final_content[:max_content_length] + "... [TRUNCATED]"
         
@@ -252,6 +287,9 @@ async def crawl_single_page(
             except:
                 title = ""
         
+        if page_cache:
+            await page_cache.put_async(url, full_content, "text", {'title': title, 'extraction_method': extraction_method})
+        
         crawl_time = time.time() - start_time
         
         print(f"✅ [{url}] Extracted successfully ({len(final_content)} chars, {crawl_time:.2f}s) via {extraction_method}")
@@ -54,6 +54,8 @@ except ImportError as e:
     print(f"Warning: Failed to import crawler modules: {e}")
     CRAWLERS_AVAILABLE = False
 
+from discovery_cache import get_discovery_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -73,6 +75,14 @@ def normalize_domain_url(url: str) -> str:
     parsed = urlparse(url)
     domain = parsed.netloc
     
+    # The www/non-www probe costs up to two HEAD requests; reuse a recent answer
+    cache = get_discovery_cache()
+    cache_variant = parsed.path or "/"
+    cached = cache.lookup(url, "canonical_url", cache_variant) if cache else None
+    if cached and cached.fresh:
+        print(f"🔄 Domain normalized (cached): {url} → {cached.payload['url']}")
+        return cached.payload['url']
+    
     # If domain already has www, try both variants
     # If domain doesn't have www, try both variants
     
@@ -101,6 +111,8 @@ def normalize_domain_url(url: str) -> str:
                 # Use the final URL after redirects
                 final_url = response.url
                 print(f"🔄 Domain normalized: {url} → {final_url}")
+                if cache:
+                    cache.store(url, "canonical_url", {'url': final_url}, variant=cache_variant)
                 return final_url
         except:
             continue
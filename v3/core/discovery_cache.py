@@ -0,0 +1,33 @@
+"""
+Discovery Cache
+===============
+
+The v3 website discovery crawlers (`crawl_robots_txt`, `crawl_sitemap_xml`,
+`crawl_header_for_links`, used by `critter.discover_all_paths`) share the
+main Theodore package's per-domain discovery cache, src/discovery_cache.py,
+the same way `crawler` shares src/page_cache.py. Both pipelines therefore
+read and write one database (data/discovery_cache/discovery.db), and a
+domain discovered by either is served to the other.
+
+See src/discovery_cache.py for the cache itself and its configuration.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.discovery_cache import (  # noqa: E402,F401
+    DEFAULT_TTL_SECONDS,
+    NEGATIVE_TTL_SECONDS,
+    REVALIDATE_TIMEOUT_SECONDS,
+    DiscoveryCache,
+    DiscoveryEntry,
+    conditional_headers,
+    domain_key,
+    get_discovery_cache,
+    get_discovery_cache_stats,
+    revalidate,
+    set_discovery_cache,
+    validator_from_headers,
+)
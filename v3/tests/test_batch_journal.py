@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Tests for the v3 batch outcome journal and the `theodore batch`
+--journal / --restart resume path.
+"""
+
+import sys
+import os
+import json
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# Add v3 paths
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'core'))
+
+from click.testing import CliRunner
+
+from batch_journal import BatchJournal, company_key
+from cli.commands.batch import batch
+
+
+class TestBatchJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "companies.txt.journal.jsonl")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_replay_keeps_last_outcome_per_company(self):
+        journal = BatchJournal(self.path)
+        journal.open()
+        journal.record("acme.com", "failed", error="timeout")
+        journal.record("https://www.acme.com/", "success", result={"company_name": "Acme"})
+        journal.record("Globex", "failed", error="no website")
+        journal.close()
+
+        replayed = BatchJournal(self.path)
+        entries = replayed.open()
+        replayed.close()
+
+        self.assertEqual(set(entries), {company_key("acme.com"), company_key("Globex")})
+        self.assertEqual(replayed.completed("ACME.com")["result"], {"company_name": "Acme"})
+        self.assertEqual(entries[company_key("acme.com")]["attempts"], 2)
+        self.assertIsNone(replayed.completed("Globex"))
+
+    def test_torn_tail_is_truncated(self):
+        journal = BatchJournal(self.path)
+        journal.open()
+        journal.record("acme.com", "success", result={})
+        journal.close()
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"type": "outcome", "key": "globex.com", "sta')
+
+        replayed = BatchJournal(self.path)
+        replayed.open()
+        replayed.record("globex.com", "success", result={})
+        replayed.close()
+
+        with open(self.path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([record.get("key") for record in records], [None, "acme.com", "globex.com"])
+
+    def test_restart_discards_previous_outcomes(self):
+        journal = BatchJournal(self.path)
+        journal.open()
+        journal.record("acme.com", "success", result={})
+        journal.close()
+
+        restarted = BatchJournal(self.path)
+        self.assertEqual(restarted.open(restart=True), {})
+        restarted.close()
+
+        replayed = BatchJournal(self.path)
+        self.assertEqual(replayed.open(), {})
+        replayed.close()
+
+
+class TestBatchCommandResume(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.input_path = os.path.join(self.tmp.name, "companies.txt")
+        with open(self.input_path, "w", encoding="utf-8") as f:
+            f.write("acme.com\nglobex.com\ninitech.com\n")
+        self.journal_path = os.path.join(self.tmp.name, "copied", "journal.jsonl")
+        self.researched = []
+        self.failing = {"Globex"}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def research(self, base_url, company_name, show_progress=False, verbose=False):
+        self.researched.append(company_name)
+        if company_name in self.failing:
+            return {"success": False, "error": "site unreachable"}
+        return {"success": True, "company_name": company_name, "total_cost": 0.01}
+
+    def run_batch(self, *args):
+        with patch("cli.commands.research.execute_research_pipeline", side_effect=self.research):
+            result = CliRunner().invoke(
+                batch, [self.input_path, "--skip-errors", "--journal", self.journal_path, *args],
+                obj={"verbose": False}
+            )
+        self.assertIsNone(result.exception, result.output)
+        return result
+
+    def test_rerun_skips_completed_companies_and_retries_failures(self):
+        self.run_batch()
+        self.assertEqual(self.researched, ["Acme", "Globex", "Initech"])
+
+        self.researched.clear()
+        self.failing.clear()
+        result = self.run_batch()
+
+        self.assertEqual(self.researched, ["Globex"])
+        self.assertIn("Resumed from journal: 2", result.output)
+        journal = BatchJournal(self.journal_path)
+        journal.open()
+        journal.close()
+        self.assertTrue(all(journal.completed(company) for company in ("acme.com", "globex.com", "initech.com")))
+
+    def test_restart_researches_every_company_again(self):
+        self.run_batch()
+        self.researched.clear()
+
+        self.run_batch("--restart")
+
+        self.assertEqual(self.researched, ["Acme", "Globex", "Initech"])
+
+
+if __name__ == '__main__':
+    unittest.main()